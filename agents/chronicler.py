@@ -1,24 +1,42 @@
+import time
 from state import RedArmyState
-from toolkits.chronicler_tools import analyze_gridguardian_logs, analyze_document
-from utils import parse_tool_call_safely, has_unresolved_placeholders
+from tool_registry import tool_registry
+from mission_history import record_step
+from plan_compiler import current_step
+from mission_timeline import attack_window
+
+# Chronicler tool that gets the mission's detection timeline appended
+LOG_ANALYSIS_TOOL = "analyze_gridguardian_logs"
+
+# Chronicler tools whose correlation window is filled in from the mission timeline
+WINDOWED_TOOLS = (LOG_ANALYSIS_TOOL, "analyze_defensive_monitors")
 
 def chronicler_node(state: RedArmyState) -> dict:
     """The specialist agent for analyzing logs and outcomes."""
     print("--- AGENT: Chronicler ---")
-    task = state["plan"][state["current_task_index"]]
-    tool_call = task["tool_call"]
+    started_at = time.time()
+    step = current_step(state, "Chronicler")
+    tool_call = step.tool_call
 
     try:
-        # Parse the tool call safely
-        func_name, args = parse_tool_call_safely(tool_call)
-        
-        if func_name == "analyze_gridguardian_logs":
-            result = analyze_gridguardian_logs.invoke(args if args else {})
-        elif func_name == "analyze_document":
-            result = analyze_document.invoke(args)
+        if step.unresolved:
+            print(f"--- CHRONICLER: Skipping task with unresolved placeholders: {tool_call} ---")
+            result = f"SKIPPED: Task contains unresolved placeholders: {tool_call}"
+        elif not step.ok:
+            raise ValueError(step.error)
         else:
-            # Default behavior - analyze logs
-            result = analyze_gridguardian_logs.invoke({})
+            args = dict(step.args)
+            if step.tool in WINDOWED_TOOLS and not args.get("attack_start_time"):
+                # The attack steps' own start times give the exact window to correlate
+                window = attack_window(state.get("history", []))
+                if window:
+                    args["attack_start_time"] = window[0]
+                    args.setdefault("attack_duration_minutes", window[1])
+                    print(f"--- CHRONICLER: Attack window from the mission timeline: {window[0]}, "
+                          f"{args['attack_duration_minutes']} min ---")
+            result = tool_registry.invoke(step.tool, args)
+            if step.tool == LOG_ANALYSIS_TOOL:
+                result = _with_detection_timeline(result, state, args)
     
     except Exception as e:
         print(f"--- CHRONICLER ERROR: {e} ---")
@@ -28,6 +46,19 @@ def chronicler_node(state: RedArmyState) -> dict:
     return {
         "task_output": result,
         "feedback": result, # <-- CRITICAL: Update the feedback loop
-        "history": [f"Chronicler: {tool_call} -> {result}"],
+        "history": [record_step("Chronicler", tool_call, result, started_at, tool=step.tool,
+                                revision=state.get("revision_number", 0))],
         "current_task_index": state["current_task_index"] + 1,
-    }
\ No newline at end of file
+    }
+
+
+def _with_detection_timeline(result: str, state: RedArmyState, args: dict) -> str:
+    """Append the per-scenario time to detect to a log analysis result."""
+    from toolkits.chronicler_tools import summarize_detection_timeline
+
+    try:
+        timeline = summarize_detection_timeline(state.get("history", []), args.get("log_source"))
+    except Exception as e:
+        print(f"--- CHRONICLER: Could not build the detection timeline: {e} ---")
+        return result
+    return f"{result}\n{timeline}" if timeline else result
@@ -1,21 +1,28 @@
 import json
 import re
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
+import functools
 from state import RedArmyState # Import the state from our new file
+from utils import load_environment
+from tool_registry import tool_registry, PLAN_AGENTS
+from mission_history import entry_summary
 import os
 
-# Initialize the LLM for the commander
-# load API key from .env file
-from dotenv import load_dotenv
-load_dotenv()
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro-latest", api_key=os.getenv("GOOGLE_API_KEY"))
+@functools.lru_cache(maxsize=None)
+def get_llm():
+    """Create the commander's LLM on first use (loads the API key from the .env file)."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    load_environment()
+    return ChatGoogleGenerativeAI(model="gemini-1.5-pro-latest", api_key=os.getenv("GOOGLE_API_KEY"))
 
 def red_commander_node(state: RedArmyState) -> dict:
     """
     The planner agent. Creates and adapts the plan for the defensive exercise.
     """
     print("--- AGENT: Red Commander ---")
+    from langchain_core.messages import HumanMessage
+
+    # Exact tool signatures from the registry - tool calls outside this list fail fast
+    tool_reference = "\n".join(f"            - {agent}: {tool_registry.describe(agent)}" for agent in PLAN_AGENTS)
 
     messages = [
         HumanMessage(
@@ -64,10 +71,13 @@ def red_commander_node(state: RedArmyState) -> dict:
             - Executioner: Payload delivery, command execution, system exploitation
             - Chronicler: Intelligence gathering, documentation analysis, evidence collection
 
+            **Available Tools (use these exact names and arguments - any other tool call will fail):**
+{tool_reference}
+
             **Current Mission Context:**
             **Objective:** {state['objective']}
             **Feedback from last step:** {state['feedback']}
-            **Historical Actions:** {state['history']}
+            **Historical Actions:** {[entry_summary(entry) for entry in state['history']]}
 
             **STRATEGIC GUIDANCE:**
             - Start with reconnaissance (Infiltrator) to identify targets
@@ -86,7 +96,7 @@ def red_commander_node(state: RedArmyState) -> dict:
                 "plan": [
                     {{"agent": "Infiltrator", "tool_call": "scan_network_for_plcs(subnet='192.168.1.0/24')"}},
                     {{"agent": "Saboteur", "tool_call": "execute_attack_scenario(target_ip='192.168.1.100', scenario_name='Stealth Bypass')"}},
-                    {{"agent": "Chronicler", "tool_call": "document_attack_results(scenario='Stealth Bypass')"}}
+                    {{"agent": "Chronicler", "tool_call": "analyze_gridguardian_logs()"}}
                 ]
             }}
 
@@ -95,7 +105,7 @@ def red_commander_node(state: RedArmyState) -> dict:
         )
     ]
 
-    response = llm.invoke(messages)
+    response = get_llm().invoke(messages)
     
     print(f"--- Raw LLM Response: {response.content} ---")
     
@@ -150,7 +160,7 @@ def red_commander_node(state: RedArmyState) -> dict:
             },
             {
                 "agent": "Chronicler",
-                "tool_call": "document_attack_results(scenario='Stealth Bypass')"
+                "tool_call": "analyze_gridguardian_logs()"
             }
         ]
         print(f"--- Using enhanced fallback plan with scenario execution ---")
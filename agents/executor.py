@@ -1,26 +1,17 @@
 # agents/executor.py
 
+import time
 from state import RedArmyState # Import the state
-from toolkits.infiltrator_tools import scan_network_for_plcs
-from toolkits.saboteur_tools import craft_modbus_exploit_packet, create_evasion_attack_sequence
-from toolkits.executioner_tools import execute_direct_attack, execute_evasion_sequence
-from toolkits.chronicler_tools import analyze_gridguardian_logs
-
-# Combine all tools into a single dictionary for easy access.
-all_tools = {
-    "scan_network_for_plcs": scan_network_for_plcs,
-    "craft_modbus_exploit_packet": craft_modbus_exploit_packet,
-    "create_evasion_attack_sequence": create_evasion_attack_sequence,
-    "execute_direct_attack": execute_direct_attack,
-    "execute_evasion_sequence": execute_evasion_sequence,
-    "analyze_gridguardian_logs": analyze_gridguardian_logs,
-}
+from tool_registry import tool_registry
+from mission_history import record_step
+from plan_compiler import current_step
 
 def tool_executor_node(state: RedArmyState) -> dict:
     """
     The worker agent node. It executes the tool call for the current step in the plan.
     """
     print("--- AGENT: Tool Executor ---")
+    started_at = time.time()
 
     task_index = state["current_task_index"]
     task = state["plan"][task_index]
@@ -29,17 +20,13 @@ def tool_executor_node(state: RedArmyState) -> dict:
 
     print(f"--- Executing task for {agent}: {tool_call} ---")
 
-    tool_name = tool_call.split("(")[0]
-    args_str = tool_call.split('(', 1)[1][:-1]
-
-    # Safer way to parse arguments without full eval
+    step = current_step(state, agent)
     try:
-        args = eval(f"dict({args_str})", {"__builtins__": None}, {})
-    except Exception:
-        return {"task_output": "Error: Invalid arguments in tool call."}
-
-    tool = all_tools[tool_name]
-    result = tool.invoke(args)
+        if not step.ok:
+            raise ValueError(step.error)
+        result = tool_registry.dispatch(step.agent, step.tool, step.args)
+    except ValueError as e:
+        return {"task_output": f"Error: {e}"}
 
     feedback = state.get("feedback")
     if agent == "Chronicler":
@@ -48,6 +35,7 @@ def tool_executor_node(state: RedArmyState) -> dict:
     return {
         "task_output": result,
         "feedback": feedback,
-        "history": [f"{agent}: {tool_call} -> {result}"],
+        "history": [record_step(agent, tool_call, result, started_at, tool=step.tool,
+                                revision=state.get("revision_number", 0))],
         "current_task_index": task_index + 1,
     }
\ No newline at end of file
@@ -1,5 +1,42 @@
+import os
+import time
 from state import RedArmyState
-from toolkits.reporting_tools import generate_mission_debrief, save_mission_report
+from toolkits.reporting_tools import (generate_mission_debrief, save_mission_report,
+                                      render_mission_debrief, write_mission_report, enrich_archived_report)
+from mission_history import record_step
+from mission_assessor import mission_assessor
+from report_builder import report_builder
+from report_archive import mission_metadata
+
+# How the debrief is produced:
+#   "template" - render locally from the assessment in milliseconds (default)
+#   "enrich"   - render locally and archive the report, then polish the selected ones with the
+#                LLM in the background and upgrade them in the archive
+#   "llm"      - send the whole history to the LLM and wait for the report
+DEBRIEF_MODES = ("template", "enrich", "llm")
+DEBRIEF_MODE = os.getenv("RED_ARMY_DEBRIEF_MODE", "template")
+
+# Mission statuses enriched in "enrich" mode, e.g. "FAILED,PARTIAL_SUCCESS" (empty: every
+# mission). Any other archived report can be enriched later: python report_archive.py enrich <ID>
+ENRICH_STATUSES = frozenset(status.strip() for status in os.getenv("RED_ARMY_ENRICH_STATUSES", "").split(",")
+                            if status.strip())
+
+def _archive_and_enrich(mission_report: str, state: RedArmyState, assessment: dict) -> None:
+    """Archive the templated report now; enrich it in the background if its status is selected."""
+    try:
+        filename, report_id = write_mission_report(mission_report, metadata=mission_metadata(state, assessment))
+        print(f"--- REPORTER: Templated report saved to {filename} (archive ID {report_id}) ---")
+    except Exception as e:
+        print(f"--- REPORTER ERROR: Templated report could not be saved, skipping enrichment: {e} ---")
+        return
+
+    status = assessment["mission_status"]
+    if ENRICH_STATUSES and status not in ENRICH_STATUSES:
+        print(f"--- REPORTER: {status} mission not selected for enrichment; "
+              f"enrich it later with: python report_archive.py enrich {report_id} ---")
+        return
+    print("--- REPORTER: LLM enrichment started in the background; the archived report will be upgraded ---")
+    enrich_archived_report(report_id)
 
 def reporting_node(state: RedArmyState) -> dict:
     """
@@ -8,6 +45,8 @@ def reporting_node(state: RedArmyState) -> dict:
     """
     print("--- AGENT: Reporter ---")
     print("--- Generating Final Mission Debrief ---")
+    started_at = time.time()
+    debrief_tool = "generate_mission_debrief" if DEBRIEF_MODE == "llm" else "render_mission_debrief"
 
     try:
         # Extract mission data from state
@@ -19,17 +58,35 @@ def reporting_node(state: RedArmyState) -> dict:
         print(f"--- REPORTER: Mission objective: {mission_objective} ---")
         print(f"--- REPORTER: Final feedback: {mission_feedback[:100]}{'...' if len(mission_feedback) > 100 else ''} ---")
         
-        # Generate the comprehensive mission debrief
-        mission_report = generate_mission_debrief.invoke({
-            "history": mission_history,
-            "feedback": mission_feedback,
-            "objective": mission_objective
-        })
+        if DEBRIEF_MODE not in DEBRIEF_MODES:
+            raise ValueError(f"Unknown RED_ARMY_DEBRIEF_MODE '{DEBRIEF_MODE}'. Use one of: {', '.join(DEBRIEF_MODES)}")
+        
+        if DEBRIEF_MODE == "llm":
+            # Generate the comprehensive mission debrief
+            mission_report = generate_mission_debrief.invoke({
+                "history": mission_history,
+                "feedback": mission_feedback,
+                "objective": mission_objective
+            })
+        else:
+            # Format the sections the router accumulated step by step; only
+            # entries not yet observed are folded in here, and no LLM round
+            # trip sits on the critical path
+            sections = report_builder.observe(state)
+            assessment = mission_assessor.assess_mission_completion(state)
+            mission_report = render_mission_debrief(state, assessment, mission_feedback, sections=sections)
+            print("\n" + "="*80)
+            print(mission_report)
+            print("="*80 + "\n")
+            
+            if DEBRIEF_MODE == "enrich":
+                _archive_and_enrich(mission_report, state, assessment)
         
         # Optionally save the report to file (uncomment if permanent storage is needed)
         # save_result = save_mission_report.invoke({
         #     "report": mission_report,
-        #     "filename": None  # Will auto-generate timestamp-based filename
+        #     "filename": None,  # Will auto-generate timestamp-based filename
+        #     "metadata": mission_metadata(state),  # Indexes the report in the archive
         # })
         # print(f"--- REPORTER: {save_result} ---")
         
@@ -39,7 +96,9 @@ def reporting_node(state: RedArmyState) -> dict:
         return {
             "task_output": mission_report,
             "feedback": "MISSION DEBRIEF COMPLETED: Final after-action report generated successfully",
-            "history": [f"Reporter: Generated comprehensive mission debrief report ({len(mission_report)} characters)"],
+            "history": [record_step("Reporter", f"{debrief_tool}()",
+                                    f"Generated comprehensive mission debrief report ({len(mission_report)} characters)",
+                                    started_at, tool=debrief_tool)],
             "current_task_index": state.get("current_task_index", 0) + 1,
         }
         
@@ -50,6 +109,7 @@ def reporting_node(state: RedArmyState) -> dict:
         return {
             "task_output": error_msg,
             "feedback": f"MISSION DEBRIEF FAILED: {error_msg}",
-            "history": [f"Reporter: Failed to generate mission debrief - {error_msg}"],
+            "history": [record_step("Reporter", f"{debrief_tool}()", error_msg, started_at,
+                                    tool=debrief_tool)],
             "current_task_index": state.get("current_task_index", 0) + 1,
         }
\ No newline at end of file
@@ -1,39 +1,19 @@
-import json
 import re
+import time
 from typing import Optional
 from state import RedArmyState
-from toolkits.saboteur_tools import (
-    craft_modbus_exploit_packet, 
-    create_evasion_attack_sequence,
-    craft_openplc_web_exploit,
-    create_openplc_persistence_backdoor,
-    create_dual_vector_attack_sequence,
-    create_adaptive_attack_sequence,
-    reconnaissance_openplc_system,
-    fingerprint_openplc_defenses,
-    analyze_document,
-    # New specialized attack vector functions
-    maintenance_override_bypass,
-    manipulate_safety_timer,
-    activate_emergency_bypass,
-    corrupt_system_health_signature,
-    establish_covert_channel,
-    # Advanced scenario execution capability
-    execute_attack_scenario
-)
-from utils import parse_tool_call_safely, has_unresolved_placeholders
+from tool_registry import tool_registry
+from mission_history import record_step, entry_text
+from plan_compiler import current_step
 from rag_service import rag_service
+from technique_catalog import technique_catalog
+from technique_selector import technique_selector, DEFAULT_STRATEGY
 
 def load_mitre_techniques():
-    """Load MITRE ATT&CK for ICS technique mappings from JSON file."""
-    try:
-        with open('/Users/gareth/cyber/red-army/saboteur_techniques.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("--- SABOTEUR WARNING: saboteur_techniques.json not found. Using basic mapping. ---")
-        return {"mitre_attack_ics_mapping": {"techniques": {}}}
+    """MITRE ATT&CK for ICS technique mappings (the cached catalog document, see technique_catalog)."""
+    return technique_catalog.data
 
-def select_technique_function(technique_id: str, context: str = "", strategy: str = "stealth_focused") -> Optional[str]:
+def select_technique_function(technique_id: str, context: str = "", strategy: str = DEFAULT_STRATEGY) -> Optional[str]:
     """
     Select the most appropriate attack function for a given MITRE technique based on context.
     
@@ -45,49 +25,20 @@ def select_technique_function(technique_id: str, context: str = "", strategy: st
     Returns:
         Function name to execute for the technique, or None if not found
     """
-    techniques_data = load_mitre_techniques()
-    techniques = techniques_data.get("mitre_attack_ics_mapping", {}).get("techniques", {})
-    
-    if technique_id not in techniques:
+    if technique_id not in technique_catalog:
         print(f"--- SABOTEUR WARNING: Unknown MITRE technique {technique_id} ---")
         return None
-        
-    technique = techniques[technique_id]
-    mapped_functions = technique["mapped_functions"]
     
-    if not mapped_functions:
+    # Every mapped function is scored against the context in one pass (see technique_selector)
+    ranking = technique_selector.rank(technique_id, context, strategy)
+    if not ranking:
         print(f"--- SABOTEUR WARNING: No functions mapped for technique {technique_id} ---")
         return None
     
-    # If only one function is mapped, use it
-    if len(mapped_functions) == 1:
-        return mapped_functions[0]
-    
-    # Use RAG context to inform selection
-    if context:
-        context_lower = context.lower()
-        rag_keywords = technique.get("rag_context_keywords", [])
-        
-        # Check if context mentions specific approach
-        if any(keyword in context_lower for keyword in ["stealth", "covert", "undetected"]):
-            strategy = "stealth_focused"
-        elif any(keyword in context_lower for keyword in ["fast", "immediate", "quick"]):
-            strategy = "speed_focused"
-        elif any(keyword in context_lower for keyword in ["persistent", "maintain", "ongoing"]):
-            strategy = "persistence_focused"
-    
-    # Apply selection criteria based on strategy
-    selection_criteria = technique.get("selection_criteria", {})
-    
-    if strategy == "stealth_focused" and "stealth_priority" in selection_criteria:
-        return selection_criteria["stealth_priority"]
-    elif strategy == "speed_focused" and "speed_priority" in selection_criteria:
-        return selection_criteria["speed_priority"]
-    elif strategy == "persistence_focused" and "persistence_priority" in selection_criteria:
-        return selection_criteria["persistence_priority"]
-    
-    # Fallback to first available function
-    return mapped_functions[0]
+    if len(ranking) > 1:
+        print(f"--- SABOTEUR: Ranked functions for {technique_id}: "
+              f"{', '.join(f'{name} ({score:.2f})' for name, score in ranking)} ---")
+    return ranking[0][0]
 
 def extract_technique_id(tool_call: str) -> Optional[str]:
     """Extract MITRE technique ID from tool call if present."""
@@ -104,9 +55,9 @@ def get_mission_context(state: RedArmyState) -> str:
         current_task = state["plan"][state["current_task_index"]]
         context_sources.append(current_task.get("description", ""))
     
-    # Get recent history for context
+    # Get recent history for context (full outputs are fetched from the artifact store)
     recent_history = state.get("history", [])[-3:]  # Last 3 actions
-    context_sources.extend(recent_history)
+    context_sources.extend(entry_text(entry) for entry in recent_history)
     
     # Get mission objectives if available
     objectives = state.get("objectives", [])
@@ -117,20 +68,24 @@ def get_mission_context(state: RedArmyState) -> str:
 def saboteur_node(state: RedArmyState) -> dict:
     """The specialist agent for crafting and disguising payloads with MITRE ATT&CK integration."""
     print("--- AGENT: Saboteur ---")
-    task = state["plan"][state["current_task_index"]]
-    tool_call = task["tool_call"]
+    started_at = time.time()
+    step = current_step(state, "Saboteur")
+    tool_call = step.tool_call
+    func_name = step.tool
 
     try:
         # Check if the tool call has unresolved placeholders
-        if has_unresolved_placeholders(tool_call):
+        if step.unresolved:
             print(f"--- SABOTEUR: Skipping task with unresolved placeholders: {tool_call} ---")
             result = f"SKIPPED: Task contains unresolved placeholders: {tool_call}"
+        elif not step.ok:
+            raise ValueError(step.error)
         else:
-            # Parse the tool call safely
-            func_name, args = parse_tool_call_safely(tool_call)
+            # Arguments were parsed by the plan compiler
+            args = step.args
             
             # Check if this is a MITRE technique execution
-            technique_id = extract_technique_id(tool_call)
+            technique_id = step.technique_id
             if technique_id:
                 print(f"--- SABOTEUR: MITRE technique {technique_id} detected ---")
                 
@@ -158,50 +113,22 @@ def saboteur_node(state: RedArmyState) -> dict:
                 else:
                     print(f"--- SABOTEUR: No function mapped for technique {technique_id}, using original call ---")
             
-            # Enhanced tool mapping with new attack vector functions
-            tool_map = {
-                # Original tools
-                "craft_modbus_exploit_packet": craft_modbus_exploit_packet,
-                "create_evasion_attack_sequence": create_evasion_attack_sequence,
-                "craft_openplc_web_exploit": craft_openplc_web_exploit,
-                "create_openplc_persistence_backdoor": create_openplc_persistence_backdoor,
-                "create_dual_vector_attack_sequence": create_dual_vector_attack_sequence,
-                "create_adaptive_attack_sequence": create_adaptive_attack_sequence,
-                "reconnaissance_openplc_system": reconnaissance_openplc_system,
-                "fingerprint_openplc_defenses": fingerprint_openplc_defenses,
-                "analyze_document": analyze_document,
-                
-                # Specialized attack vector functions
-                "maintenance_override_bypass": maintenance_override_bypass,
-                "manipulate_safety_timer": manipulate_safety_timer,
-                "activate_emergency_bypass": activate_emergency_bypass,
-                "corrupt_system_health_signature": corrupt_system_health_signature,
-                "establish_covert_channel": establish_covert_channel,
-                
-                # Advanced scenario execution capability
-                "execute_attack_scenario": execute_attack_scenario
-            }
+            # Resolve through the shared registry; unknown tools fail fast
+            spec = tool_registry.resolve("Saboteur", func_name)
+            print(f"--- SABOTEUR: Executing {func_name} ---")
             
-            if func_name in tool_map:
-                print(f"--- SABOTEUR: Executing {func_name} ---")
-                
-                # Log MITRE technique mapping if applicable
-                if technique_id:
-                    techniques_data = load_mitre_techniques()
-                    technique_info = techniques_data.get("mitre_attack_ics_mapping", {}).get("techniques", {}).get(technique_id, {})
-                    technique_name = technique_info.get("name", "Unknown")
-                    print(f"--- SABOTEUR: MITRE Technique: {technique_id} - {technique_name} ---")
-                
-                result = tool_map[func_name].invoke(args)
-                
-                # Enhance result with technique metadata
-                if technique_id and isinstance(result, str):
-                    result = f"MITRE {technique_id} executed via {func_name}: {result}"
-                    
-            else:
-                # Simulate unknown saboteur tools
-                print(f"--- SABOTEUR/TOOL: Simulating {func_name} with args {args} ---")
-                result = f"SIMULATED: {func_name} executed successfully"
+            # Log MITRE technique mapping if applicable
+            if technique_id:
+                technique_name = (technique_catalog.technique(technique_id) or {}).get("name", "Unknown")
+                print(f"--- SABOTEUR: MITRE Technique: {technique_id} - {technique_name} ---")
+            
+            # A technique call's arguments were written for the technique, not the
+            # selected function, so drop any the function does not accept.
+            result = spec.tool.invoke(spec.validate(args, drop_unknown=bool(technique_id)))
+            
+            # Enhance result with technique metadata
+            if technique_id and isinstance(result, str):
+                result = f"MITRE {technique_id} executed via {func_name}: {result}"
 
     except Exception as e:
         print(f"--- SABOTEUR ERROR: {e} ---")
@@ -209,6 +136,7 @@ def saboteur_node(state: RedArmyState) -> dict:
 
     return {
         "task_output": result,
-        "history": [f"Saboteur: {tool_call} -> {result}"],
+        "history": [record_step("Saboteur", tool_call, result, started_at, tool=func_name,
+                                revision=state.get("revision_number", 0))],
         "current_task_index": state["current_task_index"] + 1,
     }
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Streaming parser for GridGuardian anomaly reports.
+
+The detector writes each report as a block of log lines:
+
+    2025-09-17 15:01:14 - INFO - 🚨 ANOMALY DETECTED!
+    2025-09-17 15:01:14 - INFO - Unusual power line loading detected at the following times:
+    2025-09-17 15:01:14 - INFO -   ⚡ 2025-09-17 18:52:40.009034: 890.39% loading
+    ...
+    2025-09-17 15:01:14 - INFO - 📋 END ANOMALY REPORT
+
+AnomalyReportParser is a line-at-a-time state machine over any iterable of
+lines (a file, a pipe, a socket's makefile(), a list) and yields each report
+as soon as its END marker is read, so logs of any size parse in constant
+memory. Its state survives between feed() calls, which lets the incremental
+log reader hand it each newly read batch of lines.
+
+Besides the timestamp strings, each report carries its anomalies as typed
+NumPy arrays (anomaly_times as datetime64[us], anomaly_loadings as float64
+percent, NaN when a line has no loading), so statistics never reparse text.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+REPORT_START_MARKER = "🚨 ANOMALY DETECTED!"
+REPORT_END_MARKER = "📋 END ANOMALY REPORT"
+ANOMALY_MARKER = "⚡"
+
+# Timestamp at the start of the report's first line (when the detector ran)
+REPORT_TIME_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+
+# One flagged measurement inside a report, with its line loading when given
+ANOMALY_PATTERN = re.compile(r"⚡ (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+):(?: ([\d.]+)% loading)?")
+
+TIME_UNIT = "datetime64[us]"
+NOT_A_TIME = np.datetime64("NaT", "us")
+
+
+def parse_times(values: Sequence[Optional[str]]) -> np.ndarray:
+    """Parse timestamps in one vectorized call, falling back per value to mark malformed ones NaT."""
+    try:
+        return np.array(values, dtype=TIME_UNIT)
+    except ValueError:
+        times = np.empty(len(values), dtype=TIME_UNIT)
+        for i, value in enumerate(values):
+            try:
+                times[i] = np.datetime64(value, "us") if value else NOT_A_TIME
+            except ValueError:
+                times[i] = NOT_A_TIME
+        return times
+
+
+def _report(report_timestamp: Optional[str], anomaly_timestamps: List[str], anomaly_loadings: List[float]) -> Dict:
+    return {
+        "report_timestamp": report_timestamp,
+        "anomaly_timestamps": anomaly_timestamps,
+        "anomaly_times": parse_times(anomaly_timestamps),
+        "anomaly_loadings": np.array(anomaly_loadings, dtype=np.float64),
+        "anomaly_count": len(anomaly_timestamps),
+    }
+
+
+def _loading(value: Optional[str]) -> float:
+    try:
+        return float(value) if value else np.nan
+    except ValueError:
+        return np.nan
+
+
+class AnomalyReportParser:
+    """Incremental anomaly report parser. Reports without any anomaly lines are skipped."""
+
+    __slots__ = ("_in_report", "_report_timestamp", "_anomaly_timestamps", "_anomaly_loadings")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard a partially read report (e.g. after the log was rotated)."""
+        self._in_report = False
+        self._report_timestamp: Optional[str] = None
+        self._anomaly_timestamps: List[str] = []
+        self._anomaly_loadings: List[float] = []   # Percent; NaN when not logged
+
+    @property
+    def in_report(self) -> bool:
+        """True while a report's END marker has not been read yet."""
+        return self._in_report
+
+    def _start(self, line: str) -> None:
+        match = REPORT_TIME_PATTERN.match(line)
+        self._in_report = True
+        self._report_timestamp = match.group(1) if match else None
+        self._anomaly_timestamps = []
+        self._anomaly_loadings = []
+
+    def _close(self) -> Optional[Dict]:
+        report = (_report(self._report_timestamp, self._anomaly_timestamps, self._anomaly_loadings)
+                  if self._anomaly_timestamps else None)
+        self.reset()
+        return report
+
+    def feed(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """Consume lines, yielding each report completed by them."""
+        anomaly_search = ANOMALY_PATTERN.search
+        for line in lines:
+            if not self._in_report:
+                if REPORT_START_MARKER in line:
+                    self._start(line)
+                continue
+
+            # Cheap substring tests first; the regex only runs on anomaly lines
+            if ANOMALY_MARKER in line:
+                match = anomaly_search(line)
+                if match:
+                    timestamp, loading = match.groups()
+                    self._anomaly_timestamps.append(timestamp)
+                    self._anomaly_loadings.append(_loading(loading))
+            elif REPORT_END_MARKER in line:
+                report = self._close()
+                if report:
+                    yield report
+            elif REPORT_START_MARKER in line:
+                # A new report began before the previous one was closed
+                report = self._close()
+                if report:
+                    yield report
+                self._start(line)
+
+    def finish(self) -> Iterator[Dict]:
+        """Yield a report left open at the end of the input (a log cut off mid-report)."""
+        if self._in_report:
+            report = self._close()
+            if report:
+                yield report
+
+
+def parse_anomaly_reports(lines: Iterable[str]) -> Iterator[Dict]:
+    """Parse a complete log, given as an iterable of lines, into anomaly reports."""
+    parser = AnomalyReportParser()
+    yield from parser.feed(lines)
+    yield from parser.finish()
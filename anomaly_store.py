@@ -0,0 +1,306 @@
+"""
+Time-indexed store of the anomalies found in GridGuardian reports.
+
+Every anomaly of every report is parsed once, when its report is added, into
+sorted NumPy arrays: the anomaly time (datetime64[us]), the ID of the report
+it came from and its line loading. Window queries, "first anomaly after T"
+and correlating many attack windows at once are binary searches over the
+time array; recency checks are a vectorized mask over the report times.
+Loading statistics for any number of windows (peak, mean, time over a
+threshold, anomalies per minute) come from prefix sums over the same arrays,
+and grade_severity() turns them into the severity the Chronicler reports.
+
+Report IDs are sequence numbers assigned as reports are added, so the oldest
+reports can be trimmed without renumbering the rest. Each update builds new
+arrays and swaps them in with a single assignment, so a reader on another
+thread never sees a half-updated index.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from anomaly_parser import TIME_UNIT, parse_times
+
+# Line loading (%) above which the grid is overloaded
+LOADING_THRESHOLD = 100.0
+
+# A sample counts toward time over threshold until the next sample, at most this long
+MAX_SAMPLE_GAP_SECONDS = 60.0
+
+# (grade, peak loading %, anomalies per minute): the first grade whose peak or rate is reached applies
+SEVERITY_GRADES = (
+    ("CRITICAL", 500.0, 10.0),
+    ("HIGH", 200.0, 2.0),
+    ("MODERATE", 100.0, 0.5),
+)
+
+Timestamp = Union[str, datetime, np.datetime64]
+
+
+def to_datetime64(value: Timestamp) -> np.datetime64:
+    """Convert an ISO string ('T' or space separated), datetime or datetime64 to datetime64[us]."""
+    return np.datetime64(value, "us")
+
+
+def _times(report: Dict) -> np.ndarray:
+    times = report.get("anomaly_times")
+    return times if times is not None else parse_times(report["anomaly_timestamps"])
+
+
+def _loadings(report: Dict) -> np.ndarray:
+    # Reports built elsewhere may carry loadings as a list (None when not logged), or none at all
+    loadings = report.get("anomaly_loadings")
+    if loadings is None:
+        return np.full(len(report["anomaly_timestamps"]), np.nan)
+    return np.array([np.nan if value is None else value for value in loadings], dtype=np.float64)
+
+
+class AnomalyArrays(NamedTuple):
+    """One consistent version of the index."""
+    times: np.ndarray          # Anomaly times, sorted ascending
+    report_ids: np.ndarray     # Report ID of each anomaly
+    loadings: np.ndarray       # Line loading (%) of each anomaly, NaN when not logged
+    report_times: np.ndarray   # When each report was written, by report ID - first_id (NaT if unknown)
+    reports: List[Dict]        # Reports by report ID - first_id
+    first_id: int              # ID of reports[0]
+
+
+EMPTY_ARRAYS = AnomalyArrays(np.empty(0, dtype=TIME_UNIT), np.empty(0, dtype=np.int64),
+                             np.empty(0, dtype=np.float64), np.empty(0, dtype=TIME_UNIT), [], 0)
+
+
+class LoadingStats(NamedTuple):
+    """Loading statistics of a window (or, from window_stats_many, arrays of them)."""
+    count: int                       # Anomalies in the window
+    peak: float                      # Highest loading (%), NaN when none was logged
+    mean: float                      # Mean loading (%), NaN when none was logged
+    seconds_over_threshold: float
+    rate_per_minute: float           # Anomalies per minute of window
+
+
+def grade_severity(stats: LoadingStats) -> str:
+    """CRITICAL, HIGH, MODERATE or LOW for a window with anomalies; NONE without."""
+    if not stats.count:
+        return "NONE"
+    for grade, peak, rate in SEVERITY_GRADES:
+        if stats.peak >= peak or stats.rate_per_minute >= rate:
+            return grade
+    return "LOW"
+
+
+class _PrefixSums(NamedTuple):
+    loading_sum: np.ndarray      # Prefix sums, one longer than the anomaly arrays
+    loading_count: np.ndarray
+    over_seconds: np.ndarray
+    over: np.ndarray             # Seconds over threshold credited to each sample
+    peak_source: np.ndarray      # Loadings with NaN as -inf, plus a -inf sentinel
+
+
+class AnomalyMatch(NamedTuple):
+    """A single anomaly returned by a query."""
+    time: np.datetime64
+    report_id: int
+    loading: float
+    report: Dict
+
+
+class AnomalyIndex:
+    """Sorted anomaly times with their report IDs and loadings."""
+
+    def __init__(self, reports: Iterable[Dict] = ()):
+        self._arrays = EMPTY_ARRAYS
+        self._prefix_cache = None
+        self.add(reports)
+
+    # --- Updates ---
+
+    def add(self, reports: Iterable[Dict]) -> List[int]:
+        """Index new reports and return their report IDs."""
+        reports = list(reports)
+        if not reports:
+            return []
+        arrays = self._arrays
+        next_id = arrays.first_id + len(arrays.reports)
+        ids = list(range(next_id, next_id + len(reports)))
+
+        times = np.concatenate([_times(report) for report in reports])
+        report_ids = np.repeat(np.array(ids, dtype=np.int64),
+                               [len(report["anomaly_timestamps"]) for report in reports])
+        loadings = np.concatenate([_loadings(report) for report in reports])
+
+        # Malformed timestamps cannot be placed in time; leave them out of the index
+        valid = ~np.isnat(times)
+        times, report_ids, loadings = times[valid], report_ids[valid], loadings[valid]
+
+        all_times = np.concatenate([arrays.times, times])
+        all_ids = np.concatenate([arrays.report_ids, report_ids])
+        all_loadings = np.concatenate([arrays.loadings, loadings])
+        # Reports usually arrive in time order; only re-sort when they did not
+        if len(times) and (np.any(times[1:] < times[:-1]) or (len(arrays.times) and times[0] < arrays.times[-1])):
+            order = np.argsort(all_times, kind="stable")
+            all_times, all_ids, all_loadings = all_times[order], all_ids[order], all_loadings[order]
+
+        report_times = parse_times([report.get("report_timestamp") for report in reports])
+        self._arrays = AnomalyArrays(all_times, all_ids, all_loadings,
+                                     np.concatenate([arrays.report_times, report_times]),
+                                     arrays.reports + reports, arrays.first_id)
+        return ids
+
+    def trim(self, max_reports: int) -> None:
+        """Drop the oldest reports (and their anomalies) beyond `max_reports`."""
+        arrays = self._arrays
+        excess = len(arrays.reports) - max_reports
+        if excess <= 0:
+            return
+        first_id = arrays.first_id + excess
+        keep = arrays.report_ids >= first_id
+        self._arrays = AnomalyArrays(arrays.times[keep], arrays.report_ids[keep], arrays.loadings[keep],
+                                     arrays.report_times[excess:], arrays.reports[excess:], first_id)
+
+    # --- Queries ---
+
+    @property
+    def arrays(self) -> AnomalyArrays:
+        return self._arrays
+
+    @property
+    def reports(self) -> List[Dict]:
+        return list(self._arrays.reports)
+
+    def __len__(self) -> int:
+        """Number of indexed anomalies."""
+        return len(self._arrays.times)
+
+    def report(self, report_id: int) -> Dict:
+        arrays = self._arrays
+        return arrays.reports[report_id - arrays.first_id]
+
+    def _bounds(self, arrays: AnomalyArrays, start: Timestamp, end: Timestamp):
+        return (int(np.searchsorted(arrays.times, to_datetime64(start), side="left")),
+                int(np.searchsorted(arrays.times, to_datetime64(end), side="right")))
+
+    def window(self, start: Timestamp, end: Timestamp) -> AnomalyArrays:
+        """Anomalies with start <= time <= end, as array slices (reports are shared, not sliced)."""
+        arrays = self._arrays
+        lo, hi = self._bounds(arrays, start, end)
+        return arrays._replace(times=arrays.times[lo:hi], report_ids=arrays.report_ids[lo:hi],
+                               loadings=arrays.loadings[lo:hi])
+
+    def count_in_window(self, start: Timestamp, end: Timestamp) -> int:
+        lo, hi = self._bounds(self._arrays, start, end)
+        return hi - lo
+
+    def reports_in_window(self, start: Timestamp, end: Timestamp) -> List[Dict]:
+        """Reports with at least one anomaly in [start, end], in the order they were added."""
+        arrays = self._arrays
+        lo, hi = self._bounds(arrays, start, end)
+        return [arrays.reports[i - arrays.first_id] for i in np.unique(arrays.report_ids[lo:hi]).tolist()]
+
+    def correlate(self, starts: Sequence[Timestamp], ends: Sequence[Timestamp]) -> np.ndarray:
+        """Number of anomalies inside each [start, end] window, for many windows in one pass."""
+        times = self._arrays.times
+        starts = np.asarray(starts, dtype=TIME_UNIT)
+        ends = np.asarray(ends, dtype=TIME_UNIT)
+        return np.searchsorted(times, ends, side="right") - np.searchsorted(times, starts, side="left")
+
+    def first_after(self, when: Timestamp) -> Optional[AnomalyMatch]:
+        """The earliest anomaly at or after `when`, or None."""
+        arrays = self._arrays
+        i = int(np.searchsorted(arrays.times, to_datetime64(when), side="left"))
+        if i == len(arrays.times):
+            return None
+        report_id = int(arrays.report_ids[i])
+        return AnomalyMatch(arrays.times[i], report_id, float(arrays.loadings[i]),
+                            arrays.reports[report_id - arrays.first_id])
+
+    def recent_reports(self, minutes: float = 30, now: Optional[Timestamp] = None) -> List[Dict]:
+        """Reports written at most `minutes` before `now` (default: the current local time)."""
+        arrays = self._arrays
+        now = to_datetime64(now if now is not None else datetime.now())
+        cutoff = now - np.timedelta64(int(timedelta(minutes=minutes).total_seconds() * 1e6), "us")
+        return [arrays.reports[i] for i in np.flatnonzero(arrays.report_times >= cutoff).tolist()]
+
+    # --- Loading statistics ---
+
+    def _prefix_sums(self, arrays: AnomalyArrays, threshold: float, max_gap_seconds: float) -> _PrefixSums:
+        cached = self._prefix_cache
+        if cached and cached[0] is arrays and cached[1] == (threshold, max_gap_seconds):
+            return cached[2]
+        loadings = arrays.loadings
+        valid = ~np.isnan(loadings)
+        gaps = np.diff(arrays.times).astype(np.float64) / 1e6
+        intervals = np.minimum(np.append(gaps, max_gap_seconds), max_gap_seconds)
+        over = np.where(valid & (loadings >= threshold), intervals, 0.0)
+        prefix = _PrefixSums(
+            np.concatenate([[0.0], np.cumsum(np.where(valid, loadings, 0.0))]),
+            np.concatenate([[0], np.cumsum(valid)]),
+            np.concatenate([[0.0], np.cumsum(over)]),
+            over,
+            np.append(np.where(valid, loadings, -np.inf), -np.inf),
+        )
+        self._prefix_cache = (arrays, (threshold, max_gap_seconds), prefix)
+        return prefix
+
+    def window_stats_many(self, starts: Sequence[Timestamp], ends: Sequence[Timestamp],
+                          threshold: float = LOADING_THRESHOLD,
+                          max_gap_seconds: float = MAX_SAMPLE_GAP_SECONDS) -> LoadingStats:
+        """Statistics of every [start, end] window at once, as arrays in a LoadingStats."""
+        arrays = self._arrays
+        times = arrays.times
+        starts = np.atleast_1d(np.asarray(starts, dtype=TIME_UNIT))
+        ends = np.atleast_1d(np.asarray(ends, dtype=TIME_UNIT))
+        prefix = self._prefix_sums(arrays, threshold, max_gap_seconds)
+
+        lo = np.searchsorted(times, starts, side="left")
+        hi = np.maximum(np.searchsorted(times, ends, side="right"), lo)
+        count = hi - lo
+        nonempty = count > 0
+
+        valid = prefix.loading_count[hi] - prefix.loading_count[lo]
+        total = prefix.loading_sum[hi] - prefix.loading_sum[lo]
+        mean = np.divide(total, valid, out=np.full(len(lo), np.nan), where=valid > 0)
+
+        # Max over each [lo, hi) slice: reduceat over interleaved bounds, keeping the even results
+        peak = np.maximum.reduceat(prefix.peak_source, np.column_stack([lo, hi]).ravel())[::2]
+        peak = np.where(nonempty & np.isfinite(peak), peak, np.nan)
+
+        over = prefix.over_seconds[hi] - prefix.over_seconds[lo]
+        if len(times):
+            # The last sample in a window is only credited up to the window's end
+            last = np.maximum(hi - 1, 0)
+            remaining = np.maximum((ends - times[last]).astype(np.float64) / 1e6, 0.0)
+            over = np.where(nonempty, over - prefix.over[last] + np.minimum(prefix.over[last], remaining), 0.0)
+
+        minutes = (ends - starts).astype(np.float64) / 6e7
+        rate = np.divide(count, minutes, out=np.zeros(len(lo)), where=minutes > 0)
+        return LoadingStats(count, peak, mean, over, rate)
+
+    def window_stats(self, start: Timestamp, end: Timestamp, threshold: float = LOADING_THRESHOLD,
+                     max_gap_seconds: float = MAX_SAMPLE_GAP_SECONDS) -> LoadingStats:
+        """Peak, mean, time over threshold and anomaly rate of the [start, end] window."""
+        stats = self.window_stats_many([to_datetime64(start)], [to_datetime64(end)], threshold, max_gap_seconds)
+        return LoadingStats(int(stats.count[0]), float(stats.peak[0]), float(stats.mean[0]),
+                            float(stats.seconds_over_threshold[0]), float(stats.rate_per_minute[0]))
+
+    def loading_series(self, bucket_seconds: float, start: Optional[Timestamp] = None,
+                       end: Optional[Timestamp] = None, threshold: float = LOADING_THRESHOLD):
+        """
+        Per-bucket statistics from `start` to `end` (default: the indexed range),
+        e.g. for plotting detector behavior. Buckets start at `start`, the last one
+        is the one holding `end` and is cut off there. Returns (bucket starts,
+        LoadingStats of arrays).
+        """
+        times = self._arrays.times
+        if start is None or end is None:
+            if not len(times):
+                return np.empty(0, dtype=TIME_UNIT), self.window_stats_many([], [], threshold)
+            start = times[0] if start is None else start
+            end = times[-1] if end is None else end
+        step = np.timedelta64(int(bucket_seconds * 1e6), "us")
+        start, end = to_datetime64(start), to_datetime64(end)
+        one_us = np.timedelta64(1, "us")
+        starts = np.arange(start, end + one_us, step)
+        ends = np.minimum(starts + step - one_us, end)
+        return starts, self.window_stats_many(starts, ends, threshold)
@@ -0,0 +1,90 @@
+"""
+Content-addressed artifact store for large tool outputs.
+
+Mission history records keep only a short preview of each tool result; the
+full output is stored here under its SHA-256 digest and fetched lazily by the
+consumers that need it (the reporter, the Saboteur's context lookup). Identical
+outputs are stored once.
+
+By default artifacts live in memory until they are discarded (the batch runner
+discards each mission's artifacts once its results are recorded). Set
+RED_ARMY_ARTIFACT_DIR (or pass a directory) to keep them on disk instead, which
+also makes them available to other processes and after batch workers exit.
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Dict, Iterable, Optional
+
+
+class ArtifactNotFoundError(KeyError):
+    """Raised when an artifact ID is not present in the store."""
+
+
+class ArtifactStore:
+    """Stores text artifacts by content hash, in memory or under a directory."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+        self._memory: Dict[str, str] = {}
+        if root:
+            os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def artifact_id(data: str) -> str:
+        """The content address of `data`."""
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, artifact_id: str) -> str:
+        # Two-level fan-out keeps directories small on long batch runs
+        return os.path.join(self.root, artifact_id[:2], artifact_id[2:])
+
+    def put(self, data: str) -> str:
+        """Store `data` and return its artifact ID. Storing the same content twice is a no-op."""
+        artifact_id = self.artifact_id(data)
+        if not self.root:
+            self._memory.setdefault(artifact_id, data)
+            return artifact_id
+
+        path = self._path(artifact_id)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial artifact
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return artifact_id
+
+    def get(self, artifact_id: str) -> str:
+        """Fetch an artifact. Raises ArtifactNotFoundError if it is unknown."""
+        if not self.root:
+            try:
+                return self._memory[artifact_id]
+            except KeyError:
+                raise ArtifactNotFoundError(artifact_id) from None
+
+        try:
+            with open(self._path(artifact_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise ArtifactNotFoundError(artifact_id) from None
+
+    def discard(self, artifact_ids: Iterable[str]) -> None:
+        """
+        Drop artifacts from memory once nothing will read them again. On-disk
+        artifacts are kept: other processes may still reference them.
+        """
+        if not self.root:
+            for artifact_id in artifact_ids:
+                self._memory.pop(artifact_id, None)
+
+    def __contains__(self, artifact_id: str) -> bool:
+        if not self.root:
+            return artifact_id in self._memory
+        return os.path.exists(self._path(artifact_id))
+
+
+# Global artifact store instance
+artifact_store = ArtifactStore(os.getenv("RED_ARMY_ARTIFACT_DIR") or None)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Parallel batch mission runner for the Red Army system.
+
+Runs many exercise variants in one invocation. The environment and the
+compiled LangGraph workflow (with every agent and toolkit module imported) are
+warmed up once in the parent process, then a pool of worker processes is
+forked so every worker shares that warm, read-only state copy-on-write instead
+of rebuilding it per mission. Gemini clients talk gRPC, which is not fork-safe
+once a channel exists, so the attack guide is embedded once in a spawned
+helper process that saves the RAG vector index to a temporary directory; each
+worker loads that index after the fork and only creates its own query
+embedding and LLM clients.
+
+Usage:
+    python batch_runner.py missions.jsonl --workers 8 --output results.jsonl
+
+The missions file is either JSON Lines or a JSON list. Each entry is an
+objective string or an object with an "objective" key, an optional "id" and
+any other RedArmyState fields to seed the initial state with:
+
+    {"id": "direct-01", "objective": "Open the substation circuit breaker"}
+    {"objective": "Evade the detector", "feedback": "Previous run was detected"}
+
+Each result line carries the mission's per-step rows; run mission_analytics.py
+over one or more results files for cross-mission statistics and Parquet export.
+
+To archive every debrief instantly and only send the ones worth reading to the
+LLM, run with RED_ARMY_DEBRIEF_MODE=enrich RED_ARMY_ENRICH_STATUSES=FAILED,PARTIAL_SUCCESS
+and enrich any other report later with `python report_archive.py enrich <ID>`.
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from typing import Dict, List, Optional
+
+STATE_FIELDS = ("plan", "current_task_index", "task_output", "feedback", "history", "revision_number")
+
+# Seconds a worker waits for a mission's background debrief enrichment
+# (RED_ARMY_DEBRIEF_MODE=enrich) before moving on; pool workers exit without
+# interpreter shutdown, so unfinished enrichments would be lost. Only missions
+# selected by RED_ARMY_ENRICH_STATUSES are enriched (and waited for); every
+# report is archived immediately and can be enriched later on demand.
+ENRICHMENT_WAIT_SECONDS = 300
+
+
+def load_missions(path: str) -> List[Dict]:
+    """
+    Load mission definitions from a JSON list or JSON Lines file.
+
+    Returns:
+        List of dicts with "id", "objective" and "initial_state" overrides.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    stripped = content.strip()
+    if stripped.startswith('['):
+        entries = json.loads(stripped)
+    else:
+        entries = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    missions = []
+    for i, entry in enumerate(entries, 1):
+        if isinstance(entry, str):
+            entry = {"objective": entry}
+        if not isinstance(entry, dict) or not entry.get("objective"):
+            raise ValueError(f"Mission entry {i} in {path} has no objective: {entry!r}")
+
+        overrides = dict(entry.get("initial_state", {}))
+        overrides.update({key: entry[key] for key in STATE_FIELDS if key in entry})
+        missions.append({
+            "id": str(entry.get("id", f"mission-{i:04d}")),
+            "objective": entry["objective"],
+            "initial_state": overrides,
+        })
+
+    return missions
+
+
+def warm_up(rag_index_path: Optional[str] = None) -> bool:
+    """
+    Build the shared state once, before forking: the environment, the compiled
+    workflow graph and, when rag_index_path is given, the RAG vector index.
+    Workers inherit the first two copy-on-write. Nothing in this process may
+    open a Gemini/gRPC channel, so the index is embedded in a spawned helper
+    and saved to rag_index_path for the workers to load (see _init_worker).
+
+    Returns:
+        True if the RAG index was built.
+    """
+    print("--- BATCH: Warming up workflow graph ---")
+    start = time.perf_counter()
+
+    from utils import load_environment
+    from red_army import build_app
+    load_environment()
+    build_app()
+
+    index_built = False
+    if rag_index_path:
+        import rag_service
+        with multiprocessing.get_context("spawn").Pool(processes=1) as helper:
+            index_built = helper.apply(rag_service.build_index, (rag_index_path,))
+        if not index_built:
+            print("--- BATCH: RAG index build failed, workers will initialize RAG on first query ---")
+    print(f"--- BATCH: Warm-up complete in {time.perf_counter() - start:.2f}s ---")
+    return index_built
+
+
+def _init_worker(rag_index_path: Optional[str]) -> None:
+    """Pool initializer: load the prebuilt RAG index and create this worker's gRPC-backed clients after the fork."""
+    if rag_index_path:
+        from red_army import initialize_rag
+        initialize_rag(rag_index_path)
+
+
+def _run_mission(job: Dict) -> Dict:
+    """Run a single mission in a worker process and assess its outcome."""
+    from red_army import app, create_initial_state, mission_assessor, report_builder, RECURSION_LIMIT
+    from artifact_store import artifact_store
+    from mission_analytics import mission_row, step_rows
+    from toolkits.reporting_tools import wait_for_enrichments
+
+    result = {
+        "id": job["id"],
+        "objective": job["objective"],
+        "worker_pid": os.getpid(),
+    }
+    log_dir = job.get("log_dir")
+    log_file = open(os.path.join(log_dir, f"{job['id']}.log"), 'w', encoding='utf-8') if log_dir else None
+
+    history = []
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log_file) if log_file else contextlib.nullcontext():
+            initial_state = create_initial_state(job["objective"], **{"mission_id": job["id"], **job["initial_state"]})
+            final_state = app.invoke(initial_state, {"recursion_limit": RECURSION_LIMIT})
+            history = final_state.get("history", [])
+            assessment = mission_assessor.assess_mission_completion(final_state)
+            mission_assessor.discard(initial_state["mission_id"])
+            report_builder.discard(initial_state["mission_id"])
+            if not wait_for_enrichments(ENRICHMENT_WAIT_SECONDS):
+                print(f"--- BATCH: Debrief enrichment still running after {ENRICHMENT_WAIT_SECONDS}s, "
+                      f"its report may be lost ---")
+
+        # Columnar-ready rows for mission_analytics (outputs stay in the artifact store)
+        result.update(mission_row(job["id"], assessment, final_state))
+        result.update({
+            "summary": assessment["summary"],
+            "recommendations": assessment["recommendations"],
+            "history_entries": len(history),
+            "steps": step_rows(job["id"], history, mission_assessor.classifier),
+            "error": None,
+        })
+    except Exception as e:
+        result.update({
+            "mission_status": "ERROR",
+            "confidence_score": 0.0,
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        })
+    finally:
+        # The worker outlives the mission: free its in-memory tool outputs
+        # (kept on disk when RED_ARMY_ARTIFACT_DIR is set)
+        artifact_store.discard(entry.artifact_id for entry in history if getattr(entry, "artifact_id", None))
+        result["latency_seconds"] = time.perf_counter() - start
+        if log_file:
+            log_file.close()
+
+    return result
+
+
+def summarize_results(results: List[Dict], elapsed_seconds: float) -> Dict:
+    """Aggregate per-mission results into throughput and latency statistics."""
+    latencies = sorted(r["latency_seconds"] for r in results)
+    status_counts: Dict[str, int] = {}
+    for r in results:
+        status_counts[r["mission_status"]] = status_counts.get(r["mission_status"], 0) + 1
+
+    def percentile(fraction: float) -> float:
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(fraction * (len(latencies) - 1))))
+        return latencies[index]
+
+    return {
+        "missions": len(results),
+        "elapsed_seconds": elapsed_seconds,
+        "missions_per_hour": len(results) / elapsed_seconds * 3600 if elapsed_seconds > 0 else 0.0,
+        "status_counts": status_counts,
+        "latency_seconds": {
+            "mean": statistics.fmean(latencies) if latencies else 0.0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+
+
+def run_batch(missions: List[Dict], output_path: str, workers: Optional[int] = None,
+              log_dir: Optional[str] = None) -> Dict:
+    """
+    Run all missions across a forked worker pool and write the results.
+
+    Each completed mission is appended to output_path as one JSON line; the
+    aggregate summary is written as the final line.
+
+    Returns:
+        The summary dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    jobs = [dict(mission, log_dir=log_dir) for mission in missions]
+
+    rag_dir = tempfile.TemporaryDirectory(prefix="red_army_rag_")
+    rag_index_path = rag_dir.name if warm_up(rag_dir.name) else None
+
+    # Fork (not spawn) so workers inherit the warmed-up modules copy-on-write;
+    # gRPC clients are only created in the workers, after the fork.
+    context = multiprocessing.get_context("fork")
+    results = []
+
+    print(f"--- BATCH: Running {len(jobs)} missions on {workers} workers ---")
+    start = time.perf_counter()
+    with rag_dir, open(output_path, 'w', encoding='utf-8') as out, \
+            context.Pool(processes=workers, initializer=_init_worker, initargs=(rag_index_path,)) as pool:
+        for result in pool.imap_unordered(_run_mission, jobs):
+            results.append(result)
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+            print(f"--- BATCH: [{len(results)}/{len(jobs)}] {result['id']}: "
+                  f"{result['mission_status']} in {result['latency_seconds']:.1f}s ---")
+
+        summary = summarize_results(results, time.perf_counter() - start)
+        out.write(json.dumps({"summary": summary}) + "\n")
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a batch of Red Army missions in parallel.")
+    parser.add_argument("missions", help="JSON or JSON Lines file of objectives and initial states")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Results file (JSON Lines)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--log-dir", default=None, help="Write each mission's console output to <log-dir>/<id>.log")
+    args = parser.parse_args(argv)
+
+    missions = load_missions(args.missions)
+    summary = run_batch(missions, args.output, workers=args.workers, log_dir=args.log_dir)
+
+    latency = summary["latency_seconds"]
+    print("\n" + "=" * 60)
+    print("RED ARMY BATCH SUMMARY")
+    print("=" * 60)
+    print(f"Missions: {summary['missions']} in {summary['elapsed_seconds']:.1f}s")
+    print(f"Throughput: {summary['missions_per_hour']:.1f} missions/hour")
+    print(f"Latency: mean {latency['mean']:.1f}s | p50 {latency['p50']:.1f}s | "
+          f"p95 {latency['p95']:.1f}s | max {latency['max']:.1f}s")
+    print(f"Outcomes: {summary['status_counts']}")
+    print(f"Results written to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
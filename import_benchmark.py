@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the Red Army modules.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each entry point, reports the cumulative import time, the slowest imports and
+any heavy dependency that leaked into the import graph. Importing the CLI and
+the agent modules must stay free of side effects and well under one second.
+
+Usage:
+    python import_benchmark.py                 # benchmark the default modules
+    python import_benchmark.py red_army -n 5   # best of 5 runs
+    python import_benchmark.py --budget-ms 500 # exit non-zero if over budget
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_MODULES = [
+    "red_army",
+    "batch_runner",
+    "mission_assessor",
+    "agents.commander",
+    "agents.infiltrator",
+    "agents.saboteur",
+    "agents.executioner",
+    "agents.chronicler",
+    "agents.reporter",
+]
+
+# Dependencies that must only be imported on first tool use / graph build.
+HEAVY_MODULES = [
+    "scapy",
+    "nmap",
+    "langgraph",
+    "langchain_google_genai",
+    "langchain_community",
+    "faiss",
+]
+
+DEFAULT_BUDGET_MS = 1000.0
+
+
+def measure_import(module: str) -> Dict:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dict with wall-clock time, cumulative import time, per-import timings,
+        leaked heavy modules and anything the import printed to stdout.
+    """
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=repo_dir,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    top_level = next((cumulative for name, _, cumulative in imports if name.strip() == module), 0)
+    loaded = {name.strip() for name, _, _ in imports}
+    leaked = [heavy for heavy in HEAVY_MODULES if heavy in loaded]
+
+    return {
+        "module": module,
+        "wall_ms": wall_ms,
+        "import_ms": top_level / 1000,
+        "slowest": sorted(imports, key=lambda entry: entry[1], reverse=True)[:5],
+        "leaked_heavy_modules": leaked,
+        "stdout": result.stdout,
+    }
+
+
+def run_benchmark(modules: List[str], repeat: int = 3) -> List[Dict]:
+    """Measure each module `repeat` times and keep the fastest run."""
+    results = []
+    for module in modules:
+        runs = [measure_import(module) for _ in range(repeat)]
+        results.append(min(runs, key=lambda run: run["import_ms"]))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Red Army import times.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Runs per module (best is reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail if any module's cumulative import time exceeds this")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the slowest imports per module")
+    args = parser.parse_args(argv)
+
+    print("=" * 72)
+    print(f"{'MODULE':<24}{'IMPORT (ms)':>14}{'WALL (ms)':>12}  ISSUES")
+    print("=" * 72)
+
+    failures = 0
+    for result in run_benchmark(args.modules, args.repeat):
+        issues = []
+        if result["import_ms"] > args.budget_ms:
+            issues.append(f"over {args.budget_ms:.0f}ms budget")
+        if result["leaked_heavy_modules"]:
+            issues.append(f"imports {', '.join(result['leaked_heavy_modules'])}")
+        if result["stdout"].strip():
+            issues.append("prints at import")
+        failures += bool(issues)
+
+        print(f"{result['module']:<24}{result['import_ms']:>14.1f}{result['wall_ms']:>12.1f}  "
+              f"{'; '.join(issues) if issues else 'ok'}")
+        if args.verbose:
+            for name, self_us, _ in result["slowest"]:
+                print(f"    {self_us / 1000:>8.1f}ms  {name.strip()}")
+
+    print("=" * 72)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Parallel offline analysis of archived GridGuardian detector logs.
+
+Finds every detector log under a directory (plain, .gz or .zst rotations),
+then parses and indexes each one in a worker process with the Chronicler's
+own streaming report parser and AnomalyIndex, using every core by default.
+Each file yields one row of detection statistics (reports, anomalies, time
+range, peak and mean loading, time over threshold, severity); optional attack
+windows are correlated against every file in one vectorized pass. Per-file,
+per-window and aggregate tables are exported as Parquet (or Arrow/Feather).
+
+Files are handed out largest first so one big log does not finish last.
+Throughput is reported as MB/s of log files read (compressed size for
+archives) and lines/s parsed, over the wall-clock time of the whole run.
+
+Usage:
+    python log_batch.py /srv/exercises/logs --workers 8 --export-dir log_stats/
+    python log_batch.py logs/ --windows attacks.jsonl --pattern "anomaly_detector.log*"
+
+The windows file is a JSON list or JSON Lines of {"id", "start", "minutes"}:
+
+    {"id": "stealth-bypass-03", "start": "2025-09-17T18:50:00", "minutes": 15}
+
+pandas and pyarrow are imported on first use, not at module import.
+"""
+
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from anomaly_parser import parse_anomaly_reports
+from anomaly_store import AnomalyIndex, LoadingStats, grade_severity
+from log_sources import LogSourceError, open_log_source
+from mission_analytics import EXPORT_FORMATS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Detector logs and their rotations (anomaly_detector.log.1, .2.gz, ...)
+DEFAULT_PATTERN = "anomaly_detector.log*"
+
+
+class LogBatchResult(NamedTuple):
+    files: List[Dict]      # One row per log file
+    windows: List[Dict]    # One row per (file, attack window) with anomalies in it
+    summary: Dict          # Aggregate statistics and throughput
+
+
+def find_logs(directory: str, pattern: str = DEFAULT_PATTERN) -> List[str]:
+    """Log files under `directory` whose name matches `pattern`, largest first."""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if fnmatch.fnmatch(name, pattern))
+    return sorted(paths, key=lambda path: (-os.path.getsize(path), path))
+
+
+def load_attack_windows(path: str) -> List[Dict]:
+    """Attack windows from a JSON list or JSON Lines file of {"id", "start", "minutes"}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    entries = json.loads(content) if content.startswith('[') else [
+        json.loads(line) for line in content.splitlines() if line.strip()]
+
+    windows = []
+    for i, entry in enumerate(entries, 1):
+        try:
+            start = datetime.fromisoformat(str(entry["start"]).replace('T', ' '))
+            windows.append({"id": str(entry.get("id", f"window-{i:04d}")), "start": start,
+                            "end": start + timedelta(minutes=float(entry.get("minutes", 60)))})
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Attack window {i} in {path} is invalid ({e}): {entry!r}")
+    return windows
+
+
+def _counted(lines: Iterable[str], counter: List[int]) -> Iterator[str]:
+    for line in lines:
+        counter[0] += 1
+        yield line
+
+
+def _stat(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _analyze_file(job: Dict) -> Dict:
+    """Parse, index and correlate one log file in a worker process."""
+    path, windows = job["path"], job["windows"]
+    row = {"path": path, "bytes": os.path.getsize(path), "lines": 0, "reports": 0, "anomalies": 0,
+           "first_anomaly": None, "last_anomaly": None, "peak_loading": None, "mean_loading": None,
+           "seconds_over_threshold": 0.0, "anomalies_per_minute": 0.0, "severity": "NONE",
+           "parse_seconds": 0.0, "worker_pid": os.getpid(), "error": None}
+    window_rows = []
+
+    start = time.perf_counter()
+    try:
+        lines = [0]
+        index = AnomalyIndex(parse_anomaly_reports(_counted(open_log_source(path).iter_lines(), lines)))
+        row["lines"] = lines[0]
+    except (LogSourceError, OSError, EOFError, ValueError) as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        row["parse_seconds"] = time.perf_counter() - start
+        return {"file": row, "windows": window_rows}
+
+    times = index.arrays.times
+    row.update(reports=len(index.arrays.reports), anomalies=len(times))
+    if len(times):
+        stats = index.window_stats(times[0], times[-1])
+        row.update(first_anomaly=str(times[0]), last_anomaly=str(times[-1]),
+                   peak_loading=_stat(stats.peak), mean_loading=_stat(stats.mean),
+                   seconds_over_threshold=stats.seconds_over_threshold,
+                   anomalies_per_minute=stats.rate_per_minute, severity=grade_severity(stats))
+
+        if windows:
+            # Every attack window against this file at once
+            stats = index.window_stats_many([w["start"] for w in windows], [w["end"] for w in windows])
+            for i in np.flatnonzero(stats.count):
+                window = windows[i]
+                window_stats = LoadingStats(*(field[i] for field in stats))
+                window_rows.append({
+                    "window_id": window["id"], "path": path,
+                    "start": window["start"].isoformat(), "end": window["end"].isoformat(),
+                    "reports": len(index.reports_in_window(window["start"], window["end"])),
+                    "anomalies": int(window_stats.count), "peak_loading": _stat(window_stats.peak),
+                    "mean_loading": _stat(window_stats.mean),
+                    "seconds_over_threshold": float(window_stats.seconds_over_threshold),
+                    "severity": grade_severity(window_stats),
+                })
+
+    row["parse_seconds"] = time.perf_counter() - start
+    return {"file": row, "windows": window_rows}
+
+
+def summarize_files(files: List[Dict], windows: List[Dict], attack_windows: List[Dict],
+                    elapsed_seconds: float, workers: int) -> Dict:
+    """Aggregate detection statistics and throughput of a run."""
+    parsed = [f for f in files if not f["error"]]
+    total_bytes = sum(f["bytes"] for f in parsed)
+    total_lines = sum(f["lines"] for f in parsed)
+    severities: Dict[str, int] = {}
+    for f in parsed:
+        severities[f["severity"]] = severities.get(f["severity"], 0) + 1
+    peaks = [f["peak_loading"] for f in parsed if f["peak_loading"] is not None]
+    firsts = [f["first_anomaly"] for f in parsed if f["first_anomaly"]]
+    lasts = [f["last_anomaly"] for f in parsed if f["last_anomaly"]]
+
+    return {
+        "files": len(files),
+        "failed_files": len(files) - len(parsed),
+        "files_with_anomalies": sum(1 for f in parsed if f["anomalies"]),
+        "bytes": total_bytes,
+        "lines": total_lines,
+        "reports": sum(f["reports"] for f in parsed),
+        "anomalies": sum(f["anomalies"] for f in parsed),
+        "first_anomaly": min(firsts) if firsts else None,
+        "last_anomaly": max(lasts) if lasts else None,
+        "peak_loading": max(peaks) if peaks else None,
+        "severity_counts": severities,
+        "attack_windows": len(attack_windows),
+        "detected_windows": len({w["window_id"] for w in windows}),
+        "workers": workers,
+        "elapsed_seconds": elapsed_seconds,
+        "mb_per_second": total_bytes / 1e6 / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+        "lines_per_second": total_lines / elapsed_seconds if elapsed_seconds > 0 else 0.0,
+    }
+
+
+def analyze_log_directory(directory: str, workers: Optional[int] = None, pattern: str = DEFAULT_PATTERN,
+                          attack_windows: Optional[List[Dict]] = None) -> LogBatchResult:
+    """
+    Analyze every matching log under `directory` across a forked worker pool
+    (default: one worker per core).
+    """
+    paths = find_logs(directory, pattern)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    attack_windows = attack_windows or []
+    jobs = [{"path": path, "windows": attack_windows} for path in paths]
+
+    print(f"--- LOG BATCH: Analyzing {len(paths)} log file(s) under {directory} on {workers} worker(s) ---")
+    files, windows = [], []
+    start = time.perf_counter()
+    if workers == 1:
+        results = map(_analyze_file, jobs)
+    else:
+        pool = multiprocessing.get_context("fork").Pool(processes=workers)
+        results = pool.imap_unordered(_analyze_file, jobs)
+    try:
+        for result in results:
+            row = result["file"]
+            files.append(row)
+            windows.extend(result["windows"])
+            outcome = row["error"] or f"{row['reports']} reports, {row['anomalies']} anomalies, {row['severity']}"
+            print(f"--- LOG BATCH: [{len(files)}/{len(jobs)}] {row['path']}: {outcome} ---")
+    finally:
+        if workers > 1:
+            pool.close()
+            pool.join()
+    elapsed = time.perf_counter() - start
+
+    files.sort(key=lambda row: row["path"])
+    windows.sort(key=lambda row: (row["window_id"], row["path"]))
+    return LogBatchResult(files, windows, summarize_files(files, windows, attack_windows, elapsed, workers))
+
+
+def build_tables(result: LogBatchResult) -> Dict[str, "pd.DataFrame"]:
+    """The files, windows and summary tables of a run."""
+    import pandas as pd
+
+    files = pd.DataFrame.from_records(result.files, columns=[
+        "path", "bytes", "lines", "reports", "anomalies", "first_anomaly", "last_anomaly",
+        "peak_loading", "mean_loading", "seconds_over_threshold", "anomalies_per_minute",
+        "severity", "parse_seconds", "worker_pid", "error",
+    ])
+    for column in ("first_anomaly", "last_anomaly"):
+        files[column] = pd.to_datetime(files[column])
+    files["severity"] = files["severity"].astype("category")
+    files = files.astype({"peak_loading": "float64", "mean_loading": "float64"})
+
+    windows = pd.DataFrame.from_records(result.windows, columns=[
+        "window_id", "path", "start", "end", "reports", "anomalies", "peak_loading", "mean_loading",
+        "seconds_over_threshold", "severity",
+    ])
+    for column in ("start", "end"):
+        windows[column] = pd.to_datetime(windows[column])
+    windows = windows.astype({"peak_loading": "float64", "mean_loading": "float64"})
+
+    summary = {key: value for key, value in result.summary.items() if key != "severity_counts"}
+    summary.update({f"severity_{grade.lower()}": count for grade, count in result.summary["severity_counts"].items()})
+    return {"files": files, "windows": windows, "summary": pd.DataFrame([summary])}
+
+
+def export_tables(tables: Dict[str, "pd.DataFrame"], export_dir: str, file_format: str = "parquet") -> List[str]:
+    """Write the tables to export_dir as Parquet or Feather (Arrow IPC) files."""
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    os.makedirs(export_dir, exist_ok=True)
+
+    paths = []
+    for name, frame in tables.items():
+        path = os.path.join(export_dir, f"log_{name}.{file_format}")
+        if file_format == "parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.reset_index(drop=True).to_feather(path)
+        paths.append(path)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze archived GridGuardian detector logs in parallel.")
+    parser.add_argument("directory", help="Directory searched recursively for detector logs")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help=f"Log file name pattern (default: {DEFAULT_PATTERN})")
+    parser.add_argument("--windows", default=None, help="JSON or JSON Lines file of attack windows to correlate")
+    parser.add_argument("--export-dir", default=None, help="Write files/windows/summary tables to this directory")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet", help="Export file format")
+    args = parser.parse_args(argv)
+
+    attack_windows = load_attack_windows(args.windows) if args.windows else []
+    result = analyze_log_directory(args.directory, workers=args.workers, pattern=args.pattern,
+                                   attack_windows=attack_windows)
+    summary = result.summary
+
+    print("\n" + "=" * 60)
+    print("DETECTOR LOG BATCH SUMMARY")
+    print("=" * 60)
+    print(f"Files: {summary['files']} ({summary['failed_files']} failed, "
+          f"{summary['files_with_anomalies']} with anomalies)")
+    print(f"Reports: {summary['reports']} | Anomalies: {summary['anomalies']} | "
+          f"Range: {summary['first_anomaly']} .. {summary['last_anomaly']}")
+    print(f"Severity: {summary['severity_counts']}")
+    if attack_windows:
+        print(f"Attack windows detected: {summary['detected_windows']}/{summary['attack_windows']}")
+    print(f"Throughput: {summary['mb_per_second']:.1f} MB/s, {summary['lines_per_second']:,.0f} lines/s "
+          f"on {summary['workers']} worker(s) ({summary['elapsed_seconds']:.2f}s)")
+
+    if args.export_dir:
+        for path in export_tables(build_tables(result), args.export_dir, args.format):
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
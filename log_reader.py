@@ -0,0 +1,136 @@
+"""
+Incremental reader for the GridGuardian detector log.
+
+Each log source keeps a cursor: the inode and byte offset of what has already
+been read, any trailing partial line and the state of the streaming report
+parser, so a report whose END marker has not been written yet is completed by
+a later read. A read fetches only the bytes appended since the previous one,
+parses only the newly completed reports and adds them to the reports kept for
+that source. A changed inode (the log was rotated) or a file shorter than the
+cursor (it was truncated) restarts reading at the start of the new file;
+reports parsed before are kept.
+
+The first read of a source starts at most MAX_INITIAL_BYTES before the end of
+the file, so attaching to a long-running detector does not pull its whole log.
+The position half of a cursor, LineCursor, also tails the other defensive
+monitors' logs (see monitors.py).
+The sources themselves (local file, archive, docker exec, Docker Engine API,
+fixture) live in log_sources.py.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from anomaly_parser import AnomalyReportParser
+from anomaly_store import AnomalyIndex
+from log_sources import MAX_INITIAL_BYTES, LogSource
+
+# Parsed reports kept per source (oldest dropped first)
+MAX_REPORTS_PER_SOURCE = 10000
+
+
+class LineCursor:
+    """Read position in one log source: inode, byte offset and the partial line after it."""
+
+    __slots__ = ("inode", "offset", "partial_line", "skip_to_newline", "lock")
+
+    def __init__(self):
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.partial_line = b""             # Bytes after the last newline read
+        self.skip_to_newline = False        # Reading started mid-line: drop bytes up to the next newline
+        self.lock = threading.Lock()        # Serializes reads (e.g. the log watcher and the Chronicler)
+
+    def advance(self, source: LogSource, max_initial_bytes: int = MAX_INITIAL_BYTES) -> Tuple[List[str], int, bool]:
+        """
+        Read what was appended since the last call (callers hold `lock`).
+
+        Returns:
+            The newly completed lines, the bytes read, and whether reading
+            restarted because the log was new, rotated or truncated
+        """
+        # One byte more than the window, so a read that starts mid-file also gets
+        # the byte before the window: if that is a newline, the window starts on
+        # a complete line, which is kept
+        chunk = source.read(self.inode, self.offset, max_initial_bytes + 1)
+        data = chunk.data
+
+        reset = chunk.inode != self.inode or chunk.start != self.offset
+        if reset:
+            self.partial_line = b""
+            self.skip_to_newline = chunk.start > 0
+        if self.skip_to_newline:
+            # The rest of a line whose start was not read, possibly over several reads
+            newline = data.find(b"\n")
+            self.skip_to_newline = newline < 0
+            data = data[newline + 1:] if newline >= 0 else b""
+        self.inode = chunk.inode
+        self.offset = chunk.start + len(chunk.data)
+
+        buffered = self.partial_line + data
+        complete, _, self.partial_line = buffered.rpartition(b"\n")
+        lines = complete.decode("utf-8", errors="replace").split("\n") if complete else []
+        return lines, len(chunk.data), reset
+
+
+class LogCursor(LineCursor):
+    """Read position and parsed reports of one log source."""
+
+    __slots__ = ("parser", "index")
+
+    def __init__(self):
+        super().__init__()
+        self.parser = AnomalyReportParser()  # Holds a report still waiting for its END marker
+        self.index = AnomalyIndex()         # Parsed reports, indexed by anomaly time
+
+
+class LogRead(NamedTuple):
+    """Outcome of one incremental read."""
+    reports: List[Dict]       # Every report parsed from the source so far
+    new_reports: List[Dict]   # Reports completed by this read
+    bytes_read: int
+    lines_read: int
+    reset: bool               # The log was new, rotated or truncated
+    index: AnomalyIndex       # Time index over `reports`
+
+
+class IncrementalLogReader:
+    """Reads log sources from their cursors and keeps the parsed anomaly reports."""
+
+    def __init__(self, max_initial_bytes: int = MAX_INITIAL_BYTES):
+        self.max_initial_bytes = max_initial_bytes
+        self._cursors: Dict[Tuple, LogCursor] = {}
+        self._lock = threading.Lock()
+
+    def cursor(self, source: LogSource) -> LogCursor:
+        with self._lock:
+            return self._cursors.setdefault(source.key, LogCursor())
+
+    def forget(self, source: LogSource) -> None:
+        """Drop a source's cursor and reports; the next read starts afresh."""
+        with self._lock:
+            self._cursors.pop(source.key, None)
+
+    def read(self, source: LogSource) -> LogRead:
+        """Read what was appended to `source` since the last call and parse the completed reports."""
+        cursor = self.cursor(source)
+        with cursor.lock:
+            return self._read(source, cursor)
+
+    def _read(self, source: LogSource, cursor: LogCursor) -> LogRead:
+        attached = cursor.inode is not None
+        lines, bytes_read, reset = cursor.advance(source, self.max_initial_bytes)
+        if reset:
+            if attached:
+                print(f"--- CHRONICLER: Log {source.key[-1]} was rotated or truncated, "
+                      f"reading from offset {cursor.offset - bytes_read} ---")
+            cursor.parser.reset()
+
+        new_reports = list(cursor.parser.feed(lines))
+        cursor.index.add(new_reports)
+        cursor.index.trim(MAX_REPORTS_PER_SOURCE)
+        return LogRead(cursor.index.reports, new_reports, bytes_read, len(lines), reset, cursor.index)
+
+
+# Global log reader instance (cursors persist across Chronicler calls)
+log_reader = IncrementalLogReader()
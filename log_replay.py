@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded GridGuardian detector log in (compressed) real time.
+
+Rewrites a recorded log such as anomaly_detector_log_example.txt into a local
+file, a named pipe or stdout with the original pacing of its lines, so
+analyze_gridguardian_logs, the log watcher and the log sources can be
+exercised without a live detector container:
+
+    python log_replay.py anomaly_detector_log_example.txt --output /tmp/anomaly_detector.log --speed 100x --rebase now
+    RED_ARMY_DETECTOR_SOURCE=/tmp/anomaly_detector.log python red_army.py
+
+Lines are scheduled by the timestamp at their start; --speed 100x divides
+the gaps by 100 and --speed max writes as fast as possible. --rebase shifts
+every timestamp in the log (line prefixes and anomaly times alike) so the
+first line lands at the given time ("now" or an ISO timestamp). --loops
+repeats the recording, each pass shifted past the previous one so time keeps
+moving forward.
+
+--benchmark replays into a temporary file while an IncrementalLogReader
+tails it, and reports the latency from a report being written to it being
+parsed, tail and parse throughput, and attack window correlation throughput:
+
+    python log_replay.py anomaly_detector_log_example.txt --benchmark --speed max --loops 500
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+import numpy as np
+
+from anomaly_parser import REPORT_END_MARKER, REPORT_TIME_PATTERN
+from log_reader import IncrementalLogReader
+from log_sources import LocalFileSource
+
+# Every timestamp the detector writes: line prefixes and anomaly times
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?")
+
+# Gap between the end of one loop of the recording and the start of the next
+LOOP_GAP = timedelta(seconds=1)
+
+
+class ReplayStats(NamedTuple):
+    lines: int
+    bytes: int
+    reports: int          # END markers written
+    elapsed: float        # Seconds
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """'1x', '100', '2.5x' -> the factor; 'max' -> None (no pacing)."""
+    text = value.strip().lower()
+    if text in ("max", "0", "0x", "inf"):
+        return None
+    speed = float(text[:-1] if text.endswith("x") else text)
+    if speed <= 0:
+        raise ValueError(f"Replay speed must be positive or 'max', got {value!r}")
+    return speed
+
+
+def parse_rebase(value: Optional[str]) -> Optional[datetime]:
+    """'now' or an ISO timestamp -> datetime; None leaves timestamps unchanged."""
+    if not value:
+        return None
+    if value.lower() == "now":
+        return datetime.now()
+    return datetime.fromisoformat(value.replace("T", " "))
+
+
+def load_recording(path: str) -> Tuple[List[Tuple[Optional[datetime], str]], Optional[datetime], timedelta]:
+    """
+    The recording's lines with their line timestamps (None for lines without
+    one), the first line timestamp and the span of all timestamps in it.
+    """
+    lines, first_time, earliest, latest = [], None, None, None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = REPORT_TIME_PATTERN.match(line)
+            line_time = datetime.fromisoformat(match.group(1)) if match else None
+            if line_time is not None and first_time is None:
+                first_time = line_time
+            for stamp in TIMESTAMP_PATTERN.findall(line):
+                moment = datetime.fromisoformat(stamp)
+                earliest = moment if earliest is None or moment < earliest else earliest
+                latest = moment if latest is None or moment > latest else latest
+            lines.append((line_time, line if line.endswith("\n") else line + "\n"))
+    span = latest - earliest if earliest is not None else timedelta(0)
+    return lines, first_time, span
+
+
+def _shift(line: str, offset: timedelta) -> str:
+    def shifted(match: re.Match) -> str:
+        stamp = match.group(0)
+        moment = datetime.fromisoformat(stamp) + offset
+        fraction = stamp.partition(".")[2]
+        text = moment.strftime("%Y-%m-%d %H:%M:%S")
+        return f"{text}.{moment.microsecond:06d}"[:len(text) + 1 + len(fraction)] if fraction else text
+    return TIMESTAMP_PATTERN.sub(shifted, line)
+
+
+def iter_replay(path: str, rebase_to: Optional[datetime] = None, loops: int = 1) -> Iterator[Tuple[float, str]]:
+    """
+    Yield (seconds into the recording, rewritten line): the line's place on
+    the recording's own clock, before any time compression.
+    """
+    lines, first_time, span = load_recording(path)
+    base_offset = rebase_to - first_time if rebase_to is not None and first_time is not None else timedelta(0)
+    loop_shift = span + LOOP_GAP
+
+    for loop in range(loops):
+        offset = base_offset + loop * loop_shift
+        previous = first_time
+        for line_time, line in lines:
+            line_time = line_time or previous
+            previous = line_time
+            position = ((line_time - first_time) + loop * loop_shift).total_seconds() if line_time else 0.0
+            yield position, (_shift(line, offset) if offset else line)
+
+
+def replay(path: str, output: TextIO, speed: Optional[float] = 1.0, rebase_to: Optional[datetime] = None,
+           loops: int = 1, on_write: Optional[Callable[[str, float], None]] = None) -> ReplayStats:
+    """
+    Write the recording to `output`, pacing it by its timestamps divided by
+    `speed` (None: no pacing). Lines with the same timestamp are written and
+    flushed together; `on_write(block, time)` is called after each flush with
+    its time.perf_counter().
+    """
+    start = time.perf_counter()
+    lines = written = reports = 0
+    block, block_position = [], 0.0
+
+    def flush():
+        nonlocal written, reports
+        text = "".join(block)
+        output.write(text)
+        output.flush()
+        written += len(text.encode("utf-8"))
+        reports += text.count(REPORT_END_MARKER)
+        if on_write:
+            on_write(text, time.perf_counter())
+        block.clear()
+
+    for position, line in iter_replay(path, rebase_to, loops):
+        if block and position != block_position:
+            flush()
+        if not block:
+            if speed is not None:
+                # Sleep against the schedule, not the previous write, so delays do not accumulate
+                wait = start + position / speed - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            block_position = position
+        block.append(line)
+        lines += 1
+    if block:
+        flush()
+    return ReplayStats(lines, written, reports, time.perf_counter() - start)
+
+
+def replay_to(path: str, destination: str, append: bool = False, **options) -> ReplayStats:
+    """Replay into a file or named pipe ('-' for stdout)."""
+    if destination == "-":
+        return replay(path, sys.stdout, **options)
+    with open(destination, "a" if append else "w", encoding="utf-8") as output:
+        return replay(path, output, **options)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def benchmark(path: str, speed: Optional[float] = None, loops: int = 100, rebase_to: Optional[datetime] = None,
+              poll_interval: float = 0.01, windows: int = 10000) -> dict:
+    """
+    Replay `path` into a temporary log while tailing it, and measure the
+    Chronicler's read path: write-to-parse latency per report, tail and parse
+    throughput, then correlation of `windows` attack windows against the result.
+    """
+    write_times: List[float] = []
+    read_times: List[float] = []
+    parse_seconds = 0.0
+    bytes_read = lines_read = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "anomaly_detector.log")
+        open(log_path, "w").close()
+        source, reader = LocalFileSource(log_path), IncrementalLogReader()
+        reader.read(source)   # Attach at offset 0 before anything is written
+
+        def on_write(block: str, when: float):
+            write_times.extend([when] * block.count(REPORT_END_MARKER))
+
+        result = {}
+        writer = threading.Thread(target=lambda: result.update(stats=replay_to(
+            path, log_path, append=True, speed=speed, rebase_to=rebase_to, loops=loops, on_write=on_write)))
+        start = time.perf_counter()
+        writer.start()
+        while True:
+            done = not writer.is_alive()
+            read_start = time.perf_counter()
+            read = reader.read(source)
+            now = time.perf_counter()
+            parse_seconds += now - read_start
+            bytes_read += read.bytes_read
+            lines_read += read.lines_read
+            read_times.extend([now] * len(read.new_reports))
+            if done and not read.bytes_read:
+                break
+            if not read.bytes_read:
+                time.sleep(poll_interval)
+        elapsed = time.perf_counter() - start
+        writer.join()
+        index = read.index
+
+    latencies = [parsed - written for written, parsed in zip(write_times, read_times)]
+    times = index.arrays.times
+    correlate_seconds = stats_seconds = 0.0
+    if len(times) and windows:
+        rng = np.random.default_rng(0)
+        span = max(int((times[-1] - times[0]) / np.timedelta64(1, "s")), 1)
+        starts = times[0] + rng.integers(0, span, windows).astype("timedelta64[s]")
+        ends = starts + np.timedelta64(15, "m")
+        started = time.perf_counter()
+        index.correlate(starts, ends)
+        correlate_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        index.window_stats_many(starts, ends)
+        stats_seconds = time.perf_counter() - started
+
+    return {
+        "speed": speed,
+        "loops": loops,
+        "replay": result["stats"]._asdict(),
+        "reports_parsed": len(read_times),
+        "anomalies_indexed": len(times),
+        "elapsed_seconds": elapsed,
+        "tail_mb_per_second": bytes_read / 1e6 / elapsed if elapsed > 0 else 0.0,
+        "parse_lines_per_second": lines_read / parse_seconds if parse_seconds > 0 else 0.0,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            "p50": _percentile(latencies, 0.50) * 1000,
+            "p95": _percentile(latencies, 0.95) * 1000,
+            "max": max(latencies) * 1000 if latencies else 0.0,
+        },
+        "windows": windows if len(times) else 0,
+        "correlate_windows_per_second": windows / correlate_seconds if correlate_seconds > 0 else 0.0,
+        "window_stats_per_second": windows / stats_seconds if stats_seconds > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded GridGuardian detector log.")
+    parser.add_argument("recording", help="Recorded detector log, e.g. anomaly_detector_log_example.txt")
+    parser.add_argument("-o", "--output", default="-", help="File or named pipe to write to ('-' for stdout)")
+    parser.add_argument("--append", action="store_true", help="Append to the output file instead of truncating it")
+    parser.add_argument("--speed", default="1x", help="Time compression: 1x, 100x, ... or max (default: 1x)")
+    parser.add_argument("--rebase", default=None, help="Shift timestamps so the log starts at 'now' or an ISO time")
+    parser.add_argument("--loops", type=int, default=1, help="Repeat the recording this many times")
+    parser.add_argument("--benchmark", action="store_true", help="Measure tailing, parsing and correlation instead")
+    parser.add_argument("--poll-interval", type=float, default=0.01, help="Benchmark tail poll interval (s)")
+    args = parser.parse_args(argv)
+
+    speed, rebase_to = parse_speed(args.speed), parse_rebase(args.rebase)
+    if not args.benchmark:
+        stats = replay_to(args.recording, args.output, append=args.append, speed=speed,
+                          rebase_to=rebase_to, loops=args.loops)
+        print(f"--- REPLAY: {stats.lines} lines, {stats.reports} reports, {stats.bytes} bytes "
+              f"in {stats.elapsed:.2f}s ---", file=sys.stderr)
+        return 0
+
+    results = benchmark(args.recording, speed=speed, loops=args.loops, rebase_to=rebase_to,
+                        poll_interval=args.poll_interval)
+    latency = results["latency_ms"]
+    print("\n" + "=" * 60)
+    print("CHRONICLER LOG REPLAY BENCHMARK")
+    print("=" * 60)
+    print(f"Replay: {results['replay']['lines']} lines, {results['replay']['reports']} reports at "
+          f"{args.speed} in {results['elapsed_seconds']:.2f}s")
+    print(f"Tail: {results['tail_mb_per_second']:.1f} MB/s | Parse: {results['parse_lines_per_second']:,.0f} lines/s")
+    print(f"Write-to-parse latency: mean {latency['mean']:.1f}ms | p50 {latency['p50']:.1f}ms | "
+          f"p95 {latency['p95']:.1f}ms | max {latency['max']:.1f}ms")
+    print(f"Correlation: {results['windows']} windows over {results['anomalies_indexed']} anomalies, "
+          f"{results['correlate_windows_per_second']:,.0f} windows/s, "
+          f"{results['window_stats_per_second']:,.0f} window stats/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,572 @@
+"""
+Backends the Chronicler reads the GridGuardian detector log from.
+
+Every source offers two ways in:
+- read(cursor_inode, cursor_offset, max_initial_bytes) returns the bytes after
+  a cursor, for the incremental reader in log_reader.py;
+- iter_lines() streams the whole log, for bulk historical analysis.
+
+Backends:
+- LocalFileSource: a local path, read through mmap.
+- ArchiveSource: a gzip (.gz) or zstd (.zst) rotated archive, streamed.
+- DockerExecSource: a file inside a container, via one `docker exec` per read.
+- DockerAPISource: the same file via the Docker Engine API (no subprocess).
+- DockerLogsSource: the container's stdout via the Engine API with `since=`.
+- FixtureSource: a stand-in that replays a file such as
+  anomaly_detector_log_example.txt, optionally a chunk per read.
+
+open_log_source() turns a spec string into a source and keeps one source per
+spec, so sources that remember where they stopped (DockerLogsSource) resume.
+"""
+
+import abc
+import gzip
+import http.client
+import json
+import mmap
+import os
+import socket
+import subprocess
+import threading
+import urllib.parse
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# The first read of a log starts at most this many bytes before its end
+MAX_INITIAL_BYTES = 8 * 1024 * 1024
+
+# Read size when streaming archives and API responses
+STREAM_CHUNK_BYTES = 1024 * 1024
+
+DOCKER_HOST = os.getenv("DOCKER_HOST", "unix:///var/run/docker.sock")
+DOCKER_API_VERSION = "v1.41"
+DOCKER_API_TIMEOUT = 30.0
+
+DOCKER_CLI_MISSING = "'docker' command not found. Is Docker installed and in your system's PATH?"
+
+
+class LogSourceError(Exception):
+    """A log source could not be opened or read."""
+
+
+class LogChunk(NamedTuple):
+    """Bytes read from a log source."""
+    inode: int
+    start: int    # Offset of `data` in the file
+    data: bytes
+
+
+def start_offset(inode: int, size: int, cursor_inode: Optional[int], cursor_offset: int,
+                 max_initial_bytes: int = MAX_INITIAL_BYTES) -> int:
+    """Where to resume reading: the cursor, unless the file is new, rotated or truncated."""
+    if inode == cursor_inode and cursor_offset <= size:
+        return cursor_offset
+    return max(0, size - max_initial_bytes)
+
+
+def iter_chunk_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Split a stream of byte chunks into decoded lines (without line endings)."""
+    partial = b""
+    for chunk in chunks:
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if partial:
+        yield partial.decode("utf-8", errors="replace")
+
+
+def _script_chunk(output: bytes) -> LogChunk:
+    """Parse the output of the in-container read script: an 'inode start' header, then the data."""
+    header, _, data = output.partition(b"\n")
+    try:
+        inode, start = (int(value) for value in header.split())
+    except ValueError:
+        raise LogSourceError(f"Unexpected output from the log read script: {header[:200]!r}")
+    return LogChunk(inode, start, data)
+
+
+class LogSource(abc.ABC):
+    """Interface of a log backend. `key` identifies the log for cursors and caching."""
+
+    key: Tuple = ()
+
+    @abc.abstractmethod
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        """The bytes after the cursor, or the last max_initial_bytes if the log is new, rotated or truncated."""
+
+    @abc.abstractmethod
+    def iter_lines(self) -> Iterator[str]:
+        """Every line of the log, from the start."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.key[1:]}"
+
+
+# --- Local files ---
+
+class LocalFileSource(LogSource):
+    """A log file on the local filesystem (e.g. a bind-mounted detector log), read through mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key = ("file", os.path.abspath(path))
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                start = start_offset(stat.st_ino, stat.st_size, cursor_inode, cursor_offset, max_initial_bytes)
+                if start >= stat.st_size:
+                    return LogChunk(stat.st_ino, start, b"")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return LogChunk(stat.st_ino, start, mapped[start:stat.st_size])
+        except OSError as e:
+            raise LogSourceError(f"Cannot read log file {self.path}: {e}")
+
+    def iter_lines(self) -> Iterator[str]:
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for line in iter(mapped.readline, b""):
+                        yield line.rstrip(b"\n").decode("utf-8", errors="replace")
+        except OSError as e:
+            raise LogSourceError(f"Cannot read log file {self.path}: {e}")
+
+
+class ArchiveSource(LogSource):
+    """
+    A rotated, compressed log (.gz, or .zst with the optional `zstandard`
+    package). Archives do not change, so only the first read decompresses.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.key = ("archive", os.path.abspath(path))
+
+    def _open(self):
+        if self.path.endswith(".zst"):
+            try:
+                import zstandard
+            except ImportError:
+                raise LogSourceError(f"Reading {self.path} requires the 'zstandard' package")
+            return zstandard.ZstdDecompressor().stream_reader(open(self.path, "rb"), closefd=True)
+        return gzip.open(self.path, "rb")
+
+    def _chunks(self) -> Iterator[bytes]:
+        try:
+            with self._open() as stream:
+                while True:
+                    chunk = stream.read(STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        return
+                    yield chunk
+        except (OSError, EOFError) as e:
+            raise LogSourceError(f"Cannot read log archive {self.path}: {e}")
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError as e:
+            raise LogSourceError(f"Cannot read log archive {self.path}: {e}")
+        if inode == cursor_inode:
+            return LogChunk(inode, cursor_offset, b"")
+
+        # Keep only the last max_initial_bytes while streaming the archive
+        kept: deque = deque()
+        kept_bytes = total = 0
+        for chunk in self._chunks():
+            kept.append(chunk)
+            kept_bytes += len(chunk)
+            total += len(chunk)
+            while len(kept) > 1 and kept_bytes - len(kept[0]) >= max_initial_bytes:
+                kept_bytes -= len(kept.popleft())
+        data = b"".join(kept)[-max_initial_bytes:] if max_initial_bytes else b""
+        return LogChunk(inode, total - len(data), data)
+
+    def iter_lines(self) -> Iterator[str]:
+        return iter_chunk_lines(self._chunks())
+
+
+class FixtureSource(LogSource):
+    """
+    Replays a log file such as anomaly_detector_log_example.txt. With
+    `chunk_bytes`, each read reveals the next chunk, as if the detector were
+    still writing it.
+    """
+
+    def __init__(self, path: str, chunk_bytes: Optional[int] = None):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.key = ("fixture", os.path.abspath(path), chunk_bytes)
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                start = cursor_offset if cursor_inode == stat.st_ino and cursor_offset <= stat.st_size else 0
+                f.seek(start)
+                return LogChunk(stat.st_ino, start, f.read(self.chunk_bytes or -1))
+        except OSError as e:
+            raise LogSourceError(f"Cannot read fixture {self.path}: {e}")
+
+    def iter_lines(self) -> Iterator[str]:
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    yield line.rstrip("\n")
+        except OSError as e:
+            raise LogSourceError(f"Cannot read fixture {self.path}: {e}")
+
+
+# --- Docker ---
+
+class DockerExecSource(LogSource):
+    """
+    A log file inside a running container, read with a single `docker exec` per
+    call that reports the file's inode and streams the bytes after the cursor.
+    """
+
+    # $1 path, $2 cursor inode, $3 cursor offset, $4 max initial bytes
+    SCRIPT = (
+        'set -e; info=$(stat -c "%i %s" "$1"); set -- "$1" "$2" "$3" "$4" $info; '
+        'start=$3; if [ "$5" != "$2" ] || [ "$3" -gt "$6" ]; then '
+        'start=$(( $6 > $4 ? $6 - $4 : 0 )); fi; '
+        'echo "$5 $start"; tail -c +$((start + 1)) "$1"'
+    )
+
+    def __init__(self, container: str, path: str):
+        self.container = container
+        self.path = path
+        self.key = ("docker", container, path)
+
+    def script_command(self, cursor_inode: Optional[int], cursor_offset: int, max_initial_bytes: int) -> List[str]:
+        return ["sh", "-c", self.SCRIPT, "sh", self.path,
+                str(cursor_inode if cursor_inode is not None else -1), str(cursor_offset), str(max_initial_bytes)]
+
+    def _failed(self, detail: str) -> LogSourceError:
+        return LogSourceError(f"Could not access {self.path} in container '{self.container}'. "
+                              f"Is the container name correct and running? Error: {detail}")
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        command = ["docker", "exec", self.container] + self.script_command(cursor_inode, cursor_offset,
+                                                                             max_initial_bytes)
+        try:
+            result = subprocess.run(command, capture_output=True, check=True)
+        except FileNotFoundError:
+            raise LogSourceError(DOCKER_CLI_MISSING)
+        except subprocess.CalledProcessError as e:
+            raise self._failed(e.stderr.decode("utf-8", errors="replace").strip())
+        return _script_chunk(result.stdout)
+
+    def iter_lines(self) -> Iterator[str]:
+        try:
+            process = subprocess.Popen(["docker", "exec", self.container, "cat", self.path],
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise LogSourceError(DOCKER_CLI_MISSING)
+        try:
+            yield from iter_chunk_lines(iter(lambda: process.stdout.read(STREAM_CHUNK_BYTES), b""))
+            # Only a stream read to the end is checked: closing it early stops cat with SIGPIPE
+            if process.wait() != 0:
+                raise self._failed(process.stderr.read().decode("utf-8", errors="replace").strip())
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+            process.wait()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP over the Docker daemon's unix socket."""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def demux_stream(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split a Docker attach/logs body into (stdout, stderr). Containers without a
+    TTY frame their output with 8-byte headers; a TTY's output is raw.
+    """
+    if len(data) < 8 or data[0] not in (0, 1, 2) or data[1:4] != b"\0\0\0":
+        return data, b""
+    streams: Dict[int, List[bytes]] = {1: [], 2: []}
+    pos = 0
+    while pos + 8 <= len(data):
+        size = int.from_bytes(data[pos + 4:pos + 8], "big")
+        streams[2 if data[pos] == 2 else 1].append(data[pos + 8:pos + 8 + size])
+        pos += 8 + size
+    return b"".join(streams[1]), b"".join(streams[2])
+
+
+def _iter_frames(response) -> Iterator[bytes]:
+    """Stream the stdout frames of a multiplexed response."""
+    while True:
+        header = response.read(8)
+        if len(header) < 8:
+            return
+        payload = response.read(int.from_bytes(header[4:8], "big"))
+        if header[0] != 2:
+            yield payload
+
+
+class DockerEngineClient:
+    """
+    Minimal Docker Engine API client over the daemon's unix socket. Requests
+    share one keep-alive connection; a stale connection is reopened once.
+    """
+
+    def __init__(self, host: str = DOCKER_HOST, timeout: float = DOCKER_API_TIMEOUT):
+        if not host.startswith("unix://"):
+            raise LogSourceError(f"Only unix:// Docker hosts are supported, got {host}")
+        self.socket_path = host[len("unix://"):]
+        self.timeout = timeout
+        self._connection: Optional[_UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def _url(self, path: str, params: Optional[Dict] = None) -> str:
+        query = f"?{urllib.parse.urlencode(params)}" if params else ""
+        return f"/{DOCKER_API_VERSION}{path}{query}"
+
+    def request(self, method: str, path: str, params: Optional[Dict] = None, body: Optional[Dict] = None) -> bytes:
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        with self._lock:
+            for attempt in range(2):
+                reused = self._connection is not None
+                if not reused:
+                    self._connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+                try:
+                    self._connection.request(method, self._url(path, params), body=payload, headers=headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    self._connection.close()
+                    self._connection = None
+                    if not reused or attempt:
+                        raise LogSourceError(f"Docker Engine API unavailable at {self.socket_path}: {e}")
+        if response.status >= 400:
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data[:200].decode("utf-8", errors="replace")
+            raise LogSourceError(f"Docker Engine API {method} {path} failed ({response.status}): {message}")
+        return data
+
+    def stream(self, method: str, path: str, params: Optional[Dict] = None, body: Optional[Dict] = None):
+        """Open a dedicated connection for a long response; the caller reads and closes it."""
+        connection = _UnixHTTPConnection(self.socket_path, self.timeout)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        try:
+            connection.request(method, self._url(path, params), body=payload, headers=headers)
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise LogSourceError(f"Docker Engine API unavailable at {self.socket_path}: {e}")
+        if response.status >= 400:
+            connection.close()
+            raise LogSourceError(f"Docker Engine API {method} {path} failed ({response.status})")
+        return connection, response
+
+    def exec_run(self, container: str, command: List[str]) -> bytes:
+        """Run a command in a container and return its stdout, raising if it fails."""
+        exec_id = json.loads(self.request("POST", f"/containers/{container}/exec", body={
+            "AttachStdout": True, "AttachStderr": True, "Cmd": command}))["Id"]
+        stdout, stderr = demux_stream(self.request("POST", f"/exec/{exec_id}/start",
+                                                   body={"Detach": False, "Tty": False}))
+        exit_code = json.loads(self.request("GET", f"/exec/{exec_id}/json")).get("ExitCode")
+        if exit_code:
+            raise LogSourceError(f"Command in container '{container}' exited with {exit_code}: "
+                                 f"{stderr.decode('utf-8', errors='replace').strip()}")
+        return stdout
+
+    def logs(self, container: str, since: Optional[str] = None) -> bytes:
+        """The container's stdout/stderr log lines, each prefixed with its RFC 3339 timestamp."""
+        params = {"stdout": 1, "stderr": 1, "timestamps": 1}
+        if since:
+            params["since"] = since
+        stdout, stderr = demux_stream(self.request("GET", f"/containers/{container}/logs", params))
+        return stdout + stderr
+
+
+# Global Docker Engine API client (created on first use)
+_docker_client: Optional[DockerEngineClient] = None
+_docker_client_lock = threading.Lock()
+
+
+def docker_client() -> DockerEngineClient:
+    global _docker_client
+    with _docker_client_lock:
+        if _docker_client is None:
+            _docker_client = DockerEngineClient()
+        return _docker_client
+
+
+class DockerAPISource(DockerExecSource):
+    """A log file inside a container, read by running the read script through the Engine API."""
+
+    def __init__(self, container: str, path: str, client: Optional[DockerEngineClient] = None):
+        super().__init__(container, path)
+        self.key = ("docker-api", container, path)
+        self._client = client
+
+    @property
+    def client(self) -> DockerEngineClient:
+        return self._client or docker_client()
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        return _script_chunk(self.client.exec_run(
+            self.container, self.script_command(cursor_inode, cursor_offset, max_initial_bytes)))
+
+    def iter_lines(self) -> Iterator[str]:
+        client = self.client
+        exec_id = json.loads(client.request("POST", f"/containers/{self.container}/exec", body={
+            "AttachStdout": True, "AttachStderr": True, "Cmd": ["cat", self.path]}))["Id"]
+        connection, response = client.stream("POST", f"/exec/{exec_id}/start", body={"Detach": False, "Tty": False})
+        try:
+            yield from iter_chunk_lines(_iter_frames(response))
+        finally:
+            connection.close()
+
+
+def _log_time(stamp: bytes) -> Tuple[int, int]:
+    """(unix seconds, nanoseconds) of a Docker RFC 3339 log timestamp such as 2025-09-17T15:01:14.12Z."""
+    text = stamp.decode("ascii").rstrip("Z")
+    seconds, _, fraction = text.partition(".")
+    moment = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return int(moment.timestamp()), int(fraction[:9].ljust(9, "0")) if fraction else 0
+
+
+class DockerLogsSource(LogSource):
+    """
+    The container's own stdout (where the detector also logs its reports),
+    fetched through the Engine API. Each read asks only for entries `since`
+    the last timestamp seen, so the daemon does the filtering.
+    """
+
+    # Container logs have no inode; the cursor offset counts bytes handed out
+    INODE = 0
+
+    def __init__(self, container: str, client: Optional[DockerEngineClient] = None):
+        self.container = container
+        self.key = ("docker-logs", container)
+        self._client = client
+        self._resume: Optional[Tuple[int, Tuple[int, int]]] = None   # (cursor offset, last timestamp)
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> DockerEngineClient:
+        return self._client or docker_client()
+
+    @staticmethod
+    def _entries(raw: bytes, after: Optional[Tuple[int, int]]) -> Tuple[List[bytes], Optional[Tuple[int, int]]]:
+        lines, last = [], after
+        for entry in raw.split(b"\n"):
+            stamp, _, message = entry.partition(b" ")
+            if not stamp:
+                continue
+            try:
+                when = _log_time(stamp)
+            except ValueError:
+                continue
+            if after is not None and when <= after:
+                continue  # `since` is inclusive; skip entries already handed out
+            lines.append(message)
+            last = when
+        return lines, last
+
+    def read(self, cursor_inode: Optional[int], cursor_offset: int,
+             max_initial_bytes: int = MAX_INITIAL_BYTES) -> LogChunk:
+        with self._lock:
+            resume = self._resume if cursor_inode == self.INODE else None
+            if resume and resume[0] == cursor_offset:
+                seconds, nanos = resume[1]
+                lines, last = self._entries(self.client.logs(self.container, f"{seconds}.{nanos:09d}"), resume[1])
+                start = cursor_offset
+                data = b"".join(line + b"\n" for line in lines)
+            else:
+                lines, last = self._entries(self.client.logs(self.container), None)
+                data = b"".join(line + b"\n" for line in lines)[-max_initial_bytes:] if max_initial_bytes else b""
+                start = sum(len(line) + 1 for line in lines) - len(data)
+            self._resume = (start + len(data), last) if last else None
+            return LogChunk(self.INODE, start, data)
+
+    def iter_lines(self) -> Iterator[str]:
+        connection, response = self.client.stream("GET", f"/containers/{self.container}/logs",
+                                                  {"stdout": 1, "stderr": 1})
+        try:
+            yield from iter_chunk_lines(_iter_frames(response))
+        finally:
+            connection.close()
+
+
+# --- Specs ---
+
+SOURCE_SCHEMES = ("file", "archive", "fixture", "docker-exec", "docker-api", "docker-logs")
+
+_sources: Dict[str, LogSource] = {}
+_sources_lock = threading.Lock()
+
+
+def _container_path(rest: str, spec: str) -> Tuple[str, str]:
+    container, _, path = rest.partition(":")
+    if not container or not path:
+        raise LogSourceError(f"Log source '{spec}' needs CONTAINER:PATH")
+    return container, path
+
+
+def _build_source(spec: str) -> LogSource:
+    scheme, sep, rest = spec.partition(":")
+    if not sep or scheme not in SOURCE_SCHEMES:
+        # A bare path: archives by extension, anything else as a local file
+        scheme, rest = ("archive" if spec.endswith((".gz", ".zst")) else "file"), spec
+    if scheme == "file":
+        return LocalFileSource(rest)
+    if scheme == "archive":
+        return ArchiveSource(rest)
+    if scheme == "fixture":
+        path, _, chunk = rest.rpartition("@")
+        return FixtureSource(path, int(chunk)) if path and chunk.isdigit() else FixtureSource(rest)
+    if scheme == "docker-exec":
+        return DockerExecSource(*_container_path(rest, spec))
+    if scheme == "docker-api":
+        return DockerAPISource(*_container_path(rest, spec))
+    if not rest:
+        raise LogSourceError(f"Log source '{spec}' needs a container name")
+    return DockerLogsSource(rest)
+
+
+def open_log_source(spec: str) -> LogSource:
+    """
+    Return the source for a spec, creating it on first use:
+
+        file:/var/log/anomaly_detector.log        (or just the path)
+        archive:/var/log/anomaly_detector.log.1.gz  (or a path ending in .gz / .zst)
+        fixture:anomaly_detector_log_example.txt[@CHUNK_BYTES]
+        docker-exec:CONTAINER:/path/in/container
+        docker-api:CONTAINER:/path/in/container
+        docker-logs:CONTAINER
+    """
+    with _sources_lock:
+        source = _sources.get(spec)
+        if source is None:
+            source = _sources[spec] = _build_source(spec)
+        return source
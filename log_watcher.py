@@ -0,0 +1,236 @@
+"""
+Background watcher for the GridGuardian detector log.
+
+The Chronicler only reads the detector log when the plan schedules an
+analyze_gridguardian_logs step, so a detection early in a long scenario used
+to go unnoticed until the end. While a mission runs, LogWatcher tails the log
+on a daemon thread through the shared log_reader (the Chronicler's later
+analysis reuses the reports it already parsed) and publishes a DetectionEvent
+for every newly completed anomaly report. Reports already in the log when the
+watcher attaches are the baseline, not detections.
+
+Events are numbered in publication order; consumers remember the last number
+they handled:
+
+- execute_attack_scenario waits out its step delays with log_watcher.sleep(),
+  which returns as soon as a detection is published, and stops the scenario.
+- The router sends the mission to detection_node while the state's
+  detections_seen is behind. Per RED_ARMY_ON_DETECTION the node ends the plan
+  so the Commander replans ("replan", the default), ends the mission
+  ("abort"), or only records the detection ("continue").
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+import numpy as np
+
+from anomaly_store import AnomalyIndex, grade_severity
+from log_reader import IncrementalLogReader, log_reader
+from log_sources import LogSourceError, open_log_source
+from mission_history import record_step
+
+# Seconds between reads of the detector log
+WATCH_INTERVAL_SECONDS = float(os.getenv("RED_ARMY_WATCH_INTERVAL", "2"))
+
+# What a detection does to the running mission
+DETECTION_POLICIES = ("replan", "abort", "continue")
+DETECTION_POLICY = os.getenv("RED_ARMY_ON_DETECTION", "replan").lower()
+
+# Published events kept for consumers that fall behind
+MAX_EVENTS = 1000
+
+# Tool name the detections are recorded under in the mission history
+WATCH_TOOL = "watch_gridguardian_logs"
+
+
+class DetectionEvent(NamedTuple):
+    """One anomaly report published by the watcher."""
+    sequence: int                  # 1-based publication number
+    report_id: int                 # ID in the source's AnomalyIndex
+    report_timestamp: Optional[str]
+    first_anomaly: np.datetime64
+    last_anomaly: np.datetime64
+    anomaly_count: int
+    peak_loading: float            # Percent, NaN when the report logs no loadings
+    severity: str                  # grade_severity() of the report's anomalies
+    observed_at: float             # time.time() when the watcher read it
+
+
+def _detection(sequence: int, report_id: int, report: dict, observed_at: float) -> DetectionEvent:
+    times = report["anomaly_times"]
+    times = np.sort(times[~np.isnat(times)])
+    if len(times):
+        stats = AnomalyIndex([report]).window_stats(times[0], times[-1])
+        first, last, peak, severity = times[0], times[-1], stats.peak, grade_severity(stats)
+    else:
+        first = last = np.datetime64("NaT", "us")
+        peak, severity = np.nan, "LOW"
+    return DetectionEvent(sequence, report_id, report.get("report_timestamp"), first, last,
+                          report["anomaly_count"], float(peak), severity, observed_at)
+
+
+class LogWatcher:
+    """Tails one detector log source on a daemon thread and publishes detection events."""
+
+    def __init__(self, reader: IncrementalLogReader = log_reader,
+                 interval: float = WATCH_INTERVAL_SECONDS, policy: str = DETECTION_POLICY):
+        if policy not in DETECTION_POLICIES:
+            raise ValueError(f"Unknown detection policy '{policy}'. Use one of {DETECTION_POLICIES}")
+        self.reader = reader
+        self.interval = interval
+        self.policy = policy
+        self.source = None
+        self._events: Deque[DetectionEvent] = deque(maxlen=MAX_EVENTS)
+        self._published = 0
+        self._next_report_id: Optional[int] = None   # None until the baseline read
+        self._last_error: Optional[str] = None
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, source_spec: str) -> None:
+        """Attach to `source_spec` (see log_sources.open_log_source) and start polling it."""
+        self.stop()
+        self.source = open_log_source(source_spec)
+        self._next_report_id = None
+        self._last_error = None
+        self._stop.clear()
+        print(f"--- WATCHER: Watching {source_spec} every {self.interval:g}s (on detection: {self.policy}) ---")
+        self.poll()   # Baseline: reports already in the log are not detections
+        self._thread = threading.Thread(target=self._run, name="gridguardian-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling. Published events stay available."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    # --- Reading ---
+
+    def poll(self) -> List[DetectionEvent]:
+        """Read the source once and publish the reports completed since the previous poll."""
+        if self.source is None:
+            return []
+        try:
+            index = self.reader.read(self.source).index
+        except LogSourceError as e:
+            if str(e) != self._last_error:   # Report each distinct failure once, then keep retrying
+                print(f"--- WATCHER ERROR: {e} ---")
+                self._last_error = str(e)
+            return []
+        self._last_error = None
+
+        arrays = index.arrays
+        end_id = arrays.first_id + len(arrays.reports)
+        if self._next_report_id is None:
+            self._next_report_id = end_id
+            return []
+        # Reports trimmed from the index before this poll saw them are gone
+        first_new = max(self._next_report_id, arrays.first_id)
+        self._next_report_id = end_id
+        if first_new >= end_id:
+            return []
+
+        observed_at = time.time()
+        with self._changed:
+            events = []
+            for report_id in range(first_new, end_id):
+                self._published += 1
+                events.append(_detection(self._published, report_id, index.report(report_id), observed_at))
+            self._events.extend(events)
+            self._changed.notify_all()
+        for event in events:
+            print(f"--- WATCHER: Detection #{event.sequence}: {event.anomaly_count} anomalies, "
+                  f"severity {event.severity} ---")
+        return events
+
+    # --- Consuming ---
+
+    @property
+    def published(self) -> int:
+        """Sequence number of the latest event (0 before the first)."""
+        return self._published
+
+    def events(self, since: int = 0) -> List[DetectionEvent]:
+        """Events published after sequence number `since` that are still kept."""
+        with self._changed:
+            return [event for event in self._events if event.sequence > since]
+
+    def sleep(self, seconds: float, since: Optional[int] = None) -> List[DetectionEvent]:
+        """
+        Wait up to `seconds`, returning early once an event newer than `since`
+        (default: the latest at the call) is published. Returns those events.
+        """
+        deadline = time.monotonic() + seconds
+        with self._changed:
+            since = self._published if since is None else since
+            while self._published <= since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return [event for event in self._events if event.sequence > since]
+
+    @property
+    def interrupts(self) -> bool:
+        """Whether a detection should cut running scenarios short."""
+        return self.policy != "continue"
+
+
+def format_detections(events: List[DetectionEvent]) -> str:
+    """One line per detection event."""
+    lines = []
+    for event in events:
+        loading = f", peak {event.peak_loading:.1f}% loading" if not np.isnan(event.peak_loading) else ""
+        lines.append(f"- Report at {event.report_timestamp or 'unknown time'}: {event.anomaly_count} anomalies "
+                     f"from {str(event.first_anomaly)[:19].replace('T', ' ')}{loading}, severity {event.severity}")
+    return "\n".join(lines)
+
+
+# Global log watcher instance (started by the CLI when RED_ARMY_WATCH is set)
+log_watcher = LogWatcher()
+
+
+def detection_pending(state) -> bool:
+    """Whether the watcher published events the mission has not handled yet."""
+    return log_watcher.published > state.get("detections_seen", 0)
+
+
+def detection_node(state) -> dict:
+    """Record the detections published since the mission last looked and apply the detection policy."""
+    print("--- AGENT: Detection Watcher ---")
+    started_at = time.time()
+    events = log_watcher.events(since=state.get("detections_seen", 0))
+    result = (f"Analysis: FAILURE. GridGuardian detected {len(events)} anomaly report(s) while the mission "
+              f"was running. The attack was detected.\n{format_detections(events)}")
+
+    update = {
+        "task_output": result,
+        "feedback": result,
+        "history": [record_step("Chronicler", f"{WATCH_TOOL}()", result, started_at, tool=WATCH_TOOL,
+                                revision=state.get("revision_number", 0))],
+        "detections_seen": log_watcher.published,
+    }
+    if log_watcher.policy != "continue":
+        remaining = len(state["plan"]) - state["current_task_index"]
+        print(f"--- WATCHER: Detected mid-mission; skipping the remaining {remaining} step(s) ({log_watcher.policy}) ---")
+        update["current_task_index"] = len(state["plan"])
+    return update
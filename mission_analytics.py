@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Cross-mission analytics for the Red Army system.
+
+Flattens mission assessments and their per-step history into two columnar
+tables, exports them as Parquet (or Arrow/Feather) and computes detector
+effectiveness statistics with vectorized pandas group-bys:
+
+    missions: one row per mission (status, confidence, task counts, latency)
+    steps:    one row per history entry (agent, tool, outcome, timing,
+              scenario, whether the Chronicler reported a detection)
+
+The batch runner stores each mission's step rows in its results file, so the
+analytics can be run over any number of batch runs after the fact.
+
+Usage:
+    python mission_analytics.py batch_results.jsonl [more.jsonl ...]
+    python mission_analytics.py batch_results.jsonl --export-dir analytics/ --format parquet
+
+pandas and pyarrow are imported on first use, not at module import.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from mission_history import HistoryRecord, entry_agent, entry_text
+from plan_compiler import STATE_ARGUMENTS
+from report_builder import DETECTED_MARKER, UNDETECTED_MARKER
+from utils import parse_tool_call
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Agents whose steps define the attack vector a later detection verdict applies to
+ATTACK_AGENTS = ("Saboteur", "Executioner")
+
+EXPORT_FORMATS = ("parquet", "feather")
+
+
+@functools.lru_cache(maxsize=None)
+def _default_classifier():
+    from mission_assessor import MissionAssessor
+
+    return MissionAssessor().classifier
+
+
+def _attack_vector(agent: Optional[str], tool_call: str) -> Optional[str]:
+    """Scenario name, MITRE technique or tool of an attack step; None if the step defines no new vector."""
+    if agent not in ATTACK_AGENTS:
+        return None
+    try:
+        func_name, _, args = parse_tool_call(tool_call)
+    except ValueError:
+        return None
+    if func_name == "execute_attack_scenario" and "scenario_name" in args:
+        return str(args["scenario_name"])
+    if func_name in STATE_ARGUMENTS:
+        return None  # Delivers the previous step's payload, so it keeps that step's vector
+    from agents.saboteur import extract_technique_id
+
+    return extract_technique_id(tool_call) or func_name
+
+
+def step_rows(mission_id: str, history: Iterable, classifier=None) -> List[Dict]:
+    """
+    Flatten a mission's history into JSON-serializable step rows.
+
+    Records contribute timing and tool fields; legacy string entries only
+    agent and outcome. Outputs are classified, never copied into the rows.
+    """
+    classifier = classifier or _default_classifier()
+    rows = []
+    for step, entry in enumerate(history):
+        agent = entry_agent(entry)
+        record = entry if isinstance(entry, HistoryRecord) else None
+        tool_call = record.tool_call if record else ""
+
+        # Only the Chronicler's verdicts need the full output
+        detected = None
+        if agent == "Chronicler":
+            text = record.output if record else entry_text(entry)
+            if DETECTED_MARKER in text:
+                detected = True
+            elif UNDETECTED_MARKER in text:
+                detected = False
+
+        rows.append({
+            "mission_id": mission_id,
+            "step": step,
+            "agent": agent,
+            "tool": record.tool if record else None,
+            "outcome": classifier.classify(entry).outcome,
+            "status": record.status if record else None,
+            "started_at": record.started_at if record else None,
+            "duration_seconds": record.duration if record else None,
+            "revision": record.revision if record else None,
+            "output_size": record.output_size if record else len(str(entry)),
+            "scenario": _attack_vector(agent, tool_call) if record else None,
+            "detected": detected,
+        })
+    return rows
+
+
+def mission_row(mission_id: str, assessment: Dict, state: Dict, latency_seconds: Optional[float] = None) -> Dict:
+    """One JSON-serializable row summarizing an assessed mission."""
+    execution = assessment["detailed_analysis"]["plan_execution"]
+    objective = assessment["detailed_analysis"]["objective_completion"]
+    return {
+        "mission_id": mission_id,
+        "objective": state.get("objective", ""),
+        "mission_status": assessment["mission_status"],
+        "confidence_score": assessment["confidence_score"],
+        "total_tasks": execution["total_tasks"],
+        "completed_tasks": execution["completed_tasks"],
+        "successful_tasks": execution["successful_tasks"],
+        "skipped_tasks": execution["skipped_tasks"],
+        "failed_tasks": execution["failed_tasks"],
+        "objective_alignment_score": objective["objective_alignment_score"],
+        "revision_number": state.get("revision_number", 0),
+        "latency_seconds": latency_seconds,
+    }
+
+
+def load_results(paths: Iterable[str]) -> List[Dict]:
+    """Read batch runner result files (JSON Lines), skipping their summary lines."""
+    results = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "summary" not in entry:
+                    results.append(entry)
+    return results
+
+
+def build_frames(results: Iterable[Dict]) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    """
+    Build the columnar missions and steps tables from batch results.
+
+    Each result is a batch runner result dict: mission fields plus a "steps"
+    list from step_rows().
+    """
+    import pandas as pd
+
+    mission_records, step_records = [], []
+    for result in results:
+        mission_records.append({key: value for key, value in result.items() if key not in ("steps", "traceback")})
+        step_records.extend(result.get("steps") or [])
+
+    missions = pd.DataFrame.from_records(mission_records)
+    if "id" in missions:
+        # Batch results carry the mission ID as "id"
+        missions = missions.drop(columns=["id"]) if "mission_id" in missions else missions.rename(columns={"id": "mission_id"})
+
+    steps = pd.DataFrame.from_records(step_records, columns=[
+        "mission_id", "step", "agent", "tool", "outcome", "status", "started_at",
+        "duration_seconds", "revision", "output_size", "scenario", "detected",
+    ])
+    steps = steps.astype({
+        "step": "int64",
+        "started_at": "float64",
+        "duration_seconds": "float64",
+        "output_size": "int64",
+        "revision": "Int64",
+        "detected": "boolean",
+    })
+    for column in ("agent", "tool", "outcome", "status"):
+        steps[column] = steps[column].astype("category")
+    return missions, steps
+
+
+def export_frames(missions: "pd.DataFrame", steps: "pd.DataFrame", export_dir: str,
+                  file_format: str = "parquet") -> List[str]:
+    """Write both tables to export_dir as Parquet or Feather (Arrow IPC) files."""
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}")
+    os.makedirs(export_dir, exist_ok=True)
+
+    paths = []
+    for name, frame in (("missions", missions), ("steps", steps)):
+        path = os.path.join(export_dir, f"{name}.{file_format}")
+        if file_format == "parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.reset_index(drop=True).to_feather(path)
+        paths.append(path)
+    return paths
+
+
+def agent_outcome_rates(steps: "pd.DataFrame") -> "pd.DataFrame":
+    """Per-agent action counts and success/skip/failure rates."""
+    import pandas as pd
+
+    rates = pd.crosstab(steps["agent"], steps["outcome"], normalize="index")
+    rates = rates.reindex(columns=["successful", "skipped", "failed"], fill_value=0.0)
+    rates.columns = [f"{outcome}_rate" for outcome in rates.columns]
+    rates.insert(0, "actions", steps.groupby("agent", observed=True).size())
+    return rates
+
+
+def scenario_detection_rates(steps: "pd.DataFrame") -> "pd.DataFrame":
+    """
+    Detection rate per attack scenario. Each Chronicler verdict is attributed to
+    the most recent attack step of the same mission.
+    """
+    ordered = steps.sort_values(["mission_id", "step"])
+    scenario = ordered.groupby("mission_id", sort=False)["scenario"].ffill()
+    verdicts = ordered.assign(scenario=scenario).dropna(subset=["detected", "scenario"])
+
+    grouped = verdicts.groupby("scenario")["detected"]
+    return grouped.agg(verdicts="count", detected="sum").assign(
+        detection_rate=lambda frame: frame["detected"] / frame["verdicts"]
+    ).sort_values("detection_rate", ascending=False)
+
+
+def latency_distribution(missions: "pd.DataFrame", steps: "pd.DataFrame",
+                         quantiles: Tuple[float, ...] = (0.5, 0.9, 0.95, 0.99)) -> Dict[str, "pd.DataFrame"]:
+    """Latency quantiles per mission status and step duration quantiles per agent."""
+    result = {}
+    if "latency_seconds" in missions:
+        result["mission_latency"] = (
+            missions.groupby("mission_status")["latency_seconds"].quantile(list(quantiles)).unstack()
+        )
+    result["step_duration"] = (
+        steps.dropna(subset=["duration_seconds"])
+        .groupby("agent", observed=True)["duration_seconds"].quantile(list(quantiles)).unstack()
+    )
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze Red Army batch results across missions.")
+    parser.add_argument("results", nargs="+", help="Batch runner result files (JSON Lines)")
+    parser.add_argument("--export-dir", default=None, help="Write missions/steps tables to this directory")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="parquet", help="Export file format")
+    args = parser.parse_args(argv)
+
+    missions, steps = build_frames(load_results(args.results))
+    print(f"Loaded {len(missions)} missions and {len(steps)} steps")
+
+    print("\n=== Mission outcomes ===")
+    print(missions["mission_status"].value_counts().to_string())
+    print("\n=== Agent outcome rates ===")
+    print(agent_outcome_rates(steps).to_string(float_format="{:.1%}".format))
+    print("\n=== Detection rate per scenario ===")
+    print(scenario_detection_rates(steps).to_string(float_format="{:.1%}".format))
+    for name, table in latency_distribution(missions, steps).items():
+        print(f"\n=== {name.replace('_', ' ').capitalize()} quantiles (s) ===")
+        print(table.to_string(float_format="{:.2f}".format))
+
+    if args.export_dir:
+        for path in export_frames(missions, steps, args.export_dir, args.format):
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
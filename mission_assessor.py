@@ -5,8 +5,44 @@ This module provides explainable mission assessment and generates detailed
 reports about what was executed and why conclusions were reached.
 """
 
-from typing import Dict, List, Tuple
+import io
+import json
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 from state import RedArmyState
+from mission_history import HistoryFold, MissionFolds, entry_agent, entry_summary
+from outcome_classifier import OutcomeClassifier
+
+REPORT_FORMATS = ("text", "jsonl")
+
+# Key objective indicators looked for in the history
+OBJECTIVE_KEYWORDS = (
+    "circuit breaker", "plc", "scada", "gridguardian",
+    "substation", "attack", "exploit", "vulnerability"
+)
+
+# Phrases behind the objective indicators (direct/stealth attack, PLC interaction)
+OBJECTIVE_FLAGS = ("direct", "evasion", "stealth", "plc")
+
+# Phrases that mark an entry with ✗ in the action history
+ICON_FAILURE_PHRASES = ("error", "failed")
+
+
+class MissionAggregate(HistoryFold):
+    """Running totals for one mission, updated once per appended history entry."""
+
+    __slots__ = ("agent_tasks", "task_outcomes", "agent_performance", "relevant_actions",
+                 "direct_attack_attempted", "stealth_attack_attempted", "plc_interaction", "status_icons")
+
+    def __init__(self):
+        super().__init__()
+        self.agent_tasks: Dict[str, List[str]] = {}
+        self.task_outcomes: Dict[str, List[str]] = {"successful": [], "skipped": [], "failed": []}
+        self.agent_performance: Dict[str, Dict] = {}
+        self.relevant_actions: List[str] = []
+        self.direct_attack_attempted = False
+        self.stealth_attack_attempted = False
+        self.plc_interaction = False
+        self.status_icons: List[str] = []
 
 
 class MissionAssessor:
@@ -32,6 +68,17 @@ class MissionAssessor:
             "timeout",
             "exception"
         ]
+        
+        # One compiled matcher classifies each entry in a single pass. Failures are
+        # keyed on the upper-case indicators: the lower-case phrases never matched
+        # the original `indicator in action.upper()` check, and counting them would
+        # flag successful outputs such as attack sequences with a "timeout" field.
+        # They are still recorded as phrase matches.
+        self.classifier = OutcomeClassifier(
+            failure_phrases=[indicator for indicator in self.failure_indicators if indicator.isupper()],
+            flag_phrases=[*self.success_indicators, *self.failure_indicators, *OBJECTIVE_KEYWORDS, *OBJECTIVE_FLAGS, *ICON_FAILURE_PHRASES],
+        )
+        self._aggregates = MissionFolds(MissionAggregate, self._observe_entry)
     
     def assess_mission_completion(self, state: RedArmyState) -> Dict:
         """
@@ -77,116 +124,97 @@ class MissionAssessor:
         
         return report
     
+    def observe(self, state: RedArmyState) -> "MissionAggregate":
+        """
+        Fold any history entries appended since the last call into the mission's
+        running aggregates. Each entry is classified exactly once, so calling this
+        after every node keeps assessment cost independent of history length.
+        """
+        return self._aggregates.observe(state)
+
+    def discard(self, mission_id: str) -> None:
+        """Drop the running aggregates of a finished mission."""
+        self._aggregates.discard(mission_id)
+
+    def _observe_entry(self, aggregate: "MissionAggregate", entry) -> None:
+        """Classify one history entry and update the aggregates."""
+        agent = entry_agent(entry)
+        summary = entry_summary(entry)
+        classification = self.classifier.classify(entry)
+        outcome = classification.outcome
+
+        aggregate.agent_tasks.setdefault(agent or "Unknown", []).append(summary)
+        aggregate.task_outcomes[outcome].append(summary)
+
+        if agent is not None:
+            stats = aggregate.agent_performance.get(agent)
+            if stats is None:
+                stats = aggregate.agent_performance[agent] = {
+                    "total_actions": 0,
+                    "successful_actions": 0,
+                    "skipped_actions": 0,
+                    "failed_actions": 0,
+                    "actions": []
+                }
+            stats["total_actions"] += 1
+            stats["actions"].append(summary)
+            stats[f"{outcome}_actions"] += 1
+
+        if classification.has_any(OBJECTIVE_KEYWORDS):
+            aggregate.relevant_actions.append(summary)
+        aggregate.direct_attack_attempted |= classification.has_any(("direct",))
+        aggregate.stealth_attack_attempted |= classification.has_any(("evasion", "stealth"))
+        aggregate.plc_interaction |= classification.has_any(("plc",))
+        aggregate.status_icons.append("⚠️" if outcome == "skipped" else "✗" if classification.has_any(ICON_FAILURE_PHRASES) else "✓")
+
     def _analyze_plan_execution(self, state: RedArmyState) -> Dict:
         """Analyze how well the plan was executed."""
+        aggregate = self.observe(state)
         total_tasks = len(state["plan"])
         completed_tasks = state["current_task_index"]
         
         execution_rate = completed_tasks / total_tasks if total_tasks > 0 else 0
-        
-        # Categorize tasks by agent
-        agent_tasks = {}
-        skipped_tasks = []
-        failed_tasks = []
-        successful_tasks = []
-        
-        for i, action in enumerate(state["history"]):
-            agent = action.split(":")[0] if ":" in action else "Unknown"
-            if agent not in agent_tasks:
-                agent_tasks[agent] = []
-            
-            agent_tasks[agent].append(action)
-            
-            # Categorize task outcomes
-            if "SKIPPED" in action:
-                skipped_tasks.append(action)
-            elif any(indicator in action.upper() for indicator in self.failure_indicators):
-                failed_tasks.append(action)
-            else:
-                successful_tasks.append(action)
+        outcomes = aggregate.task_outcomes
         
         return {
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
             "execution_rate": execution_rate,
-            "agent_distribution": agent_tasks,
-            "successful_tasks": len(successful_tasks),
-            "skipped_tasks": len(skipped_tasks),
-            "failed_tasks": len(failed_tasks),
-            "task_outcomes": {
-                "successful": successful_tasks,
-                "skipped": skipped_tasks,
-                "failed": failed_tasks
-            }
+            "agent_distribution": aggregate.agent_tasks,
+            "successful_tasks": len(outcomes["successful"]),
+            "skipped_tasks": len(outcomes["skipped"]),
+            "failed_tasks": len(outcomes["failed"]),
+            "task_outcomes": outcomes
         }
     
     def _analyze_agent_performance(self, state: RedArmyState) -> Dict:
         """Analyze individual agent performance."""
         agent_performance = {}
         
-        for action in state["history"]:
-            if ":" not in action:
-                continue
-                
-            agent = action.split(":")[0]
-            if agent not in agent_performance:
-                agent_performance[agent] = {
-                    "total_actions": 0,
-                    "successful_actions": 0,
-                    "skipped_actions": 0,
-                    "failed_actions": 0,
-                    "actions": []
-                }
-            
-            agent_performance[agent]["total_actions"] += 1
-            agent_performance[agent]["actions"].append(action)
-            
-            if "SKIPPED" in action:
-                agent_performance[agent]["skipped_actions"] += 1
-            elif any(indicator in action.upper() for indicator in self.failure_indicators):
-                agent_performance[agent]["failed_actions"] += 1
-            else:
-                agent_performance[agent]["successful_actions"] += 1
-        
-        # Calculate performance metrics
-        for agent, stats in agent_performance.items():
-            if stats["total_actions"] > 0:
-                stats["success_rate"] = stats["successful_actions"] / stats["total_actions"]
-                stats["skip_rate"] = stats["skipped_actions"] / stats["total_actions"]
-                stats["failure_rate"] = stats["failed_actions"] / stats["total_actions"]
+        for agent, stats in self.observe(state).agent_performance.items():
+            stats = dict(stats)
+            # Calculate performance metrics
+            stats["success_rate"] = stats["successful_actions"] / stats["total_actions"]
+            stats["skip_rate"] = stats["skipped_actions"] / stats["total_actions"]
+            stats["failure_rate"] = stats["failed_actions"] / stats["total_actions"]
+            agent_performance[agent] = stats
         
         return agent_performance
     
     def _analyze_objective_completion(self, state: RedArmyState) -> Dict:
         """Analyze how well the mission objective was met."""
-        objective = state["objective"]
-        history = state["history"]
-        
-        # Look for key objective indicators in the history
-        objective_keywords = [
-            "circuit breaker", "plc", "scada", "gridguardian", 
-            "substation", "attack", "exploit", "vulnerability"
-        ]
-        
-        relevant_actions = []
-        for action in history:
-            if any(keyword.lower() in action.lower() for keyword in objective_keywords):
-                relevant_actions.append(action)
-        
-        # Check if specific objective goals were mentioned/achieved
-        direct_attack_attempted = any("direct" in action.lower() for action in history)
-        stealth_attack_attempted = any("evasion" in action.lower() or "stealth" in action.lower() for action in history)
-        plc_interaction = any("plc" in action.lower() for action in history)
+        aggregate = self.observe(state)
+        history_length = aggregate.entries_seen
         
         return {
-            "objective": objective,
-            "relevant_actions": relevant_actions,
+            "objective": state["objective"],
+            "relevant_actions": aggregate.relevant_actions,
             "objective_indicators": {
-                "direct_attack_attempted": direct_attack_attempted,
-                "stealth_attack_attempted": stealth_attack_attempted,
-                "plc_interaction": plc_interaction
+                "direct_attack_attempted": aggregate.direct_attack_attempted,
+                "stealth_attack_attempted": aggregate.stealth_attack_attempted,
+                "plc_interaction": aggregate.plc_interaction
             },
-            "objective_alignment_score": len(relevant_actions) / len(history) if history else 0
+            "objective_alignment_score": len(aggregate.relevant_actions) / history_length if history_length else 0
         }
     
     def _determine_mission_status(self, execution_analysis: Dict, agent_analysis: Dict, 
@@ -255,8 +283,47 @@ class MissionAssessor:
     
     def generate_detailed_report(self, assessment: Dict, state: RedArmyState) -> str:
         """Generate a human-readable detailed report."""
+        buffer = io.StringIO()
+        self.write_report(assessment, state, buffer)
+        return buffer.getvalue().removesuffix("\n")
+    
+    def write_report(self, assessment: Dict, state: RedArmyState, sink: TextIO, report_format: str = "text",
+                     max_action_chars: Optional[int] = None, link_artifacts: bool = False) -> None:
+        """
+        Stream the assessment report to a file-like sink, one line at a time.
+        
+        Args:
+            assessment: Result of assess_mission_completion
+            state: The mission state the assessment was made from
+            sink: Any object with a write() method (sys.stdout, an open file, ...)
+            report_format: "text" for the emoji report, "jsonl" for one JSON object per line
+            max_action_chars: Truncate each action history entry to this many characters
+            link_artifacts: Reference out-of-line tool outputs by artifact ID
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{report_format}'. Use one of: {', '.join(REPORT_FORMATS)}")
         
-        report_lines = [
+        if report_format == "jsonl":
+            for record in self._report_records(assessment, state, max_action_chars, link_artifacts):
+                sink.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        else:
+            for line in self._report_lines(assessment, state, max_action_chars, link_artifacts):
+                sink.write(line + "\n")
+    
+    def _actions(self, state: RedArmyState, max_action_chars: Optional[int], link_artifacts: bool) -> Iterator[Tuple]:
+        """Yield (index, entry, status_icon, text, artifact_id) for the action history."""
+        status_icons = self.observe(state).status_icons
+        for i, (entry, status_icon) in enumerate(zip(state["history"], status_icons), 1):
+            text = entry_summary(entry)
+            if max_action_chars is not None and len(text) > max_action_chars:
+                text = f"{text[:max_action_chars]}... (+{len(text) - max_action_chars} chars)"
+            artifact_id = getattr(entry, "artifact_id", None) if link_artifacts else None
+            yield i, entry, status_icon, text, artifact_id
+    
+    def _report_lines(self, assessment: Dict, state: RedArmyState, max_action_chars: Optional[int],
+                      link_artifacts: bool) -> Iterator[str]:
+        """The human-readable report, line by line."""
+        yield from [
             "=" * 80,
             "🎯 RED ARMY MISSION ASSESSMENT REPORT",
             "=" * 80,
@@ -274,7 +341,7 @@ class MissionAssessor:
         
         # Plan execution analysis
         exec_analysis = assessment["detailed_analysis"]["plan_execution"]
-        report_lines.extend([
+        yield from [
             "📈 Plan Execution:",
             f"   • Total Tasks: {exec_analysis['total_tasks']}",
             f"   • Completed: {exec_analysis['completed_tasks']} ({exec_analysis['execution_rate']:.1%})",
@@ -282,59 +349,106 @@ class MissionAssessor:
             f"   • Skipped: {exec_analysis['skipped_tasks']}",
             f"   • Failed: {exec_analysis['failed_tasks']}",
             ""
-        ])
+        ]
         
         # Agent performance analysis
         agent_analysis = assessment["detailed_analysis"]["agent_performance"]
         if agent_analysis:
-            report_lines.append("👥 Agent Performance:")
+            yield "👥 Agent Performance:"
             for agent, stats in agent_analysis.items():
-                report_lines.extend([
+                yield from [
                     f"   • {agent}:",
                     f"     - Total Actions: {stats['total_actions']}",
                     f"     - Success Rate: {stats.get('success_rate', 0):.1%}",
                     f"     - Skip Rate: {stats.get('skip_rate', 0):.1%}",
                     f"     - Failure Rate: {stats.get('failure_rate', 0):.1%}",
-                ])
-            report_lines.append("")
+                ]
+            yield ""
         
         # Objective completion analysis
         obj_analysis = assessment["detailed_analysis"]["objective_completion"]
-        report_lines.extend([
+        yield from [
             "🎯 Objective Analysis:",
             f"   • Direct Attack Attempted: {'✓' if obj_analysis['objective_indicators']['direct_attack_attempted'] else '✗'}",
             f"   • Stealth Attack Attempted: {'✓' if obj_analysis['objective_indicators']['stealth_attack_attempted'] else '✗'}",
             f"   • PLC Interaction: {'✓' if obj_analysis['objective_indicators']['plc_interaction'] else '✗'}",
             f"   • Objective Alignment Score: {obj_analysis['objective_alignment_score']:.1%}",
             ""
-        ])
+        ]
         
         # Action history
         if state["history"]:
-            report_lines.extend([
+            yield from [
                 "📜 Action History:",
                 ""
-            ])
-            for i, action in enumerate(state["history"], 1):
-                status_icon = "✓" if "SKIPPED" not in action and not any(fail in action.upper() for fail in ["ERROR", "FAILED"]) else "⚠️" if "SKIPPED" in action else "✗"
-                report_lines.append(f"   {i}. {status_icon} {action}")
-            report_lines.append("")
+            ]
+            for i, _, status_icon, text, artifact_id in self._actions(state, max_action_chars, link_artifacts):
+                link = f" [artifact {artifact_id}]" if artifact_id else ""
+                yield f"   {i}. {status_icon} {text}{link}"
+            yield ""
         
         # Recommendations
         if assessment["recommendations"]:
-            report_lines.extend([
+            yield from [
                 "💡 RECOMMENDATIONS:",
                 ""
-            ])
+            ]
             for i, rec in enumerate(assessment["recommendations"], 1):
-                report_lines.append(f"   {i}. {rec}")
-            report_lines.append("")
+                yield f"   {i}. {rec}"
+            yield ""
         
-        report_lines.extend([
+        yield from [
             "=" * 80,
             f"📊 Plan Revisions: {state.get('revision_number', 0)}",
             f"🔄 Final Task Index: {state.get('current_task_index', 0)}/{len(state.get('plan', []))}",
             "=" * 80
-        ])
+        ]
+    
+    def _report_records(self, assessment: Dict, state: RedArmyState, max_action_chars: Optional[int],
+                        link_artifacts: bool) -> Iterator[Dict]:
+        """The machine-readable report: one compact record per section item."""
+        yield {
+            "type": "assessment",
+            "mission_id": state.get("mission_id"),
+            "objective": state["objective"],
+            "mission_status": assessment["mission_status"],
+            "confidence_score": assessment["confidence_score"],
+            "summary": assessment["summary"],
+            "revision_number": state.get("revision_number", 0),
+            "task_index": state.get("current_task_index", 0),
+            "plan_length": len(state.get("plan", [])),
+        }
+        
+        exec_analysis = assessment["detailed_analysis"]["plan_execution"]
+        yield {"type": "plan_execution", **{key: value for key, value in exec_analysis.items()
+                                             if key not in ("agent_distribution", "task_outcomes")}}
+        
+        for agent, stats in assessment["detailed_analysis"]["agent_performance"].items():
+            yield {"type": "agent", "agent": agent, **{key: value for key, value in stats.items() if key != "actions"}}
         
-        return "\n".join(report_lines)
\ No newline at end of file
+        obj_analysis = assessment["detailed_analysis"]["objective_completion"]
+        yield {
+            "type": "objective",
+            **obj_analysis["objective_indicators"],
+            "objective_alignment_score": obj_analysis["objective_alignment_score"],
+        }
+        
+        for i, entry, status_icon, text, artifact_id in self._actions(state, max_action_chars, link_artifacts):
+            yield {
+                "type": "action",
+                "index": i,
+                "agent": entry_agent(entry),
+                "tool": getattr(entry, "tool", None),
+                "status": getattr(entry, "status", None),
+                "failed": status_icon == "✗",
+                "skipped": status_icon == "⚠️",
+                "text": text,
+                "artifact_id": artifact_id,
+            }
+        
+        for i, rec in enumerate(assessment["recommendations"], 1):
+            yield {"type": "recommendation", "index": i, "text": rec}
+
+
+# Global mission assessor instance, shared by the router and the reporter
+mission_assessor = MissionAssessor()
@@ -0,0 +1,174 @@
+"""
+Compact mission history records.
+
+Each agent step appends one HistoryRecord to `RedArmyState.history` instead of
+a formatted string embedding the whole tool result. A record holds the agent,
+tool call, outcome status, timing and either the output itself (when short)
+or the ID of the full output in the artifact store plus a short preview. This
+keeps the per-step list merge in LangGraph cheap however verbose the tools are.
+
+Older code and tests still put plain "Agent: action -> result" strings in the
+history, so the `entry_*` helpers accept both.
+
+Consumers that summarize a running mission (the assessor's aggregates, the
+report builder's sections) fold each entry in exactly once, relying on the
+history being append-only; MissionFolds keeps those folds per mission.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+from artifact_store import artifact_store
+
+# Missions without a mission_id in their state share one fold
+DEFAULT_MISSION_ID = "default"
+
+# Folds are kept for this many missions (least recently used first out)
+MAX_TRACKED_MISSIONS = 64
+
+# Outputs up to this many characters are kept inline in the record
+INLINE_OUTPUT_LIMIT = 512
+
+# Length of the preview kept for outputs moved to the artifact store
+PREVIEW_LENGTH = 200
+
+
+def classify_status(result: Any) -> str:
+    """Outcome status of a node result: SKIPPED, ERROR or COMPLETED."""
+    text = str(result)
+    if text.startswith("SKIPPED"):
+        return "SKIPPED"
+    if text.startswith("ERROR"):
+        return "ERROR"
+    return "COMPLETED"
+
+
+class HistoryRecord:
+    """One executed plan step. The full output is fetched from the artifact store on demand."""
+
+    __slots__ = ("agent", "tool_call", "tool", "status", "started_at", "duration",
+                 "revision", "output_size", "artifact_id", "preview")
+
+    def __init__(self, agent: str, tool_call: str, output: Any, tool: Optional[str] = None,
+                 status: Optional[str] = None, started_at: Optional[float] = None,
+                 duration: float = 0.0, revision: int = 0):
+        output = str(output)
+        self.agent = agent
+        self.tool_call = tool_call
+        self.tool = tool
+        self.status = status or classify_status(output)
+        self.started_at = started_at if started_at is not None else time.time()
+        self.duration = duration
+        self.revision = revision
+        self.output_size = len(output)
+
+        if len(output) > INLINE_OUTPUT_LIMIT:
+            self.artifact_id = artifact_store.put(output)
+            self.preview = output[:PREVIEW_LENGTH] + "..."
+        else:
+            self.artifact_id = None
+            self.preview = output
+
+    @property
+    def output(self) -> str:
+        """The full tool output (loaded from the artifact store if it was stored out of line)."""
+        if self.artifact_id is None:
+            return self.preview
+        return artifact_store.get(self.artifact_id)
+
+    @property
+    def text(self) -> str:
+        """The entry in the legacy "Agent: tool_call -> output" form, with the full output."""
+        return f"{self.agent}: {self.tool_call} -> {self.output}"
+
+    def __str__(self) -> str:
+        return f"{self.agent}: {self.tool_call} -> {self.preview}"
+
+    __repr__ = __str__
+
+
+def record_step(agent: str, tool_call: str, result: Any, started_at: float,
+                tool: Optional[str] = None, revision: int = 0) -> HistoryRecord:
+    """Build the history record for a node that started executing at `started_at` (time.time())."""
+    return HistoryRecord(agent, tool_call, result, tool=tool, started_at=started_at,
+                         duration=time.time() - started_at, revision=revision)
+
+
+def entry_agent(entry: Any) -> Optional[str]:
+    """The agent of a history entry, or None for an untagged legacy string."""
+    if isinstance(entry, HistoryRecord):
+        return entry.agent
+    text = str(entry)
+    return text.split(":")[0] if ":" in text else None
+
+
+def entry_text(entry: Any) -> str:
+    """The full text of a history entry, including the complete tool output."""
+    if isinstance(entry, HistoryRecord):
+        return entry.text
+    return str(entry)
+
+
+def entry_summary(entry: Any) -> str:
+    """A short form of a history entry suitable for prompts and console reports."""
+    return str(entry)
+
+
+class HistoryFold:
+    """How far an incremental fold has read a mission's append-only history."""
+
+    __slots__ = ("entries_seen", "last_entry")
+
+    def __init__(self):
+        self.entries_seen = 0
+        self.last_entry = None
+
+    def extended_by(self, history: List) -> bool:
+        """True if `history` starts with the entries already folded in."""
+        if len(history) < self.entries_seen:
+            return False
+        return self.entries_seen == 0 or history[self.entries_seen - 1] is self.last_entry
+
+    def new_entries(self, history: List) -> List:
+        """The entries of `history` not folded in yet, which are now marked as seen."""
+        entries = history[self.entries_seen:]
+        self.entries_seen = len(history)
+        self.last_entry = history[-1] if history else None
+        return entries
+
+
+class MissionFolds:
+    """
+    One HistoryFold per mission ID, for the most recently observed missions.
+    `new_fold()` creates a mission's fold and `add(fold, entry)` folds in one entry.
+    """
+
+    def __init__(self, new_fold: Callable[[], HistoryFold], add: Callable[[Any, Any], None],
+                 max_missions: int = MAX_TRACKED_MISSIONS):
+        self._new_fold = new_fold
+        self._add = add
+        self._max_missions = max_missions
+        self._folds: "OrderedDict[str, HistoryFold]" = OrderedDict()
+
+    def observe(self, state: dict) -> HistoryFold:
+        """Fold any history entries appended since the last call into the mission's fold."""
+        mission_id = state.get("mission_id", DEFAULT_MISSION_ID)
+        history = state.get("history", [])
+
+        fold = self._folds.get(mission_id)
+        if fold is None or not fold.extended_by(history):
+            # New mission, or a state that does not extend the one we saw (e.g. a rerun)
+            fold = self._new_fold()
+            self._folds[mission_id] = fold
+            while len(self._folds) > self._max_missions:
+                self._folds.popitem(last=False)
+        else:
+            self._folds.move_to_end(mission_id)
+
+        for entry in fold.new_entries(history):
+            self._add(fold, entry)
+        return fold
+
+    def discard(self, mission_id: str) -> None:
+        """Drop the fold of a finished mission."""
+        self._folds.pop(mission_id, None)
@@ -0,0 +1,261 @@
+"""
+Unified mission timeline: attack steps merged with detector anomalies.
+
+Attack steps come from the mission history (Saboteur and Executioner steps),
+with execute_attack_scenario results expanded into their individual scenario
+steps. Anomalies come from the detector's AnomalyIndex. Both are already in
+time order, so heapq.merge streams them into one ordered sequence without
+materializing either side.
+
+While the merged stream is consumed, every step stays "open" for
+DETECTION_WINDOW_MINUTES: the first anomaly at or after its start gives its
+time to detect, and every anomaly inside the window counts as an alert for it.
+Averaging over the detected steps of a scenario gives its mean time to detect
+(MTTD). attack_window() gives the Chronicler the exact window to correlate
+instead of a guessed attack_start_time.
+"""
+
+import ast
+import heapq
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from anomaly_store import AnomalyIndex
+
+# How long after a step an anomaly still counts as detecting it
+DETECTION_WINDOW_MINUTES = 10
+
+# Agents whose steps act on the target
+ATTACK_AGENTS = ("Saboteur", "Executioner")
+
+# Tools whose output is an execution log of individually timed steps
+SCENARIO_TOOLS = ("execute_attack_scenario",)
+
+
+class StepEvent(NamedTuple):
+    """An attack step on the timeline."""
+    time: np.datetime64          # When the step started (datetime64[us], local time)
+    agent: str
+    label: str                   # Tool call, or the scenario step's description
+    scenario: Optional[str]      # Scenario name for scenario steps, else None
+    status: str
+
+
+class AnomalyEvent(NamedTuple):
+    """A detector anomaly on the timeline."""
+    time: np.datetime64
+    report_id: int
+    loading: float
+
+
+TimelineEvent = Union[StepEvent, AnomalyEvent]
+
+
+class StepDetection(NamedTuple):
+    """How the detector reacted to one step."""
+    step: StepEvent
+    time_to_detect: Optional[float]   # Seconds to the first anomaly within the window, None if undetected
+    alerts_in_window: int
+
+
+class ScenarioDetection(NamedTuple):
+    """Detection metrics of one scenario (or of the standalone steps, scenario None)."""
+    scenario: Optional[str]
+    steps: int
+    detected_steps: int
+    mean_time_to_detect: Optional[float]   # Seconds, over the detected steps
+
+
+class MissionTimeline(NamedTuple):
+    events: List[TimelineEvent]
+    steps: List[StepDetection]
+    scenarios: List[ScenarioDetection]
+    mean_time_to_detect: Optional[float]
+
+
+def _us(value: Any) -> np.datetime64:
+    return np.datetime64(value, "us")
+
+
+def steps_from_execution_log(output: str, agent: str = "Saboteur") -> List[StepEvent]:
+    """
+    Steps of an execute_attack_scenario result (the str() of its execution log).
+    Uses each step's 'started_at' when present; older logs only carry a
+    HH:MM:SS 'timestamp', dated from the scenario's start_time.
+    """
+    try:
+        log = ast.literal_eval(output)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return []
+    if not isinstance(log, dict) or not isinstance(log.get("steps_executed"), list):
+        return []
+
+    scenario = log.get("scenario")
+    try:
+        day = datetime.strptime(log.get("start_time", ""), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        day = None
+    steps, previous = [], None
+    for step in log["steps_executed"]:
+        try:
+            if step.get("started_at"):
+                when = datetime.fromisoformat(step["started_at"])
+            elif day is not None and step.get("timestamp"):
+                clock = datetime.strptime(step["timestamp"], "%H:%M:%S").time()
+                when = datetime.combine(day.date(), clock)
+                if previous is not None and when < previous:
+                    when += timedelta(days=1)   # The scenario ran past midnight
+            else:
+                continue
+        except (TypeError, ValueError):
+            continue
+        previous = when
+        steps.append(StepEvent(_us(when), agent, str(step.get("description", "")), scenario,
+                               str(step.get("status", ""))))
+    return steps
+
+
+def steps_from_history(history: Iterable[Any]) -> List[StepEvent]:
+    """Attack steps of a mission history, in time order. Entries without a start time are skipped."""
+    steps: List[StepEvent] = []
+    for entry in history:
+        agent = getattr(entry, "agent", None)
+        started_at = getattr(entry, "started_at", None)
+        if agent not in ATTACK_AGENTS or started_at is None:
+            continue
+        if entry.tool in SCENARIO_TOOLS:
+            scenario_steps = steps_from_execution_log(entry.output, agent)
+            if scenario_steps:
+                steps.extend(scenario_steps)
+                continue
+        steps.append(StepEvent(_us(datetime.fromtimestamp(started_at)), agent, entry.tool_call, None, entry.status))
+    steps.sort(key=lambda step: step.time)
+    return steps
+
+
+def iter_anomaly_events(index: AnomalyIndex, start: Optional[Any] = None,
+                        end: Optional[Any] = None) -> Iterator[AnomalyEvent]:
+    """Stream the indexed anomalies in [start, end] (default: all) in time order."""
+    arrays = index.arrays
+    lo = int(np.searchsorted(arrays.times, _us(start), side="left")) if start is not None else 0
+    hi = int(np.searchsorted(arrays.times, _us(end), side="right")) if end is not None else len(arrays.times)
+    for i in range(lo, hi):
+        yield AnomalyEvent(arrays.times[i], int(arrays.report_ids[i]), float(arrays.loadings[i]))
+
+
+def merge_events(steps: Iterable[StepEvent], anomalies: Iterable[AnomalyEvent]) -> Iterator[TimelineEvent]:
+    """Merge two time-ordered event streams. A step and an anomaly at the same instant yield the step first."""
+    return heapq.merge(steps, anomalies, key=lambda event: event.time)
+
+
+def detect_steps(events: Iterable[TimelineEvent],
+                 window_minutes: float = DETECTION_WINDOW_MINUTES) -> Iterator[StepDetection]:
+    """
+    Consume a merged timeline and yield each step's detection once its window
+    has closed (or the timeline ended), in step order.
+    """
+    window = np.timedelta64(int(window_minutes * 60 * 1e6), "us")
+    open_steps: Deque[List] = deque()   # [step, time_to_detect, alerts]
+
+    for event in events:
+        # Close the windows that ended before this event
+        while open_steps and open_steps[0][0].time + window < event.time:
+            step, time_to_detect, alerts = open_steps.popleft()
+            yield StepDetection(step, time_to_detect, alerts)
+
+        if isinstance(event, StepEvent):
+            open_steps.append([event, None, 0])
+            continue
+        for entry in open_steps:
+            if entry[1] is None:
+                entry[1] = (event.time - entry[0].time) / np.timedelta64(1, "s")
+            entry[2] += 1
+
+    for step, time_to_detect, alerts in open_steps:
+        yield StepDetection(step, time_to_detect, alerts)
+
+
+def summarize_scenarios(detections: Sequence[StepDetection]) -> List[ScenarioDetection]:
+    """Per-scenario detection rate and mean time to detect, in order of first appearance."""
+    groups: Dict[Optional[str], List[StepDetection]] = {}
+    for detection in detections:
+        groups.setdefault(detection.step.scenario, []).append(detection)
+    summaries = []
+    for scenario, group in groups.items():
+        latencies = [d.time_to_detect for d in group if d.time_to_detect is not None]
+        summaries.append(ScenarioDetection(scenario, len(group), len(latencies),
+                                           sum(latencies) / len(latencies) if latencies else None))
+    return summaries
+
+
+def build_timeline(history: Iterable[Any], index: AnomalyIndex,
+                   window_minutes: float = DETECTION_WINDOW_MINUTES,
+                   include_all_anomalies: bool = False) -> MissionTimeline:
+    """
+    Merge a mission's attack steps with the detector's anomalies and compute
+    detection latency per step and per scenario. Unless `include_all_anomalies`,
+    only anomalies from the first step to the end of the last step's window are
+    placed on the timeline.
+    """
+    steps = steps_from_history(history)
+    if include_all_anomalies or not steps:
+        anomalies = iter_anomaly_events(index) if include_all_anomalies else iter(())
+    else:
+        window = np.timedelta64(int(window_minutes * 60 * 1e6), "us")
+        anomalies = iter_anomaly_events(index, steps[0].time, steps[-1].time + window)
+
+    events: List[TimelineEvent] = []
+
+    def recorded(stream: Iterator[TimelineEvent]) -> Iterator[TimelineEvent]:
+        for event in stream:
+            events.append(event)
+            yield event
+
+    detections = list(detect_steps(recorded(merge_events(steps, anomalies)), window_minutes))
+    latencies = [d.time_to_detect for d in detections if d.time_to_detect is not None]
+    return MissionTimeline(events, detections, summarize_scenarios(detections),
+                           sum(latencies) / len(latencies) if latencies else None)
+
+
+def attack_window(history: Iterable[Any], now: Optional[datetime] = None,
+                  window_minutes: float = DETECTION_WINDOW_MINUTES) -> Optional[Tuple[str, int]]:
+    """
+    (attack_start_time, attack_duration_minutes) for analyze_gridguardian_logs:
+    from the first attack step of the mission until `now` plus the detection
+    window, or None when the mission has no timed attack steps yet.
+    """
+    steps = steps_from_history(history)
+    if not steps:
+        return None
+    start = steps[0].time.astype(datetime)
+    end = max(now or datetime.now(), steps[-1].time.astype(datetime)) + timedelta(minutes=window_minutes)
+    minutes = int(-(-(end - start).total_seconds() // 60))
+    return start.strftime("%Y-%m-%dT%H:%M:%S"), max(minutes, 1)
+
+
+def format_timeline(timeline: MissionTimeline, max_events: int = 50) -> str:
+    """Readable summary: per-scenario MTTD, then the first `max_events` events."""
+    def seconds(value: Optional[float]) -> str:
+        return f"{value:.1f}s" if value is not None else "undetected"
+
+    lines = [f"Mean time to detect: {seconds(timeline.mean_time_to_detect)}"]
+    for summary in timeline.scenarios:
+        lines.append(f"- {summary.scenario or 'Standalone steps'}: {summary.detected_steps}/{summary.steps} "
+                     f"steps detected, MTTD {seconds(summary.mean_time_to_detect)}")
+    detections = {id(d.step): d for d in timeline.steps}
+    for event in timeline.events[:max_events]:
+        stamp = str(event.time)[:19].replace("T", " ")
+        if isinstance(event, StepEvent):
+            detection = detections.get(id(event))
+            detail = (f" (detected after {seconds(detection.time_to_detect)}, {detection.alerts_in_window} alerts)"
+                      if detection and detection.time_to_detect is not None else " (undetected)")
+            lines.append(f"{stamp} STEP    {event.agent}: {event.label}{detail}")
+        else:
+            loading = f" {event.loading:.1f}% loading" if not np.isnan(event.loading) else ""
+            lines.append(f"{stamp} ANOMALY report {event.report_id}{loading}")
+    if max_events and len(timeline.events) > max_events:
+        lines.append(f"... {len(timeline.events) - max_events} more events")
+    return "\n".join(lines)
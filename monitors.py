@@ -0,0 +1,380 @@
+"""
+Concurrent analysis of several defensive monitors.
+
+A monitor is a named log source (see log_sources.open_log_source) with the
+parser that understands its output and a timeout, e.g. the GridGuardian
+power-flow anomaly detector, a network IDS and a Modbus audit log. All
+monitors are queried at once on a long-lived, bounded thread pool, so an
+analysis takes as long as the slowest monitor instead of the sum; a monitor
+that misses its deadline or fails is reported as unavailable without holding
+up the others. A read that outlives its deadline cannot be interrupted, so the
+next query of that monitor is queued behind it instead of starting a second
+read that would block on the same log cursor.
+
+Monitors are configured with RED_ARMY_MONITORS, a JSON list (or the path of a
+JSON file holding one):
+
+    [{"name": "power-flow", "parser": "gridguardian",
+      "source": "docker-api:anomaly_detector:/usr/src/app/logs/anomaly_detector.log"},
+     {"name": "network-ids", "parser": "suricata-eve",
+      "source": "docker-api:suricata:/var/log/suricata/eve.json", "timeout": 10},
+     {"name": "modbus-audit", "parser": "modbus-audit", "source": "docker-logs:modbus_audit"}]
+
+Parsers:
+    gridguardian   GridGuardian anomaly reports, read incrementally through log_reader
+    suricata-eve   Suricata EVE JSON lines; alert events, severity 1 (high) to 3 (low)
+    modbus-audit   "YYYY-MM-DD HH:MM:SS[.f] LEVEL message" lines at WARNING, ALERT or CRITICAL
+
+The Suricata and Modbus audit logs are tailed like the detector log: each
+source keeps a log_reader.LineCursor and the alerts parsed so far, so a query
+only parses the lines appended since the previous one (the first read starts
+at most MAX_INITIAL_BYTES before the end of the log).
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from anomaly_store import grade_severity, to_datetime64
+from log_reader import LineCursor, log_reader
+from log_sources import LogSource, open_log_source
+
+# Seconds a monitor may take before it is reported as unavailable
+DEFAULT_MONITOR_TIMEOUT = 30.0
+
+# Threads shared by all monitor queries
+MONITOR_WORKERS = int(os.getenv("RED_ARMY_MONITOR_WORKERS", "8"))
+
+# Alerts kept per monitor source (earliest dropped first)
+MAX_ALERTS_PER_SOURCE = 100000
+
+# Severity grades from least to most severe
+SEVERITY_ORDER = ("NONE", "LOW", "MODERATE", "HIGH", "CRITICAL")
+
+
+class MonitorError(ValueError):
+    """Raised for an invalid monitor configuration."""
+
+
+class Monitor(NamedTuple):
+    name: str
+    source: str                 # Log source spec
+    parser: str                 # Key in PARSERS
+    timeout: float = DEFAULT_MONITOR_TIMEOUT
+
+
+class MonitorFindings(NamedTuple):
+    """What one monitor flagged inside the attack window."""
+    alerts: int
+    first_alert: Optional[np.datetime64]
+    severity: str               # SEVERITY_ORDER grade; NONE without alerts
+    detail: str                 # Short summary for the verdict
+
+
+class MonitorResult(NamedTuple):
+    monitor: Monitor
+    status: str                 # "ok", "timeout" or "error"
+    findings: Optional[MonitorFindings]
+    elapsed: float              # Seconds
+    error: Optional[str] = None
+
+    @property
+    def detected(self) -> bool:
+        return self.findings is not None and self.findings.alerts > 0
+
+
+NO_FINDINGS = MonitorFindings(0, None, "NONE", "no alerts")
+
+
+# --- Parsers ---
+# Each takes the monitor's source and the [start, end] window (datetime64[us])
+# and returns its findings.
+
+class Alert(NamedTuple):
+    """One alert line of a monitor's log."""
+    time: np.datetime64
+    severity: str               # SEVERITY_ORDER grade
+    label: str                  # Signature or message
+
+
+class AlertLog:
+    """
+    Alerts parsed so far from one source, sorted by time so a window is found
+    by bisection (like AnomalyIndex), extended from a line cursor on every read.
+    """
+
+    def __init__(self, parse_line: Callable[[str], Optional[Alert]]):
+        self.parse_line = parse_line
+        self.cursor = LineCursor()
+        self.alerts: List[Alert] = []
+        self.times: List[np.datetime64] = []   # alert.time of each alert, for bisection
+
+    def _add(self, alert: Alert) -> None:
+        if not self.times or alert.time >= self.times[-1]:
+            self.alerts.append(alert)
+            self.times.append(alert.time)
+        else:
+            # Logged out of order (e.g. by several Suricata worker threads)
+            i = bisect.bisect_right(self.times, alert.time)
+            self.alerts.insert(i, alert)
+            self.times.insert(i, alert.time)
+
+    def read(self, source: LogSource, start: np.datetime64, end: np.datetime64) -> List[Alert]:
+        """Parse the lines appended since the last read, then return every alert in [start, end]."""
+        with self.cursor.lock:
+            lines, _, _ = self.cursor.advance(source)
+            for line in lines:
+                alert = self.parse_line(line)
+                if alert is not None:
+                    self._add(alert)
+            excess = len(self.alerts) - MAX_ALERTS_PER_SOURCE
+            if excess > 0:
+                del self.alerts[:excess], self.times[:excess]
+            return self.alerts[bisect.bisect_left(self.times, start):bisect.bisect_right(self.times, end)]
+
+
+_alert_logs: Dict[Tuple, AlertLog] = {}
+_alert_logs_lock = threading.Lock()
+
+
+def _alerts_in_window(parser: str, parse_line: Callable[[str], Optional[Alert]], source: LogSource,
+                      start: np.datetime64, end: np.datetime64) -> List[Alert]:
+    key = (parser, source.key)
+    with _alert_logs_lock:
+        alert_log = _alert_logs.get(key)
+        if alert_log is None:
+            alert_log = _alert_logs[key] = AlertLog(parse_line)
+    return alert_log.read(source, start, end)
+
+
+def _gridguardian(source: LogSource, start: np.datetime64, end: np.datetime64) -> MonitorFindings:
+    index = log_reader.read(source).index
+    reports = index.reports_in_window(start, end)
+    if not reports:
+        return NO_FINDINGS
+    stats = index.window_stats(start, end)
+    first = index.first_after(start)
+    peak = f", peak {stats.peak:.1f}% loading" if not np.isnan(stats.peak) else ""
+    return MonitorFindings(stats.count, first.time if first else None, grade_severity(stats),
+                           f"{len(reports)} anomaly report(s){peak}")
+
+
+# Suricata alert.severity: 1 is the most severe
+SURICATA_SEVERITY = {1: "HIGH", 2: "MODERATE", 3: "LOW"}
+
+
+def _suricata_time(stamp: str) -> np.datetime64:
+    # EVE timestamps carry a UTC offset (2025-09-17T18:52:40.009034+0000);
+    # the other monitors log naive local time
+    moment = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%f%z").astimezone().replace(tzinfo=None)
+    return np.datetime64(moment, "us")
+
+
+def _suricata_alert(line: str) -> Optional[Alert]:
+    if '"alert"' not in line:   # Skip flow, dns, stats... events without decoding them
+        return None
+    try:
+        event = json.loads(line)
+        if event.get("event_type") != "alert":
+            return None
+        alert = event.get("alert", {})
+        return Alert(_suricata_time(event["timestamp"]), SURICATA_SEVERITY.get(alert.get("severity"), "LOW"),
+                     alert.get("signature", "unknown signature"))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _suricata_eve(source: LogSource, start: np.datetime64, end: np.datetime64) -> MonitorFindings:
+    alerts = _alerts_in_window("suricata-eve", _suricata_alert, source, start, end)
+    if not alerts:
+        return NO_FINDINGS
+    signatures = Counter(alert.label for alert in alerts)
+    signature, hits = signatures.most_common(1)[0]
+    return MonitorFindings(len(alerts), min(alert.time for alert in alerts),
+                           max((alert.severity for alert in alerts), key=SEVERITY_ORDER.index),
+                           f"{len(signatures)} signature(s), most frequent '{signature}' ({hits}x)")
+
+
+MODBUS_AUDIT_PATTERN = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)\s+(?:-\s+)?(WARNING|ALERT|CRITICAL)\b[\s:-]*(.*)")
+MODBUS_AUDIT_SEVERITY = {"WARNING": "MODERATE", "ALERT": "HIGH", "CRITICAL": "CRITICAL"}
+
+
+def _modbus_alert(line: str) -> Optional[Alert]:
+    match = MODBUS_AUDIT_PATTERN.match(line)
+    if not match:
+        return None
+    stamp, level, message = match.groups()
+    try:
+        when = np.datetime64(stamp.replace(" ", "T").replace(",", "."), "us")
+    except ValueError:
+        return None
+    return Alert(when, MODBUS_AUDIT_SEVERITY[level], message.strip())
+
+
+def _modbus_audit(source: LogSource, start: np.datetime64, end: np.datetime64) -> MonitorFindings:
+    alerts = _alerts_in_window("modbus-audit", _modbus_alert, source, start, end)
+    if not alerts:
+        return NO_FINDINGS
+    first = min(alerts, key=lambda alert: alert.time)
+    return MonitorFindings(len(alerts), first.time,
+                           max((alert.severity for alert in alerts), key=SEVERITY_ORDER.index),
+                           f"first: {first.label}")
+
+
+PARSERS: Dict[str, Callable[[LogSource, np.datetime64, np.datetime64], MonitorFindings]] = {
+    "gridguardian": _gridguardian,
+    "suricata-eve": _suricata_eve,
+    "modbus-audit": _modbus_audit,
+}
+
+
+# --- Configuration ---
+
+def load_monitors(config: Optional[str], default_source: str) -> List[Monitor]:
+    """
+    Monitors from a JSON list or the path of a JSON file holding one. Without a
+    config, the GridGuardian detector at `default_source` is the only monitor.
+    """
+    if not config:
+        return [Monitor("gridguardian", default_source, "gridguardian")]
+    try:
+        if config.lstrip().startswith("["):
+            entries = json.loads(config)
+        else:
+            with open(config, encoding="utf-8") as f:
+                entries = json.load(f)
+    except (OSError, ValueError) as e:
+        raise MonitorError(f"Cannot load monitor configuration: {e}")
+
+    monitors = []
+    for entry in entries:
+        try:
+            monitor = Monitor(str(entry["name"]), str(entry["source"]), str(entry.get("parser", "gridguardian")),
+                              float(entry.get("timeout", DEFAULT_MONITOR_TIMEOUT)))
+        except (KeyError, TypeError, ValueError) as e:
+            raise MonitorError(f"Invalid monitor entry {entry!r}: {e}")
+        if monitor.parser not in PARSERS:
+            raise MonitorError(f"Monitor '{monitor.name}' uses unknown parser '{monitor.parser}'. "
+                               f"Available: {', '.join(PARSERS)}")
+        monitors.append(monitor)
+    if not monitors:
+        raise MonitorError("The monitor configuration lists no monitors")
+    return monitors
+
+
+def select_monitors(monitors: List[Monitor], names: Optional[str]) -> List[Monitor]:
+    """The monitors named in a comma-separated list (all when `names` is empty)."""
+    wanted = [name.strip() for name in (names or "").split(",") if name.strip()]
+    if not wanted:
+        return monitors
+    known = {monitor.name: monitor for monitor in monitors}
+    unknown = [name for name in wanted if name not in known]
+    if unknown:
+        raise MonitorError(f"Unknown monitor(s) {', '.join(unknown)}. Configured: {', '.join(known)}")
+    return [known[name] for name in wanted]
+
+
+# --- Analysis ---
+
+def _analyze(monitor: Monitor, start: np.datetime64, end: np.datetime64):
+    started = time.perf_counter()
+    findings = PARSERS[monitor.parser](open_log_source(monitor.source), start, end)
+    return findings, time.perf_counter() - started
+
+
+_monitor_pool = None
+_latest_reads: Dict[Tuple[str, str, str], Future] = {}   # Most recent read per (name, source, parser)
+_reads_lock = threading.Lock()
+
+
+def _relay(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def _submit(monitor: Monitor, start: np.datetime64, end: np.datetime64) -> Future:
+    """Start a read of `monitor`, or queue it behind its previous read if that is still running."""
+    global _monitor_pool
+    with _reads_lock:
+        if _monitor_pool is None:
+            _monitor_pool = ThreadPoolExecutor(max_workers=MONITOR_WORKERS, thread_name_prefix="monitor")
+        key = (monitor.name, monitor.source, monitor.parser)
+        previous = _latest_reads.get(key)
+        if previous is None or previous.done():
+            future = _monitor_pool.submit(_analyze, monitor, start, end)
+        else:
+            # No thread waits for the running read: this one is submitted when it finishes
+            future = Future()
+
+            def start_next(_):
+                read = _monitor_pool.submit(_analyze, monitor, start, end)
+                read.add_done_callback(lambda done: _relay(done, future))
+
+            previous.add_done_callback(start_next)
+        _latest_reads[key] = future
+    return future
+
+
+def analyze_monitors(monitors: Sequence[Monitor], start, end) -> List[MonitorResult]:
+    """
+    Query every monitor concurrently for alerts in [start, end]. Each gets
+    its own deadline from the shared start; results keep the monitors' order.
+    """
+    start, end = to_datetime64(start), to_datetime64(end)
+    started = time.monotonic()
+    futures = [_submit(monitor, start, end) for monitor in monitors]
+    results = []
+    for monitor, future in zip(monitors, futures):
+        try:
+            findings, elapsed = future.result(timeout=max(started + monitor.timeout - time.monotonic(), 0))
+            results.append(MonitorResult(monitor, "ok", findings, elapsed))
+        except FuturesTimeout:
+            # The read carries on in the pool; the monitor's next query waits for it
+            results.append(MonitorResult(monitor, "timeout", None, monitor.timeout,
+                                         f"no answer within {monitor.timeout:g}s"))
+        except Exception as e:
+            results.append(MonitorResult(monitor, "error", None, time.monotonic() - started, str(e)))
+    return results
+
+
+def format_verdict(results: Sequence[MonitorResult]) -> str:
+    """One verdict for all monitors, attributing every detection to its monitor."""
+    detected = [r for r in results if r.detected]
+    unavailable = [r for r in results if r.status != "ok"]
+    lines = []
+    for result in results:
+        if result.status != "ok":
+            lines.append(f"- {result.monitor.name}: UNAVAILABLE ({result.status}: {result.error})")
+        elif result.detected:
+            findings = result.findings
+            first = str(findings.first_alert)[:19].replace("T", " ") if findings.first_alert is not None else "?"
+            lines.append(f"- {result.monitor.name}: DETECTED, {findings.alerts} alert(s) from {first}, "
+                         f"severity {findings.severity} ({findings.detail}) [{result.elapsed:.2f}s]")
+        else:
+            lines.append(f"- {result.monitor.name}: no alerts [{result.elapsed:.2f}s]")
+
+    if len(unavailable) == len(results):
+        return "Analysis Error: No defensive monitor could be read.\n" + "\n".join(lines)
+    if detected:
+        severity = max((r.findings.severity for r in detected), key=SEVERITY_ORDER.index)
+        names = ", ".join(r.monitor.name for r in detected)
+        headline = (f"Analysis: FAILURE. {len(detected)} of {len(results)} defensive monitor(s) detected the "
+                    f"attack ({names}). The attack was likely detected. Severity: {severity}.")
+    else:
+        headline = (f"Analysis: SUCCESS. None of the {len(results) - len(unavailable)} readable defensive "
+                    f"monitor(s) raised alerts in the attack timeframe.")
+        if unavailable:
+            headline += f" {len(unavailable)} monitor(s) could not be read, so detection cannot be ruled out."
+    return headline + "\n" + "\n".join(lines)
@@ -0,0 +1,119 @@
+"""
+Single-pass outcome classifier for mission history entries.
+
+All indicator phrases (success, failure, objective keywords) are compiled into
+one regular expression built as a prefix trie, so classifying an entry costs a
+single lower-casing and a single scan of its text no matter how many phrases
+are tracked. Results are cached per entry: a HistoryRecord is keyed by its
+artifact ID (or inline output), so large outputs are neither re-fetched nor
+re-scanned when the same entry is assessed again.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable
+
+from mission_history import HistoryRecord, entry_text
+
+# Results are cached for this many distinct entries
+CACHE_SIZE = 4096
+
+# Skips are flagged by the nodes with an exact "SKIPPED:" prefix, so this one
+# marker is matched case-sensitively.
+SKIP_MARKER = "SKIPPED"
+
+
+def trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a prefix trie, e.g. "fail(?:ed|ure)".
+    Shared prefixes are only tried once, and the longest phrase at a position wins.
+    """
+    root: Dict = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(root)
+
+
+class EntryClassification:
+    """Outcome and matched phrases of one history entry."""
+
+    __slots__ = ("outcome", "matches")
+
+    def __init__(self, outcome: str, matches: FrozenSet[str]):
+        self.outcome = outcome   # "successful", "skipped" or "failed"
+        self.matches = matches   # Lower-cased phrases found in the entry
+
+    def has_any(self, phrases: Iterable[str]) -> bool:
+        return not self.matches.isdisjoint(phrases)
+
+    def __repr__(self) -> str:
+        return f"EntryClassification({self.outcome!r}, {sorted(self.matches)!r})"
+
+
+class OutcomeClassifier:
+    """Classifies history entries into success/skip/failure plus phrase flags in one pass."""
+
+    def __init__(self, failure_phrases: Iterable[str], flag_phrases: Iterable[str] = ()):
+        self.failure_phrases = frozenset(phrase.lower() for phrase in failure_phrases)
+        phrases = self.failure_phrases | {phrase.lower() for phrase in flag_phrases} | {SKIP_MARKER.lower()}
+
+        # A match also implies every shorter phrase it contains ("attack completed" -> "attack")
+        self._implied = {
+            phrase: frozenset(other for other in phrases if other in phrase)
+            for phrase in phrases
+        }
+        self._pattern = re.compile(trie_pattern(phrases))
+        self._cache: "OrderedDict[object, EntryClassification]" = OrderedDict()
+
+    def classify_text(self, text: str) -> EntryClassification:
+        """Classify raw entry text (uncached)."""
+        lowered = text.lower()
+        same_offsets = len(lowered) == len(text)
+        matches = set()
+        skipped = False
+
+        for match in self._pattern.finditer(lowered):
+            phrase = match.group()
+            matches |= self._implied[phrase]
+            if phrase == "skipped" and not skipped:
+                skipped = text.startswith(SKIP_MARKER, match.start()) if same_offsets else SKIP_MARKER in text
+
+        if skipped:
+            outcome = "skipped"
+        elif not self.failure_phrases.isdisjoint(matches):
+            outcome = "failed"
+        else:
+            outcome = "successful"
+        return EntryClassification(outcome, frozenset(matches))
+
+    def classify(self, entry) -> EntryClassification:
+        """Classify a history entry (HistoryRecord or legacy string), using the cache."""
+        key = self._cache_key(entry)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+
+        result = self.classify_text(entry_text(entry))
+        self._cache[key] = result
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _cache_key(entry) -> object:
+        if isinstance(entry, HistoryRecord):
+            return (entry.agent, entry.tool_call, entry.artifact_id or entry.preview)
+        # str caches its own hash, so repeated lookups of the same string are O(1)
+        return str(entry)
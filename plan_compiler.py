@@ -0,0 +1,188 @@
+"""
+Plan compiler for the Red Army system.
+
+Runs right after the Red Commander. Every step of the plan is parsed once with
+the AST-based `utils.parse_tool_call`, bound to the tool's argument schema from
+the tool registry and checked for unresolved placeholders, unknown tools,
+tools the agent does not own and unknown MITRE techniques. The typed steps are
+cached in the state (`compiled_plan`) so the agent nodes never re-parse tool
+call strings, and all errors go back to the Commander in a single round trip
+instead of surfacing one at a time as the router reaches each step.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from state import RedArmyState
+from tool_registry import tool_registry, PLAN_AGENTS, ToolArgumentError
+from utils import parse_tool_call, has_unresolved_placeholders
+
+# How many times the Commander may be asked to fix a rejected plan. After that
+# the plan runs as is and invalid steps report SKIPPED/ERROR when reached.
+MAX_PLAN_REVISIONS = 3
+
+# Arguments filled in from the state at execution time rather than by the plan.
+# The Executioner runs the sequence built by the previous Saboteur task.
+STATE_ARGUMENTS = {
+    "execute_evasion_sequence": {"sequence_plan_str": "task_output"},
+}
+
+_AGENTS = {agent.lower(): agent for agent in PLAN_AGENTS}
+
+
+class CompiledStep(NamedTuple):
+    """A plan step parsed and validated once by the plan compiler."""
+    index: int
+    agent: str
+    tool_call: str
+    tool: Optional[str]                 # Registered tool to run (None for technique-only steps)
+    args: Dict[str, Any]                # Arguments coerced against the tool's schema
+    technique_id: Optional[str] = None  # MITRE technique resolved by the Saboteur at run time
+    unresolved: bool = False            # Step still contains <placeholders>
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def describe_error(self) -> str:
+        return f"Step {self.index + 1} ({self.agent}: {self.tool_call}): {self.error}"
+
+
+def _technique_catalog() -> Dict[str, Any]:
+    from technique_catalog import technique_catalog
+
+    return technique_catalog.techniques
+
+
+def _bind_arguments(spec, positional: Tuple, keywords: Dict[str, Any]) -> Dict[str, Any]:
+    """Bind positional arguments to parameter names in the tool's signature order."""
+    names = list(spec.arguments)
+    if len(positional) > len(names):
+        raise ToolArgumentError(
+            f"{spec.name} takes {len(names)} argument(s) but {len(positional)} were given; expected {spec.signature()}"
+        )
+    args = dict(zip(names, positional))
+    for name, value in keywords.items():
+        if name in args:
+            raise ToolArgumentError(f"{spec.name} got multiple values for argument '{name}'")
+        args[name] = value
+    return args
+
+
+def compile_step(index: int, task: Dict[str, Any], default_agent: str = "", techniques=None) -> CompiledStep:
+    """
+    Parse and validate a single plan step.
+
+    Args:
+        index: Position of the step in the plan
+        task: The plan step ({"agent", "tool_call", ...})
+        default_agent: Agent to assume when the step does not name one
+        techniques: MITRE technique catalog (loaded on demand if None)
+
+    Returns:
+        CompiledStep; never raises. Problems are recorded in `error`.
+    """
+    tool_call = task.get("tool_call", "")
+    agent = _AGENTS.get(str(task.get("agent") or default_agent).lower(), task.get("agent") or default_agent)
+
+    def rejected(message: str, **fields) -> CompiledStep:
+        return CompiledStep(index, agent, tool_call, None, {}, error=message, **fields)
+
+    if agent not in PLAN_AGENTS:
+        return rejected(f"Unknown agent '{agent}'. Use one of: {', '.join(PLAN_AGENTS)}")
+
+    if has_unresolved_placeholders(tool_call):
+        return rejected("Tool call contains unresolved placeholders", unresolved=True)
+
+    try:
+        func_name, positional, keywords = parse_tool_call(tool_call)
+    except ValueError as e:
+        return rejected(str(e))
+
+    technique_id = None
+    if agent == "Saboteur":
+        from agents.saboteur import extract_technique_id
+
+        technique_id = extract_technique_id(tool_call)
+
+    if technique_id:
+        techniques = _technique_catalog() if techniques is None else techniques
+        technique = techniques.get(technique_id)
+        if technique is None:
+            return rejected(f"Unknown MITRE technique {technique_id}", technique_id=technique_id)
+        if not technique.get("mapped_functions"):
+            return rejected(f"No functions mapped for MITRE technique {technique_id}", technique_id=technique_id)
+        if func_name not in tool_registry:
+            # The Saboteur picks the function at run time; arguments are checked against it then.
+            if positional:
+                return rejected("MITRE technique calls take keyword arguments only", technique_id=technique_id)
+            return CompiledStep(index, agent, tool_call, None, keywords, technique_id=technique_id)
+
+    try:
+        spec = tool_registry.resolve(agent, func_name)
+        args = _bind_arguments(spec, positional, keywords)
+        injected = STATE_ARGUMENTS.get(func_name, {})
+        args = spec.validate({**args, **{name: "" for name in injected}}, drop_unknown=bool(technique_id))
+        for name in injected:
+            args.pop(name)
+    except ValueError as e:
+        return rejected(str(e), technique_id=technique_id)
+
+    return CompiledStep(index, agent, tool_call, func_name, args, technique_id=technique_id)
+
+
+def compile_plan(plan: List[Dict[str, Any]]) -> Tuple[List[CompiledStep], List[str]]:
+    """
+    Compile every step of a plan.
+
+    Returns:
+        Tuple of (compiled_steps, error_messages)
+    """
+    techniques = None
+    steps = []
+    for index, task in enumerate(plan):
+        if techniques is None and str(task.get("agent", "")).lower() == "saboteur":
+            techniques = _technique_catalog()  # Loaded once per plan
+        steps.append(compile_step(index, task, techniques=techniques))
+    return steps, [step.describe_error() for step in steps if not step.ok]
+
+
+def current_step(state: RedArmyState, agent: str) -> CompiledStep:
+    """
+    The compiled step for the current task. Falls back to compiling just this
+    step when the state was not produced by the plan compiler (e.g. in tests).
+    """
+    index = state["current_task_index"]
+    task = state["plan"][index]
+    compiled = state.get("compiled_plan") or []
+    if index < len(compiled) and compiled[index].tool_call == task.get("tool_call"):
+        return compiled[index]
+    return compile_step(index, task, default_agent=agent)
+
+
+def plan_compiler_node(state: RedArmyState) -> dict:
+    """Compile and validate the Commander's plan before any step executes."""
+    print("--- AGENT: Plan Compiler ---")
+    steps, errors = compile_plan(state["plan"])
+
+    update = {
+        "compiled_plan": steps,
+        "plan_errors": errors,
+        "current_task_index": 0,
+    }
+
+    if not errors:
+        print(f"--- PLAN COMPILER: All {len(steps)} steps validated ---")
+        return update
+
+    print(f"--- PLAN COMPILER: {len(errors)} of {len(steps)} steps rejected ---")
+    for error in errors:
+        print(f"    {error}")
+
+    if state.get("revision_number", 0) < MAX_PLAN_REVISIONS:
+        update["feedback"] = (
+            f"PLAN REJECTED: {len(errors)} step(s) are invalid and must be fixed before execution. "
+            "Use only the listed tools with literal argument values and no <placeholders>.\n"
+            + "\n".join(errors)
+        )
+    return update
+
@@ -4,23 +4,94 @@ This service provides document analysis capabilities to all agents.
 """
 
 import os
-from typing import Optional, Any
+import importlib.util
+from typing import Any, List, Optional
+from utils import load_environment
 
-# RAG imports
-RAG_AVAILABLE = False
-try:
+# RAG dependencies are heavy (langchain, FAISS, Gemini clients), so only check
+# that they are installed here and import them when the service is initialized.
+RAG_DEPENDENCIES = ("langchain_community", "langchain_core", "langchain_google_genai", "langchain_text_splitters")
+RAG_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in RAG_DEPENDENCIES)
+
+DEFAULT_DOCUMENT = "RED_TEAM_ATTACK_GUIDE.md"
+EMBEDDING_MODEL = "models/embedding-001"
+
+
+def _load_chunks(document_path: str) -> Optional[List[Any]]:
+    """Load the document and split it into header-aware chunks, or None if it is missing."""
     from langchain_community.document_loaders import TextLoader
-    from langchain_community.vectorstores import FAISS
-    from langchain_google_genai import GoogleGenerativeAIEmbeddings
     from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain_core.prompts import ChatPromptTemplate
-    from langchain_core.output_parsers import StrOutputParser
-    from langchain_core.runnables import RunnablePassthrough
-    RAG_AVAILABLE = True
-except ImportError as e:
-    print(f"RAG dependencies not available: {e}")
-    RAG_AVAILABLE = False
+
+    # Get the document path
+    if not os.path.isabs(document_path):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        doc_path = os.path.join(current_dir, document_path)
+    else:
+        doc_path = document_path
+        
+    if not os.path.exists(doc_path):
+        print(f"Document not found at {doc_path}")
+        return None
+        
+    print(f"Initializing RAG system with document: {doc_path}")
+    
+    # Load and split document
+    loader = TextLoader(doc_path, encoding='utf-8')
+    documents = loader.load()
+    
+    # Split by markdown headers first
+    headers_to_split_on = [
+        ("#", "Header 1"),
+        ("##", "Header 2"), 
+        ("###", "Header 3"),
+        ("####", "Header 4"),
+    ]
+    
+    markdown_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers_to_split_on)
+    md_header_splits = markdown_splitter.split_text(documents[0].page_content)
+    
+    # Further split into smaller chunks
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", " ", ""]
+    )
+    
+    final_splits = text_splitter.split_documents(md_header_splits)
+    print(f"Created {len(final_splits)} document chunks")
+    return final_splits
+
+
+def build_index(index_path: str, document_path: str = DEFAULT_DOCUMENT) -> bool:
+    """
+    Embed the document once and save its FAISS vector index to index_path, for
+    RAGService.initialize(index_path=...) to load. The embedding client talks
+    gRPC, so callers that fork afterwards run this in a spawned process.
+    """
+    if not RAG_AVAILABLE:
+        print("RAG dependencies not available")
+        return False
+
+    try:
+        from langchain_community.vectorstores import FAISS
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        load_environment()
+        if not os.getenv("GOOGLE_API_KEY"):
+            print("GOOGLE_API_KEY environment variable not set")
+            return False
+
+        chunks = _load_chunks(document_path)
+        if chunks is None:
+            return False
+        print("Creating FAISS vector store...")
+        FAISS.from_documents(chunks, GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)).save_local(index_path)
+        print(f"FAISS vector store saved to {index_path}")
+        return True
+
+    except Exception as e:
+        print(f"Failed to build RAG index: {e}")
+        return False
 
 
 class RAGService:
@@ -29,10 +100,14 @@ class RAGService:
     def __init__(self):
         self.vector_store: Optional[Any] = None
         self.rag_chain: Optional[Any] = None
+        self.index_path: Optional[str] = None
         self.initialized = False
         
-    def initialize(self, document_path: str = "RED_TEAM_ATTACK_GUIDE.md") -> bool:
-        """Initialize the RAG system with the specified document."""
+    def initialize(self, document_path: str = DEFAULT_DOCUMENT, index_path: Optional[str] = None) -> bool:
+        """
+        Initialize the RAG system with the specified document, or with the
+        vector index build_index() saved to index_path (no embedding pass).
+        """
         if not RAG_AVAILABLE:
             print("RAG dependencies not available")
             return False
@@ -40,67 +115,43 @@ class RAGService:
         if self.initialized:
             return True  # Already initialized
             
+        try:
+            from langchain_community.vectorstores import FAISS
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            from langchain_core.prompts import ChatPromptTemplate
+            from langchain_core.output_parsers import StrOutputParser
+            from langchain_core.runnables import RunnablePassthrough
+        except ImportError as e:
+            print(f"RAG dependencies not available: {e}")
+            return False
+
         try:
             # Check for API key
+            load_environment()
             api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                try:
-                    from dotenv import load_dotenv
-                    load_dotenv()
-                    api_key = os.getenv("GOOGLE_API_KEY")
-                except:
-                    pass
                     
             if not api_key:
                 print("GOOGLE_API_KEY environment variable not set")
                 return False
                 
-            # Get the document path
-            if not os.path.isabs(document_path):
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                doc_path = os.path.join(current_dir, document_path)
-            else:
-                doc_path = document_path
-                
-            if not os.path.exists(doc_path):
-                print(f"Document not found at {doc_path}")
-                return False
-                
-            print(f"Initializing RAG system with document: {doc_path}")
-            
-            # Load and split document
-            loader = TextLoader(doc_path, encoding='utf-8')
-            documents = loader.load()
-            
-            # Split by markdown headers first
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"), 
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-            ]
-            
-            markdown_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers_to_split_on)
-            md_header_splits = markdown_splitter.split_text(documents[0].page_content)
-            
-            # Further split into smaller chunks
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                separators=["\n\n", "\n", " ", ""]
-            )
-            
-            final_splits = text_splitter.split_documents(md_header_splits)
-            print(f"Created {len(final_splits)} document chunks")
-            
-            # Initialize embeddings
+            # Initialize embeddings (only queries are embedded when loading a saved index)
             embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/embedding-001"
+                model=EMBEDDING_MODEL
             )
             
-            # Create vector store
-            print("Creating FAISS vector store...")
-            self.vector_store = FAISS.from_documents(final_splits, embeddings)
+            index_path = index_path or self.index_path
+            if index_path:
+                print(f"Loading FAISS vector store from {index_path}")
+                # Only load indexes build_index() wrote; the docstore is pickled
+                self.vector_store = FAISS.load_local(index_path, embeddings, allow_dangerous_deserialization=True)
+                self.index_path = index_path
+            else:
+                chunks = _load_chunks(document_path)
+                if chunks is None:
+                    return False
+                print("Creating FAISS vector store...")
+                self.vector_store = FAISS.from_documents(chunks, embeddings)
             
             # Initialize the LLM
             llm = ChatGoogleGenerativeAI(
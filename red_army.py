@@ -1,26 +1,43 @@
 # red_army.py
-
-from langgraph.graph import StateGraph, END
+#
+# Importing this module has no side effects: LangGraph, the agent nodes (and
+# through them langchain/Gemini) are only loaded when the graph is first built,
+# and the RAG index is only built by initialize_rag() or on the first query.
+
+import functools
+import os
+import sys
+import uuid
 from state import RedArmyState
-from agents.commander import red_commander_node
-from agents.infiltrator import infiltrator_node
-from agents.saboteur import saboteur_node
-from agents.executioner import executioner_node
-from agents.chronicler import chronicler_node
-from agents.reporter import reporting_node
-from mission_assessor import MissionAssessor
-from rag_service import rag_service
-
-# Initialize the mission assessor
-mission_assessor = MissionAssessor()
-
-# Initialize the RAG service for document analysis
-print("--- Initializing RAG Service for Document Analysis ---")
-rag_initialized = rag_service.initialize()
-if rag_initialized:
-    print("--- RAG Service: Successfully initialized ---")
-else:
-    print("--- RAG Service: Initialization failed, falling back to simple text search ---")
+from mission_assessor import mission_assessor
+from report_builder import report_builder
+from plan_compiler import plan_compiler_node, MAX_PLAN_REVISIONS
+
+# The full assessment report is only rendered when asked for; the router
+# otherwise prints a one-line status from the running aggregates.
+DETAILED_REPORT = os.getenv("RED_ARMY_DETAILED_REPORT", "").lower() in ("1", "true", "yes")
+
+# The report is streamed to stdout as "text" or compact "jsonl"; long actions are
+# truncated and large tool outputs are referenced by artifact ID.
+REPORT_FORMAT = os.getenv("RED_ARMY_REPORT_FORMAT", "text")
+REPORT_MAX_ACTION_CHARS = int(os.getenv("RED_ARMY_REPORT_MAX_ACTION_CHARS", "300"))
+
+# Tail the detector log during the mission and react to detections as they
+# happen (see log_watcher; RED_ARMY_ON_DETECTION picks replan/abort/continue).
+WATCH_DETECTOR = os.getenv("RED_ARMY_WATCH", "").lower() in ("1", "true", "yes")
+
+
+def initialize_rag(index_path: str = None) -> bool:
+    """Initialize the RAG service for document analysis, from a prebuilt vector index if given."""
+    from rag_service import rag_service
+
+    print("--- Initializing RAG Service for Document Analysis ---")
+    rag_initialized = rag_service.initialize(index_path=index_path)
+    if rag_initialized:
+        print("--- RAG Service: Successfully initialized ---")
+    else:
+        print("--- RAG Service: Initialization failed, falling back to simple text search ---")
+    return rag_initialized
 
 # --- Define the Graph's Routing Logic ---
 
@@ -29,19 +46,33 @@ def agent_router(state: RedArmyState) -> str:
     This is the conditional router that directs the workflow to the correct agent
     based on the current step in the plan.
     """
+    # Fold the latest history entries into the running mission assessment
+    # and into the report sections, so the Reporter only has to format them
+    mission_assessor.observe(state)
+    report_builder.observe(state)
+
+    # A detection published by the log watcher is handled before anything else
+    from log_watcher import detection_pending
+    if detection_pending(state):
+        print("--- ROUTER: Log watcher reported a detection. ---")
+        return "detection"
+
     # First, check if the plan is complete.
     if state["current_task_index"] >= len(state["plan"]):
         print("--- ROUTER: Plan complete. ---")
         
-        # Generate comprehensive mission assessment report
-        print("\n" + "=" * 50)
-        print("GENERATING MISSION ASSESSMENT REPORT...")
-        print("=" * 50)
-        
         assessment = mission_assessor.assess_mission_completion(state)
-        detailed_report = mission_assessor.generate_detailed_report(assessment, state)
         
-        print(detailed_report)
+        if DETAILED_REPORT:
+            # Stream the comprehensive mission assessment report
+            if REPORT_FORMAT == "text":
+                print("\n" + "=" * 50)
+                print("GENERATING MISSION ASSESSMENT REPORT...")
+                print("=" * 50)
+            mission_assessor.write_report(assessment, state, sys.stdout, report_format=REPORT_FORMAT,
+                                          max_action_chars=REPORT_MAX_ACTION_CHARS, link_artifacts=True)
+        else:
+            print(f"--- ROUTER: Assessment: {assessment['summary']} (set RED_ARMY_DETAILED_REPORT=1 for the full report) ---")
         
         # If the last action failed, loop back to the commander to replan.
         if assessment["mission_status"] in ["FAILED", "INCOMPLETE"] and "FAILURE" in state.get("feedback", ""):
@@ -59,70 +90,159 @@ def agent_router(state: RedArmyState) -> str:
     return next_agent
 
 
+def plan_router(state: RedArmyState) -> str:
+    """
+    Runs after the plan compiler. A rejected plan goes back to the Commander
+    (up to MAX_PLAN_REVISIONS times); a valid plan starts executing.
+    """
+    if state.get("plan_errors") and state.get("revision_number", 0) < MAX_PLAN_REVISIONS:
+        print("--- ROUTER: Plan rejected by compiler. Returning to Red Commander for revision. ---")
+        return "commander"
+    return agent_router(state)
+
+
+def detection_router(state: RedArmyState) -> str:
+    """Runs after the detection node: straight to the Reporter when aborting, otherwise as usual."""
+    from log_watcher import log_watcher
+    if log_watcher.policy == "abort":
+        print("--- ROUTER: Detected mid-mission. Aborting to final debriefing. ---")
+        return "reporter"
+    return agent_router(state)
+
+
 # --- Build the Graph ---
 
-workflow = StateGraph(RedArmyState)
-
-# 1. Add all our dedicated agent nodes
-workflow.add_node("commander", red_commander_node)
-workflow.add_node("infiltrator", infiltrator_node)
-workflow.add_node("saboteur", saboteur_node)
-workflow.add_node("executioner", executioner_node)
-workflow.add_node("chronicler", chronicler_node)
-workflow.add_node("reporter", reporting_node)
-
-# 2. Set the entry point - the Commander always starts
-workflow.set_entry_point("commander")
-
-# 3. Add the main routing logic. After the commander plans, the router decides who goes next.
-workflow.add_conditional_edges(
-    "commander",
-    agent_router,
-)
-
-# 4. Create the main work loop. After any specialist agent finishes, the router decides who goes next.
-workflow.add_conditional_edges(
-    "infiltrator",
-    agent_router,
-)
-workflow.add_conditional_edges(
-    "saboteur",
-    agent_router,
-)
-workflow.add_conditional_edges(
-    "executioner",
-    agent_router,
-)
-workflow.add_conditional_edges(
-    "chronicler",
-    agent_router,
-)
-
-# 5. Add the final reporting step - reporter always goes to END
-workflow.add_edge("reporter", END)
-
-# 6. Compile the graph
-app = workflow.compile()
-print("--- Red Army Workflow Graph (Advanced Architecture) Compiled Successfully ---")
+@functools.lru_cache(maxsize=None)
+def build_app():
+    """Build and compile the workflow graph. Compiled once per process, on first use."""
+    from langgraph.graph import StateGraph, END
+    from agents.commander import red_commander_node
+    from agents.infiltrator import infiltrator_node
+    from agents.saboteur import saboteur_node
+    from agents.executioner import executioner_node
+    from agents.chronicler import chronicler_node
+    from agents.reporter import reporting_node
+    from log_watcher import detection_node
+
+    workflow = StateGraph(RedArmyState)
+
+    # 1. Add all our dedicated agent nodes
+    workflow.add_node("commander", red_commander_node)
+    workflow.add_node("plan_compiler", plan_compiler_node)
+    workflow.add_node("infiltrator", infiltrator_node)
+    workflow.add_node("saboteur", saboteur_node)
+    workflow.add_node("executioner", executioner_node)
+    workflow.add_node("chronicler", chronicler_node)
+    workflow.add_node("reporter", reporting_node)
+    workflow.add_node("detection", detection_node)
+
+    # 2. Set the entry point - the Commander always starts
+    workflow.set_entry_point("commander")
+
+    # 3. Every plan is compiled and validated before any step runs. A rejected
+    #    plan goes back to the commander; otherwise the router decides who goes next.
+    workflow.add_edge("commander", "plan_compiler")
+    workflow.add_conditional_edges(
+        "plan_compiler",
+        plan_router,
+    )
+
+    # 4. Create the main work loop. After any specialist agent finishes, the router decides who goes next.
+    workflow.add_conditional_edges(
+        "infiltrator",
+        agent_router,
+    )
+    workflow.add_conditional_edges(
+        "saboteur",
+        agent_router,
+    )
+    workflow.add_conditional_edges(
+        "executioner",
+        agent_router,
+    )
+    workflow.add_conditional_edges(
+        "chronicler",
+        agent_router,
+    )
+    # Detections published by the log watcher mid-mission
+    workflow.add_conditional_edges(
+        "detection",
+        detection_router,
+    )
+
+    # 5. Add the final reporting step - reporter always goes to END
+    workflow.add_edge("reporter", END)
+
+    # 6. Compile the graph
+    app = workflow.compile()
+    print("--- Red Army Workflow Graph (Advanced Architecture) Compiled Successfully ---")
+    return app
+
+
+def __getattr__(name):
+    # Keep `from red_army import app` working while compiling lazily.
+    if name == "app":
+        return build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # --- Run the Mission ---
-if __name__ == "__main__":
-    print("\n--- INITIATING RED ARMY DEFENSIVE EXERCISE ---")
-    
-    # Define the initial state for the mission.
+
+RECURSION_LIMIT = 25
+
+DEFAULT_OBJECTIVE = "Test the GridGuardian's defenses. First, attempt a direct attack on the substation PLC. If detected, adapt the plan to use a stealthy, model-evasion technique to achieve the same goal (open the circuit breaker)."
+
+
+def create_initial_state(objective: str = DEFAULT_OBJECTIVE, **overrides) -> RedArmyState:
+    """
+    Build the initial state for a mission. Any RedArmyState field can be
+    overridden, e.g. to seed a mission with a custom feedback message.
+    """
     initial_state = RedArmyState({
-        "objective": "Test the GridGuardian's defenses. First, attempt a direct attack on the substation PLC. If detected, adapt the plan to use a stealthy, model-evasion technique to achieve the same goal (open the circuit breaker).",
+        "objective": objective,
         "plan": [],
         "current_task_index": 0,
         "task_output": "",
         "feedback": "Mission has not started yet. Proceed with the initial plan.",
         "history": [],
         "revision_number": 0,
+        "mission_id": uuid.uuid4().hex,
+        "compiled_plan": [],
+        "plan_errors": [],
+        "detections_seen": _detections_published(),
     })
+    initial_state.update(overrides)
+    return initial_state
+
+
+def _detections_published() -> int:
+    """Detections published before the mission started belong to earlier missions."""
+    from log_watcher import log_watcher
+    return log_watcher.published
+
+
+def start_log_watcher(source_spec: str = None) -> None:
+    """Start tailing the detector log (by default the Chronicler's configured source)."""
+    from log_watcher import log_watcher
+    if source_spec is None:
+        from toolkits.chronicler_tools import GRIDGUARDIAN_LOG_SOURCE
+        source_spec = GRIDGUARDIAN_LOG_SOURCE
+    log_watcher.start(source_spec)
+
+
+if __name__ == "__main__":
+    print("\n--- INITIATING RED ARMY DEFENSIVE EXERCISE ---")
+    
+    initialize_rag()
+    app = build_app()
+    if WATCH_DETECTOR:
+        start_log_watcher()
+
+    # Define the initial state for the mission.
+    initial_state = create_initial_state()
 
     # The 'stream' method executes the graph and returns all intermediate steps.
-    for event in app.stream(initial_state, {"recursion_limit": 25}):
+    for event in app.stream(initial_state, {"recursion_limit": RECURSION_LIMIT}):
         # The key of the dictionary is the name of the node that just ran.
         node_that_ran = list(event.keys())[0]
         print(f"\n--- Turn Complete: Agent '{node_that_ran}' has finished. ---")
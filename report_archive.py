@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Indexed archive of mission reports.
+
+Every report saved with save_mission_report is also recorded in a SQLite
+database. Structured columns hold the mission ID, objective, status,
+confidence, scenarios and MITRE technique IDs, and an FTS5 index covers the
+report text, so past runs can be found by technique, target or outcome
+without grepping the Markdown files.
+
+Usage:
+    python report_archive.py search "stealth bypass" --status FAILED --technique T0831
+    python report_archive.py show 42
+    python report_archive.py enrich 42
+    python report_archive.py import mission_report_*.md
+
+The archive lives in mission_reports.db (override with RED_ARMY_REPORT_ARCHIVE).
+"""
+
+import argparse
+import contextlib
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+DEFAULT_ARCHIVE_PATH = "mission_reports.db"
+
+# Archive path override, read whenever the global archive is used
+ARCHIVE_PATH_ENV = "RED_ARMY_REPORT_ARCHIVE"
+
+# MITRE ATT&CK for ICS technique IDs (e.g. T0831, T0855.001), also inside tool names like execute_T0831
+TECHNIQUE_PATTERN = re.compile(r"(?<![A-Za-z0-9])T\d{4}(?:\.\d{3})?(?!\d)")
+
+SCENARIO_PATTERN = re.compile(r"scenario_name\s*=\s*['\"]([^'\"]+)['\"]")
+
+# Outcome line of the templated and LLM After-Action Reports
+OUTCOME_PATTERN = re.compile(r"###\s*✅\s*Outcome\s*\n+\s*\**\s*(SUCCESS|PARTIAL SUCCESS|FAILURE)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    mission_id TEXT,
+    created_at REAL NOT NULL,
+    objective TEXT NOT NULL DEFAULT '',
+    status TEXT,
+    confidence REAL,
+    filename TEXT,
+    tags TEXT NOT NULL DEFAULT '',
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_mission_id ON reports (mission_id);
+CREATE INDEX IF NOT EXISTS reports_status ON reports (status, created_at);
+CREATE INDEX IF NOT EXISTS reports_created_at ON reports (created_at);
+
+-- Scenarios and technique IDs, one row per value
+CREATE TABLE IF NOT EXISTS report_tags (
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (kind, value, report_id)
+) WITHOUT ROWID;
+
+-- Full-text index over the reports table (external content: text is stored once)
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5 (
+    objective, tags, report,
+    content='reports', content_rowid='id'
+);
+"""
+
+
+class ArchivedReport(NamedTuple):
+    """A report row as returned by ReportArchive queries."""
+    id: int
+    mission_id: Optional[str]
+    created_at: float
+    objective: str
+    status: Optional[str]
+    confidence: Optional[float]
+    filename: Optional[str]
+    scenarios: List[str]
+    techniques: List[str]
+    snippet: str  # Matching excerpt for full-text searches, the report's start otherwise
+
+
+def report_metadata(report: str) -> Dict:
+    """Metadata recoverable from a report's Markdown: objective, status, scenarios and techniques."""
+    objective = ""
+    match = re.search(r"###\s*📋\s*Mission Objective\s*\n+(.+)", report)
+    if match:
+        objective = match.group(1).strip()
+
+    outcome = OUTCOME_PATTERN.search(report)
+    status = None
+    if outcome:
+        status = {"SUCCESS": "SUCCESS", "PARTIAL SUCCESS": "PARTIAL_SUCCESS", "FAILURE": "FAILED"}[outcome.group(1)]
+
+    return {
+        "objective": objective,
+        "status": status,
+        "scenarios": sorted(set(SCENARIO_PATTERN.findall(report))),
+        "techniques": sorted(set(TECHNIQUE_PATTERN.findall(report))),
+    }
+
+
+def mission_metadata(state: Dict, assessment: Optional[Dict] = None) -> Dict:
+    """Archive metadata of a mission: IDs and outcome from the state and assessment, tags from the tool calls."""
+    tool_calls = " ".join(getattr(entry, "tool_call", "") or str(entry) for entry in state.get("history", []))
+    metadata = {
+        "mission_id": state.get("mission_id"),
+        "objective": state.get("objective", ""),
+        "scenarios": sorted(set(SCENARIO_PATTERN.findall(tool_calls))),
+        "techniques": sorted(set(TECHNIQUE_PATTERN.findall(tool_calls))),
+    }
+    if assessment:
+        metadata["status"] = assessment["mission_status"]
+        metadata["confidence"] = assessment["confidence_score"]
+    return metadata
+
+
+class ReportArchive:
+    """SQLite archive of mission reports with structured columns and a full-text index."""
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._initialized = set()
+
+    @property
+    def path(self) -> str:
+        """The archive given explicitly, else RED_ARMY_REPORT_ARCHIVE at the time of use."""
+        return self._path or os.getenv(ARCHIVE_PATH_ENV) or DEFAULT_ARCHIVE_PATH
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation: reports are saved from
+        # background threads and batch worker processes alike
+        path = self.path
+        connection = sqlite3.connect(path, timeout=30)
+        connection.execute("PRAGMA foreign_keys = ON")
+        if path not in self._initialized:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(SCHEMA)
+            self._initialized.add(path)
+        return connection
+
+    @contextlib.contextmanager
+    def recording(self, report: str, filename: Optional[str] = None, **metadata) -> Iterator[int]:
+        """
+        Insert a report inside a transaction that commits when the block exits
+        and rolls back if it raises, e.g. when writing the report file fails.
+
+        Metadata not given explicitly (objective, status, scenarios,
+        techniques) is recovered from the report text.
+
+        Yields:
+            The new report ID
+        """
+        fields = report_metadata(report)
+        for key in ("scenarios", "techniques"):
+            fields[key] = sorted(set(fields[key]) | set(metadata.pop(key, None) or ()))
+        fields.update({key: value for key, value in metadata.items() if value is not None})
+        unknown = set(fields) - {"mission_id", "objective", "status", "confidence", "scenarios", "techniques"}
+        if unknown:
+            raise ValueError(f"Unknown report metadata: {', '.join(sorted(unknown))}")
+
+        connection = self._connect()
+        try:
+            with connection:
+                tags = " ".join(fields["scenarios"] + fields["techniques"])
+                cursor = connection.execute(
+                    "INSERT INTO reports (mission_id, created_at, objective, status, confidence, filename, tags, report) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (fields.get("mission_id"), time.time(), fields["objective"], fields["status"],
+                     fields.get("confidence"), filename, tags, report),
+                )
+                report_id = cursor.lastrowid
+                connection.executemany(
+                    "INSERT INTO report_tags (report_id, kind, value) VALUES (?, ?, ?)",
+                    [(report_id, kind[:-1], value) for kind in ("scenarios", "techniques") for value in fields[kind]],
+                )
+                connection.execute(
+                    "INSERT INTO reports_fts (rowid, objective, tags, report) VALUES (?, ?, ?, ?)",
+                    (report_id, fields["objective"], tags, report),
+                )
+                yield report_id
+        finally:
+            connection.close()
+
+    def add(self, report: str, filename: Optional[str] = None, **metadata) -> int:
+        """Insert a report and return its ID (see recording() for the metadata)."""
+        with self.recording(report, filename, **metadata) as report_id:
+            return report_id
+
+    def search(self, query: Optional[str] = None, status: Optional[str] = None,
+               technique: Optional[str] = None, scenario: Optional[str] = None,
+               mission_id: Optional[str] = None, since: Optional[float] = None,
+               limit: int = 20) -> List[ArchivedReport]:
+        """
+        Find reports. `query` is an FTS5 full-text query over objective, tags and
+        report text (results ranked by relevance); the other filters are exact
+        matches on the structured columns (results newest first).
+        """
+        joins, where, params = [], [], []
+        if query:
+            joins.append("JOIN reports_fts ON reports_fts.rowid = r.id")
+            where.append("reports_fts MATCH ?")
+            params.append(query)
+        for kind, value in (("scenario", scenario), ("technique", technique)):
+            if value:
+                where.append("EXISTS (SELECT 1 FROM report_tags t WHERE t.kind = ? AND t.value = ? AND t.report_id = r.id)")
+                params.extend((kind, value))
+        for column, value in (("status", status), ("mission_id", mission_id)):
+            if value:
+                where.append(f"r.{column} = ?")
+                params.append(value)
+        if since is not None:
+            where.append("r.created_at >= ?")
+            params.append(since)
+
+        snippet = ("snippet(reports_fts, 2, '[', ']', '...', 16)" if query
+                   else "substr(r.report, 1, 160)")
+        sql = (f"SELECT r.id, r.mission_id, r.created_at, r.objective, r.status, r.confidence, r.filename, {snippet} "
+               f"FROM reports r {' '.join(joins)} "
+               f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+               f"ORDER BY {'bm25(reports_fts)' if query else 'r.created_at DESC'} LIMIT ?")
+        params.append(limit)
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql, params).fetchall()
+            return [self._with_tags(connection, row) for row in rows]
+        finally:
+            connection.close()
+
+    def get(self, report_id: int) -> Optional[str]:
+        """The full text of a report, or None if there is no such report."""
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT report FROM reports WHERE id = ?", (report_id,)).fetchone()
+            return row[0] if row else None
+        finally:
+            connection.close()
+
+    def entry(self, report_id: int) -> Optional[ArchivedReport]:
+        """A report's archive row (snippet: the start of the report), or None if there is no such report."""
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT id, mission_id, created_at, objective, status, confidence, filename, substr(report, 1, 160) "
+                "FROM reports WHERE id = ?", (report_id,)).fetchone()
+            return self._with_tags(connection, row) if row else None
+        finally:
+            connection.close()
+
+    def update(self, report_id: int, report: str) -> None:
+        """Replace a report's text, e.g. with its LLM-enriched version, keeping its metadata."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO reports_fts (reports_fts, rowid, objective, tags, report) "
+                    "SELECT 'delete', id, objective, tags, report FROM reports WHERE id = ?", (report_id,))
+                if connection.execute("UPDATE reports SET report = ? WHERE id = ?", (report, report_id)).rowcount != 1:
+                    raise KeyError(f"No report with ID {report_id}")
+                connection.execute(
+                    "INSERT INTO reports_fts (rowid, objective, tags, report) "
+                    "SELECT id, objective, tags, report FROM reports WHERE id = ?", (report_id,))
+        finally:
+            connection.close()
+
+    def delete(self, report_id: int) -> None:
+        """Remove a report and its index entries."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO reports_fts (reports_fts, rowid, objective, tags, report) "
+                    "SELECT 'delete', id, objective, tags, report FROM reports WHERE id = ?", (report_id,))
+                connection.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _with_tags(connection: sqlite3.Connection, row: tuple) -> ArchivedReport:
+        tags = {"scenario": [], "technique": []}
+        for kind, value in connection.execute(
+                "SELECT kind, value FROM report_tags WHERE report_id = ? ORDER BY value", (row[0],)):
+            tags[kind].append(value)
+        return ArchivedReport(*row[:7], scenarios=tags["scenario"], techniques=tags["technique"],
+                              snippet=" ".join(str(row[7]).split()))
+
+    def import_files(self, paths: Iterable[str]) -> int:
+        """Archive existing Markdown report files. Returns the number imported."""
+        count = 0
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                self.add(f.read(), filename=path)
+            count += 1
+        return count
+
+
+# Global report archive instance
+report_archive = ReportArchive()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the Red Army mission report archive.")
+    parser.add_argument("--archive", help=f"Archive database path (default: ${ARCHIVE_PATH_ENV} or {DEFAULT_ARCHIVE_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Search archived reports")
+    search.add_argument("query", nargs="?", help="Full-text query (FTS5 syntax)")
+    search.add_argument("--status", help="Mission status, e.g. SUCCESS or FAILED")
+    search.add_argument("--technique", help="MITRE technique ID, e.g. T0831")
+    search.add_argument("--scenario", help="Attack scenario name")
+    search.add_argument("--mission-id", help="Mission ID")
+    search.add_argument("--days", type=float, help="Only reports from the last N days")
+    search.add_argument("--limit", type=int, default=20)
+
+    show = commands.add_parser("show", help="Print an archived report")
+    show.add_argument("report_id", type=int)
+
+    import_cmd = commands.add_parser("import", help="Archive existing Markdown report files")
+    import_cmd.add_argument("paths", nargs="+")
+
+    enrich = commands.add_parser("enrich", help="Polish an archived report with the LLM and replace it (and its file)")
+    enrich.add_argument("report_id", type=int)
+
+    args = parser.parse_args(argv)
+    archive = ReportArchive(args.archive)
+
+    if args.command == "show":
+        report = archive.get(args.report_id)
+        if report is None:
+            print(f"No report with ID {args.report_id}", file=sys.stderr)
+            return 1
+        print(report)
+        return 0
+
+    if args.command == "import":
+        print(f"Imported {archive.import_files(args.paths)} report(s) into {archive.path}")
+        return 0
+
+    if args.command == "enrich":
+        from toolkits.reporting_tools import enrich_archived_report
+        original = archive.get(args.report_id)
+        if original is None:
+            print(f"No report with ID {args.report_id}", file=sys.stderr)
+            return 1
+        enriched = enrich_archived_report(args.report_id, archive).result()
+        return 0 if enriched != original and archive.get(args.report_id) == enriched else 1
+
+    start = time.perf_counter()
+    since = time.time() - args.days * 86400 if args.days is not None else None
+    try:
+        results = archive.search(args.query, status=args.status, technique=args.technique, scenario=args.scenario,
+                                 mission_id=args.mission_id, since=since, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        if not args.query:
+            raise
+        # Malformed FTS5 queries such as '"foo' or a bare 'AND'
+        parser.error(f"invalid search query {args.query!r} ({e}); "
+                     f"wrap words with special characters or FTS5 operators in double quotes")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for result in results:
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(result.created_at))
+        tags = ", ".join(result.scenarios + result.techniques) or "-"
+        print(f"[{result.id}] {created} {result.status or 'UNKNOWN'} | {result.objective[:80]} | {tags}")
+        print(f"      {result.snippet}")
+    print(f"{len(results)} report(s) in {elapsed_ms:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Incremental After-Action Report builder.
+
+The router folds each agent step into the mission's report sections as soon as
+the node returns: a timeline row per step, the findings of the Chronicler's
+log analyses, failed steps and per-agent statistics. The Reporter then only
+formats the accumulated sections, and a partial report of a live mission can be
+rendered at any point with `report_builder.partial_report(state)`.
+
+Sections are keyed by mission ID and follow the same append-only contract as
+the mission assessor's running aggregates (see mission_history.MissionFolds).
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+from state import RedArmyState
+from mission_history import HistoryFold, HistoryRecord, MissionFolds, entry_agent, entry_summary, entry_text
+
+# Chronicler verdicts (see toolkits/chronicler_tools.analyze_gridguardian_logs)
+DETECTED_MARKER = "Analysis: FAILURE"
+UNDETECTED_MARKER = "Analysis: SUCCESS"
+
+
+class TimelineRow(NamedTuple):
+    """One executed step as listed in the Execution Summary."""
+    agent: str
+    tool_call: Optional[str]  # None for legacy string entries
+    status: Optional[str]
+    duration: float
+    preview: str
+
+
+class ReportSections(HistoryFold):
+    """Structured report data for one mission, updated once per appended history entry."""
+
+    __slots__ = ("timeline", "tools_used", "total_seconds", "detections", "clean_runs", "failures", "agent_stats")
+
+    def __init__(self):
+        super().__init__()
+        self.timeline: List[TimelineRow] = []
+        self.tools_used: Dict[str, int] = {}
+        self.total_seconds = 0.0
+        self.detections: List[str] = []   # Chronicler verdicts reporting a detection
+        self.clean_runs: List[str] = []   # Chronicler verdicts reporting no detection
+        self.failures: List[str] = []     # Summaries of failed steps
+        self.agent_stats: Dict[str, Dict] = {}
+
+    @classmethod
+    def from_history(cls, history: List) -> "ReportSections":
+        """Build the sections of a complete history in one go."""
+        sections = cls()
+        sections.extend(history)
+        return sections
+
+    def extend(self, history: List) -> None:
+        """Fold the entries of `history` not seen yet."""
+        for entry in self.new_entries(history):
+            self._add(entry)
+
+    def _add(self, entry) -> None:
+        agent = entry_agent(entry) or "Unknown"
+        record = entry if isinstance(entry, HistoryRecord) else None
+        duration = (record.duration or 0.0) if record else 0.0
+        status = record.status if record else None
+
+        if record:
+            self.timeline.append(TimelineRow(agent, record.tool_call, status, duration, record.preview))
+            if record.tool:
+                self.tools_used[record.tool] = self.tools_used.get(record.tool, 0) + 1
+        else:
+            self.timeline.append(TimelineRow(agent, None, None, 0.0, str(entry)))
+        self.total_seconds += duration
+
+        stats = self.agent_stats.setdefault(agent, {"steps": 0, "errors": 0, "seconds": 0.0})
+        stats["steps"] += 1
+        stats["seconds"] += duration
+
+        # Only the Chronicler's verdicts need the full output
+        if agent == "Chronicler":
+            text = entry_text(entry)
+            if DETECTED_MARKER in text:
+                self.detections.append(text.split("->", 1)[-1])
+            elif UNDETECTED_MARKER in text:
+                self.clean_runs.append(text.split("->", 1)[-1])
+
+        if status == "ERROR" or (status is None and "ERROR" in entry_text(entry).upper()):
+            self.failures.append(entry_summary(entry))
+            stats["errors"] += 1
+
+
+class ReportBuilder:
+    """Keeps the report sections of running missions up to date."""
+
+    def __init__(self):
+        self._sections = MissionFolds(ReportSections, ReportSections._add)
+
+    def observe(self, state: RedArmyState) -> ReportSections:
+        """Fold any history entries appended since the last call into the mission's report sections."""
+        return self._sections.observe(state)
+
+    def discard(self, mission_id: str) -> None:
+        """Drop the report sections of a finished mission."""
+        self._sections.discard(mission_id)
+
+    def partial_report(self, state: RedArmyState) -> str:
+        """Render the After-Action Report of a mission as it stands."""
+        from mission_assessor import mission_assessor
+        from toolkits.reporting_tools import render_mission_debrief
+
+        sections = self.observe(state)
+        assessment = mission_assessor.assess_mission_completion(state)
+        return render_mission_debrief(state, assessment, sections=sections)
+
+
+# Global report builder instance
+report_builder = ReportBuilder()
@@ -1,4 +1,4 @@
-from typing import TypedDict, Annotated, List
+from typing import TypedDict, Annotated, List, Any
 import operator
 
 class RedArmyState(TypedDict):
@@ -11,5 +11,9 @@ class RedArmyState(TypedDict):
     current_task_index: int
     task_output: str
     feedback: str
-    history: Annotated[List[str], operator.add]
-    revision_number: int
\ No newline at end of file
+    history: Annotated[List[Any], operator.add]  # HistoryRecord entries (see mission_history)
+    revision_number: int
+    mission_id: str  # Keys the mission assessor's running aggregates
+    compiled_plan: List[Any]  # CompiledStep per plan step, written by the plan compiler
+    plan_errors: List[str]
+    detections_seen: int  # Last log watcher event the mission has handled (see log_watcher)
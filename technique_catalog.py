@@ -0,0 +1,149 @@
+"""
+MITRE ATT&CK for ICS technique catalog.
+
+saboteur_techniques.json is loaded once, from next to this module, and indexed
+by technique, mapped function and RAG context keyword, so the Saboteur's
+technique lookups are dictionary hits without file I/O. The file's mtime is
+checked at most every RELOAD_CHECK_INTERVAL seconds and the catalog is
+reloaded only when it changed, so edits are picked up by running processes.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saboteur_techniques.json")
+
+# Minimum seconds between two mtime checks of the catalog file
+RELOAD_CHECK_INTERVAL = 2.0
+
+EMPTY_CATALOG = {"mitre_attack_ics_mapping": {"techniques": {}}}
+
+
+class CatalogIndex(NamedTuple):
+    """One loaded version of the catalog with its lookup indexes."""
+    data: Dict
+    techniques: Dict[str, Dict]
+    functions_by_technique: Dict[str, Tuple[str, ...]]
+    techniques_by_function: Dict[str, Tuple[str, ...]]
+    techniques_by_keyword: Dict[str, Tuple[str, ...]]
+
+
+class TechniqueCatalog:
+    """Load-once, indexed view of the technique mapping file."""
+
+    def __init__(self, path: str = CATALOG_PATH, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0  # Incremented on every (re)load; keys caches derived from the catalog
+        self._mtime: Optional[float] = None  # mtime of the loaded file, None if nothing was loaded
+        self._missing = False
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        self._build(EMPTY_CATALOG)
+
+    def _build(self, data: Dict) -> None:
+        techniques = data.get("mitre_attack_ics_mapping", {}).get("techniques", {})
+        functions_by_technique = {}
+        techniques_by_function: Dict[str, list] = {}
+        techniques_by_keyword: Dict[str, list] = {}
+        for technique_id, technique in techniques.items():
+            functions = tuple(technique.get("mapped_functions", ()))
+            functions_by_technique[technique_id] = functions
+            for function in functions:
+                techniques_by_function.setdefault(function, []).append(technique_id)
+            for keyword in technique.get("rag_context_keywords", ()):
+                techniques_by_keyword.setdefault(keyword.lower(), []).append(technique_id)
+
+        # Swapped in with a single assignment so concurrent readers never see a partial catalog
+        self._index = CatalogIndex(
+            data, techniques, functions_by_technique,
+            {name: tuple(ids) for name, ids in techniques_by_function.items()},
+            {name: tuple(ids) for name, ids in techniques_by_keyword.items()},
+        )
+        self.version += 1
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload the catalog if the file changed (checked at most every check_interval seconds)."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                if not self._missing:
+                    print(f"--- SABOTEUR WARNING: {os.path.basename(self.path)} not found. Using basic mapping. ---")
+                    self._missing = True
+                if self._mtime is not None:
+                    self._mtime = None
+                    self._build(EMPTY_CATALOG)
+                return
+            self._missing = False
+            if mtime == self._mtime and not force:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good catalog while the file is being rewritten
+                print(f"--- SABOTEUR WARNING: Could not load {os.path.basename(self.path)}: {e} ---")
+                return
+            self._mtime = mtime
+            self._build(data)
+
+    @property
+    def data(self) -> Dict:
+        """The raw catalog document."""
+        self.refresh()
+        return self._index.data
+
+    @property
+    def techniques(self) -> Dict[str, Dict]:
+        """Technique ID -> technique definition."""
+        self.refresh()
+        return self._index.techniques
+
+    def technique(self, technique_id: str) -> Optional[Dict]:
+        self.refresh()
+        return self._index.techniques.get(technique_id)
+
+    def functions_for(self, technique_id: str) -> Tuple[str, ...]:
+        """Functions mapped to a technique, in catalog order."""
+        self.refresh()
+        return self._index.functions_by_technique.get(technique_id, ())
+
+    def techniques_for_function(self, function: str) -> Tuple[str, ...]:
+        """Techniques a function is mapped to."""
+        self.refresh()
+        return self._index.techniques_by_function.get(function, ())
+
+    def techniques_for_keyword(self, keyword: str) -> Tuple[str, ...]:
+        """Techniques listing `keyword` among their RAG context keywords."""
+        self.refresh()
+        return self._index.techniques_by_keyword.get(keyword.lower(), ())
+
+    def function_metadata(self, function: str) -> Dict:
+        self.refresh()
+        return self._index.data.get("function_metadata", {}).get(function, {})
+
+    @property
+    def strategies(self) -> Dict[str, Dict]:
+        """Execution strategy name -> strategy definition (description, preferred_order)."""
+        self.refresh()
+        return self._index.data.get("execution_strategies", {})
+
+    def __contains__(self, technique_id: str) -> bool:
+        self.refresh()
+        return technique_id in self._index.techniques
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._index.techniques)
+
+
+# Global technique catalog instance
+technique_catalog = TechniqueCatalog()
@@ -0,0 +1,224 @@
+"""
+Scored technique-to-function selection for the Saboteur.
+
+Every keyword the catalog knows about (each technique's rag_context_keywords
+plus the strategy cue words) is compiled into one trie-shaped regular
+expression, so the mission and RAG context is scanned once into a keyword
+count vector. The pick is the Saboteur's original rule: the first strategy
+whose cue words appear in the context (stealth, then speed, then persistence)
+replaces the requested one, and the technique's selection_criteria entry for
+that strategy wins, else its first mapped function. The remaining functions
+are ordered by a score from a few small matrix products:
+
+    strategy weights  the requested strategy, shifted by cue words in the context
+    preference        the function's rank in each strategy's preferred_order,
+                      plus a bonus where the technique's selection_criteria pick it
+    relevance         context mentions of the technique's keywords that describe
+                      the function (its name or metadata description)
+
+Rankings are cached per (technique, strategy, context hash) and the matrices
+are rebuilt only when the technique catalog is reloaded, so selection stays
+cheap as the catalog grows to the full ATT&CK for ICS matrix.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from outcome_classifier import trie_pattern
+from technique_catalog import TechniqueCatalog, technique_catalog
+
+DEFAULT_STRATEGY = "stealth_focused"
+
+# Context words that switch the execution strategy
+STRATEGY_CUES = {
+    "stealth_focused": ("stealth", "covert", "undetected"),
+    "speed_focused": ("fast", "immediate", "quick"),
+    "persistence_focused": ("persistent", "maintain", "ongoing"),
+}
+
+# Each strategy cue in the context weighs this much against the requested strategy
+CUE_WEIGHT = 2.0
+
+# Bonus for the function a technique's selection_criteria name for a strategy
+PRIORITY_BONUS = 1.0
+
+# Weight of the (log-scaled) context mentions of a keyword describing a function
+KEYWORD_WEIGHT = 0.25
+
+# Rankings and context vectors are cached for this many distinct inputs
+CACHE_SIZE = 1024
+
+
+class _TechniqueModel(NamedTuple):
+    functions: Tuple[str, ...]   # Mapped functions, in catalog order
+    keywords: np.ndarray         # Indexes of the technique's keywords
+    relevance: np.ndarray        # (functions, technique keywords): keyword describes function
+    preference: np.ndarray       # (strategies, functions): preferred_order rank + criteria bonus
+    picks: np.ndarray            # (strategies + 1, functions): the function picked per strategy, last row: none
+
+
+class _SelectionModel:
+    """Matrices derived from one catalog version."""
+
+    def __init__(self, catalog: TechniqueCatalog):
+        self.version = catalog.version
+        techniques = catalog.techniques
+        strategies = catalog.strategies
+        self.strategies = tuple(dict.fromkeys([*STRATEGY_CUES, *strategies]))
+        strategy_index = {name: i for i, name in enumerate(self.strategies)}
+
+        vocabulary = {keyword.lower() for technique in techniques.values()
+                      for keyword in technique.get("rag_context_keywords", ())}
+        vocabulary.update(cue for cues in STRATEGY_CUES.values() for cue in cues)
+        self.keywords = tuple(sorted(vocabulary))
+        keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self.pattern = re.compile(trie_pattern(self.keywords)) if self.keywords else None
+        # A match also counts every keyword it contains ("undetected" -> "detect")
+        self.implied = {keyword: [keyword_index[other] for other in self.keywords if other in keyword]
+                        for keyword in self.keywords}
+
+        self.cues = np.zeros((len(self.strategies), len(self.keywords)))
+        for strategy, cues in STRATEGY_CUES.items():
+            for cue in cues:
+                self.cues[strategy_index[strategy], keyword_index[cue]] = 1.0
+
+        # Strategy preference of every function: 1.0 for the first in preferred_order down to 1/n
+        rank_score: Dict[str, np.ndarray] = {}
+        for strategy, definition in strategies.items():
+            order = definition.get("preferred_order", [])
+            for rank, function in enumerate(order):
+                scores = rank_score.setdefault(function, np.zeros(len(self.strategies)))
+                scores[strategy_index[strategy]] = (len(order) - rank) / len(order)
+
+        self.techniques: Dict[str, _TechniqueModel] = {}
+        for technique_id, technique in techniques.items():
+            functions = tuple(catalog.functions_for(technique_id))
+            keywords = sorted({keyword_index[k.lower()] for k in technique.get("rag_context_keywords", ())})
+            descriptions = [f"{function.replace('_', ' ')} {catalog.function_metadata(function).get('description', '')}".lower()
+                            for function in functions]
+            relevance = np.array([[1.0 if self.keywords[k] in text else 0.0 for k in keywords] for text in descriptions])
+            preference = np.zeros((len(self.strategies), len(functions)))
+            for column, function in enumerate(functions):
+                if function in rank_score:
+                    preference[:, column] = rank_score[function]
+            # The pick per strategy: its selection_criteria entry, else the first mapped function
+            picks = np.zeros((len(self.strategies) + 1, len(functions)), dtype=bool)
+            picks[:, :1] = True
+            for strategy in self.strategies:
+                pick = technique.get("selection_criteria", {}).get(strategy.replace("_focused", "_priority"))
+                if pick in functions:
+                    preference[strategy_index[strategy], functions.index(pick)] += PRIORITY_BONUS
+                    picks[strategy_index[strategy]] = False
+                    picks[strategy_index[strategy], functions.index(pick)] = True
+            self.techniques[technique_id] = _TechniqueModel(
+                functions, np.array(keywords, dtype=np.intp),
+                relevance.reshape(len(functions), len(keywords)), preference, picks,
+            )
+
+    def context_counts(self, context: str) -> np.ndarray:
+        """Mentions of every keyword in the context, from a single scan."""
+        ids = []
+        if self.pattern is not None and context:
+            for match in self.pattern.finditer(context.lower()):
+                ids.extend(self.implied[match.group()])
+        return np.bincount(np.array(ids, dtype=np.intp), minlength=len(self.keywords)).astype(float)
+
+    def effective_strategy(self, counts: np.ndarray, strategy: str) -> str:
+        """The first strategy (in STRATEGY_CUES order) with a cue in the context, else the requested one."""
+        for row, cued in enumerate(self.cues[:len(STRATEGY_CUES)] @ counts):
+            if cued:
+                return self.strategies[row]
+        return strategy
+
+    def rank(self, technique_id: str, counts: np.ndarray, strategy: str) -> List[Tuple[str, float]]:
+        model = self.techniques[technique_id]
+        if not model.functions:
+            return []
+
+        effective = self.effective_strategy(counts, strategy)
+        picked = model.picks[self.strategies.index(effective) if effective in self.strategies else -1]
+
+        weights = CUE_WEIGHT * (self.cues @ counts)
+        if strategy in self.strategies:
+            weights[self.strategies.index(strategy)] += 1.0
+        total = weights.sum()
+        weights = weights / total if total else np.full(len(self.strategies), 1.0 / len(self.strategies))
+
+        scores = weights @ model.preference
+        if model.keywords.size:
+            scores = scores + KEYWORD_WEIGHT * (model.relevance @ np.log1p(counts[model.keywords]))
+        # The pick first, then the rest by score; ties keep catalog order
+        order = np.lexsort((np.arange(len(scores)), -scores, ~picked))
+        return [(model.functions[i], round(float(scores[i]), 4)) for i in order]
+
+
+class TechniqueSelector:
+    """Ranks the functions mapped to a technique for a given context and strategy."""
+
+    def __init__(self, catalog: TechniqueCatalog = technique_catalog):
+        self.catalog = catalog
+        self._model: Optional[_SelectionModel] = None
+        self._counts: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._rankings: "OrderedDict[Tuple, List[Tuple[str, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _current_model(self) -> _SelectionModel:
+        self.catalog.refresh()
+        model = self._model
+        if model is None or model.version != self.catalog.version:
+            model = self._model = _SelectionModel(self.catalog)
+            with self._lock:
+                self._counts.clear()
+                self._rankings.clear()
+        return model
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: Tuple, value) -> None:
+        cache[key] = value
+        if len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def rank(self, technique_id: str, context: str = "",
+             strategy: str = DEFAULT_STRATEGY) -> List[Tuple[str, float]]:
+        """
+        Mapped functions of a technique with their scores, best first.
+        Empty for unknown techniques and techniques without mapped functions.
+        """
+        model = self._current_model()
+        if technique_id not in model.techniques:
+            return []
+
+        digest = hashlib.blake2b(context.encode("utf-8"), digest_size=16).digest()
+        key = (model.version, technique_id, strategy, digest)
+        with self._lock:
+            ranking = self._rankings.get(key)
+            if ranking is not None:
+                self._rankings.move_to_end(key)
+                self.hits += 1
+                return ranking
+            self.misses += 1
+            counts = self._counts.get((model.version, digest))
+
+        if counts is None:
+            counts = model.context_counts(context)
+        ranking = model.rank(technique_id, counts, strategy)
+        with self._lock:
+            self._remember(self._counts, (model.version, digest), counts)
+            self._remember(self._rankings, key, ranking)
+        return ranking
+
+    def select(self, technique_id: str, context: str = "", strategy: str = DEFAULT_STRATEGY) -> Optional[str]:
+        """The best-scoring function for a technique, or None."""
+        ranking = self.rank(technique_id, context, strategy)
+        return ranking[0][0] if ranking else None
+
+
+# Global technique selector instance
+technique_selector = TechniqueSelector()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming anomaly report parser: the example detector log,
+early yields, reports split across feeds, and constant-memory parsing of a
+large generated log.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import time
+import tracemalloc
+import numpy as np
+from anomaly_parser import AnomalyReportParser, parse_anomaly_reports
+from toolkits.chronicler_tools import _parse_anomaly_reports
+
+
+def _report_lines(minute: int, anomalies: int = 3):
+    yield f"2025-09-17 15:{minute % 60:02d}:14 - INFO - 🚨 ANOMALY DETECTED!\n"
+    yield "2025-09-17 15:01:14 - INFO - Unusual power line loading detected at the following times:\n"
+    for i in range(anomalies):
+        yield f"2025-09-17 15:01:14 - INFO -   ⚡ 2025-09-17 18:{minute % 60:02d}:{i % 60:02d}.009034: 890.39% loading\n"
+    yield "2025-09-17 15:01:14 - INFO - 📋 END ANOMALY REPORT\n"
+
+
+def test_example_log():
+    """Test parsing the example detector log straight from the open file."""
+    print("🧪 Testing Example Detector Log...")
+
+    with open("anomaly_detector_log_example.txt", encoding="utf-8") as f:
+        reports = list(parse_anomaly_reports(f))
+    assert [r["anomaly_count"] for r in reports] == [44, 45]
+    assert reports[0]["report_timestamp"] == "2025-09-17 15:01:14"
+    assert all(len(ts) == 26 for r in reports for ts in r["anomaly_timestamps"])
+    assert reports[0]["anomaly_loadings"][0] == 890.39
+    assert all(len(r["anomaly_loadings"]) == r["anomaly_count"] for r in reports)
+    # Typed arrays are built as the reports are parsed
+    assert reports[0]["anomaly_times"].dtype == np.dtype("datetime64[us]")
+    assert str(reports[0]["anomaly_times"][0]) == reports[0]["anomaly_timestamps"][0].replace(" ", "T")
+    assert reports[0]["anomaly_loadings"].dtype == np.float64
+
+    with open("anomaly_detector_log_example.txt", encoding="utf-8") as f:
+        reparsed = _parse_anomaly_reports(f.read())
+    assert [r["anomaly_timestamps"] for r in reparsed] == [r["anomaly_timestamps"] for r in reports]
+    assert all(np.array_equal(a["anomaly_loadings"], b["anomaly_loadings"]) for a, b in zip(reparsed, reports))
+    print("✅ Example log parsed")
+
+
+def test_streaming_yields():
+    """Test that reports are yielded at their END marker and survive being split across feeds."""
+    print("\n🧪 Testing Streaming Yields...")
+
+    consumed = []
+
+    def lines():
+        for minute in range(3):
+            for line in _report_lines(minute):
+                consumed.append(line)
+                yield line
+
+    stream = parse_anomaly_reports(lines())
+    first = next(stream)
+    assert first["report_timestamp"] == "2025-09-17 15:00:14"
+    assert "END ANOMALY REPORT" in consumed[-1] and len(consumed) == 6  # Nothing read past the first report
+    assert len(list(stream)) == 2
+
+    parser = AnomalyReportParser()
+    report = list(_report_lines(5, anomalies=4))
+    assert list(parser.feed(report[:3])) == [] and parser.in_report
+    assert [r["anomaly_count"] for r in parser.feed(report[3:])] == [4] and not parser.in_report
+
+    # A log cut off mid-report still yields it at the end of a one-shot parse
+    assert [r["anomaly_count"] for r in parse_anomaly_reports(report[:-1])] == [4]
+    # A report interrupted by the next one is closed, not merged
+    merged = report[:-1] + list(_report_lines(6, anomalies=2))
+    assert [r["anomaly_count"] for r in parse_anomaly_reports(merged)] == [4, 2]
+    print("✅ Reports yielded as soon as they complete")
+
+
+def test_constant_memory():
+    """Test that a large generated log parses in bounded memory."""
+    print("\n🧪 Testing Constant-Memory Parsing...")
+
+    def log(reports):
+        for minute in range(reports):
+            yield "2025-09-17 15:01:14 - INFO - Processed 1024 measurements, none flagged\n"
+            yield from _report_lines(minute, anomalies=50)
+
+    reports = 4000
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = 0
+    for report in parse_anomaly_reports(log(reports)):
+        count += report["anomaly_count"]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = sum(len(line) for line in log(reports))
+    print(f"⏱️  Parsed {size / 1e6:.1f}MB in {elapsed:.2f}s (peak {peak / 1024:.0f}KB traced)")
+    assert count == reports * 50
+    assert peak < 1024 * 1024  # The log is never held in memory
+    print("✅ Memory stays flat regardless of log size")
+
+
+if __name__ == "__main__":
+    test_example_log()
+    test_streaming_yields()
+    test_constant_memory()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script for the time-indexed anomaly store: window and recency queries
+against a brute-force scan, out-of-order reports, trimming, correlating
+many attack windows against a day of detector output, and loading statistics.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import random
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from anomaly_parser import parse_anomaly_reports
+from anomaly_store import AnomalyIndex, LoadingStats, grade_severity
+from toolkits.chronicler_tools import _correlated_reports
+
+DAY_START = datetime(2025, 9, 17)
+
+
+def _report(report_time: datetime, anomaly_times, loading: float = 890.39) -> dict:
+    return {
+        "report_timestamp": report_time.strftime("%Y-%m-%d %H:%M:%S"),
+        "anomaly_timestamps": [t.strftime("%Y-%m-%d %H:%M:%S.%f") for t in anomaly_times],
+        "anomaly_loadings": [loading] * len(anomaly_times),
+        "anomaly_count": len(anomaly_times),
+    }
+
+
+def _day_of_reports(reports: int = 2000, per_report: int = 40):
+    rng = random.Random(7)
+    result = []
+    for i in range(reports):
+        report_time = DAY_START + timedelta(seconds=i * 86400 / reports)
+        anomalies = sorted(report_time - timedelta(seconds=rng.uniform(0, 600)) for _ in range(per_report))
+        result.append(_report(report_time, anomalies, loading=100 + i % 900))
+    return result
+
+
+def test_window_queries():
+    """Test window, first-after and recency queries against a brute-force scan."""
+    print("🧪 Testing Window Queries...")
+
+    reports = _day_of_reports(reports=200, per_report=10)
+    index = AnomalyIndex(reports)
+    assert len(index) == 2000 and index.reports == reports
+
+    rng = random.Random(3)
+    for _ in range(50):
+        start = DAY_START + timedelta(seconds=rng.uniform(0, 86400))
+        end = start + timedelta(minutes=rng.choice([1, 15, 60]))
+        expected = [r for r in reports if any(start <= datetime.fromisoformat(ts) <= end
+                                              for ts in r["anomaly_timestamps"])]
+        assert index.reports_in_window(start, end) == expected
+        assert index.count_in_window(start, end) == sum(
+            start <= datetime.fromisoformat(ts) <= end for r in reports for ts in r["anomaly_timestamps"])
+
+    when = DAY_START + timedelta(hours=12)
+    first = index.first_after(when)
+    earliest = min(datetime.fromisoformat(ts) for r in reports for ts in r["anomaly_timestamps"]
+                   if datetime.fromisoformat(ts) >= when)
+    assert first.time == np.datetime64(earliest, "us") and first.report is index.report(first.report_id)
+    assert index.first_after(DAY_START + timedelta(days=2)) is None
+
+    recent = index.recent_reports(minutes=30, now=DAY_START + timedelta(hours=23, minutes=59))
+    assert recent == [r for r in reports
+                      if datetime.fromisoformat(r["report_timestamp"]) >= DAY_START + timedelta(hours=23, minutes=29)]
+    print("✅ Binary-search queries match a full scan")
+
+
+def test_out_of_order_and_trim():
+    """Test that late reports are sorted in, malformed timestamps skipped and old reports trimmed."""
+    print("\n🧪 Testing Out-of-Order Reports and Trimming...")
+
+    index = AnomalyIndex()
+    late = _report(DAY_START + timedelta(hours=2), [DAY_START + timedelta(hours=2)])
+    early = _report(DAY_START + timedelta(hours=1), [DAY_START + timedelta(hours=1)], loading=120.5)
+    broken = {"report_timestamp": None, "anomaly_timestamps": ["2025-13-40 99:00:00.000000"], "anomaly_count": 1}
+    assert index.add([late]) == [0] and index.add([early, broken]) == [1, 2]
+
+    assert np.all(np.diff(index.arrays.times) >= np.timedelta64(0, "us")) and len(index) == 2
+    assert index.first_after(DAY_START).report is early and index.first_after(DAY_START).loading == 120.5
+    assert index.recent_reports(minutes=60 * 24, now=DAY_START + timedelta(hours=3)) == [late, early]
+
+    index.trim(2)
+    assert index.reports == [early, broken] and index.report(1) is early
+    assert index.reports_in_window(DAY_START, DAY_START + timedelta(days=1)) == [early]
+    print("✅ Index stays sorted and consistent")
+
+
+def test_chronicler_correlation():
+    """Test the Chronicler's attack-window correlation on the example detector log."""
+    print("\n🧪 Testing Chronicler Correlation...")
+
+    with open("anomaly_detector_log_example.txt", encoding="utf-8") as f:
+        index = AnomalyIndex(parse_anomaly_reports(f))
+    first = index.arrays.times[0].astype(datetime)
+
+    assert len(_correlated_reports(index, first.strftime("%Y-%m-%dT%H:%M:%S"), 60)) >= 1
+    assert _correlated_reports(index, "2020-01-01T00:00:00", 60) == []
+    assert _correlated_reports(index, "not a timestamp", 60) == []
+
+    # The example's anomalies span 18:52:40 to 20:00:49: two hourly buckets, no empty one after them
+    starts, series = index.loading_series(3600)
+    assert len(starts) == 2 and list(series.count) == [73, 16]
+    starts, series = index.loading_series(60)
+    assert len(starts) == 69 and series.count.sum() == 89 and series.count[-1] > 0
+    print("✅ Attack windows correlate through the index")
+
+
+def test_many_windows():
+    """Test correlating many attack windows against a day of detector output."""
+    print("\n🧪 Testing Bulk Correlation...")
+
+    reports = _day_of_reports()
+    start = time.perf_counter()
+    index = AnomalyIndex(reports)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.default_rng(11)
+    starts = np.datetime64(DAY_START, "us") + rng.integers(0, 86400, 10000).astype("timedelta64[s]")
+    ends = starts + np.timedelta64(30, "m")
+
+    start = time.perf_counter()
+    counts = index.correlate(starts, ends)
+    correlate_ms = (time.perf_counter() - start) * 1000
+
+    print(f"⏱️  Indexed {len(index)} anomalies in {build_ms:.1f}ms; "
+          f"correlated {len(starts)} windows in {correlate_ms:.2f}ms")
+    assert counts[0] == index.count_in_window(starts[0], ends[0])
+    assert counts.sum() > 0 and correlate_ms < 100
+    print("✅ Thousands of windows correlate in milliseconds")
+
+
+def test_loading_stats():
+    """Test window statistics against hand-computed values, and severity grades."""
+    print("\n🧪 Testing Loading Statistics...")
+
+    # Samples every 10s: loadings 50, 150, 250, 350 (+ one without a loading value)
+    times = [DAY_START + timedelta(seconds=10 * i) for i in range(5)]
+    report = _report(DAY_START, times)
+    report["anomaly_loadings"] = [50.0, 150.0, 250.0, 350.0, None]
+    index = AnomalyIndex([report])
+
+    stats = index.window_stats(DAY_START, DAY_START + timedelta(seconds=45))
+    assert stats.count == 5 and stats.peak == 350.0 and stats.mean == 200.0
+    # 150, 250 and 350 are over 100% until the next sample: 3 x 10s
+    assert stats.seconds_over_threshold == 30.0
+    assert abs(stats.rate_per_minute - 5 / 0.75) < 1e-9
+
+    # The last sample in a window is credited only up to the window's end
+    partial = index.window_stats(DAY_START + timedelta(seconds=10), DAY_START + timedelta(seconds=24))
+    assert partial.count == 2 and partial.seconds_over_threshold == 14.0
+
+    empty = index.window_stats(DAY_START + timedelta(hours=1), DAY_START + timedelta(hours=2))
+    assert empty.count == 0 and np.isnan(empty.peak) and grade_severity(empty) == "NONE"
+
+    assert grade_severity(stats) == "HIGH"   # peak 350%
+    assert grade_severity(LoadingStats(1, 120.0, 120.0, 0.0, 0.1)) == "MODERATE"
+    assert grade_severity(LoadingStats(1, np.nan, np.nan, 0.0, 12.0)) == "CRITICAL"
+    assert grade_severity(LoadingStats(1, 80.0, 80.0, 0.0, 0.1)) == "LOW"
+
+    starts, series = index.loading_series(20)
+    assert list(series.count) == [2, 2, 1] and list(series.peak[:2]) == [150.0, 350.0]
+    assert np.isnan(series.peak[2]) and starts[0] == np.datetime64(DAY_START, "us")
+    print("✅ Statistics match hand-computed values")
+
+
+def test_million_sample_stats():
+    """Test statistics over many windows of a million-sample series."""
+    print("\n🧪 Testing Statistics at Scale...")
+
+    rng = np.random.default_rng(5)
+    samples = 1_000_000
+    times = np.datetime64(DAY_START, "us") + np.sort(rng.integers(0, 86_400_000_000, samples)).astype("timedelta64[us]")
+    loadings = rng.uniform(50, 900, samples)
+    index = AnomalyIndex([{"report_timestamp": None, "anomaly_timestamps": [None] * samples,
+                           "anomaly_times": times, "anomaly_loadings": loadings, "anomaly_count": samples}])
+
+    starts = np.datetime64(DAY_START, "us") + np.arange(0, 86400, 60).astype("timedelta64[s]")
+    ends = starts + np.timedelta64(5, "m")
+    start = time.perf_counter()
+    stats = index.window_stats_many(starts, ends)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    lo, hi = np.searchsorted(times, starts[100]), np.searchsorted(times, ends[100], side="right")
+    assert stats.count[100] == hi - lo and stats.peak[100] == loadings[lo:hi].max()
+    assert abs(stats.mean[100] - loadings[lo:hi].mean()) < 1e-6
+    print(f"⏱️  {len(starts)} window statistics over {samples} samples in {elapsed_ms:.1f}ms")
+    assert elapsed_ms < 1000
+    print("✅ Statistics without reparsing text")
+
+
+if __name__ == "__main__":
+    test_window_queries()
+    test_out_of_order_and_trim()
+    test_chronicler_correlation()
+    test_many_windows()
+    test_loading_stats()
+    test_million_sample_stats()
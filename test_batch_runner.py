@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for the parallel batch mission runner helpers.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.getcwd())
+
+import rag_service
+import red_army
+import toolkits.reporting_tools as reporting_tools
+from batch_runner import load_missions, run_batch, summarize_results
+from artifact_store import artifact_store
+from mission_history import HistoryRecord, INLINE_OUTPUT_LIMIT
+
+
+def test_load_missions():
+    """Test loading objectives and initial state overrides from JSON Lines and JSON lists."""
+    print("🧪 Testing Batch Mission Loading...")
+
+    entries = [
+        "Open the substation circuit breaker",
+        {"id": "stealth-01", "objective": "Evade the detector", "feedback": "Previous run was detected"},
+        {"objective": "Persist on the PLC", "initial_state": {"revision_number": 2}},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "missions.jsonl")
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(json.dumps(entry) for entry in entries) + "\n")
+
+        json_path = os.path.join(tmp, "missions.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+
+        for path in (jsonl_path, json_path):
+            missions = load_missions(path)
+            print(f"📋 Loaded {len(missions)} missions from {os.path.basename(path)}")
+
+            assert [m["id"] for m in missions] == ["mission-0001", "stealth-01", "mission-0003"]
+            assert missions[0]["initial_state"] == {}
+            assert missions[1]["initial_state"] == {"feedback": "Previous run was detected"}
+            assert missions[2]["initial_state"] == {"revision_number": 2}
+
+    print("✅ Mission files parsed correctly")
+
+
+def test_summarize_results():
+    """Test throughput and latency aggregation."""
+    print("\n🧪 Testing Batch Result Summary...")
+
+    results = [
+        {"mission_status": "SUCCESS", "latency_seconds": 10.0},
+        {"mission_status": "FAILED", "latency_seconds": 30.0},
+        {"mission_status": "SUCCESS", "latency_seconds": 20.0},
+    ]
+    summary = summarize_results(results, elapsed_seconds=36.0)
+    print(f"📊 Summary: {summary}")
+
+    assert summary["missions"] == 3
+    assert summary["missions_per_hour"] == 300.0
+    assert summary["status_counts"] == {"SUCCESS": 2, "FAILED": 1}
+    assert summary["latency_seconds"]["p50"] == 20.0
+    assert summary["latency_seconds"]["max"] == 30.0
+    print("✅ Summary statistics correct")
+
+
+class SlowLLM:
+    def invoke(self, messages):
+        time.sleep(0.5)
+        return type("Response", (), {"content": "Enriched report"})()
+
+
+class StubApp:
+    """Stands in for the compiled workflow: one Chronicler step and a background enrichment, or a crash."""
+
+    def __init__(self, enriched_dir=None):
+        self.enriched_dir = enriched_dir
+        self.artifacts = []   # Per worker after the fork
+
+    def invoke(self, state, config):
+        leaked = [artifact_id for artifact_id in self.artifacts if artifact_id in artifact_store]
+        if leaked:
+            raise RuntimeError(f"artifacts of earlier missions still in memory: {leaked}")
+        if "crash" in state["objective"]:
+            raise RuntimeError("graph exploded")
+        if self.enriched_dir:
+            def save(report):
+                with open(os.path.join(self.enriched_dir, state["mission_id"]), "w", encoding="utf-8") as f:
+                    f.write(report)
+            reporting_tools.enrich_mission_debrief("Templated report", state["objective"], "", save)
+        output = f"Analysis: FAILURE. GridGuardian shows 2 recent anomaly report(s). {state['mission_id']} "
+        step = HistoryRecord("Chronicler", "analyze_gridguardian_logs()", output.ljust(INLINE_OUTPUT_LIMIT + 1, "."),
+                             tool="analyze_gridguardian_logs", duration=0.1)
+        self.artifacts.append(step.artifact_id)
+        return dict(state, plan=[{}], current_task_index=1, history=[step], feedback=step.output)
+
+
+def build_index(index_path):
+    """Stands in for rag_service.build_index in the spawned helper: saves a fake index and its builder's pid."""
+    with open(os.path.join(index_path, "index.faiss"), "w", encoding="utf-8") as f:
+        f.write(f"{os.getpid()}\n")
+    return True
+
+
+def test_run_batch():
+    """Test a batch run end to end with a stubbed workflow and per-worker client initialization."""
+    print("\n🧪 Testing Batch Run...")
+
+    missions = [{"id": f"m-{i}", "objective": "Open the breaker", "initial_state": {}} for i in range(4)]
+    missions.append({"id": "broken", "objective": "crash the graph", "initial_state": {}})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        init_log = os.path.join(tmp, "init.log")
+
+        def initialize_rag(index_path=None):
+            with open(os.path.join(index_path, "index.faiss"), encoding="utf-8") as f:
+                builder_pid = f.read().strip()
+            with open(init_log, "a", encoding="utf-8") as f:
+                f.write(f"{os.getpid()} {builder_pid}\n")
+            return True
+
+        enriched_dir = os.path.join(tmp, "enriched")
+        os.makedirs(enriched_dir)
+        patched = {"build_app": StubApp, "initialize_rag": initialize_rag}
+        originals = {name: getattr(red_army, name) for name in patched}
+        get_llm, real_build_index = reporting_tools.get_llm, rag_service.build_index
+        vars(red_army).update(patched, app=StubApp(enriched_dir))
+        reporting_tools.get_llm = SlowLLM
+        rag_service.build_index = build_index
+        try:
+            output = os.path.join(tmp, "results.jsonl")
+            summary = run_batch(missions, output, workers=2, log_dir=os.path.join(tmp, "logs"))
+        finally:
+            vars(red_army).update(originals)
+            vars(red_army).pop("app")
+            reporting_tools.get_llm = get_llm
+            rag_service.build_index = real_build_index
+
+        with open(output, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        results = {line["id"]: line for line in lines[:-1]}
+        print(f"📊 Summary: {summary}")
+
+        assert lines[-1] == {"summary": summary} and summary["missions"] == 5
+        assert summary["status_counts"].get("ERROR") == 1 and "graph exploded" in results["broken"]["error"]
+        # Each worker discarded the previous mission's artifacts before the next one started
+        assert all(results[f"m-{i}"]["error"] is None and results[f"m-{i}"]["history_entries"] == 1 for i in range(4))
+        assert all(results[f"m-{i}"]["steps"][0]["detected"] for i in range(4))
+        assert len(os.listdir(os.path.join(tmp, "logs"))) == 5
+        # Workers waited for the background enrichments before returning
+        assert sorted(os.listdir(enriched_dir)) == [f"m-{i}" for i in range(4)]
+
+        # The index is embedded once in a spawned helper; clients are created once per
+        # worker from that index, after the fork, and never in the parent
+        with open(init_log, encoding="utf-8") as f:
+            inits = [tuple(int(pid) for pid in line.split()) for line in f]
+        init_pids = {pid for pid, _ in inits}
+        builder_pids = {builder_pid for _, builder_pid in inits}
+        assert os.getpid() not in init_pids and 1 <= len(init_pids) <= 2 and len(inits) == len(init_pids)
+        assert {r["worker_pid"] for r in results.values()} <= init_pids
+        assert len(builder_pids) == 1 and not builder_pids & (init_pids | {os.getpid()})
+        assert not rag_service.rag_service.initialized and rag_service.rag_service.vector_store is None
+    print("✅ Batch results, errors, shared RAG index and per-worker initialization correct")
+
+
+if __name__ == "__main__":
+    test_load_missions()
+    test_summarize_results()
+    test_run_batch()
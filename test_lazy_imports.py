@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that importing the Red Army modules is fast and free of
+side effects (no heavy dependencies, no RAG initialization, no console output).
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from import_benchmark import measure_import, DEFAULT_MODULES, DEFAULT_BUDGET_MS
+
+
+def test_imports_are_lazy():
+    """Test that no entry point pulls in scapy, nmap, langgraph or the Gemini clients at import."""
+    print("🧪 Testing Lazy Module Imports...")
+
+    for module in DEFAULT_MODULES:
+        result = measure_import(module)
+        print(f"📦 {module}: {result['import_ms']:.1f}ms, heavy modules: {result['leaked_heavy_modules'] or 'none'}")
+
+        assert not result["leaked_heavy_modules"], f"{module} imports {result['leaked_heavy_modules']}"
+        assert not result["stdout"].strip(), f"{module} prints at import: {result['stdout'][:200]}"
+
+    print("✅ All modules import without heavy dependencies or side effects")
+
+
+def test_cli_cold_start():
+    """Test that the CLI module imports well within the startup budget."""
+    print("\n🧪 Testing CLI Cold Start...")
+
+    result = measure_import("red_army")
+    print(f"⏱️  red_army import: {result['import_ms']:.1f}ms (budget {DEFAULT_BUDGET_MS:.0f}ms)")
+
+    assert result["import_ms"] < DEFAULT_BUDGET_MS
+    print("✅ CLI cold start within budget")
+
+
+if __name__ == "__main__":
+    test_imports_are_lazy()
+    test_cli_cold_start()
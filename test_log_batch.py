@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline detector log batch analysis: per-file and
+aggregate statistics across plain and compressed rotations, attack window
+correlation, columnar export, the CLI and throughput reporting.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import gzip
+import json
+import tempfile
+import pandas as pd
+from log_batch import analyze_log_directory, build_tables, export_tables, find_logs, load_attack_windows, main
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+REPEATS = 300
+
+
+def _write_archive(directory: str) -> int:
+    """An archive directory of detector logs; returns the example log's line count."""
+    with open(EXAMPLE_LOG, "rb") as f:
+        example = f.read()
+    os.makedirs(os.path.join(directory, "exercise-02"))
+    files = {
+        "anomaly_detector.log": example,
+        "anomaly_detector.log.2": example * REPEATS,
+        "anomaly_detector.log.3": b"",
+        "anomaly_detector.log.4.gz": b"not gzip data",
+        "notes.txt": b"not a detector log",
+    }
+    for name, data in files.items():
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(data)
+    with gzip.open(os.path.join(directory, "exercise-02", "anomaly_detector.log.1.gz"), "wb") as f:
+        f.write(example)
+    return example.count(b"\n")
+
+
+def _windows_file(directory: str) -> str:
+    path = os.path.join(directory, "attacks.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "overload", "start": "2025-09-17T18:50:00", "minutes": 15}) + "\n")
+        f.write(json.dumps({"id": "old-exercise", "start": "2020-01-01T00:00:00"}) + "\n")
+    return path
+
+
+def test_directory_analysis():
+    """Test per-file rows, window correlation and the aggregate summary."""
+    print("🧪 Testing Directory Analysis...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        example_lines = _write_archive(tmp)
+        assert len(find_logs(tmp)) == 5 and find_logs(tmp)[0].endswith(".log.2")   # Largest first
+
+        windows = load_attack_windows(_windows_file(tmp))
+        result = analyze_log_directory(tmp, workers=2, attack_windows=windows)
+
+        rows = {os.path.relpath(row["path"], tmp): row for row in result.files}
+        for name in ("anomaly_detector.log", os.path.join("exercise-02", "anomaly_detector.log.1.gz")):
+            assert rows[name]["reports"] == 2 and rows[name]["anomalies"] == 89, rows[name]
+            assert rows[name]["lines"] == example_lines and rows[name]["severity"] == "CRITICAL"
+        big = rows["anomaly_detector.log.2"]
+        assert big["reports"] == 2 * REPEATS and big["anomalies"] == 89 * REPEATS
+        assert rows["anomaly_detector.log.3"]["reports"] == 0 and rows["anomaly_detector.log.3"]["severity"] == "NONE"
+        assert rows["anomaly_detector.log.4.gz"]["error"]
+
+        assert {row["window_id"] for row in result.windows} == {"overload"}
+        overload = [row for row in result.windows if row["path"].endswith("anomaly_detector.log")][0]
+        assert overload["reports"] >= 1 and overload["anomalies"] > 0
+
+        summary = result.summary
+        assert summary["files"] == 5 and summary["failed_files"] == 1 and summary["files_with_anomalies"] == 3
+        assert summary["anomalies"] == 89 * (REPEATS + 2) and summary["detected_windows"] == 1
+        assert summary["lines"] == example_lines * (REPEATS + 2)
+        assert summary["first_anomaly"].startswith("2025-09-17T18:52:40")
+        print(f"⏱️  {summary['bytes'] / 1e6:.1f} MB in {summary['elapsed_seconds']:.2f}s: "
+              f"{summary['mb_per_second']:.1f} MB/s, {summary['lines_per_second']:,.0f} lines/s "
+              f"on {summary['workers']} workers")
+        assert summary["mb_per_second"] > 0 and summary["lines_per_second"] > 0
+    print("✅ Every log analyzed with per-file attribution")
+
+
+def test_columnar_export_and_cli():
+    """Test the exported tables and the command line entry point."""
+    print("\n🧪 Testing Columnar Export and CLI...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = os.path.join(tmp, "logs")
+        os.makedirs(logs)
+        _write_archive(logs)
+        windows = load_attack_windows(_windows_file(tmp))
+
+        tables = build_tables(analyze_log_directory(logs, workers=1, attack_windows=windows))
+        paths = export_tables(tables, os.path.join(tmp, "out"))
+        files = pd.read_parquet(os.path.join(tmp, "out", "log_files.parquet"))
+        assert len(paths) == 3 and len(files) == 5
+        assert str(files["first_anomaly"].dtype).startswith("datetime64") and files["error"].notna().sum() == 1
+        summary = pd.read_parquet(os.path.join(tmp, "out", "log_summary.parquet"))
+        assert summary["severity_critical"][0] == 3 and summary["severity_none"][0] == 1
+
+        assert main([logs, "--windows", os.path.join(tmp, "attacks.jsonl"), "--workers", "2",
+                     "--export-dir", os.path.join(tmp, "cli"), "--format", "feather"]) == 0
+        windows_table = pd.read_feather(os.path.join(tmp, "cli", "log_windows.feather"))
+        assert set(windows_table["window_id"]) == {"overload"} and len(windows_table) == 3
+    print("✅ Tables export as Parquet and Feather")
+
+
+if __name__ == "__main__":
+    test_directory_analysis()
+    test_columnar_export_and_cli()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental log reader: cursor-based reads, reports split
+across reads, rotation and truncation, and the in-container read script.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import subprocess
+import tempfile
+from log_reader import IncrementalLogReader, LineCursor
+from log_sources import DockerExecSource, LocalFileSource
+
+
+def _report(minute: int, anomalies: int = 3) -> str:
+    lines = ["2025-09-17 15:01:14 - INFO - ", f"2025-09-17 15:{minute:02d}:14 - INFO - 🚨 ANOMALY DETECTED!",
+             "2025-09-17 15:01:14 - INFO - Unusual power line loading detected at the following times:"]
+    lines += [f"2025-09-17 15:01:14 - INFO -   ⚡ 2025-09-17 18:{(minute + i // 60) % 60:02d}:{i % 60:02d}.009034: 890.39% loading"
+              for i in range(anomalies)]
+    lines.append("2025-09-17 15:01:14 - INFO - 📋 END ANOMALY REPORT")
+    return "\n".join(lines) + "\n"
+
+
+def _append(path: str, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_incremental_reads():
+    """Test that each read only parses appended bytes, including reports split across reads."""
+    print("🧪 Testing Incremental Log Reads...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        _append(path, _report(1) + _report(2, anomalies=300))  # Longer than the old 200-line window
+        reader = IncrementalLogReader()
+        source = LocalFileSource(path)
+
+        first = reader.read(source)
+        assert [r["anomaly_count"] for r in first.reports] == [3, 300] and first.reset
+
+        assert reader.read(source).bytes_read == 0  # Nothing new
+
+        # A report written in two halves is only parsed once complete
+        report = _report(3)
+        _append(path, report[:len(report) // 2])
+        partial = reader.read(source)
+        assert partial.new_reports == [] and partial.bytes_read > 0
+        _append(path, report[len(report) // 2:])
+        completed = reader.read(source)
+        assert len(completed.new_reports) == 1 and len(completed.reports) == 3
+        assert completed.bytes_read == len(report.encode("utf-8")) - partial.bytes_read
+    print("✅ Only new bytes are read and parsed")
+
+
+def test_rotation_and_truncation():
+    """Test that rotated and truncated logs are re-read from the start, keeping parsed reports."""
+    print("\n🧪 Testing Rotation and Truncation...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        _append(path, _report(1))
+        reader = IncrementalLogReader()
+        source = LocalFileSource(path)
+        reader.read(source)
+
+        os.rename(path, path + ".1")
+        _append(path, _report(2))
+        rotated = reader.read(source)
+        assert rotated.reset and len(rotated.new_reports) == 1 and len(rotated.reports) == 2
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_report(3, anomalies=1))
+        truncated = reader.read(source)
+        assert truncated.reset and len(truncated.reports) == 3
+
+        # Attaching to a long log starts near its end
+        tail_reader = IncrementalLogReader(max_initial_bytes=len(_report(4)) + 10)
+        _append(path, _report(4))
+        assert [r["report_timestamp"] for r in tail_reader.read(source).reports] == ["2025-09-17 15:04:14"]
+    print("✅ Rotation and truncation handled")
+
+
+def test_mid_file_start():
+    """Test that a read starting mid-file keeps a line starting exactly at the window and skips partial ones."""
+    print("\n🧪 Testing Mid-File Starts...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "monitor.log")
+        _append(path, "line one\nline two\n")
+        source = LocalFileSource(path)
+        assert LineCursor().advance(source, max_initial_bytes=len("line two\n"))[0] == ["line two"]
+        assert LineCursor().advance(source, max_initial_bytes=len("ine two\n"))[0] == []
+
+        # The window starts inside a line that has no newline yet: its rest is
+        # dropped when it arrives, not parsed as a line of its own
+        _append(path, "x" * 100)
+        cursor = LineCursor()
+        assert cursor.advance(source, max_initial_bytes=10)[0] == []
+        _append(path, "x" * 100)
+        assert cursor.advance(source, max_initial_bytes=10)[0] == []
+        _append(path, "xx end of long line\nline three\n")
+        assert cursor.advance(source, max_initial_bytes=10)[0] == ["line three"]
+    print("✅ Only complete lines are read after a mid-file start")
+
+
+def test_container_read_script():
+    """Test the script run inside the container with a local shell."""
+    print("\n🧪 Testing Container Read Script...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        _append(path, "line one\nline two\n")
+        inode = os.stat(path).st_ino
+
+        def run(cursor_inode, offset, max_initial=1024):
+            out = subprocess.run(["sh", "-c", DockerExecSource.SCRIPT, "sh", path, str(cursor_inode), str(offset),
+                                  str(max_initial)], capture_output=True, check=True).stdout
+            header, _, data = out.partition(b"\n")
+            return tuple(int(v) for v in header.split()), data
+
+        assert run(-1, 0) == ((inode, 0), b"line one\nline two\n")
+        assert run(inode, 9) == ((inode, 9), b"line two\n")
+        assert run(inode, 100) == ((inode, 0), b"line one\nline two\n")  # Truncated
+        assert run(-1, 0, max_initial=5) == ((inode, 13), b" two\n")
+    print("✅ Script resumes from the cursor")
+
+
+if __name__ == "__main__":
+    test_incremental_reads()
+    test_rotation_and_truncation()
+    test_mid_file_start()
+    test_container_read_script()
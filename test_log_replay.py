@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the detector log replay harness: faithful and rebased
+replays, time compression, named pipes, the Chronicler reading a replayed
+log, and the tailing benchmark.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import io
+import tempfile
+import threading
+from datetime import datetime
+from anomaly_parser import parse_anomaly_reports
+from log_replay import benchmark, main, parse_speed, replay, replay_to
+from toolkits.chronicler_tools import analyze_gridguardian_logs
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+REBASE_TO = datetime(2026, 1, 1)
+
+
+def test_rebase_and_loops():
+    """Test that replays are faithful by default and rebased/looped replays keep time moving forward."""
+    print("🧪 Testing Rebased Replays...")
+
+    with open(EXAMPLE_LOG, encoding="utf-8") as f:
+        original = f.read()
+    output = io.StringIO()
+    stats = replay(EXAMPLE_LOG, output, speed=None)
+    assert output.getvalue() == original and stats.reports == 2 and stats.lines == original.count("\n")
+
+    output = io.StringIO()
+    assert replay(EXAMPLE_LOG, output, speed=None, rebase_to=REBASE_TO, loops=3).reports == 6
+    text = output.getvalue()
+    assert text.startswith("2026-01-01 00:00:00 - INFO") and "2025-09-17" not in text
+    reports = list(parse_anomaly_reports(text.splitlines()))
+    assert len(reports) == 6
+    # The example's first anomaly is 3:51:26.009034 after its first line
+    assert reports[0]["anomaly_timestamps"][0] == "2026-01-01 03:51:26.009034"
+    assert reports[2]["anomaly_times"].min() > reports[1]["anomaly_times"].max()   # Loops do not overlap
+
+    assert parse_speed("100x") == 100.0 and parse_speed("2.5") == 2.5 and parse_speed("max") is None
+    print("✅ Timestamps rebased and looped")
+
+
+def test_time_compression():
+    """Test that the 10s between the example's two reports shrink by the speed factor."""
+    print("\n🧪 Testing Time Compression...")
+
+    flushes = []
+    stats = replay(EXAMPLE_LOG, io.StringIO(), speed=20,
+                   on_write=lambda block, when: flushes.append((block.count("END ANOMALY REPORT"), when)))
+    gap = flushes[-1][1] - flushes[0][1]
+    print(f"⏱️  10s of detector output replayed at 20x in {stats.elapsed:.2f}s")
+    assert len(flushes) == 2 and [count for count, _ in flushes] == [1, 1]
+    assert 0.45 <= gap < 1.5 and stats.elapsed < 1.5
+    print("✅ Replay follows the compressed schedule")
+
+
+def test_pipe_and_chronicler():
+    """Test replaying into a named pipe and the Chronicler analyzing a replayed file."""
+    print("\n🧪 Testing Named Pipe and Chronicler...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fifo = os.path.join(tmp, "detector.pipe")
+        os.mkfifo(fifo)
+        received = []
+
+        def consume():
+            with open(fifo, encoding="utf-8") as pipe:
+                received.extend(parse_anomaly_reports(pipe))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        replay_to(EXAMPLE_LOG, fifo, speed=None)
+        consumer.join(timeout=10)
+        assert [report["anomaly_count"] for report in received] == [44, 45]
+
+        log_path = os.path.join(tmp, "anomaly_detector.log")
+        assert main([EXAMPLE_LOG, "--output", log_path, "--speed", "max", "--rebase", REBASE_TO.isoformat()]) == 0
+        result = analyze_gridguardian_logs.invoke({"attack_start_time": "2026-01-01T03:50:00",
+                                                   "attack_duration_minutes": 30, "log_source": log_path})
+        assert result.startswith("Analysis: FAILURE"), result
+    print("✅ Replayed logs feed pipes and the Chronicler")
+
+
+def test_benchmark():
+    """Test the tailing benchmark end to end."""
+    print("\n🧪 Testing Replay Benchmark...")
+
+    results = benchmark(EXAMPLE_LOG, speed=None, loops=50, windows=1000)
+    latency = results["latency_ms"]
+    print(f"⏱️  {results['reports_parsed']} reports: tail {results['tail_mb_per_second']:.1f} MB/s, "
+          f"parse {results['parse_lines_per_second']:,.0f} lines/s, latency p50 {latency['p50']:.1f}ms, "
+          f"{results['correlate_windows_per_second']:,.0f} windows/s")
+    assert results["reports_parsed"] == 100 and results["anomalies_indexed"] == 89 * 50
+    assert results["replay"]["reports"] == 100 and 0 <= latency["p50"] <= latency["max"]
+    assert results["parse_lines_per_second"] > 0 and results["correlate_windows_per_second"] > 0
+    print("✅ Benchmark measures tailing, parsing and correlation")
+
+
+if __name__ == "__main__":
+    test_rebase_and_loops()
+    test_time_compression()
+    test_pipe_and_chronicler()
+    test_benchmark()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Test script for the Chronicler's log sources: mmap'd local files, compressed
+archives, the fixture stand-in, source specs, and the Docker Engine API
+sources against a small API server on a unix socket.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import gzip
+import http.server
+import json
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.parse
+from anomaly_parser import parse_anomaly_reports
+from log_reader import IncrementalLogReader
+from log_sources import (ArchiveSource, DockerAPISource, DockerEngineClient, DockerExecSource, DockerLogsSource,
+                         FixtureSource, LocalFileSource, LogSource, LogSourceError, open_log_source)
+from log_watcher import LogWatcher
+from toolkits.chronicler_tools import analyze_gridguardian_logs
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+
+
+def test_local_and_archive_sources():
+    """Test mmap'd local files and streamed archives, incrementally and in bulk."""
+    print("🧪 Testing Local File and Archive Sources...")
+
+    with open(EXAMPLE_LOG, "rb") as f:
+        example = f.read()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        with open(path, "wb") as f:
+            f.write(example)
+        archive = path + ".1.gz"
+        with gzip.open(archive, "wb") as f:
+            f.write(example)
+        empty = os.path.join(tmp, "empty.log")
+        open(empty, "wb").close()
+
+        reader = IncrementalLogReader()
+        for source in (LocalFileSource(path), ArchiveSource(archive)):
+            assert [r["anomaly_count"] for r in reader.read(source).reports] == [44, 45]
+            assert reader.read(source).bytes_read == 0  # Nothing new; archives are not decompressed again
+            assert len(list(parse_anomaly_reports(source.iter_lines()))) == 2
+
+        assert reader.read(LocalFileSource(empty)).reports == []
+        assert list(LocalFileSource(empty).iter_lines()) == []
+
+        tail = ArchiveSource(archive).read(None, 0, max_initial_bytes=100)
+        assert tail.start == len(example) - 100 and tail.data == example[-100:]
+
+        try:
+            LocalFileSource(os.path.join(tmp, "missing.log")).read(None, 0)
+            assert False, "missing file should raise"
+        except LogSourceError as e:
+            assert "missing.log" in str(e)
+    print("✅ Local and archived logs read")
+
+
+def test_fixture_and_specs():
+    """Test the fixture stand-in and the spec strings the Chronicler accepts."""
+    print("\n🧪 Testing Fixture Source and Specs...")
+
+    reader = IncrementalLogReader()
+    fixture = FixtureSource(EXAMPLE_LOG, chunk_bytes=2048)
+    counts = [len(reader.read(fixture).new_reports) for _ in range(12)]
+    assert sum(counts) == 2 and counts[0] == 0  # Reports appear as the replay reaches them
+
+    assert isinstance(open_log_source("/tmp/detector.log"), LocalFileSource)
+    assert isinstance(open_log_source("/tmp/detector.log.2.zst"), ArchiveSource)
+    assert isinstance(open_log_source("docker-api:det:/logs/a.log"), DockerAPISource)
+    assert open_log_source("docker-logs:det") is open_log_source("docker-logs:det")
+    assert open_log_source(f"fixture:{EXAMPLE_LOG}@512").chunk_bytes == 512
+    try:
+        open_log_source("docker-exec:det")
+        assert False, "spec without a path should raise"
+    except LogSourceError:
+        pass
+
+    result = analyze_gridguardian_logs.invoke({"attack_start_time": "2025-09-17T18:50:00",
+                                               "log_source": f"fixture:{EXAMPLE_LOG}"})
+    assert result.startswith("Analysis: FAILURE"), result
+    error = analyze_gridguardian_logs.invoke({"log_source": "/nonexistent/anomaly_detector.log"})
+    assert error.startswith("Analysis Error"), error
+
+    class TailOnlySource(LogSource):
+        def read(self, cursor_inode, cursor_offset, max_initial_bytes=0):
+            return None
+
+    try:
+        TailOnlySource()   # No iter_lines: rejected when built, not halfway through a read
+        assert False, "an incomplete source should not be constructible"
+    except TypeError:
+        pass
+    print("✅ Fixture replays and specs resolve")
+
+
+class _FakeDockerAPI(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Just enough of the Docker Engine API: container logs and exec, run against local files."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, log_entries):
+        self.log_entries = log_entries   # [(RFC 3339 timestamp, line)]
+        self.connections = 0
+        self.since_values = []
+        self.execs = {}
+        super().__init__(socket_path, _FakeDockerHandler)
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def _frame(data: bytes, stream: int = 1) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(data).to_bytes(4, "big") + data
+
+
+class _FakeDockerHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bytes, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        if url.path == "/v1.41/containers/det/logs":
+            since = query.get("since")
+            self.server.since_values.append(since)
+            entries = [(ts, line) for ts, line in self.server.log_entries
+                       if since is None or _unix(ts) >= float(since) - 1e-6]
+            prefix = query.get("timestamps") == "1"
+            self._send(b"".join(_frame(((ts + " ") if prefix else "").encode() + line.encode() + b"\n")
+                                for ts, line in entries))
+        elif url.path.startswith("/v1.41/exec/") and url.path.endswith("/json"):
+            exec_id = url.path.split("/")[3]
+            self._send(json.dumps({"ExitCode": self.server.execs[exec_id]["exit"]}).encode())
+        else:
+            self._send(b'{"message": "no such container"}', 404)
+
+    def do_POST(self):
+        url = urllib.parse.urlparse(self.path)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if url.path == "/v1.41/containers/det/exec":
+            exec_id = f"e{len(self.server.execs)}"
+            self.server.execs[exec_id] = {"cmd": body["Cmd"], "exit": None}
+            self._send(json.dumps({"Id": exec_id}).encode())
+        elif url.path.startswith("/v1.41/exec/") and url.path.endswith("/start"):
+            record = self.server.execs[url.path.split("/")[3]]
+            result = subprocess.run(record["cmd"], capture_output=True)
+            record["exit"] = result.returncode
+            self._send(_frame(result.stdout) + (_frame(result.stderr, 2) if result.stderr else b""))
+        else:
+            self._send(b'{"message": "no such container"}', 404)
+
+
+def _unix(stamp: str) -> float:
+    from datetime import datetime, timezone
+    seconds, _, fraction = stamp.rstrip("Z").partition(".")
+    moment = datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return moment.timestamp() + float(f"0.{fraction or 0}")
+
+
+def test_docker_engine_api():
+    """Test the Engine API sources: one reused connection, since= filtering and exec reads."""
+    print("\n🧪 Testing Docker Engine API Sources...")
+
+    with open(EXAMPLE_LOG, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    entries = [(f"2025-09-17T15:01:{i // 10:02d}.{i % 10}Z", line) for i, line in enumerate(lines[:80])]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, "docker.sock")
+        server = _FakeDockerAPI(socket_path, entries)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = DockerEngineClient(f"unix://{socket_path}")
+            reader = IncrementalLogReader()
+
+            logs = DockerLogsSource("det", client)
+            first = reader.read(logs)
+            assert [r["anomaly_count"] for r in first.reports] == [44]   # Second report still open
+            last_stamp = entries[-1][0]
+            server.log_entries += [(f"2025-09-17T15:02:{i // 10:02d}.{i % 10}Z", line)
+                                   for i, line in enumerate(lines[80:])]
+            read = reader.read(logs)
+            assert [r["anomaly_count"] for r in read.new_reports] == [45] and not read.reset
+            assert server.since_values[0] is None and abs(float(server.since_values[1]) - _unix(last_stamp)) < 1e-6
+            assert reader.read(logs).bytes_read == 0
+            assert len(list(parse_anomaly_reports(logs.iter_lines()))) == 2
+
+            log_path = os.path.join(tmp, "anomaly_detector.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            api = DockerAPISource("det", log_path, client)
+            assert [r["anomaly_count"] for r in reader.read(api).reports] == [44, 45]
+            assert reader.read(api).bytes_read == 0
+            assert len(list(parse_anomaly_reports(api.iter_lines()))) == 2
+
+            connections = server.connections
+            for _ in range(5):
+                reader.read(api)
+            assert server.connections == connections  # Keep-alive connection reused
+
+            try:
+                DockerAPISource("det", os.path.join(tmp, "missing.log"), client).read(None, 0)
+                assert False, "missing file should raise"
+            except LogSourceError as e:
+                assert "exited with" in str(e)
+            try:
+                DockerLogsSource("other", client).read(None, 0)
+                assert False, "unknown container should raise"
+            except LogSourceError as e:
+                assert "404" in str(e)
+        finally:
+            server.shutdown()
+            server.server_close()
+    print(f"✅ Engine API reads over {server.connections} connection(s), no subprocess per read")
+
+
+def test_docker_cli_errors():
+    """Test that a missing or failing docker CLI surfaces as LogSourceError, not a raw exception."""
+    print("\n🧪 Testing Docker CLI Errors...")
+
+    source = DockerExecSource("det", "/logs/anomaly_detector.log")
+    path = os.environ.get("PATH", "")
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            os.environ["PATH"] = tmp              # No docker on the PATH
+            for attempt in (lambda: source.read(None, 0), lambda: list(source.iter_lines())):
+                try:
+                    attempt()
+                    assert False, "a missing docker CLI should raise LogSourceError"
+                except LogSourceError as e:
+                    assert "'docker' command not found" in str(e)
+
+            docker = os.path.join(tmp, "docker")
+            with open(docker, "w", encoding="utf-8") as f:
+                f.write("#!/bin/sh\necho 'Error: No such container: det' >&2\nexit 1\n")
+            os.chmod(docker, 0o755)
+            for attempt in (lambda: source.read(None, 0), lambda: list(source.iter_lines())):
+                try:
+                    attempt()
+                    assert False, "a failing docker exec should raise LogSourceError"
+                except LogSourceError as e:
+                    assert "No such container: det" in str(e)
+
+            # The watcher keeps running on a source it cannot read
+            watcher = LogWatcher(IncrementalLogReader(), interval=0.05)
+            watcher.start("docker-exec:det:/logs/anomaly_detector.log")
+            try:
+                time.sleep(0.2)                   # Several failed polls on the watcher thread
+                assert watcher.poll() == [] and watcher.running
+            finally:
+                watcher.stop()
+        finally:
+            os.environ["PATH"] = path
+    print("✅ Docker CLI failures are reported as log source errors")
+
+
+if __name__ == "__main__":
+    test_local_and_archive_sources()
+    test_fixture_and_specs()
+    test_docker_engine_api()
+    test_docker_cli_errors()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the background log watcher: detections published as the
+detector writes them, delays cut short by a detection, and the detection
+node ending or replanning a running mission.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import tempfile
+import threading
+import time
+from log_reader import IncrementalLogReader
+from log_watcher import LogWatcher, detection_node, detection_pending, log_watcher
+from red_army import agent_router, create_initial_state, detection_router
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+
+
+def _example_halves():
+    """The example log split after its first report."""
+    with open(EXAMPLE_LOG, encoding="utf-8") as f:
+        text = f.read()
+    split = text.index("📋 END ANOMALY REPORT")
+    split = text.index("\n", split) + 1
+    return text[:split], text[split:]
+
+
+def _append_later(path: str, text: str, delay: float) -> threading.Thread:
+    def append():
+        time.sleep(delay)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+    thread = threading.Thread(target=append)
+    thread.start()
+    return thread
+
+
+def test_detections_interrupt_delays():
+    """Test that a report written mid-delay is published and ends the delay early."""
+    print("🧪 Testing Detection Events...")
+
+    first, second = _example_halves()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(first)
+
+        watcher = LogWatcher(IncrementalLogReader(), interval=0.05)
+        watcher.start(path)
+        try:
+            assert watcher.running and watcher.published == 0   # The existing report is the baseline
+            assert watcher.sleep(0.2) == []
+
+            writer = _append_later(path, second, 0.3)
+            start = time.perf_counter()
+            events = watcher.sleep(30, since=0)
+            waited = time.perf_counter() - start
+            writer.join()
+        finally:
+            watcher.stop()
+
+    print(f"⏱️  30s delay ended after {waited:.2f}s")
+    assert waited < 5 and not watcher.running
+    assert len(events) == 1 and events[0].sequence == 1 and events[0].anomaly_count == 45
+    assert events[0].severity == "CRITICAL" and events[0].peak_loading > 500
+    assert watcher.events(since=0) == events and watcher.events(since=1) == []
+    print("✅ Detections are published while the mission runs")
+
+
+def test_missing_log_is_retried():
+    """Test that an unreadable log is reported and watched until it appears."""
+    print("\n🧪 Testing Missing Log...")
+
+    first, second = _example_halves()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        watcher = LogWatcher(IncrementalLogReader(), interval=0.05)
+        watcher.start(path)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(first)
+            time.sleep(0.3)   # First successful read becomes the baseline
+            assert watcher.published == 0
+            _append_later(path, second, 0).join()
+            assert len(watcher.sleep(5, since=0)) == 1
+        finally:
+            watcher.stop()
+    print("✅ Watcher attaches once the log exists")
+
+
+def test_detection_node_policies():
+    """Test that the router hands pending detections to the detection node and the policies."""
+    print("\n🧪 Testing Detection Node...")
+
+    first, second = _example_halves()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anomaly_detector.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(first)
+
+        state = create_initial_state(plan=[
+            {"agent": "Saboteur", "tool_call": "execute_attack_scenario(target_ip='10.0.0.5', scenario_name='Stealth Bypass')"},
+            {"agent": "Saboteur", "tool_call": "craft_modbus_exploit_packet(target_ip='10.0.0.5', register=1, value=0)"},
+            {"agent": "Chronicler", "tool_call": "analyze_gridguardian_logs"},
+        ], current_task_index=1)
+        interval = log_watcher.interval
+        log_watcher.interval = 0.05
+        log_watcher.start(path)
+        try:
+            assert agent_router(state) == "saboteur"
+            _append_later(path, second, 0).join()
+            assert log_watcher.sleep(5, since=state["detections_seen"])
+        finally:
+            log_watcher.stop()
+            log_watcher.interval = interval
+
+    assert detection_pending(state) and agent_router(state) == "detection"
+    update = detection_node(state)
+    assert update["current_task_index"] == 3 and update["detections_seen"] == log_watcher.published
+    assert update["feedback"].startswith("Analysis: FAILURE") and "45 anomalies" in update["feedback"]
+    assert update["history"][0].agent == "Chronicler"
+
+    state.update({key: value for key, value in update.items() if key != "history"})
+    assert not detection_pending(state) and detection_router(state) in ("commander", "reporter")
+    assert create_initial_state()["detections_seen"] == log_watcher.published   # Old detections do not leak
+
+    policy, log_watcher.policy = log_watcher.policy, "abort"
+    try:
+        assert detection_router(state) == "reporter"
+    finally:
+        log_watcher.policy = policy
+    print("✅ Detections end the plan early")
+
+
+if __name__ == "__main__":
+    test_detections_interrupt_delays()
+    test_missing_log_is_retried()
+    test_detection_node_policies()
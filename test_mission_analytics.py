@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-mission analytics: step rows, columnar tables,
+vectorized group-bys and Parquet export.
+"""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append(os.getcwd())
+
+import pandas as pd
+
+from mission_analytics import (step_rows, build_frames, load_results, export_frames,
+                               agent_outcome_rates, scenario_detection_rates, latency_distribution)
+from mission_history import HistoryRecord
+
+
+def make_result(mission_id, scenario, detected, status, latency):
+    verdict = ("Analysis: FAILURE. GridGuardian detected 2 anomaly report(s)." if detected
+               else "Analysis: SUCCESS. No recent anomaly reports found.")
+    history = [
+        HistoryRecord("Infiltrator", "discover_docker_networks()", "Found 2 networks", duration=1.0),
+        HistoryRecord("Saboteur", f"execute_attack_scenario(target_ip='192.168.1.100', scenario_name='{scenario}')",
+                      "{'status': 'SIMULATED'} " * 50, duration=6.0),
+        HistoryRecord("Executioner", "execute_evasion_sequence()", "ERROR: connection refused", duration=0.5),
+        HistoryRecord("Chronicler", "analyze_gridguardian_logs()", verdict, duration=2.0),
+    ]
+    return {"id": mission_id, "mission_status": status, "latency_seconds": latency,
+            "steps": step_rows(mission_id, history)}
+
+
+def test_step_rows_and_group_bys():
+    """Test the per-agent, per-scenario and latency aggregations."""
+    print("🧪 Testing Mission Analytics...")
+
+    results = [
+        make_result("m1", "Stealth Bypass", False, "SUCCESS", 30.0),
+        make_result("m2", "Stealth Bypass", True, "FAILED", 50.0),
+        make_result("m3", "Persistence Attack", True, "FAILED", 70.0),
+        make_result("m4", "Stealth Bypass", False, "SUCCESS", 40.0),
+    ]
+    missions, steps = build_frames(results)
+    print(f"📋 {len(missions)} missions, {len(steps)} steps")
+    assert len(steps) == 16 and list(missions["mission_id"]) == ["m1", "m2", "m3", "m4"]
+    assert str(steps["agent"].dtype) == "category"
+
+    rates = agent_outcome_rates(steps)
+    print(rates)
+    assert rates.loc["Executioner", "failed_rate"] == 1.0
+    assert rates.loc["Infiltrator", "successful_rate"] == 1.0
+    assert rates.loc["Saboteur", "actions"] == 4
+
+    detection = scenario_detection_rates(steps)
+    print(detection)
+    assert detection.loc["Stealth Bypass", "verdicts"] == 3
+    assert abs(detection.loc["Stealth Bypass", "detection_rate"] - 1 / 3) < 1e-9
+    assert detection.loc["Persistence Attack", "detection_rate"] == 1.0
+
+    latency = latency_distribution(missions, steps, quantiles=(0.5,))
+    assert latency["mission_latency"].loc["FAILED", 0.5] == 60.0
+    assert latency["step_duration"].loc["Saboteur", 0.5] == 6.0
+    print("✅ Vectorized aggregations correct")
+
+
+def test_export_round_trip():
+    """Test loading batch result files and exporting Parquet/Feather tables."""
+    print("\n🧪 Testing Columnar Export...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results_path = os.path.join(tmp, "batch_results.jsonl")
+        with open(results_path, 'w', encoding='utf-8') as f:
+            for result in [make_result("m1", "Stealth Bypass", True, "FAILED", 12.0)]:
+                f.write(json.dumps(result) + "\n")
+            f.write(json.dumps({"summary": {"missions": 1}}) + "\n")
+
+        missions, steps = build_frames(load_results([results_path]))
+        for file_format, reader in (("parquet", pd.read_parquet), ("feather", pd.read_feather)):
+            missions_path, steps_path = export_frames(missions, steps, os.path.join(tmp, "out"), file_format)
+            restored = reader(steps_path)
+            print(f"📦 {os.path.basename(steps_path)}: {len(restored)} rows")
+            assert len(restored) == 4
+            assert restored["detected"].dropna().tolist() == [True]
+            assert reader(missions_path)["mission_status"].tolist() == ["FAILED"]
+    print("✅ Tables exported and read back")
+
+
+if __name__ == "__main__":
+    test_step_rows_and_group_bys()
+    test_export_round_trip()
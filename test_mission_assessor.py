@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental mission assessment: running aggregates are
+updated once per history entry and match a from-scratch assessment.
+"""
+
+import json
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from mission_assessor import MissionAssessor
+from mission_history import HistoryRecord
+
+
+class CountingAssessor(MissionAssessor):
+    """Counts how many times history entries are classified."""
+
+    def __init__(self):
+        super().__init__()
+        self.classified = 0
+
+    def _observe_entry(self, aggregate, entry):
+        self.classified += 1
+        super()._observe_entry(aggregate, entry)
+
+
+def make_history():
+    return [
+        HistoryRecord("Infiltrator", "scan_network_for_plcs(subnet='192.168.1.0/24')", "Found PLC at 192.168.1.100"),
+        HistoryRecord("Saboteur", "craft_modbus_exploit_packet(target_ip='<plc_ip>')", "SKIPPED: Task contains unresolved placeholders"),
+        HistoryRecord("Executioner", "execute_direct_attack(target_ip='192.168.1.100')", "ERROR: connection refused"),
+        HistoryRecord("Saboteur", "create_evasion_attack_sequence(target_ip='192.168.1.100')", "Stealth sequence " * 100),
+        HistoryRecord("Chronicler", "analyze_gridguardian_logs()", "SUCCESS: no anomalies detected"),
+    ]
+
+
+def test_incremental_matches_full_assessment():
+    """Test that observing the history step by step gives the same assessment as one full pass."""
+    print("🧪 Testing Incremental Assessment...")
+
+    history = make_history()
+    state = {
+        "objective": "Open the substation circuit breaker",
+        "plan": [{"agent": record.agent, "tool_call": record.tool_call} for record in history],
+        "current_task_index": 0,
+        "feedback": "",
+        "history": [],
+        "revision_number": 1,
+        "mission_id": "incremental-test",
+    }
+
+    incremental = CountingAssessor()
+    for record in history:
+        # LangGraph builds a new list on every step
+        state = {**state, "history": state["history"] + [record], "current_task_index": state["current_task_index"] + 1}
+        incremental.observe(state)
+
+    assessment = incremental.assess_mission_completion(state)
+    report = incremental.generate_detailed_report(assessment, state)
+    print(f"📊 {assessment['mission_status']}: {assessment['summary']}")
+
+    assert incremental.classified == len(history), "each entry must be classified exactly once"
+    full = MissionAssessor().assess_mission_completion(state)
+    assert assessment["mission_status"] == full["mission_status"]
+    assert assessment["detailed_analysis"]["plan_execution"]["failed_tasks"] == 1
+    assert assessment["detailed_analysis"]["plan_execution"]["skipped_tasks"] == 1
+    assert assessment["detailed_analysis"]["agent_performance"]["Saboteur"]["skip_rate"] == 0.5
+    assert assessment["detailed_analysis"]["objective_completion"]["objective_indicators"]["stealth_attack_attempted"]
+    assert "⚠️ Saboteur" in report and "✗ Executioner" in report
+    print("✅ Running aggregates match a full assessment")
+
+
+def test_unrelated_state_resets_aggregates():
+    """Test that a state which does not extend the observed history is reassessed from scratch."""
+    print("\n🧪 Testing Aggregate Reset...")
+
+    assessor = CountingAssessor()
+    first = {"objective": "x", "plan": [], "current_task_index": 0, "feedback": "", "history": make_history()}
+    second = {**first, "history": ["Infiltrator: Found target PLCs", "Saboteur: Crafted exploit successfully",
+                                   "Chronicler: FAILURE detected", "Executioner: done", "Reporter: done", "Extra: entry"]}
+
+    assessor.observe(first)
+    aggregate = assessor.observe(second)
+    assert aggregate.entries_seen == 6
+    assert len(aggregate.task_outcomes["failed"]) == 1
+    assert assessor.classified == 11
+    print("✅ Aggregates rebuilt for an unrelated history")
+
+
+class RecordingSink:
+    """File-like sink that keeps every write separately."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def test_streaming_report():
+    """Test that reports stream line by line, truncate long actions and export JSON lines."""
+    print("\n🧪 Testing Streaming Report Rendering...")
+
+    history = make_history()
+    state = {"objective": "Open the substation circuit breaker", "plan": [{}] * 5, "current_task_index": 5,
+             "feedback": "", "history": history, "revision_number": 1, "mission_id": "stream-test"}
+    assessor = MissionAssessor()
+    assessment = assessor.assess_mission_completion(state)
+
+    text_sink = RecordingSink()
+    assessor.write_report(assessment, state, text_sink, max_action_chars=80, link_artifacts=True)
+    assert len(text_sink.writes) > 20 and all(write.endswith("\n") for write in text_sink.writes)
+    assert "".join(text_sink.writes).rstrip("\n") != assessor.generate_detailed_report(assessment, state)
+    assert f"[artifact {history[3].artifact_id}]" in "".join(text_sink.writes)
+    assert max(len(write) for write in text_sink.writes) < 200
+
+    json_sink = RecordingSink()
+    assessor.write_report(assessment, state, json_sink, report_format="jsonl", max_action_chars=80, link_artifacts=True)
+    records = [json.loads(write) for write in json_sink.writes]
+    print(f"📋 {len(records)} JSON records: {sorted({record['type'] for record in records})}")
+    assert records[0]["type"] == "assessment" and records[0]["mission_status"] == assessment["mission_status"]
+    actions = [record for record in records if record["type"] == "action"]
+    assert len(actions) == len(history)
+    assert actions[2]["failed"] and actions[1]["skipped"]
+    assert actions[3]["artifact_id"] == history[3].artifact_id
+    print("✅ Reports stream incrementally in text and JSON lines")
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_assessment()
+    test_unrelated_state_resets_aggregates()
+    test_streaming_report()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for compact history records and the content-addressed artifact store.
+"""
+
+import pickle
+import sys
+import os
+import tempfile
+sys.path.append(os.getcwd())
+
+from artifact_store import ArtifactStore, ArtifactNotFoundError, artifact_store
+from mission_history import HistoryRecord, record_step, entry_agent, entry_text, entry_summary, INLINE_OUTPUT_LIMIT
+from mission_history import HistoryFold, MissionFolds
+
+
+def test_artifact_store():
+    """Test in-memory and on-disk storage keyed by content hash, and discarding."""
+    print("🧪 Testing Artifact Store...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for store in (ArtifactStore(), ArtifactStore(tmp)):
+            artifact_id = store.put("execution log " * 100)
+            assert artifact_id == ArtifactStore.artifact_id("execution log " * 100)
+            assert store.put("execution log " * 100) == artifact_id
+            assert artifact_id in store
+            assert store.get(artifact_id) == "execution log " * 100
+            try:
+                store.get("0" * 64)
+            except ArtifactNotFoundError:
+                pass
+            else:
+                raise AssertionError("Expected ArtifactNotFoundError")
+
+        # A second store on the same directory sees the same artifacts
+        assert ArtifactStore(tmp).get(artifact_id) == "execution log " * 100
+
+        # Discarding frees memory; on-disk artifacts stay readable by other processes
+        memory, disk = ArtifactStore(), ArtifactStore(tmp)
+        kept = memory.put("kept output")
+        memory.discard([memory.put("execution log " * 100), "0" * 64])
+        disk.discard([artifact_id])
+        assert artifact_id not in memory and kept in memory and artifact_id in disk
+    print("✅ Artifacts stored once and fetched by ID")
+
+
+def test_history_records():
+    """Test that large outputs move out of line and helpers accept records and strings."""
+    print("\n🧪 Testing History Records...")
+
+    small = record_step("Infiltrator", "discover_docker_networks()", "Found 2 networks", 0.0,
+                        tool="discover_docker_networks")
+    assert small.artifact_id is None and small.status == "COMPLETED"
+    assert str(small) == "Infiltrator: discover_docker_networks() -> Found 2 networks"
+
+    big_output = "{'step': 1, 'status': 'SIMULATED'} " * 200
+    big = HistoryRecord("Saboteur", "execute_attack_scenario(target_ip='192.168.1.100')", big_output)
+    print(f"📋 Record: {big}")
+    assert len(big_output) > INLINE_OUTPUT_LIMIT
+    assert big.artifact_id in artifact_store
+    assert big.output == big_output and big.output_size == len(big_output)
+    assert len(entry_summary(big)) < len(big_output)
+    assert entry_text(big).endswith(big_output)
+
+    assert HistoryRecord("Saboteur", "x()", "ERROR: boom").status == "ERROR"
+    assert HistoryRecord("Saboteur", "x()", "SKIPPED: Task contains unresolved placeholders").status == "SKIPPED"
+
+    restored = pickle.loads(pickle.dumps(big))
+    assert restored.output == big_output and restored.agent == "Saboteur"
+
+    assert entry_agent(big) == "Saboteur"
+    assert entry_agent("Chronicler: analyze_gridguardian_logs -> FAILURE") == "Chronicler"
+    assert entry_agent("no agent here") is None
+    assert entry_text("Commander: Created plan") == "Commander: Created plan"
+    print("✅ Records are compact and outputs are fetched lazily")
+
+
+def test_mission_folds():
+    """Test that each entry is folded once per mission and that old missions are evicted."""
+    print("\n🧪 Testing Mission Folds...")
+
+    folded = []
+    folds = MissionFolds(HistoryFold, lambda fold, entry: folded.append(entry), max_missions=2)
+    history = ["Infiltrator: scan -> ok", "Saboteur: craft -> ok"]
+    first = folds.observe({"mission_id": "m1", "history": history[:1]})
+    assert folds.observe({"mission_id": "m1", "history": history}) is first
+    assert folded == history and first.entries_seen == 2
+
+    # A state that does not extend the folded history starts a new fold
+    rerun = folds.observe({"mission_id": "m1", "history": ["Infiltrator: scan -> ok"]})
+    assert rerun is not first and rerun.entries_seen == 1 and len(folded) == 3
+
+    # Least recently observed missions are evicted first; discarded ones start over
+    folds.observe({"mission_id": "m2", "history": []})
+    folds.observe({"mission_id": "m1", "history": ["Infiltrator: scan -> ok"]})
+    folds.observe({"history": []})
+    assert folds.observe({"mission_id": "m1", "history": ["Infiltrator: scan -> ok"]}) is rerun
+    folds.discard("m1")
+    assert folds.observe({"mission_id": "m1", "history": ["Infiltrator: scan -> ok"]}) is not rerun
+    print("✅ Folds are incremental, per mission and bounded")
+
+
+if __name__ == "__main__":
+    test_artifact_store()
+    test_history_records()
+    test_mission_folds()
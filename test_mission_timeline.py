@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the mission timeline: attack steps from the mission history
+merged with detector anomalies, time to detect per step and per scenario,
+and the Chronicler's attack window taken from the timeline.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from datetime import datetime
+import numpy as np
+from anomaly_parser import parse_anomaly_reports
+from anomaly_store import AnomalyIndex
+from mission_history import HistoryRecord
+from mission_timeline import (AnomalyEvent, StepEvent, attack_window, build_timeline, format_timeline,
+                              steps_from_execution_log)
+from agents.chronicler import chronicler_node
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+FIRST_ANOMALY = datetime(2025, 9, 17, 18, 52, 40, 9034)
+
+
+def _scenario_output(steps) -> str:
+    """An execute_attack_scenario result with steps [(started_at, description)]."""
+    return str({
+        "scenario": "Grid Overload",
+        "start_time": "2025-09-17 18:52:00",
+        "steps_executed": [{"step": i + 1, "description": description, "status": "success",
+                            "timestamp": started_at.strftime("%H:%M:%S"),
+                            "started_at": started_at.isoformat(sep=" ", timespec="microseconds")}
+                           for i, (started_at, description) in enumerate(steps)],
+        "success": True,
+    })
+
+
+def _mission_history():
+    scenario = _scenario_output([(datetime(2025, 9, 17, 18, 52, 30), "Open breaker"),
+                                 (datetime(2025, 9, 17, 21, 0, 0), "Restore breaker")])
+    return [
+        HistoryRecord("Infiltrator", "scan_network_for_plcs('10.0.0.0/24')", "Found 1 PLC",
+                      tool="scan_network_for_plcs", started_at=datetime(2025, 9, 17, 18, 40).timestamp()),
+        HistoryRecord("Saboteur", "craft_modbus_exploit_packet(target_ip='10.0.0.5')", "Packet sent",
+                      tool="craft_modbus_exploit_packet", started_at=datetime(2025, 9, 17, 18, 50).timestamp()),
+        HistoryRecord("Saboteur", "execute_attack_scenario('Grid Overload')", scenario,
+                      tool="execute_attack_scenario", started_at=datetime(2025, 9, 17, 18, 52).timestamp()),
+    ]
+
+
+def test_execution_log_steps():
+    """Test step times from started_at, and from HH:MM:SS timestamps across midnight."""
+    print("🧪 Testing Execution Log Steps...")
+
+    steps = steps_from_execution_log(_scenario_output([(datetime(2025, 9, 17, 18, 52, 30, 250), "Open breaker")]))
+    assert steps == [StepEvent(np.datetime64("2025-09-17T18:52:30.000250", "us"), "Saboteur",
+                               "Open breaker", "Grid Overload", "success")]
+
+    legacy = str({"scenario": "Night Shift", "start_time": "2025-09-17 23:59:45", "steps_executed": [
+        {"step": 1, "description": "a", "status": "success", "timestamp": "23:59:50"},
+        {"step": 2, "description": "b", "status": "failed", "timestamp": "00:00:05"},
+        {"step": 3, "description": "c", "status": "success"},
+    ]})
+    times = [str(step.time) for step in steps_from_execution_log(legacy, "Executioner")]
+    assert times == ["2025-09-17T23:59:50.000000", "2025-09-18T00:00:05.000000"]
+
+    assert steps_from_execution_log("ERROR: scenario not found") == []
+    print("✅ Scenario steps are timed")
+
+
+def test_time_to_detect():
+    """Test the merged order, per-step detection and per-scenario MTTD against the example log."""
+    print("\n🧪 Testing Time to Detect...")
+
+    with open(EXAMPLE_LOG, encoding="utf-8") as f:
+        index = AnomalyIndex(parse_anomaly_reports(f))
+    timeline = build_timeline(_mission_history(), index)
+
+    assert all(a.time <= b.time for a, b in zip(timeline.events, timeline.events[1:]))
+    assert isinstance(timeline.events[0], StepEvent) and isinstance(timeline.events[-1], StepEvent)
+    assert sum(isinstance(e, AnomalyEvent) for e in timeline.events) == index.count_in_window(
+        datetime(2025, 9, 17, 18, 50), datetime(2025, 9, 17, 21, 10))
+
+    standalone, opened, restored = timeline.steps
+    first_delay = (FIRST_ANOMALY - datetime(2025, 9, 17, 18, 52, 30)).total_seconds()
+    assert standalone.step.scenario is None and abs(standalone.time_to_detect - (first_delay + 150)) < 1e-6
+    assert abs(opened.time_to_detect - first_delay) < 1e-6
+    assert opened.alerts_in_window == index.count_in_window(datetime(2025, 9, 17, 18, 52, 30),
+                                                            datetime(2025, 9, 17, 19, 2, 30))
+    assert restored.time_to_detect is None and restored.alerts_in_window == 0
+
+    scenarios = {s.scenario: s for s in timeline.scenarios}
+    assert scenarios["Grid Overload"].steps == 2 and scenarios["Grid Overload"].detected_steps == 1
+    assert abs(scenarios["Grid Overload"].mean_time_to_detect - first_delay) < 1e-6
+    assert abs(timeline.mean_time_to_detect - (2 * first_delay + 150) / 2) < 1e-6
+
+    text = format_timeline(timeline, max_events=3)
+    assert "Grid Overload: 1/2 steps detected" in text and "more events" in text
+    assert "ANOMALY" not in format_timeline(timeline, max_events=0)
+    assert build_timeline(_mission_history()[:1], index).steps == []
+    print(f"✅ MTTD {timeline.mean_time_to_detect:.1f}s over {len(timeline.events)} events")
+
+
+def test_chronicler_attack_window():
+    """Test that the Chronicler correlates the timeline's window and reports time to detect."""
+    print("\n🧪 Testing Chronicler Attack Window...")
+
+    history = _mission_history()
+    start, minutes = attack_window(history, now=datetime(2025, 9, 17, 19, 0))
+    assert start == "2025-09-17T18:50:00" and minutes == 2 * 60 + 20   # Until 21:00 plus the window
+    assert attack_window(history[:1]) is None
+
+    state = {
+        "plan": [{"agent": "Chronicler", "tool_call": f"analyze_gridguardian_logs(log_source='{EXAMPLE_LOG}')"}],
+        "current_task_index": 0,
+        "history": history,
+    }
+    result = chronicler_node(state)
+    output = result["task_output"]
+    assert output.startswith("Analysis: FAILURE"), output
+    assert "Detection timeline:" in output and "Grid Overload: 1/2 steps detected" in output
+    print("✅ Attack window comes from the mission's own steps")
+
+
+if __name__ == "__main__":
+    test_execution_log_steps()
+    test_time_to_detect()
+    test_chronicler_attack_window()
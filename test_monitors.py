@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Test script for multi-monitor analysis: the per-source parsers, concurrent
+queries with per-monitor timeouts, and the Chronicler's merged verdict.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import monitors
+from monitors import Monitor, MonitorError, analyze_monitors, format_verdict, load_monitors, select_monitors
+from log_sources import LocalFileSource
+import toolkits.chronicler_tools as chronicler_tools
+
+EXAMPLE_LOG = "anomaly_detector_log_example.txt"
+ATTACK_START = datetime(2025, 9, 17, 18, 50)
+ATTACK_END = ATTACK_START + timedelta(hours=1)
+
+
+def _eve_line(when: datetime, event_type: str = "alert", severity: int = 1,
+              signature: str = "ET SCADA Modbus Write Single Coil") -> str:
+    stamp = when.astimezone().strftime("%Y-%m-%dT%H:%M:%S.%f%z")   # Local time with its UTC offset
+    event = {"timestamp": stamp, "event_type": event_type, "src_ip": "10.0.0.9", "dest_ip": "10.0.0.5"}
+    if event_type == "alert":
+        event["alert"] = {"signature": signature, "severity": severity}
+    return json.dumps(event)
+
+
+def _write_monitor_logs(tmp: str) -> dict:
+    eve = os.path.join(tmp, "eve.json")
+    with open(eve, "w", encoding="utf-8") as f:
+        f.write("\n".join([
+            _eve_line(ATTACK_START - timedelta(hours=2)),                       # Before the attack
+            _eve_line(ATTACK_START + timedelta(minutes=3), "flow"),
+            _eve_line(ATTACK_START + timedelta(minutes=5), severity=2),
+            _eve_line(ATTACK_START + timedelta(minutes=4), severity=1),
+            _eve_line(ATTACK_START + timedelta(minutes=9), severity=3, signature="ET SCADA Modbus Scan"),
+            "not json",
+        ]) + "\n")
+
+    audit = os.path.join(tmp, "modbus_audit.log")
+    with open(audit, "w", encoding="utf-8") as f:
+        f.write("2025-09-17 18:40:00,100 WARNING write FC6 register=1 from 10.0.0.9\n"
+                "2025-09-17 18:51:00,250 INFO read FC3 register=1 from 10.0.0.2\n"
+                "2025-09-17 18:52:00,500 WARNING write FC6 register=40001 value=0 from 10.0.0.9\n"
+                "2025-09-17 18:53:00 - CRITICAL: breaker opened by unauthorized master 10.0.0.9\n")
+
+    quiet = os.path.join(tmp, "quiet_audit.log")
+    with open(quiet, "w", encoding="utf-8") as f:
+        f.write("2025-09-17 18:51:00 INFO heartbeat\n")
+    return {"eve": eve, "audit": audit, "quiet": quiet}
+
+
+def test_parsers():
+    """Test that each parser finds only the alerts inside the window."""
+    print("🧪 Testing Monitor Parsers...")
+
+    start, end = np.datetime64(ATTACK_START, "us"), np.datetime64(ATTACK_END, "us")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_monitor_logs(tmp)
+        ids = monitors.PARSERS["suricata-eve"](LocalFileSource(paths["eve"]), start, end)
+        audit = monitors.PARSERS["modbus-audit"](LocalFileSource(paths["audit"]), start, end)
+        quiet = monitors.PARSERS["modbus-audit"](LocalFileSource(paths["quiet"]), start, end)
+    grid = monitors.PARSERS["gridguardian"](LocalFileSource(EXAMPLE_LOG), start, end)
+
+    assert ids.alerts == 3 and ids.severity == "HIGH"
+    assert ids.first_alert == np.datetime64(ATTACK_START + timedelta(minutes=4), "us")
+    assert "2 signature(s)" in ids.detail and "Write Single Coil' (2x)" in ids.detail
+    assert audit.alerts == 2 and audit.severity == "CRITICAL" and "register=40001" in audit.detail
+    assert quiet == monitors.NO_FINDINGS
+    assert grid.alerts > 0 and grid.severity == "CRITICAL" and "anomaly report(s)" in grid.detail
+    print("✅ Parsers attribute alerts to the attack window")
+
+
+class CountingSource(LocalFileSource):
+    """A local log that records how many bytes each read returned."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.reads = []
+
+    def read(self, *args, **kwargs):
+        chunk = super().read(*args, **kwargs)
+        self.reads.append(len(chunk.data))
+        return chunk
+
+
+def test_incremental_reads():
+    """Test that repeated queries only read and parse what was appended since the last one."""
+    print("\n🧪 Testing Incremental Monitor Reads...")
+
+    start, end = np.datetime64(ATTACK_START, "us"), np.datetime64(ATTACK_END, "us")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_monitor_logs(tmp)
+        eve = CountingSource(paths["eve"])
+        assert monitors.PARSERS["suricata-eve"](eve, start, end).alerts == 3
+        assert eve.reads == [os.path.getsize(paths["eve"])]
+
+        appended = _eve_line(ATTACK_START + timedelta(minutes=1), severity=1, signature="ET SCADA Modbus Breaker Open")
+        with open(paths["eve"], "a", encoding="utf-8") as f:
+            f.write(appended[:40])                 # A partial line is held back until it is complete
+        assert monitors.PARSERS["suricata-eve"](eve, start, end).alerts == 3
+        with open(paths["eve"], "a", encoding="utf-8") as f:
+            f.write(appended[40:] + "\n")
+        ids = monitors.PARSERS["suricata-eve"](eve, start, end)
+        assert ids.alerts == 4 and ids.first_alert == np.datetime64(ATTACK_START + timedelta(minutes=1), "us")
+        assert eve.reads[1:] == [40, len(appended) - 40 + 1]
+        assert monitors.PARSERS["suricata-eve"](eve, start, end).alerts == 4 and eve.reads[-1] == 0
+
+        audit = CountingSource(paths["audit"])
+        assert monitors.PARSERS["modbus-audit"](audit, start, end).alerts == 2
+        with open(paths["audit"], "a", encoding="utf-8") as f:
+            f.write("2025-09-17 18:50:30 ALERT coil 17 forced on by 10.0.0.9\n")
+        findings = monitors.PARSERS["modbus-audit"](audit, start, end)
+        assert findings.alerts == 3 and findings.detail == "first: coil 17 forced on by 10.0.0.9"
+        assert audit.reads[-1] == len("2025-09-17 18:50:30 ALERT coil 17 forced on by 10.0.0.9\n")
+    print("✅ Monitor logs are tailed from a cursor")
+
+
+def test_alert_windows():
+    """Test that alerts logged out of order are kept sorted, bisected per window and capped."""
+    print("\n🧪 Testing Alert Windows...")
+
+    rng = np.random.default_rng(7)
+    offsets = rng.permutation(20000)               # Seconds after the start, written in random order
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "modbus_audit.log")
+        with open(path, "w", encoding="utf-8") as f:
+            for offset in offsets:
+                f.write(f"{ATTACK_START + timedelta(seconds=int(offset)):%Y-%m-%d %H:%M:%S} WARNING write {offset}\n")
+        alert_log = monitors.AlertLog(monitors._modbus_alert)
+        source = LocalFileSource(path)
+
+        start = np.datetime64(ATTACK_START, "us")
+        windows = [(start + np.timedelta64(int(lo), "s"), start + np.timedelta64(int(lo) + 600, "s"))
+                   for lo in rng.integers(0, 20000, 200)]
+        alert_log.read(source, *windows[0])
+        began = time.perf_counter()
+        found = [alert_log.read(source, lo, hi) for lo, hi in windows]
+        elapsed_ms = (time.perf_counter() - began) * 1000
+        print(f"⏱️  {len(windows)} windows over {len(alert_log.alerts)} alerts in {elapsed_ms:.1f}ms")
+
+        assert alert_log.times == sorted(alert_log.times)
+        for (lo, hi), alerts in zip(windows, found):
+            assert [a.label for a in alerts] == [f"write {o}" for o in sorted(offsets) if lo <= start + np.timedelta64(int(o), "s") <= hi]
+
+        # Past the cap, the earliest alerts are dropped
+        maximum = monitors.MAX_ALERTS_PER_SOURCE
+        monitors.MAX_ALERTS_PER_SOURCE = 1000
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(f"{ATTACK_START:%Y-%m-%d %H:%M:%S} ALERT late arrival\n")
+            alert_log.read(source, start, start)
+        finally:
+            monitors.MAX_ALERTS_PER_SOURCE = maximum
+        assert len(alert_log.alerts) == 1000 and alert_log.alerts[0].label == "write 19000"
+    print("✅ Alert windows are bisected from time-sorted alerts")
+
+
+def test_concurrent_queries():
+    """Test that monitors run concurrently and a slow one times out alone."""
+    print("\n🧪 Testing Concurrent Queries...")
+
+    def slow(seconds):
+        def parser(source, start, end):
+            time.sleep(seconds)
+            return monitors.MonitorFindings(1, start, "LOW", f"slept {seconds}s")
+        return parser
+
+    def broken(source, start, end):
+        raise ValueError("unreadable output")
+
+    monitors.PARSERS.update({"slow-0.5": slow(0.5), "slow-3": slow(3), "broken": broken})
+    try:
+        queried = [Monitor(f"m{i}", EXAMPLE_LOG, "slow-0.5", timeout=5) for i in range(4)]
+        queried += [Monitor("stuck", EXAMPLE_LOG, "slow-3", timeout=0.7), Monitor("bad", EXAMPLE_LOG, "broken")]
+        started = time.perf_counter()
+        results = analyze_monitors(queried, ATTACK_START, ATTACK_END)
+        elapsed = time.perf_counter() - started
+    finally:
+        for name in ("slow-0.5", "slow-3", "broken"):
+            monitors.PARSERS.pop(name)
+
+    print(f"⏱️  6 monitors (4 x 0.5s, one stuck, one failing) answered in {elapsed:.2f}s")
+    assert elapsed < 1.5   # The slowest deadline, not the 5s sum
+    assert [r.monitor.name for r in results] == ["m0", "m1", "m2", "m3", "stuck", "bad"]
+    assert all(r.status == "ok" and r.detected for r in results[:4])
+    assert results[4].status == "timeout" and results[5].status == "error" and "unreadable" in results[5].error
+
+    verdict = format_verdict(results)
+    assert verdict.startswith("Analysis: FAILURE. 4 of 6") and "stuck: UNAVAILABLE (timeout" in verdict
+    assert format_verdict(results[4:]).startswith("Analysis Error")
+    print("✅ Total time follows the slowest monitor")
+
+
+def test_timed_out_reads():
+    """Test that a read outliving its deadline neither piles up threads nor overlaps the next read."""
+    print("\n🧪 Testing Timed-Out Reads...")
+
+    active, overlap = [0], [0]
+    lock = threading.Lock()
+
+    def sluggish(source, start, end):
+        with lock:
+            active[0] += 1
+            overlap[0] = max(overlap[0], active[0])
+        time.sleep(0.4)
+        with lock:
+            active[0] -= 1
+        return monitors.NO_FINDINGS
+
+    monitors.PARSERS["sluggish"] = sluggish
+    try:
+        monitor = Monitor("sluggish", EXAMPLE_LOG, "sluggish", timeout=0.1)
+        for _ in range(3):
+            started = time.perf_counter()
+            assert analyze_monitors([monitor], ATTACK_START, ATTACK_END)[0].status == "timeout"
+            assert time.perf_counter() - started < 0.3
+        pool_threads = [t for t in threading.enumerate() if t.name.startswith("monitor")]
+        # The queued reads run one after another, then the monitor answers again
+        result = analyze_monitors([monitor._replace(timeout=5)], ATTACK_START, ATTACK_END)[0]
+    finally:
+        monitors.PARSERS.pop("sluggish")
+
+    print(f"⏱️  {len(pool_threads)} monitor thread(s), at most {overlap[0]} concurrent read(s) of one monitor")
+    assert result.status == "ok" and overlap[0] == 1
+    assert len(pool_threads) <= monitors.MONITOR_WORKERS
+    print("✅ Timed-out reads are queued, not duplicated")
+
+
+def test_chronicler_verdict():
+    """Test the Chronicler tool merging several monitors into one attributed verdict."""
+    print("\n🧪 Testing Chronicler Multi-Monitor Verdict...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_monitor_logs(tmp)
+        config = json.dumps([
+            {"name": "power-flow", "parser": "gridguardian", "source": f"fixture:{EXAMPLE_LOG}"},
+            {"name": "network-ids", "parser": "suricata-eve", "source": paths["eve"], "timeout": 5},
+            {"name": "modbus-audit", "parser": "modbus-audit", "source": paths["quiet"]},
+        ])
+        configured = chronicler_tools.DEFENSIVE_MONITORS
+        chronicler_tools.DEFENSIVE_MONITORS = config
+        try:
+            analyze = chronicler_tools.analyze_defensive_monitors.invoke
+            result = analyze({"attack_start_time": "2025-09-17T18:50:00"})
+            assert result.startswith("Analysis: FAILURE. 2 of 3 defensive monitor(s) detected the attack "
+                                     "(power-flow, network-ids)"), result
+            assert "- modbus-audit: no alerts" in result and "Severity: CRITICAL" in result
+
+            only_audit = analyze({"attack_start_time": "2025-09-17T18:50:00", "monitors": "modbus-audit"})
+            assert only_audit.startswith("Analysis: SUCCESS. None of the 1"), only_audit
+            assert analyze({"monitors": "firewall"}).startswith("Analysis Error: Unknown monitor(s) firewall")
+            assert analyze({"attack_start_time": "yesterday"}).startswith("Analysis Error")
+        finally:
+            chronicler_tools.DEFENSIVE_MONITORS = configured
+
+    assert load_monitors("", "docker-logs:det") == [Monitor("gridguardian", "docker-logs:det", "gridguardian")]
+    for bad in ('[{"name": "x"}]', '[{"name": "x", "source": "a.log", "parser": "syslog"}]', "[]",
+                "/nonexistent/monitors.json"):
+        try:
+            load_monitors(bad, "docker-logs:det")
+            assert False, f"{bad} should be rejected"
+        except MonitorError:
+            pass
+    assert select_monitors(load_monitors("", "x"), " , ") == load_monitors("", "x")
+    print("✅ One verdict with per-monitor attribution")
+
+
+if __name__ == "__main__":
+    test_parsers()
+    test_incremental_reads()
+    test_alert_windows()
+    test_concurrent_queries()
+    test_timed_out_reads()
+    test_chronicler_verdict()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass outcome classifier used by the MissionAssessor.
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.getcwd())
+
+from outcome_classifier import OutcomeClassifier
+from mission_assessor import MissionAssessor
+from mission_history import HistoryRecord
+
+
+def test_classification():
+    """Test outcomes and phrase flags against the assessor's indicators."""
+    print("🧪 Testing Outcome Classification...")
+
+    classifier = MissionAssessor().classifier
+    cases = [
+        ("Infiltrator: scan_network_for_plcs -> Found PLC at 192.168.1.100", "successful", {"plc"}),
+        ("Saboteur: craft -> SKIPPED: Task contains unresolved placeholders", "skipped", set()),
+        ("Saboteur: craft -> nothing was skipped", "successful", set()),
+        ("Executioner: execute_direct_attack -> Error: connection refused", "failed", {"direct", "attack", "error"}),
+        ("Chronicler: analyze -> FAILURE detected during the attack completed at 12:00", "failed",
+         {"failure", "attack completed", "attack"}),
+        ("Saboteur: sequence -> {'action': 'web_login_attempt', 'timeout': 30}", "successful", {"timeout"}),
+    ]
+    for text, outcome, expected_flags in cases:
+        result = classifier.classify(text)
+        print(f"   📋 {result!r}")
+        assert result.outcome == outcome, text
+        assert expected_flags <= result.matches, text
+    print("✅ Entries classified correctly")
+
+
+def test_single_pass_and_cache():
+    """Test that long entries are scanned once and cached per artifact."""
+    print("\n🧪 Testing Classifier Throughput...")
+
+    classifier = OutcomeClassifier(failure_phrases=["ERROR", "FAILED"], flag_phrases=["stealth", "plc"])
+    output = "{'step': 1, 'action': 'modbus_write', 'register': 40001, 'status': 'SIMULATED'} " * 500
+    records = [HistoryRecord("Saboteur", f"execute_attack_scenario(step={i})", output + str(i)) for i in range(2000)]
+
+    start = time.perf_counter()
+    for record in records:
+        classifier.classify(record)
+    first_pass = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in records:
+        classifier.classify(record)
+    cached_pass = time.perf_counter() - start
+
+    size_mb = sum(record.output_size for record in records) / 1e6
+    print(f"⏱️  {size_mb:.0f}MB classified in {first_pass:.2f}s, cached re-assessment in {cached_pass * 1000:.1f}ms")
+    assert cached_pass < first_pass / 10
+    print("✅ Cached classifications are not re-scanned")
+
+
+if __name__ == "__main__":
+    test_classification()
+    test_single_pass_and_cache()
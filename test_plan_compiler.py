@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the plan compiler: AST parsing, up-front validation of every
+step and reuse of the compiled steps by the agent nodes.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from plan_compiler import compile_plan, plan_compiler_node, current_step, MAX_PLAN_REVISIONS
+from utils import parse_tool_call
+
+
+def test_parse_tool_call():
+    """Test the AST-based tool call parser."""
+    print("🧪 Testing AST Tool Call Parsing...")
+
+    assert parse_tool_call("scan_network_for_plcs(subnet='192.168.1.0/24')") == \
+        ("scan_network_for_plcs", (), {"subnet": "192.168.1.0/24"})
+    assert parse_tool_call("establish_covert_channel('10.0.0.5', enable_debug=True)") == \
+        ("establish_covert_channel", ("10.0.0.5",), {"enable_debug": True})
+    assert parse_tool_call("discover_docker_networks") == ("discover_docker_networks", (), {})
+
+    for bad_call in ["scan_network_for_plcs(subnet=192.168.1.0/24)",
+                     "scan_network_for_plcs(subnet=target_subnet)",
+                     "os.system('id')",
+                     "scan_network_for_plcs(subnet='<subnet>')"]:
+        try:
+            parse_tool_call(bad_call)
+        except ValueError as e:
+            print(f"   ✅ Rejected {bad_call}: {e}")
+        else:
+            raise AssertionError(f"Expected {bad_call} to be rejected")
+    print("✅ Tool calls parsed without evaluation")
+
+
+def test_compile_plan_reports_all_errors():
+    """Test that every invalid step is reported in a single pass."""
+    print("\n🧪 Testing Whole-Plan Validation...")
+
+    plan = [
+        {"agent": "Infiltrator", "tool_call": "scan_network_for_plcs('192.168.1.0/24')"},
+        {"agent": "Saboteur", "tool_call": "craft_modbus_exploit_packet(target_ip='<plc_ip>', register=1, value=0)"},
+        {"agent": "Saboteur", "tool_call": "create_evasion_attack_sequence(target_ip='192.168.1.100', plc_register='40001')"},
+        {"agent": "Executioner", "tool_call": "execute_evasion_sequence()"},
+        {"agent": "Infiltrator", "tool_call": "execute_direct_attack(target_ip='192.168.1.100')"},
+        {"agent": "Chronicler", "tool_call": "document_attack_results(scenario='Stealth Bypass')"},
+    ]
+    steps, errors = compile_plan(plan)
+    for error in errors:
+        print(f"   📋 {error}")
+
+    assert steps[0].ok and steps[0].args == {"subnet": "192.168.1.0/24"}
+    assert steps[1].unresolved
+    assert "missing required argument(s) value" in steps[2].error
+    assert steps[3].ok and steps[3].args == {}
+    assert "not available to Infiltrator" in steps[4].error
+    assert "Unknown tool 'document_attack_results'" in steps[5].error
+    assert len(errors) == 4
+    print("✅ All invalid steps reported at once")
+
+
+def test_compiler_node_and_cached_steps():
+    """Test the compiler node feedback and that nodes reuse the cached steps."""
+    print("\n🧪 Testing Compiler Node...")
+
+    state = {
+        "objective": "Test",
+        "plan": [
+            {"agent": "Infiltrator", "tool_call": "discover_docker_networks()"},
+            {"agent": "Chronicler", "tool_call": "analyze_gridguardian_logs(attack_duration_minutes='30')"},
+            {"agent": "Saboteur", "tool_call": "craft_modbus_exploit_packet(target_ip=plc_ip)"},
+        ],
+        "current_task_index": 2,
+        "task_output": "",
+        "feedback": "",
+        "history": [],
+        "revision_number": 1,
+    }
+    update = plan_compiler_node(state)
+
+    assert update["current_task_index"] == 0
+    assert len(update["plan_errors"]) == 1
+    assert update["feedback"].startswith("PLAN REJECTED")
+    assert "FAILURE" not in update["feedback"]
+
+    state.update(update)
+    state["current_task_index"] = 1
+    step = current_step(state, "Chronicler")
+    assert step is update["compiled_plan"][1]
+    assert step.tool == "analyze_gridguardian_logs" and step.args == {"attack_duration_minutes": 30}
+
+    # Once the revision budget is spent the plan runs as is, so no feedback is sent back
+    state["revision_number"] = MAX_PLAN_REVISIONS
+    assert "feedback" not in plan_compiler_node(state)
+    print("✅ Compiler feedback and step caching behave correctly")
+
+
+if __name__ == "__main__":
+    test_parse_tool_call()
+    test_compile_plan_reports_all_errors()
+    test_compiler_node_and_cached_steps()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the mission report archive: transactional inserts, full-text
+and structured searches, and the CLI.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import tempfile
+import time
+from report_archive import ReportArchive, mission_metadata, report_metadata, report_archive, main
+from mission_history import HistoryRecord
+
+
+def _report(objective: str, outcome: str, scenario: str, technique: str) -> str:
+    return "\n".join([
+        "## 🎯 MISSION AFTER-ACTION REPORT",
+        "### 📋 Mission Objective",
+        objective,
+        "",
+        "### 📖 Execution Summary",
+        f"1. **Saboteur** `execute_attack_scenario(target_ip='192.168.1.100', scenario_name='{scenario}')` (COMPLETED)",
+        f"2. **Saboteur** `execute_{technique}()` (COMPLETED)",
+        "",
+        "### ✅ Outcome",
+        f"**{outcome}** (assessment details)",
+    ])
+
+
+def test_archive_and_search():
+    """Test inserting reports and finding them by text, technique, scenario and status."""
+    print("🧪 Testing Report Archive Search...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ReportArchive(os.path.join(tmp, "reports.db"))
+        report = _report("Open the substation circuit breaker", "FAILURE", "Stealth Bypass", "T0831")
+        assert report_metadata(report) == {
+            "objective": "Open the substation circuit breaker", "status": "FAILED",
+            "scenarios": ["Stealth Bypass"], "techniques": ["T0831"],
+        }
+
+        first = archive.add(report, mission_id="m-1", confidence=0.8)
+        for i in range(500):
+            archive.add(_report(f"Probe pump controller {i}", "SUCCESS", "Slow Drift", "T0855"), mission_id=f"bulk-{i}")
+
+        start = time.perf_counter()
+        results = archive.search("circuit breaker")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"⏱️  Full-text search over 501 reports in {elapsed_ms:.2f}ms")
+        assert [result.id for result in results] == [first]
+        assert results[0].techniques == ["T0831"] and results[0].scenarios == ["Stealth Bypass"]
+        assert "[circuit] [breaker]" in results[0].snippet
+
+        assert [r.id for r in archive.search(technique="T0831")] == [first]
+        assert [r.id for r in archive.search(scenario="Stealth Bypass", status="FAILED")] == [first]
+        assert len(archive.search(status="SUCCESS", technique="T0855", limit=1000)) == 500
+        assert archive.search("pump", mission_id="bulk-7")[0].objective == "Probe pump controller 7"
+        assert archive.search("circuit", status="SUCCESS") == []
+
+        archive.delete(first)
+        assert archive.search("circuit breaker") == [] and archive.get(first) is None
+    print("✅ Reports found by text and structured columns")
+
+
+def test_transactional_insert():
+    """Test that a failing block rolls the archive entry back."""
+    print("\n🧪 Testing Transactional Insert...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ReportArchive(os.path.join(tmp, "reports.db"))
+        try:
+            with archive.recording(_report("Rolled back", "FAILURE", "Direct", "T0836")):
+                raise OSError("disk full")
+        except OSError:
+            pass
+        assert archive.search("rolled") == [] and archive.search(technique="T0836") == []
+
+        state = {
+            "mission_id": "m-2",
+            "objective": "Test detection",
+            "history": [HistoryRecord("Saboteur", "execute_T0855(target_ip='192.168.1.100')", "SIMULATED")],
+        }
+        metadata = mission_metadata(state, {"mission_status": "PARTIAL_SUCCESS", "confidence_score": 0.5})
+        report_id = archive.add("Free-form LLM report without the usual headings", **metadata)
+        result = archive.search(technique="T0855")[0]
+        assert result.id == report_id and result.status == "PARTIAL_SUCCESS" and result.mission_id == "m-2"
+
+        assert main(["--archive", archive.path, "search", "free form"]) == 0
+        assert main(["--archive", archive.path, "show", "999"]) == 1
+        for query in ('"foo', "AND"):
+            try:
+                main(["--archive", archive.path, "search", query])
+                assert False, f"{query} should be a usage error"
+            except SystemExit as e:
+                assert e.code == 2
+    print("✅ Failed saves leave no archive entry")
+
+
+def test_archive_path_override():
+    """Test that the global archive follows RED_ARMY_REPORT_ARCHIVE when it is used."""
+    print("\n🧪 Testing Archive Path Override...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "override.db")
+        configured = os.environ.get("RED_ARMY_REPORT_ARCHIVE")
+        os.environ["RED_ARMY_REPORT_ARCHIVE"] = path
+        try:
+            assert report_archive.path == path
+            report_id = report_archive.add(_report("Overridden", "SUCCESS", "Direct", "T0831"))
+            assert ReportArchive(path).get(report_id) is not None
+        finally:
+            if configured is None:
+                os.environ.pop("RED_ARMY_REPORT_ARCHIVE")
+            else:
+                os.environ["RED_ARMY_REPORT_ARCHIVE"] = configured
+    assert ReportArchive("explicit.db").path == "explicit.db"
+    print("✅ Reports go to the configured archive")
+
+
+if __name__ == "__main__":
+    test_archive_and_search()
+    test_transactional_insert()
+    test_archive_path_override()
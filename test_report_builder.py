@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental report builder: sections updated step by
+step, partial reports during a mission and a format-only final report.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import time
+from mission_history import HistoryRecord
+from report_builder import ReportBuilder, ReportSections
+
+
+def _mission_steps():
+    return [
+        HistoryRecord("Infiltrator", "discover_docker_networks()", "Found network ics_net",
+                      tool="discover_docker_networks", duration=1.0),
+        HistoryRecord("Executioner", "execute_direct_attack(target_ip='192.168.1.100')", "ERROR: connection refused",
+                      tool="execute_direct_attack", duration=0.5),
+        HistoryRecord("Chronicler", "analyze_gridguardian_logs()",
+                      "Analysis: FAILURE. GridGuardian shows 2 recent anomaly report(s). " + "detail " * 200,
+                      tool="analyze_gridguardian_logs", duration=2.0),
+        "Saboteur: craft_modbus_exploit_packet() -> SKIPPED: Unresolved placeholder",
+    ]
+
+
+def test_incremental_sections():
+    """Test that sections folded step by step match sections built from the whole history."""
+    print("🧪 Testing Incremental Report Sections...")
+
+    builder = ReportBuilder()
+    steps = _mission_steps()
+    state = {"mission_id": "m1", "history": []}
+    for entry in steps:
+        state = {**state, "history": state["history"] + [entry]}
+        sections = builder.observe(state)
+        assert sections.entries_seen == len(state["history"])
+
+    expected = ReportSections.from_history(steps)
+    assert sections.timeline == expected.timeline
+    assert sections.tools_used == expected.tools_used == {
+        "discover_docker_networks": 1, "execute_direct_attack": 1, "analyze_gridguardian_logs": 1}
+    assert len(sections.detections) == 1 and "2 recent anomaly report(s)" in sections.detections[0]
+    assert sections.failures == ["Executioner: execute_direct_attack(target_ip='192.168.1.100') -> ERROR: connection refused"]
+    assert sections.agent_stats["Executioner"] == {"steps": 1, "errors": 1, "seconds": 0.5}
+    assert sections.timeline[-1].tool_call is None
+    assert abs(sections.total_seconds - 3.5) < 1e-9
+
+    # A state that does not extend the observed history starts over
+    assert builder.observe({"mission_id": "m1", "history": steps[:1]}).entries_seen == 1
+    print("✅ Incremental sections match a full rebuild")
+
+
+def test_partial_report():
+    """Test that a partial report can be rendered mid-mission and the final one only formats."""
+    print("\n🧪 Testing Partial Report...")
+
+    builder = ReportBuilder()
+    steps = _mission_steps()
+    state = {"mission_id": "m2", "objective": "Open the circuit breaker", "plan": [{}] * 4,
+             "current_task_index": 2, "feedback": "", "history": steps[:2], "revision_number": 0}
+    partial = builder.partial_report(state)
+    assert "### 📖 Execution Summary" in partial
+    assert "No GridGuardian log analysis was completed" in partial
+
+    state = {**state, "current_task_index": 4, "history": steps}
+    builder.observe(state)
+    start = time.perf_counter()
+    report = builder.partial_report(state)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"⏱️  Final report formatted in {elapsed_ms:.2f}ms")
+    assert "GridGuardian detected the attack in 1 of 1 log analyses" in report
+    assert "Failed step: Executioner: execute_direct_attack" in report
+    print("✅ Partial and final reports rendered from the accumulated sections")
+
+
+if __name__ == "__main__":
+    test_incremental_sections()
+    test_partial_report()
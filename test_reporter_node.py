@@ -7,7 +7,11 @@ import sys
 import os
 sys.path.append(os.getcwd())
 
+import tempfile
+import agents.reporter as reporter
+import toolkits.reporting_tools as reporting_tools
 from agents.reporter import reporting_node
+from report_archive import ReportArchive, main as archive_main
 from state import RedArmyState
 
 def test_reporting_node():
@@ -73,5 +77,92 @@ def test_reporting_node():
         import traceback
         traceback.print_exc()
 
+def test_enriched_report_saved():
+    """Test that enrich mode archives the templated report, keeps it when the LLM call fails, and can be waited for."""
+    print("\n🧪 Testing Enriched Report Saving...")
+
+    class FailingLLM:
+        def invoke(self, messages):
+            raise RuntimeError("quota exceeded")
+
+    state = {
+        "objective": "Open the substation circuit breaker", "plan": [{}], "current_task_index": 1,
+        "feedback": "Analysis: FAILURE. The attack was likely detected.", "revision_number": 0,
+        "history": ["Chronicler: analyze_gridguardian_logs -> Analysis: FAILURE. The attack was likely detected."],
+    }
+    cwd, archive = os.getcwd(), os.environ.get("RED_ARMY_REPORT_ARCHIVE")
+    get_llm, mode = reporting_tools.get_llm, reporter.DEBRIEF_MODE
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["RED_ARMY_REPORT_ARCHIVE"] = os.path.join(tmp, "reports.db")
+        reporting_tools.get_llm, reporter.DEBRIEF_MODE = FailingLLM, "enrich"
+        os.chdir(tmp)
+        try:
+            result = reporting_node(state)
+            assert reporting_tools.wait_for_enrichments(timeout=30)
+            saved = [name for name in os.listdir(tmp) if name.startswith("mission_report_")]
+        finally:
+            os.chdir(cwd)
+            reporting_tools.get_llm, reporter.DEBRIEF_MODE = get_llm, mode
+            if archive is None:
+                os.environ.pop("RED_ARMY_REPORT_ARCHIVE")
+            else:
+                os.environ["RED_ARMY_REPORT_ARCHIVE"] = archive
+        assert len(saved) == 1, saved
+        with open(os.path.join(tmp, saved[0]), encoding="utf-8") as f:
+            assert f.read() == result["task_output"]   # The templated report, not a traceback
+        assert ReportArchive(os.path.join(tmp, "reports.db")).search(status="FAILED")
+    print("✅ Failed enrichment falls back to saving the templated report")
+
+def test_selective_enrichment():
+    """Test that unselected statuses are archived without an LLM call and can be enriched on demand."""
+    print("\n🧪 Testing Selective and On-Demand Enrichment...")
+
+    calls = []
+
+    class CountingLLM:
+        def invoke(self, messages):
+            calls.append(messages)
+            return type("Response", (), {"content": "## 🎯 MISSION AFTER-ACTION REPORT\nEnriched assessment"})()
+
+    state = {
+        "objective": "Open the substation circuit breaker", "plan": [{}], "current_task_index": 1,
+        "feedback": "Analysis: FAILURE. The attack was likely detected.", "revision_number": 0, "mission_id": "m-7",
+        "history": ["Chronicler: analyze_gridguardian_logs -> Analysis: FAILURE. The attack was likely detected."],
+    }
+    cwd, archive_path = os.getcwd(), os.environ.get("RED_ARMY_REPORT_ARCHIVE")
+    get_llm, mode, statuses = reporting_tools.get_llm, reporter.DEBRIEF_MODE, reporter.ENRICH_STATUSES
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "reports.db")
+        os.environ["RED_ARMY_REPORT_ARCHIVE"] = db
+        reporting_tools.get_llm, reporter.DEBRIEF_MODE = CountingLLM, "enrich"
+        reporter.ENRICH_STATUSES = frozenset({"SUCCESS", "PARTIAL_SUCCESS"})
+        os.chdir(tmp)
+        try:
+            result = reporting_node(state)
+            assert reporting_tools.wait_for_enrichments(timeout=30)
+            assert calls == []   # A FAILED mission is not selected: no LLM round trip
+            archived = ReportArchive(db).search(mission_id="m-7")
+            assert len(archived) == 1 and ReportArchive(db).get(archived[0].id) == result["task_output"]
+
+            # Enrich it on demand: the archive entry and the report file are upgraded in place
+            assert archive_main(["--archive", db, "enrich", str(archived[0].id)]) == 0 and len(calls) == 1
+            with open(archived[0].filename, encoding="utf-8") as f:
+                assert f.read().endswith("Enriched assessment")
+            assert [r.id for r in ReportArchive(db).search("enriched")] == [archived[0].id]
+            assert ReportArchive(db).entry(archived[0].id).status == "FAILED"
+            assert archive_main(["--archive", db, "enrich", "999"]) == 1
+            saved = [name for name in os.listdir(tmp) if name.startswith("mission_report_")]
+        finally:
+            os.chdir(cwd)
+            reporting_tools.get_llm, reporter.DEBRIEF_MODE, reporter.ENRICH_STATUSES = get_llm, mode, statuses
+            if archive_path is None:
+                os.environ.pop("RED_ARMY_REPORT_ARCHIVE")
+            else:
+                os.environ["RED_ARMY_REPORT_ARCHIVE"] = archive_path
+        assert len(saved) == 1, saved
+    print("✅ Only selected reports are enriched; others upgrade on demand")
+
 if __name__ == "__main__":
-    test_reporting_node()
\ No newline at end of file
+    test_reporting_node()
+    test_enriched_report_saved()
+    test_selective_enrichment()
\ No newline at end of file
@@ -7,7 +7,14 @@ import sys
 import os
 sys.path.append(os.getcwd())
 
-from toolkits.reporting_tools import generate_mission_debrief, save_mission_report
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from toolkits.reporting_tools import generate_mission_debrief, save_mission_report, render_mission_debrief
+from toolkits.reporting_tools import map_reduce_debrief, partition_history, MAX_PHASE_CHARS, MAX_REDUCE_CHARS
+from mission_assessor import MissionAssessor
+from mission_history import HistoryRecord
+from report_archive import ReportArchive
 
 def test_reporting_tools():
     """Test the mission debrief generation with sample data"""
@@ -49,10 +56,20 @@ def test_reporting_tools():
         print("TESTING save_mission_report tool...")
         print("="*60)
         
-        save_result = save_mission_report.invoke({
-            "report": report, 
-            "filename": "test_mission_report.md"
-        })
+        # Archive into a temporary database, not mission_reports.db in the working directory
+        with tempfile.TemporaryDirectory() as tmp:
+            configured = os.environ.get("RED_ARMY_REPORT_ARCHIVE")
+            os.environ["RED_ARMY_REPORT_ARCHIVE"] = os.path.join(tmp, "reports.db")
+            try:
+                save_result = save_mission_report.invoke({
+                    "report": report,
+                    "filename": "test_mission_report.md"
+                })
+            finally:
+                if configured is None:
+                    os.environ.pop("RED_ARMY_REPORT_ARCHIVE")
+                else:
+                    os.environ["RED_ARMY_REPORT_ARCHIVE"] = configured
         print(save_result)
         
         print("\n✅ Testing completed successfully!")
@@ -62,5 +79,129 @@ def test_reporting_tools():
         import traceback
         traceback.print_exc()
 
+def test_templated_debrief():
+    """Test the local templated debrief renders every section without an LLM call"""
+    print("🧪 Testing Templated Mission Debrief...")
+
+    history = [
+        HistoryRecord("Infiltrator", "discover_docker_networks()", "Found network ics_net", tool="discover_docker_networks", duration=1.2),
+        HistoryRecord("Saboteur", "execute_attack_scenario(target_ip='192.168.1.100', scenario_name='Stealth Bypass')",
+                      "{'status': 'SIMULATED'} " * 100, tool="execute_attack_scenario", duration=8.0),
+        HistoryRecord("Executioner", "execute_direct_attack(target_ip='192.168.1.100')", "ERROR: connection refused",
+                      tool="execute_direct_attack", duration=0.3),
+        HistoryRecord("Chronicler", "analyze_gridguardian_logs()",
+                      "Analysis: FAILURE. GridGuardian shows 2 recent anomaly report(s). The attack was likely detected.",
+                      tool="analyze_gridguardian_logs", duration=2.0),
+    ]
+    state = {"objective": "Open the substation circuit breaker", "plan": [{}] * 4, "current_task_index": 4,
+             "feedback": history[-1].output, "history": history, "revision_number": 1}
+    assessment = MissionAssessor().assess_mission_completion(state)
+
+    start = time.perf_counter()
+    report = render_mission_debrief(state, assessment)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(report)
+    print(f"⏱️  Rendered in {elapsed_ms:.2f}ms")
+
+    for section in ("MISSION AFTER-ACTION REPORT", "Mission Objective", "Execution Summary", "Outcome",
+                    "Key Findings", "Recommendations", "Technical Summary"):
+        assert section in report, section
+    assert "**FAILURE**" in report
+    assert "GridGuardian detected the attack in 1 of 1 log analyses" in report
+    assert "Failed step: Executioner: execute_direct_attack" in report
+    assert "execute_attack_scenario x1" in report
+    assert elapsed_ms < 100
+    print("✅ Templated debrief contains all sections")
+
+def test_map_reduce_debrief():
+    """Test that long histories are summarized per phase, concurrently and with bounded prompts"""
+    print("🧪 Testing Map-Reduce Mission Debrief...")
+
+    history = []
+    for revision in range(3):
+        for step in range(40):
+            agent = ("Infiltrator", "Saboteur", "Chronicler")[step % 3]
+            history.append(HistoryRecord(agent, f"tool_{step}()", f"rev {revision} step {step} " + "x" * 5000,
+                                         revision=revision))
+
+    phases = partition_history(history)
+    labels = [label for label, _ in phases]
+    assert labels[0].startswith("Plan revision 0") and labels[-1].startswith("Plan revision 2")
+    assert all(sum(len(line) + 1 for line in lines) <= MAX_PHASE_CHARS for _, lines in phases)
+    assert sum(len(lines) for _, lines in phases) == len(history)
+    agent_labels = [label.split(" (part")[0] for label, _ in partition_history(history, by="agent")]
+    assert list(dict.fromkeys(agent_labels)) == ["Infiltrator", "Saboteur", "Chronicler"]
+
+    prompts = []
+    def fake_llm(prompt):
+        prompts.append(prompt)
+        if "PHASE SUMMARIES" in prompt:
+            return "## 🎯 MISSION AFTER-ACTION REPORT"
+        time.sleep(0.2)
+        return "- phase summary"
+
+    start = time.perf_counter()
+    report = map_reduce_debrief(history, "FAILURE: detected", "Test objective", max_workers=len(phases),
+                                llm_call=fake_llm)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {len(phases)} phases summarized in {elapsed:.2f}s")
+
+    assert report == "## 🎯 MISSION AFTER-ACTION REPORT"
+    assert len(prompts) == len(phases) + 1
+    assert max(len(prompt) for prompt in prompts) < 12000
+    assert elapsed < 0.2 * len(phases) / 2  # Phases ran concurrently
+    # Phase prompts carry the tool output beyond the stored 200-character preview
+    assert "x" * 1000 in prompts[0]
+
+    # Long summaries are merged level by level until the final prompt fits
+    prompts.clear()
+    def verbose_llm(prompt):
+        prompts.append(prompt)
+        return "## 🎯 MISSION AFTER-ACTION REPORT" if "MISSION PHASE SUMMARIES" in prompt else "- detail " * 200
+    long_history = history * 4
+    report = map_reduce_debrief(long_history, "FAILURE: detected", "Test objective", llm_call=verbose_llm,
+                                max_reduce_chars=MAX_REDUCE_CHARS)
+    final = prompts[-1]
+    merges = [prompt for prompt in prompts if "CONSECUTIVE PHASES" in prompt]
+    print(f"⏱️  {len(partition_history(long_history))} phase summaries reduced with {len(merges)} merge call(s)")
+    assert report == "## 🎯 MISSION AFTER-ACTION REPORT" and "MISSION PHASE SUMMARIES" in final
+    assert merges and max(len(prompt) for prompt in prompts) < 12000
+    assert "Plan revision 0" in final and "to Plan revision 2" in final
+    print("✅ Map-reduce debrief keeps prompts bounded")
+
+def test_concurrent_saves():
+    """Test that reports saved in the same second get their own files and archive entries."""
+    print("\n🧪 Testing Concurrent Report Saves...")
+
+    cwd = os.getcwd()
+    configured = os.environ.get("RED_ARMY_REPORT_ARCHIVE")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["RED_ARMY_REPORT_ARCHIVE"] = os.path.join(tmp, "reports.db")
+        os.chdir(tmp)
+        try:
+            def save(i):
+                return save_mission_report.invoke({"report": f"Report {i}", "filename": None,
+                                                   "metadata": {"mission_id": f"batch/m-{i % 2}", "objective": "Open the breaker"}})
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(save, range(16)))
+            saved = sorted(name for name in os.listdir(tmp) if name.startswith("mission_report_"))
+            archived = ReportArchive().search(limit=100)
+        finally:
+            os.chdir(cwd)
+            if configured is None:
+                os.environ.pop("RED_ARMY_REPORT_ARCHIVE")
+            else:
+                os.environ["RED_ARMY_REPORT_ARCHIVE"] = configured
+
+    print(f"📄 {len(saved)} files, e.g. {saved[0]}")
+    assert all(result.startswith("✅") for result in results)
+    assert len(saved) == 16 and all("_batch-m-" in name for name in saved)
+    assert len(archived) == 16 and len({report.filename for report in archived}) == 16
+    print("✅ Every concurrent save kept its own file")
+
+
 if __name__ == "__main__":
-    test_reporting_tools()
\ No newline at end of file
+    test_reporting_tools()
+    test_templated_debrief()
+    test_map_reduce_debrief()
+    test_concurrent_saves()
\ No newline at end of file
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the MITRE technique catalog: package-relative loading,
+precomputed indexes and mtime-based reloading.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import json
+import tempfile
+from technique_catalog import TechniqueCatalog, technique_catalog
+
+
+def _write_catalog(path: str, techniques: dict, mtime: float) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"mitre_attack_ics_mapping": {"techniques": techniques}}, f)
+    os.utime(path, (mtime, mtime))
+
+
+def test_packaged_catalog():
+    """Test that the shipped catalog is found without a hardcoded path."""
+    print("🧪 Testing Packaged Technique Catalog...")
+
+    assert len(technique_catalog) > 0
+    assert "T0849" in technique_catalog
+    assert "activate_emergency_bypass" in technique_catalog.functions_for("T0849")
+    assert "T0849" in technique_catalog.techniques_for_function("activate_emergency_bypass")
+    assert "T0849" in technique_catalog.techniques_for_keyword("Safety")
+    assert technique_catalog.function_metadata("maintenance_override_bypass")["detection_risk"] == "HIGH"
+    assert "stealth_focused" in technique_catalog.strategies
+    print(f"✅ Loaded {len(technique_catalog)} techniques from {technique_catalog.path}")
+
+
+def test_reload_on_mtime_change():
+    """Test that the file is only re-read when its mtime changes."""
+    print("\n🧪 Testing mtime-Based Reload...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "techniques.json")
+        catalog = TechniqueCatalog(path, check_interval=0)
+
+        assert len(catalog) == 0  # Missing file: empty catalog
+        _write_catalog(path, {"T0001": {"name": "One", "mapped_functions": ["f1"], "rag_context_keywords": ["alpha"]}}, 1000)
+        assert catalog.functions_for("T0001") == ("f1",)
+        version = catalog.version
+
+        for _ in range(100):
+            catalog.technique("T0001")
+        assert catalog.version == version  # Unchanged file: no reload
+
+        _write_catalog(path, {"T0002": {"name": "Two", "mapped_functions": ["f1", "f2"]}}, 2000)
+        assert "T0001" not in catalog and catalog.techniques_for_function("f1") == ("T0002",)
+        assert catalog.version == version + 1
+
+        # A malformed rewrite keeps the last good catalog
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{ not json")
+        os.utime(path, (3000, 3000))
+        assert catalog.functions_for("T0002") == ("f1", "f2")
+
+        # Throttled checks do not see the change until the interval has passed
+        throttled = TechniqueCatalog(path, check_interval=3600)
+        throttled.refresh(force=True)
+        _write_catalog(path, {"T0003": {"name": "Three", "mapped_functions": []}}, 4000)
+        assert "T0003" not in throttled
+        throttled.refresh(force=True)
+        assert "T0003" in throttled
+    print("✅ Catalog reloads only when the file changes")
+
+
+if __name__ == "__main__":
+    test_packaged_catalog()
+    test_reload_on_mtime_change()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the scored technique selector: strategy cues, keyword
+relevance, ranking cache and scaling to a full-size technique catalog.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+import json
+import tempfile
+import time
+from technique_catalog import TechniqueCatalog
+from technique_selector import TechniqueSelector, technique_selector
+
+
+def test_strategy_selection():
+    """Test that strategy cues in the context steer the choice like the old keyword checks did."""
+    print("🧪 Testing Strategy-Based Selection...")
+
+    assert technique_selector.select("T0849", "Need to disable safety systems stealthily") == "activate_emergency_bypass"
+    assert technique_selector.select("T0849", "Emergency - need immediate access") == "maintenance_override_bypass"
+    assert technique_selector.select("T0849", "", "persistence_focused") == "manipulate_safety_timer"
+    # A cue in the context overrides the requested strategy
+    assert technique_selector.select("T0849", "keep it covert", "speed_focused") == "activate_emergency_bypass"
+    assert technique_selector.rank("T9999", "anything") == []
+
+    ranking = technique_selector.rank("T0849", "stealth")
+    assert [score for _, score in ranking[1:]] == sorted((score for _, score in ranking[1:]), reverse=True)
+    print(f"✅ Ranked: {ranking}")
+
+
+def test_baseline_picks():
+    """Test that the pick matches the Saboteur's original selection_criteria rule for representative cases."""
+    print("\n🧪 Testing Baseline Picks...")
+
+    expected = [
+        # (technique, context, requested strategy, pick)
+        ("T0836", "safety timer interlock", "speed_focused", "manipulate_safety_timer"),   # No speed_priority: first mapped
+        ("T0836", "", "persistence_focused", "corrupt_system_health_signature"),
+        ("T0836", "maintain access to the timer", "stealth_focused", "corrupt_system_health_signature"),
+        ("T0849", "fast persistent access", "stealth_focused", "maintenance_override_bypass"),   # Speed cue before persistence
+        ("T0849", "covert and immediate", "persistence_focused", "activate_emergency_bypass"),   # Stealth cue first
+        ("T0849", "safety interlock maintenance", "speed_focused", "maintenance_override_bypass"),
+        ("T0855", "modbus write command", "stealth_focused", "maintenance_override_bypass"),    # No *_priority keys
+        ("T0855", "health signature", "persistence_focused", "maintenance_override_bypass"),
+        ("T0835", "I/O image coil output", "stealth_focused", "activate_emergency_bypass"),
+        ("T0856", "spoof health reporting", "speed_focused", "corrupt_system_health_signature"),
+        ("T0858", "debug mode", "direct", "maintenance_override_bypass"),                      # Unknown strategy
+        ("T0868", "stealth", "speed_focused", "establish_covert_channel"),                     # Single mapped function
+    ]
+    for technique_id, context, strategy, pick in expected:
+        selected = technique_selector.select(technique_id, context, strategy)
+        assert selected == pick, (technique_id, context, strategy, selected)
+    print(f"✅ {len(expected)} representative picks unchanged")
+
+
+def test_keyword_relevance_and_cache():
+    """Test that rag_context_keywords order the alternatives to the pick, and rankings are cached."""
+    print("\n🧪 Testing Keyword Relevance...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "techniques.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"mitre_attack_ics_mapping": {"techniques": {"T0001": {
+                "name": "Test", "mapped_functions": ["jam_radio", "flood_network", "spoof_sensor_reading"],
+                "rag_context_keywords": ["sensor", "network"],
+            }}}}, f)
+        selector = TechniqueSelector(TechniqueCatalog(path))
+
+        def order(context):
+            return [name for name, _ in selector.rank("T0001", context)]
+
+        assert order("") == ["jam_radio", "flood_network", "spoof_sensor_reading"]   # Tie: catalog order
+        # Without selection_criteria the first mapped function stays the pick
+        assert order("the network is flat, network segmentation is missing") == \
+            ["jam_radio", "flood_network", "spoof_sensor_reading"]
+        assert order("sensor readings feed the HMI") == ["jam_radio", "spoof_sensor_reading", "flood_network"]
+
+        misses = selector.misses
+        selector.rank("T0001", "sensor readings feed the HMI")
+        assert selector.misses == misses and selector.hits == 1
+    print("✅ Technique keywords score the functions they describe")
+
+
+def test_full_matrix_scale():
+    """Test selection speed with a catalog the size of the full ATT&CK for ICS matrix."""
+    print("\n🧪 Testing Selection at Catalog Scale...")
+
+    techniques = {
+        f"T{1000 + i}": {
+            "name": f"Technique {i}",
+            "mapped_functions": [f"function_{(i + j) % 150}" for j in range(6)],
+            "rag_context_keywords": [f"keyword{(i * 7 + j) % 400}" for j in range(8)],
+        }
+        for i in range(100)
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "techniques.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"mitre_attack_ics_mapping": {"techniques": techniques}}, f)
+        selector = TechniqueSelector(TechniqueCatalog(path))
+        context = " ".join(f"keyword{i % 400} function {i % 150} stealth" for i in range(20000))
+
+        start = time.perf_counter()
+        for technique_id in techniques:
+            assert len(selector.rank(technique_id, context)) == 6
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"⏱️  Ranked 100 techniques over a {len(context) // 1024}KB context in {elapsed_ms:.1f}ms")
+        assert selector.misses == 100 and elapsed_ms < 2000
+
+        start = time.perf_counter()
+        selector.rank("T1050", context)
+        print(f"⏱️  Cached ranking in {(time.perf_counter() - start) * 1000:.2f}ms")
+    print("✅ One context scan serves every technique")
+
+
+if __name__ == "__main__":
+    test_strategy_selection()
+    test_baseline_picks()
+    test_keyword_relevance_and_cache()
+    test_full_matrix_scale()
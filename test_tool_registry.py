@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the unified tool registry: O(1) dispatch, ownership checks and
+schema-checked argument coercion.
+"""
+
+import sys
+import os
+sys.path.append(os.getcwd())
+
+from tool_registry import tool_registry, UnknownToolError, ToolNotAvailableError, ToolArgumentError
+
+
+def expect_error(error_type, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except error_type as e:
+        print(f"   ✅ {error_type.__name__}: {e}")
+        return
+    raise AssertionError(f"Expected {error_type.__name__}")
+
+
+def test_argument_coercion():
+    """Test that arguments are validated and coerced against the tool signature."""
+    print("🧪 Testing Argument Coercion...")
+
+    spec = tool_registry.get("create_evasion_attack_sequence")
+    print(f"📋 Schema: {spec.signature()}")
+
+    args = spec.validate({"target_ip": "192.168.1.100", "plc_register": "40001", "value": 0.0})
+    assert args == {"target_ip": "192.168.1.100", "plc_register": 40001, "value": 0}
+
+    args = tool_registry.get("establish_covert_channel").validate({"target_ip": "10.0.0.5", "enable_debug": "false"})
+    assert args["enable_debug"] is False
+
+    args = tool_registry.get("analyze_gridguardian_logs").validate({"attack_start_time": None})
+    assert args == {"attack_start_time": None}
+
+    expect_error(ToolArgumentError, spec.validate, {"target_ip": "192.168.1.100", "plc_register": 1})
+    expect_error(ToolArgumentError, spec.validate, {"target_ip": "192.168.1.100", "plc_register": "abc", "value": 1})
+    expect_error(ToolArgumentError, spec.validate, {"target_ip": "192.168.1.100", "plc_register": 1, "value": 1, "speed": 3})
+
+    args = spec.validate({"target_ip": "192.168.1.100", "plc_register": 1, "value": 1, "speed": 3}, drop_unknown=True)
+    assert "speed" not in args
+    print("✅ Arguments coerced and validated")
+
+
+def test_dispatch():
+    """Test dispatching tools through the registry on behalf of agents."""
+    print("\n🧪 Testing Registry Dispatch...")
+
+    result = tool_registry.dispatch("Saboteur", "create_evasion_attack_sequence",
+                                    {"target_ip": "192.168.1.100", "plc_register": "40001", "value": "0"})
+    print(f"📋 Result: {result}")
+    assert "'register': 40001" in result
+
+    expect_error(UnknownToolError, tool_registry.dispatch, "Chronicler", "document_attack_results", {"scenario": "Stealth Bypass"})
+    expect_error(ToolNotAvailableError, tool_registry.dispatch, "Infiltrator", "execute_direct_attack", {})
+
+    assert {spec.name for spec in tool_registry.tools_for("Chronicler")} == {"analyze_document", "analyze_gridguardian_logs", "analyze_defensive_monitors"}
+    print("✅ Dispatch, unknown tools and ownership checks behave correctly")
+
+
+if __name__ == "__main__":
+    test_argument_coercion()
+    test_dispatch()
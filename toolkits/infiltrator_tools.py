@@ -1,15 +1,13 @@
 # toolkits/infiltrator_tools.py
 
-from dotenv import load_dotenv
-import nmap
 import subprocess
 import json
-import os
 from langchain_core.tools import tool
 from shared_tools import analyze_document
 
 # This module contains the toolkit for the Infiltrator Agent.
 # Note: analyze_document is imported from shared_tools for consistency across agents
+# Note: nmap is imported inside scan_network_for_plcs so it is only loaded on first use
 
 @tool
 def discover_docker_networks() -> str:
@@ -182,6 +180,8 @@ def scan_network_for_plcs(subnet: str) -> str:
         A string detailing the findings, including IP addresses and open ports for potential targets.
     """
     print(f"--- INFILTRATOR/TOOL: Scanning network {subnet} for SCADA/PLC targets... ---")
+    import nmap
+
     try:
         nm = nmap.PortScanner()
     except nmap.PortScannerError:
@@ -1,47 +1,36 @@
 # toolkits/reporting_tools.py
 
 import os
+import re
+import uuid
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from langchain_core.tools import tool
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
-from dotenv import load_dotenv
+from utils import load_environment
+from mission_history import HistoryRecord, entry_agent, entry_text
+from report_builder import ReportSections
+from report_archive import ReportArchive, report_archive
 
-# Load environment variables
-load_dotenv()
+@functools.lru_cache(maxsize=None)
+def get_llm():
+    """Create the report generation LLM on first use (loads the API key from the .env file)."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    load_environment()
+    return ChatGoogleGenerativeAI(model="gemini-1.5-pro-latest", api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Initialize the LLM for report generation
-llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro-latest", api_key=os.getenv("GOOGLE_API_KEY"))
-
-@tool
-def generate_mission_debrief(history: list, feedback: str, objective: str = "Security assessment mission") -> str:
-    """
-    Generates a comprehensive after-action report based on mission history and final feedback.
-    This tool synthesizes all mission activities into a structured debrief report.
-
-    Args:
-        history: List of strings containing the full mission history/actions taken
-        feedback: Final feedback or outcome from the mission execution
-        objective: The original mission objective (optional, defaults to "Security assessment mission")
-
-    Returns:
-        A formatted after-action report containing mission analysis and recommendations
-    """
-    print("--- REPORTING/TOOL: Generating Mission Debrief Report... ---")
-    
-    try:
-        # Prepare the mission data for analysis
-        history_text = "\n".join([f"• {entry}" for entry in history]) if history else "No mission history available"
-        
-        # Construct the comprehensive prompt for report generation
-        prompt = f"""
+def _aar_prompt(objective: str, feedback: str, history_text: str, history_heading: str = "MISSION HISTORY") -> str:
+    """The After-Action Report prompt shared by the single-shot and map-reduce debriefs."""
+    return f"""
         You are an expert cybersecurity analyst tasked with creating a professional After-Action Report (AAR) for a red team security assessment mission. 
 
         **MISSION DATA:**
         - Objective: {objective}
         - Final Outcome: {feedback}
         
-        **MISSION HISTORY:**
+        **{history_heading}:**
         {history_text}
 
         **TASK:** Generate a comprehensive, professional After-Action Report with the following structure:
@@ -76,9 +65,250 @@ def generate_mission_debrief(history: list, feedback: str, objective: str = "Sec
         - Use bullet points where appropriate for clarity
         """
 
+
+# --- Map-reduce debrief ---
+# Histories longer than MAP_REDUCE_THRESHOLD_CHARS are split into phases (plan
+# revisions or agents). Each phase is summarized by its own bounded LLM call,
+# concurrently, and the AAR is written from the phase summaries. When the
+# summaries themselves exceed MAX_REDUCE_CHARS, consecutive ones are merged by
+# further bounded calls until they fit. Prompt size no longer grows with the
+# mission and latency follows the longest phase.
+
+# Total history size (characters of output) above which the debrief is map-reduced
+MAP_REDUCE_THRESHOLD_CHARS = 20000
+
+# Each history entry contributes at most this many characters (of its full
+# text, tool output included) to a phase prompt
+MAX_ENTRY_CHARS = 1200
+
+# Phases larger than this are split into numbered parts
+MAX_PHASE_CHARS = 8000
+
+# Phase summaries are cut to this many characters before the reduce step
+MAX_PHASE_SUMMARY_CHARS = 1500
+
+# Combined phase summaries in one reduce prompt; larger sets are merged level by level
+MAX_REDUCE_CHARS = 8000
+
+# Concurrent phase summarization calls
+MAP_REDUCE_WORKERS = 4
+
+PHASE_GROUPINGS = ("revision", "agent")
+
+
+def _history_chars(history: list) -> int:
+    """Approximate size of a history without fetching outputs from the artifact store."""
+    return sum(entry.output_size if isinstance(entry, HistoryRecord) else len(str(entry))
+               for entry in history or [])
+
+
+def _invoke_llm(prompt: str) -> str:
+    from langchain_core.messages import HumanMessage
+
+    response = get_llm().invoke([HumanMessage(content=prompt)])
+    if not response or not response.content:
+        raise ValueError("empty LLM response")
+    return str(response.content).strip()
+
+
+def partition_history(history: list, by: str = "revision",
+                      max_phase_chars: int = MAX_PHASE_CHARS) -> List[Tuple[str, List[str]]]:
+    """
+    Split a history into labelled phases of bounded size.
+
+    by="revision" keeps contiguous runs of the same plan revision (legacy string
+    entries belong to the surrounding phase); by="agent" groups each agent's
+    steps in order of first appearance. Each phase is a list of entry lines:
+    the entry's full text (not the stored preview) cut to MAX_ENTRY_CHARS.
+    """
+    if by not in PHASE_GROUPINGS:
+        raise ValueError(f"Unsupported grouping '{by}'. Use one of: {', '.join(PHASE_GROUPINGS)}")
+
+    groups: List[Tuple[str, List[str]]] = []
+    by_agent: Dict[str, List[str]] = {}
+    for step, entry in enumerate(history or [], 1):
+        line = f"{step}. {_one_line(entry_text(entry), MAX_ENTRY_CHARS)}"
+        if by == "agent":
+            label = entry_agent(entry) or "Mission"
+            if label not in by_agent:
+                by_agent[label] = []
+                groups.append((label, by_agent[label]))
+            by_agent[label].append(line)
+            continue
+
+        if isinstance(entry, HistoryRecord):
+            label = f"Plan revision {entry.revision}"
+        else:
+            label = groups[-1][0] if groups else "Mission"
+        if not groups or groups[-1][0] != label:
+            groups.append((label, []))
+        groups[-1][1].append(line)
+
+    # Split oversized phases so every phase prompt stays bounded
+    phases = []
+    for label, lines in groups:
+        parts, size = [[]], 0
+        for line in lines:
+            if parts[-1] and size + len(line) > max_phase_chars:
+                parts.append([])
+                size = 0
+            parts[-1].append(line)
+            size += len(line) + 1
+        if len(parts) == 1:
+            phases.append((label, parts[0]))
+        else:
+            phases.extend((f"{label} (part {number})", part) for number, part in enumerate(parts, 1))
+    return phases
+
+
+def _phase_prompt(objective: str, label: str, lines: List[str]) -> str:
+    steps = "\n".join(lines)
+    return f"""
+        You are summarizing one phase of a red team security assessment mission for its After-Action Report.
+
+        **Mission Objective:** {objective}
+        **Phase:** {label}
+
+        **STEPS:**
+        {steps}
+
+        Summarize this phase in at most 8 bullet points: the actions taken, their results,
+        any detection by the defenders and any errors or skipped steps. Keep concrete
+        details (IPs, registers, techniques, tools). Do not speculate beyond the steps shown.
+        """
+
+
+def _merge_prompt(objective: str, summaries: List[str]) -> str:
+    phases = "\n\n".join(summaries)
+    return f"""
+        You are condensing consecutive phase summaries of a red team security assessment mission
+        for its After-Action Report.
+
+        **Mission Objective:** {objective}
+
+        **CONSECUTIVE PHASES:**
+        {phases}
+
+        Merge these phases into at most 8 bullet points, in order: the actions taken, their
+        results, any detection by the defenders and any errors or skipped steps. Keep concrete
+        details (IPs, registers, techniques, tools). Do not speculate beyond the summaries shown.
+        """
+
+
+class _PhaseSummary(NamedTuple):
+    first: str     # Label of the first phase covered
+    last: str      # Label of the last phase covered
+    text: str
+
+    def __str__(self) -> str:
+        label = self.first if self.first == self.last else f"{self.first} to {self.last}"
+        return f"#### {label}\n{self.text}"
+
+
+def _reduce_groups(summaries: List[_PhaseSummary], max_chars: int) -> List[List[_PhaseSummary]]:
+    """Consecutive groups of summaries within max_chars, at least two per group so each level shrinks."""
+    groups, size = [[]], 0
+    for summary in summaries:
+        length = len(str(summary)) + 2
+        if len(groups[-1]) >= 2 and size + length > max_chars:
+            groups.append([])
+            size = 0
+        groups[-1].append(summary)
+        size += length
+    return groups
+
+
+def _clip_summary(summary: str) -> str:
+    return summary if len(summary) <= MAX_PHASE_SUMMARY_CHARS else summary[:MAX_PHASE_SUMMARY_CHARS] + "..."
+
+
+def map_reduce_debrief(history: list, feedback: str, objective: str, by: str = "revision",
+                       max_workers: int = MAP_REDUCE_WORKERS,
+                       llm_call: Optional[Callable[[str], str]] = None,
+                       max_reduce_chars: int = MAX_REDUCE_CHARS) -> str:
+    """
+    Generate the After-Action Report from concurrently summarized history phases.
+
+    `llm_call` takes a prompt and returns the completion (defaults to the
+    Gemini model). A phase whose summary fails falls back to its raw steps.
+    While the phase summaries together exceed `max_reduce_chars`, consecutive
+    ones are merged by further LLM calls, so the final prompt stays bounded.
+    """
+    llm_call = llm_call or _invoke_llm
+    phases = partition_history(history, by=by)
+    print(f"--- REPORTING/TOOL: Summarizing {len(phases)} mission phase(s) with up to {max_workers} worker(s) ---")
+
+    def summarize(phase: Tuple[str, List[str]]) -> _PhaseSummary:
+        label, lines = phase
+        try:
+            summary = llm_call(_phase_prompt(objective, label, lines))
+        except Exception as e:
+            print(f"--- REPORTING/TOOL: Summary of '{label}' failed ({e}), using its raw steps ---")
+            summary = "\n".join(lines)
+        label = f"{label} ({len(lines)} steps)"
+        return _PhaseSummary(label, label, _clip_summary(summary))
+
+    def merge(group: List[_PhaseSummary]) -> _PhaseSummary:
+        if len(group) == 1:
+            return group[0]
+        try:
+            summary = llm_call(_merge_prompt(objective, [str(part) for part in group]))
+        except Exception as e:
+            print(f"--- REPORTING/TOOL: Merging phases '{group[0].first}' to '{group[-1].last}' failed ({e}), "
+                  f"keeping the start of each ---")
+            summary = "\n".join(part.text[:MAX_PHASE_SUMMARY_CHARS // len(group)] for part in group)
+        return _PhaseSummary(group[0].first, group[-1].last, _clip_summary(summary))
+
+    def combined_size(summaries: List[_PhaseSummary]) -> int:
+        return sum(len(str(summary)) + 2 for summary in summaries)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(phases) or 1))) as pool:
+        summaries = list(pool.map(summarize, phases))
+
+        while len(summaries) > 1 and combined_size(summaries) > max_reduce_chars:
+            groups = _reduce_groups(summaries, max_reduce_chars)
+            print(f"--- REPORTING/TOOL: Merging {len(summaries)} phase summaries into {len(groups)} ---")
+            summaries = list(pool.map(merge, groups))
+
+    history_text = "\n\n".join(str(summary) for summary in summaries) or "No mission history available"
+    return llm_call(_aar_prompt(objective, feedback, history_text, "MISSION PHASE SUMMARIES"))
+
+@tool
+def generate_mission_debrief(history: list, feedback: str, objective: str = "Security assessment mission") -> str:
+    """
+    Generates a comprehensive after-action report based on mission history and final feedback.
+    This tool synthesizes all mission activities into a structured debrief report.
+
+    Args:
+        history: The mission history (HistoryRecord entries or "Agent: action -> result" strings)
+        feedback: Final feedback or outcome from the mission execution
+        objective: The original mission objective (optional, defaults to "Security assessment mission")
+
+    Returns:
+        A formatted after-action report containing mission analysis and recommendations
+    """
+    print("--- REPORTING/TOOL: Generating Mission Debrief Report... ---")
+    
+    try:
+        # Very long histories are summarized phase by phase (bounded prompts)
+        if _history_chars(history) > MAP_REDUCE_THRESHOLD_CHARS:
+            print("--- REPORTING/TOOL: Long mission history, generating debrief with map-reduce ---")
+            report = map_reduce_debrief(history, feedback, objective)
+            print("\n" + "="*80)
+            print(report)
+            print("="*80 + "\n")
+            return report
+
+        # Prepare the mission data for analysis
+        history_text = "\n".join([f"• {entry_text(entry)}" for entry in history]) if history else "No mission history available"
+        
+        # Construct the comprehensive prompt for report generation
+        prompt = _aar_prompt(objective, feedback, history_text)
+
         # Generate the report using the LLM
+        from langchain_core.messages import HumanMessage
         messages = [HumanMessage(content=prompt)]
-        response = llm.invoke(messages)
+        response = get_llm().invoke(messages)
         
         if not response or not response.content:
             return "❌ Error: Failed to generate mission debrief report - empty LLM response"
@@ -98,14 +328,263 @@ def generate_mission_debrief(history: list, feedback: str, objective: str = "Sec
         return error_msg
 
 
+# --- Templated debrief ---
+# Renders the same After-Action Report sections as generate_mission_debrief
+# straight from the MissionAssessor assessment and the report sections the
+# report builder accumulates during the mission, without an LLM call. LLM
+# enrichment is an optional background pass.
+
+# Execution summary lists at most this many steps, and each output preview this many characters
+MAX_SUMMARY_STEPS = 40
+MAX_PREVIEW_CHARS = 160
+
+_enrichment_pool = None
+_pending_enrichments: set = set()   # Enrichment futures not finished yet
+_pending_lock = threading.Lock()
+
+
+def _one_line(text: str, limit: int = MAX_PREVIEW_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def render_mission_debrief(state: dict, assessment: dict, feedback: str | None = None,
+                           sections: ReportSections | None = None) -> str:
+    """
+    Render the After-Action Report from assessment data and report sections.
+    Deterministic and local: the same sections as the LLM report in milliseconds.
+
+    Args:
+        state: The final mission state (objective, history, plan, revision_number)
+        assessment: MissionAssessor.assess_mission_completion(state)
+        feedback: Final mission feedback (defaults to state["feedback"])
+        sections: The mission's accumulated report sections (report_builder.observe(state));
+            built from the history when omitted
+
+    Returns:
+        The report as Markdown
+    """
+    if sections is None:
+        sections = ReportSections.from_history(state.get("history", []))
+    feedback = state.get("feedback", "") if feedback is None else feedback
+    analysis = assessment["detailed_analysis"]
+    execution = analysis["plan_execution"]
+    indicators = analysis["objective_completion"]["objective_indicators"]
+    timeline = sections.timeline
+    detections, clean_runs = sections.detections, sections.clean_runs
+
+    outcome = "SUCCESS" if assessment["mission_status"] == "SUCCESS" else (
+        "FAILURE" if assessment["mission_status"] in ("FAILED", "INCOMPLETE") else "PARTIAL SUCCESS")
+
+    lines = [
+        "## 🎯 MISSION AFTER-ACTION REPORT",
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "### 📋 Mission Objective",
+        state.get("objective", "Security assessment mission"),
+        "",
+        "### 📖 Execution Summary",
+    ]
+    if not timeline:
+        lines.append("No mission history available.")
+    for i, row in enumerate(timeline[:MAX_SUMMARY_STEPS], 1):
+        if row.tool_call is not None:
+            timing = f", {row.duration:.1f}s" if row.duration else ""
+            lines.append(f"{i}. **{row.agent}** `{_one_line(row.tool_call, 100)}` ({row.status}{timing}): "
+                         f"{_one_line(row.preview)}")
+        else:
+            lines.append(f"{i}. {_one_line(row.preview)}")
+    if len(timeline) > MAX_SUMMARY_STEPS:
+        lines.append(f"... and {len(timeline) - MAX_SUMMARY_STEPS} further steps.")
+
+    lines.extend([
+        "",
+        "### ✅ Outcome",
+        f"**{outcome}** ({assessment['mission_status']}, {assessment['confidence_score']:.0%} confidence). {assessment['summary']}",
+        f"- Final feedback: {_one_line(feedback, 300) or 'None'}",
+        "",
+        "### 🔍 Key Findings",
+        f"- {execution['completed_tasks']}/{execution['total_tasks']} planned tasks executed: "
+        f"{execution['successful_tasks']} successful, {execution['failed_tasks']} failed, {execution['skipped_tasks']} skipped.",
+    ])
+    if detections:
+        lines.append(f"- GridGuardian detected the attack in {len(detections)} of {len(detections) + len(clean_runs)} log analyses: "
+                     f"{_one_line(detections[-1])}")
+    elif clean_runs:
+        lines.append(f"- GridGuardian raised no correlated anomalies in {len(clean_runs)} log analyses; the attack went undetected.")
+    else:
+        lines.append("- No GridGuardian log analysis was completed, so detection is unverified.")
+    lines.append(f"- Direct attack attempted: {'yes' if indicators['direct_attack_attempted'] else 'no'}; "
+                 f"stealth/evasion attempted: {'yes' if indicators['stealth_attack_attempted'] else 'no'}; "
+                 f"PLC interaction: {'yes' if indicators['plc_interaction'] else 'no'}.")
+    for failure in sections.failures[:5]:
+        lines.append(f"- Failed step: {_one_line(failure)}")
+
+    lines.extend(["", "### 🛠️ Recommendations"])
+    recommendations = list(assessment["recommendations"])
+    if detections:
+        recommendations.append("Detection is effective against the executed vectors; test lower-and-slower variants next.")
+    elif clean_runs:
+        recommendations.append("Tune GridGuardian thresholds: the executed attack vectors were not flagged.")
+    lines.extend(f"- {rec}" for rec in recommendations or ["No issues identified; repeat the exercise with new vectors."])
+
+    lines.extend([
+        "",
+        "### 📊 Technical Summary",
+        f"- Plan revisions: {state.get('revision_number', 0)}; history entries: {len(timeline)}; "
+        f"recorded step time: {sections.total_seconds:.1f}s",
+        f"- Tools used: {', '.join(f'{name} x{count}' for name, count in sections.tools_used.items()) or 'n/a'}",
+    ])
+    for agent, stats in analysis["agent_performance"].items():
+        seconds = sections.agent_stats.get(agent, {}).get("seconds", 0.0)
+        lines.append(f"- {agent}: {stats['total_actions']} actions, {stats.get('success_rate', 0):.0%} success, "
+                     f"{stats.get('failure_rate', 0):.0%} failed, {stats.get('skip_rate', 0):.0%} skipped, "
+                     f"{seconds:.1f}s")
+
+    return "\n".join(lines)
+
+
+def enrich_mission_debrief(report: str, objective: str, feedback: str,
+                           on_enriched: Optional[Callable[[str], None]] = None):
+    """
+    Start an LLM pass that polishes a templated report, in a background thread.
+    `on_enriched(report)` runs in that thread once the report is ready, so the
+    future only resolves after it (e.g. saving the report) has finished.
+
+    Returns:
+        A concurrent.futures.Future resolving to the enriched report, or to the
+        original report if the LLM call fails.
+    """
+    global _enrichment_pool
+    if _enrichment_pool is None:
+        _enrichment_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="debrief-enrich")
+
+    def enrich() -> str:
+        prompt = f"""
+        You are an expert cybersecurity analyst. Below is an automatically generated After-Action Report
+        for a red team exercise (objective: {objective}; final outcome: {feedback}).
+        Rewrite it as a polished, professional report. Keep every section heading and every fact;
+        add analysis and context where the data supports it. Do not invent results.
+
+        {report}
+        """
+        try:
+            from langchain_core.messages import HumanMessage
+            response = get_llm().invoke([HumanMessage(content=prompt)])
+            return str(response.content).strip() if response and response.content else report
+        except Exception as e:
+            print(f"--- REPORTING/TOOL: Debrief enrichment failed, keeping templated report: {e} ---")
+            return report
+
+    def enrich_and_handle() -> str:
+        enriched = enrich()
+        if on_enriched is not None:
+            on_enriched(enriched)
+        return enriched
+
+    future = _enrichment_pool.submit(enrich_and_handle)
+    with _pending_lock:
+        _pending_enrichments.add(future)
+    future.add_done_callback(_enrichment_finished)
+    return future
+
+
+def enrich_archived_report(report_id: int, archive: ReportArchive = report_archive):
+    """
+    Enrich a report already in the archive on demand (see enrich_mission_debrief)
+    and replace its archived text and its file with the result.
+
+    Returns:
+        A concurrent.futures.Future resolving to the enriched report, or to the
+        archived report if the LLM call fails.
+
+    Raises:
+        KeyError: If there is no such report.
+    """
+    entry, report = archive.entry(report_id), archive.get(report_id)
+    if entry is None or report is None:
+        raise KeyError(f"No report with ID {report_id}")
+
+    def upgrade(enriched: str) -> None:
+        # Runs on the enrichment thread: nothing raised here would reach the caller
+        if enriched == report:
+            return
+        try:
+            if entry.filename:
+                with open(entry.filename, 'w', encoding='utf-8') as f:
+                    f.write(enriched)
+            archive.update(report_id, enriched)
+            print(f"--- REPORTING/TOOL: Archived report {report_id} enriched"
+                  f"{f' and saved to {entry.filename}' if entry.filename else ''} ---")
+        except Exception as e:
+            print(f"--- REPORTING/TOOL ERROR: Enriched report {report_id} could not be saved: {e} ---")
+
+    return enrich_mission_debrief(report, entry.objective, entry.status or "unknown", upgrade)
+
+
+def _enrichment_finished(future) -> None:
+    with _pending_lock:
+        _pending_enrichments.discard(future)
+
+
+def wait_for_enrichments(timeout: Optional[float] = None) -> bool:
+    """
+    Block until every background enrichment started so far, including its
+    on_enriched handler, has finished. Processes that exit without running
+    interpreter shutdown (e.g. multiprocessing pool workers) must call this
+    first or lose the enriched reports.
+
+    Returns:
+        False if some enrichment was still running after `timeout` seconds.
+    """
+    with _pending_lock:
+        pending = list(_pending_enrichments)
+    return not wait(pending, timeout).not_done
+
+
+def _default_report_filename(mission_id: Optional[str] = None) -> str:
+    """
+    A report filename that stays unique when missions finish in the same second
+    (enrichment threads and batch workers save concurrently into one directory).
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    mission = re.sub(r"[^A-Za-z0-9_.-]+", "-", mission_id).strip("-.") if mission_id else ""
+    return "_".join(part for part in ("mission_report", timestamp, mission, uuid.uuid4().hex[:8]) if part) + ".md"
+
+def write_mission_report(report: str, filename: Optional[str] = None,
+                         metadata: Optional[dict] = None) -> Tuple[str, int]:
+    """
+    Write a report file and record it in the archive (see save_mission_report).
+
+    Returns:
+        The filename and the archive ID.
+    """
+    # Generate filename if not provided
+    if not filename:
+        filename = _default_report_filename((metadata or {}).get("mission_id"))
+    
+    # Ensure filename has .md extension
+    if not filename.endswith('.md'):
+        filename += '.md'
+        
+    # Archive and write the report together: the archive entry is only
+    # committed once the file has been written
+    with report_archive.recording(report, filename=os.path.abspath(filename), **(metadata or {})) as report_id:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(report)
+    return filename, report_id
+
 @tool
-def save_mission_report(report: str, filename: str | None = None) -> str:
+def save_mission_report(report: str, filename: str | None = None, metadata: dict | None = None) -> str:
     """
-    Saves a mission report to a file for permanent record keeping.
+    Saves a mission report to a file for permanent record keeping and records it
+    in the searchable report archive (see report_archive.py).
     
     Args:
         report: The formatted report content to save
-        filename: Optional filename (defaults to timestamp-based name)
+        filename: Optional filename (defaults to a timestamp, mission ID and random suffix)
+        metadata: Optional archive metadata (mission_id, objective, status, confidence,
+            scenarios, techniques); anything omitted is recovered from the report text
         
     Returns:
         Confirmation message with saved file path
@@ -113,20 +592,9 @@ def save_mission_report(report: str, filename: str | None = None) -> str:
     print("--- REPORTING/TOOL: Saving Mission Report... ---")
     
     try:
-        # Generate filename if not provided
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"mission_report_{timestamp}.md"
-        
-        # Ensure filename has .md extension
-        if not filename.endswith('.md'):
-            filename += '.md'
-            
-        # Write the report to file
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+        filename, report_id = write_mission_report(report, filename, metadata)
             
-        success_msg = f"✅ Mission report saved successfully to: {filename}"
+        success_msg = f"✅ Mission report saved successfully to: {filename} (archive ID {report_id})"
         print(success_msg)
         return success_msg
         
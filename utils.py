@@ -3,6 +3,80 @@ Utility functions for the Red Army system.
 """
 import re
 import ast
+import functools
+
+@functools.lru_cache(maxsize=None)
+def load_environment() -> bool:
+    """
+    Load environment variables (e.g. GOOGLE_API_KEY) from the .env file.
+    Safe to call from anywhere: the file is only read on the first call.
+
+    Returns:
+        True if a .env file was found and loaded.
+    """
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    return load_dotenv()
+
+PLACEHOLDER_PATTERN = re.compile(r'<[^>]+>')
+
+def parse_tool_call(tool_call: str) -> tuple[str, tuple, dict]:
+    """
+    Parse a tool call string with Python's own parser.
+
+    Accepts "function_name(arg1, key='value', ...)" or a bare "function_name".
+    Argument values must be literals (strings, numbers, booleans, None,
+    lists, tuples, dicts); nothing is ever evaluated.
+
+    Args:
+        tool_call: The tool call string from a plan step
+
+    Returns:
+        tuple: (function_name, positional_args, keyword_args)
+
+    Raises:
+        ValueError: If the tool call is malformed, has unresolved placeholders
+                    or has non-literal argument values
+    """
+    text = tool_call.strip()
+    if PLACEHOLDER_PATTERN.search(text):
+        raise ValueError(f"Tool call contains unresolved placeholders: {tool_call}")
+
+    try:
+        node = ast.parse(text, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid tool call syntax in '{tool_call}': {e.msg}") from None
+
+    # A bare name is a call without arguments
+    if isinstance(node, ast.Name):
+        return node.id, (), {}
+
+    if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+        raise ValueError(f"Invalid tool call format: {tool_call}")
+
+    def literal(value_node: ast.AST, label: str):
+        try:
+            return ast.literal_eval(value_node)
+        except ValueError:
+            raise ValueError(
+                f"Argument {label} in '{tool_call}' must be a literal value, got '{ast.unparse(value_node)}'"
+            ) from None
+
+    positional = []
+    for position, arg in enumerate(node.args):
+        if isinstance(arg, ast.Starred):
+            raise ValueError(f"Unpacked arguments are not allowed in '{tool_call}'")
+        positional.append(literal(arg, f"#{position + 1}"))
+
+    keywords = {}
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            raise ValueError(f"Unpacked arguments are not allowed in '{tool_call}'")
+        keywords[keyword.arg] = literal(keyword.value, f"'{keyword.arg}'")
+
+    return node.func.id, tuple(positional), keywords
 
 def parse_tool_call_safely(tool_call: str) -> tuple[str, dict]:
     """
@@ -17,59 +91,12 @@ def parse_tool_call_safely(tool_call: str) -> tuple[str, dict]:
     Raises:
         ValueError: If the tool call cannot be parsed or has invalid arguments
     """
-    # Extract function name and arguments
-    if '(' not in tool_call or not tool_call.endswith(')'):
-        raise ValueError(f"Invalid tool call format: {tool_call}")
-    
-    func_name = tool_call.split('(', 1)[0].strip()
-    args_str = tool_call.split('(', 1)[1][:-1].strip()
-    
-    # If no arguments, return empty dict
-    if not args_str:
-        return func_name, {}
-    
-    # Check for placeholder values (anything in angle brackets)
-    if re.search(r'<[^>]+>', args_str):
-        raise ValueError(f"Tool call contains unresolved placeholders: {tool_call}")
-    
-    # Try to parse arguments safely
-    try:
-        # Build a safe dictionary string and evaluate it
-        # This handles quoted strings and basic values
-        args_dict = {}
-        
-        # Simple regex-based parsing for basic cases
-        # Matches patterns like arg='value' or arg="value" or arg=123 or arg=3.14
-        arg_pattern = r"(\w+)\s*=\s*(?:'([^']*)'|\"([^\"]*)\"|([^\s,)]+))"
-        matches = re.findall(arg_pattern, args_str)
-        
-        for match in matches:
-            key = match[0]
-            # Use whichever capture group has content
-            value = match[1] or match[2] or match[3]
-            
-            # Try to convert numeric values (but avoid IP addresses and complex strings)
-            if value.isdigit():
-                value = int(value)
-            elif '.' in value:
-                # Check if it looks like a decimal number (not IP address, URL, etc.)
-                if value.count('.') == 1:
-                    parts = value.split('.')
-                    # Valid decimal: digits before and after the dot
-                    if len(parts) == 2 and all(part.isdigit() for part in parts):
-                        try:
-                            value = float(value)
-                        except ValueError:
-                            pass  # Keep as string
-                # If multiple dots or non-numeric parts, keep as string (IP addresses, etc.)
-            
-            args_dict[key] = value
-        
-        return func_name, args_dict
-        
-    except Exception as e:
-        raise ValueError(f"Failed to parse tool call arguments in '{tool_call}': {e}")
+    func_name, positional, args_dict = parse_tool_call(tool_call)
+    if positional:
+        # Binding positional arguments needs the tool's schema (see plan_compiler)
+        raise ValueError(f"Positional arguments are not supported in '{tool_call}'; use keyword arguments")
+    return func_name, args_dict
 
 def has_unresolved_placeholders(tool_call: str) -> bool:
     """Check if a tool call has unresolved placeholder values like <placeholder>."""
-    return bool(re.search(r'<[^>]+>', tool_call))
\ No newline at end of file
+    return bool(PLACEHOLDER_PATTERN.search(tool_call))
\ No newline at end of file